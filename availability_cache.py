@@ -0,0 +1,221 @@
+"""
+Versioned Facility Availability Cache
+
+Every open match-scheduling page keeps asking for the same facility-days:
+the scheduling form, ``api_facility_availability``, option refreshes and
+schedule previews all end in ``get_facility_availability``, which re-reads
+the bookings and rebuilds each FacilityAvailabilityInfo.  When several
+coordinators click through dates at once the same facility-days are queried
+over and over although nothing changed.
+
+This module keeps one process-wide cache of FacilityAvailabilityInfo per
+(database, facility, date).  Each entry is stamped with the version of what
+it was built from:
+
+- a version per facility-day, bumped when a match booked on that day is
+  scheduled, moved, unscheduled or deleted
+- a generation per facility, bumped when the facility itself changes
+  (schedule, blackout dates)
+- a generation per database, bumped by league changes (match durations) and
+  by any commit this process did not account for
+
+The last point uses ``PRAGMA data_version`` from the stats cache sentinel
+connection, so writes from other processes (the CLI while the web app runs)
+or writes that bypass ``track_writes`` drop the whole cache instead of
+serving stale availability.
+
+Entries are only read and written outside transactions; dry runs and open
+transactions see uncommitted bookings and always go to the database.
+"""
+
+import logging
+import os
+import threading
+from collections import OrderedDict
+from contextlib import contextmanager
+from datetime import date
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
+
+import stats_cache
+
+logger = logging.getLogger(__name__)
+
+# Most facility-days kept per process (least recently used are dropped first)
+MAX_ENTRIES = 20000
+
+# (facility_id or None for every facility, date or None for every date)
+FacilityDayKey = Tuple[Optional[int], Optional[date]]
+Stamp = Tuple[int, int, int]
+
+_lock = threading.RLock()
+_entries: "OrderedDict[Tuple[str, int, date], Tuple[Stamp, object]]" = OrderedDict()
+_day_versions: Dict[Tuple[str, int, date], int] = {}
+_facility_generations: Dict[Tuple[str, int], int] = {}
+_db_generations: Dict[str, int] = {}
+_seen_data_versions: Dict[str, int] = {}
+_stats = {"hits": 0, "misses": 0, "invalidations": 0}
+
+
+def _cache_key(db_path: Optional[str]) -> Optional[str]:
+    """Normalize a database path into a cache key (None if the path cannot be cached)"""
+    if not db_path or db_path == ':memory:':
+        return None
+    return os.path.abspath(db_path)
+
+
+def _data_version(key: str) -> int:
+    return stats_cache.get_change_token(key)[1]
+
+
+def _sync_external_writes(key: str) -> None:
+    """Drop everything for a database if it was committed to behind the cache's back"""
+    current = _data_version(key)
+    seen = _seen_data_versions.get(key)
+    if seen is not None and seen != current:
+        _db_generations[key] = _db_generations.get(key, 0) + 1
+        _stats["invalidations"] += 1
+        logger.debug(f"Availability cache for {key} invalidated by an external write")
+    _seen_data_versions[key] = current
+
+
+def _stamp(key: str, facility_id: int, date_obj: date) -> Stamp:
+    return (
+        _db_generations.get(key, 0),
+        _facility_generations.get((key, facility_id), 0),
+        _day_versions.get((key, facility_id, date_obj), 0),
+    )
+
+
+def lookup(db_path: Optional[str], facility_id: int,
+           dates: Iterable[date]) -> Tuple[Dict[date, object], Dict[date, Stamp]]:
+    """
+    Get cached availability for some dates of a facility
+
+    Args:
+        db_path: Path of the SQLite database file
+        facility_id: Facility ID
+        dates: Dates wanted
+
+    Returns:
+        Tuple of (cached FacilityAvailabilityInfo by date, stamps of the missing
+        dates).  Capture the stamps *before* reading the database and pass them
+        to ``store`` so that a write in between is never cached as current.
+    """
+    key = _cache_key(db_path)
+    dates = list(dates)
+    if key is None:
+        return {}, {}
+
+    found: Dict[date, object] = {}
+    missing: Dict[date, Stamp] = {}
+    with _lock:
+        _sync_external_writes(key)
+        for date_obj in dates:
+            stamp = _stamp(key, facility_id, date_obj)
+            entry = _entries.get((key, facility_id, date_obj))
+            if entry is not None and entry[0] == stamp:
+                _entries.move_to_end((key, facility_id, date_obj))
+                found[date_obj] = entry[1]
+            else:
+                missing[date_obj] = stamp
+        _stats["hits"] += len(found)
+        _stats["misses"] += len(missing)
+    return found, missing
+
+
+def store(db_path: Optional[str], facility_id: int, infos: Iterable[object],
+          stamps: Dict[date, Stamp]) -> None:
+    """
+    Cache freshly built availability
+
+    Args:
+        db_path: Path of the SQLite database file
+        facility_id: Facility ID
+        infos: FacilityAvailabilityInfo objects (anything with a ``date``)
+        stamps: Stamps returned by ``lookup`` for those dates
+    """
+    key = _cache_key(db_path)
+    if key is None:
+        return
+    with _lock:
+        for info in infos:
+            stamp = stamps.get(info.date)
+            if stamp is None:
+                continue
+            _entries[(key, facility_id, info.date)] = (stamp, info)
+            _entries.move_to_end((key, facility_id, info.date))
+        while len(_entries) > MAX_ENTRIES:
+            _entries.popitem(last=False)
+
+
+def _bump(key: str, facility_days: Iterable[FacilityDayKey]) -> None:
+    for facility_id, date_obj in facility_days:
+        if facility_id is None:
+            _db_generations[key] = _db_generations.get(key, 0) + 1
+        elif date_obj is None:
+            _facility_generations[(key, facility_id)] = _facility_generations.get((key, facility_id), 0) + 1
+        else:
+            _day_versions[(key, facility_id, date_obj)] = _day_versions.get((key, facility_id, date_obj), 0) + 1
+
+
+@contextmanager
+def track_writes(db_path: Optional[str], facility_days: Iterable[FacilityDayKey]) -> Iterator[None]:
+    """
+    Wrap a committed write (an autocommit statement or a COMMIT) that changes
+    the given facility-days
+
+    The versions are bumped after the write, and the commit it causes is
+    acknowledged so it does not count as an external write.  If something
+    else was committed since the cache last looked, everything is dropped.
+
+    Args:
+        db_path: Path of the SQLite database file
+        facility_days: (facility_id, date) keys; a None date means every date
+            of the facility, a None facility means everything
+    """
+    key = _cache_key(db_path)
+    facility_days = list(facility_days)
+    if key is None:
+        yield
+        return
+
+    with _lock:
+        unaccounted = _seen_data_versions.get(key) != _data_version(key)
+    try:
+        yield
+    finally:
+        with _lock:
+            _bump(key, facility_days)
+            if unaccounted:
+                _bump(key, [(None, None)])
+            _seen_data_versions[key] = _data_version(key)
+            _stats["invalidations"] += 1
+
+
+def invalidate(db_path: Optional[str] = None) -> None:
+    """Drop cached availability for one database, or for all databases if no path is given"""
+    key = _cache_key(db_path)
+    with _lock:
+        if db_path is None:
+            _entries.clear()
+        else:
+            for cache_key in [k for k in _entries if k[0] == key]:
+                del _entries[cache_key]
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit, miss and invalidation counters plus the current number of entries"""
+    with _lock:
+        return dict(_stats, entries=len(_entries))
+
+
+def facility_day_keys(facility_id: Optional[int], date_values: Iterable[Optional[object]]) -> List[FacilityDayKey]:
+    """(facility_id, date) keys from date objects or YYYY-MM-DD strings (None entries are skipped)"""
+    keys = []
+    for value in date_values:
+        if value is None:
+            continue
+        if isinstance(value, str):
+            value = date.fromisoformat(value)
+        keys.append((facility_id, value))
+    return keys
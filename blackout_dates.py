@@ -0,0 +1,186 @@
+"""
+Facility Blackout Dates
+
+A facility's unavailable dates used to be a list, so every
+``is_available_on_date`` call (one per candidate date and facility) was a
+linear scan, and closures were added and stored one day at a time.
+
+BlackoutDates holds them in a set (O(1) membership) and adds:
+
+- range operations: ``add_range`` / ``remove_range`` ("closed Dec 20 - Jan 3")
+  and ``ranges()``, the closures merged into contiguous (start, end) runs
+  that the database stores one row per run
+- ``bitmap(start, end)``: an int with bit i set when ``start + i days`` is
+  closed, cached per window until the dates change, and ``count_between``
+
+Values may be date objects, ``YYYY-MM-DD`` strings (as read from the
+database, YAML and forms) or ``YYYY-MM-DD..YYYY-MM-DD`` ranges; they are
+always held as date objects.
+"""
+
+from datetime import date, datetime, timedelta
+from typing import Any, Dict, Iterable, Iterator, List, Set, Tuple
+
+# Separator of the two ends of a range written as a string
+RANGE_SEPARATOR = ".."
+
+
+def _parse_date(value: Any) -> date:
+    if isinstance(value, datetime):
+        return value.date()
+    if isinstance(value, date):
+        return value
+    if isinstance(value, str):
+        try:
+            return date.fromisoformat(value.strip())
+        except ValueError:
+            pass
+    raise ValueError(f"Invalid unavailable date: {value!r}. Expected a date or YYYY-MM-DD")
+
+
+def _date_range(start: date, end: date) -> Iterator[date]:
+    if end < start:
+        raise ValueError(f"Range end {end} is before its start {start}")
+    for offset in range((end - start).days + 1):
+        yield start + timedelta(days=offset)
+
+
+class BlackoutDates:
+    """
+    Set of dates a facility is closed on
+
+    Args:
+        dates: Dates, YYYY-MM-DD strings or YYYY-MM-DD..YYYY-MM-DD ranges
+
+    Raises:
+        ValueError: If a value is not a date, a date string or a range
+    """
+
+    __slots__ = ("_dates", "_bitmaps")
+
+    def __init__(self, dates: Iterable[Any] = ()):
+        self._dates: Set[date] = set()
+        self._bitmaps: Dict[Tuple[date, date], int] = {}
+        if isinstance(dates, (str, date)):
+            dates = [dates]
+        try:
+            values = list(dates)
+        except TypeError:
+            raise ValueError(f"Unavailable dates must be a list, got: {type(dates).__name__}")
+        for value in values:
+            if isinstance(value, str) and RANGE_SEPARATOR in value:
+                start, end = value.split(RANGE_SEPARATOR, 1)
+                self._dates.update(_date_range(_parse_date(start), _parse_date(end)))
+            else:
+                self._dates.add(_parse_date(value))
+
+    # ========== Set Protocol ==========
+
+    def __contains__(self, value: Any) -> bool:
+        if isinstance(value, str):
+            try:
+                value = date.fromisoformat(value)
+            except ValueError:
+                return False
+        return value in self._dates
+
+    def __iter__(self) -> Iterator[date]:
+        """Dates in chronological order"""
+        return iter(sorted(self._dates))
+
+    def __len__(self) -> int:
+        return len(self._dates)
+
+    def __eq__(self, other: Any) -> bool:
+        if isinstance(other, BlackoutDates):
+            return self._dates == other._dates
+        return NotImplemented
+
+    __hash__ = None  # type: ignore[assignment]
+
+    def __repr__(self) -> str:
+        return f"BlackoutDates({[day.isoformat() for day in self]})"
+
+    def copy(self) -> 'BlackoutDates':
+        return BlackoutDates(self._dates)
+
+    # ========== Changes ==========
+
+    def _changed(self) -> None:
+        self._bitmaps.clear()
+
+    def add(self, date_obj: date) -> None:
+        """Close the facility on a date"""
+        self._dates.add(_parse_date(date_obj))
+        self._changed()
+
+    def discard(self, date_obj: date) -> None:
+        """Reopen the facility on a date (no error if it was open)"""
+        self._dates.discard(_parse_date(date_obj))
+        self._changed()
+
+    def add_range(self, start: date, end: date) -> int:
+        """
+        Close the facility from ``start`` to ``end`` inclusive
+
+        Returns:
+            Number of dates that were open before
+
+        Raises:
+            ValueError: If end is before start
+        """
+        days = set(_date_range(_parse_date(start), _parse_date(end)))
+        added = len(days - self._dates)
+        self._dates |= days
+        self._changed()
+        return added
+
+    def remove_range(self, start: date, end: date) -> int:
+        """
+        Reopen the facility from ``start`` to ``end`` inclusive
+
+        Returns:
+            Number of dates that were closed before
+
+        Raises:
+            ValueError: If end is before start
+        """
+        days = set(_date_range(_parse_date(start), _parse_date(end)))
+        removed = len(days & self._dates)
+        self._dates -= days
+        self._changed()
+        return removed
+
+    def clear(self) -> None:
+        self._dates.clear()
+        self._changed()
+
+    # ========== Queries ==========
+
+    def ranges(self) -> List[Tuple[date, date]]:
+        """Closed dates merged into contiguous (start, end) runs, in order"""
+        runs: List[Tuple[int, int]] = []
+        for ordinal in sorted(day.toordinal() for day in self._dates):
+            if runs and ordinal == runs[-1][1] + 1:
+                runs[-1] = (runs[-1][0], ordinal)
+            else:
+                runs.append((ordinal, ordinal))
+        return [(date.fromordinal(start), date.fromordinal(end)) for start, end in runs]
+
+    def bitmap(self, start: date, end: date) -> int:
+        """Bit i set when ``start + i days`` is closed, for the dates from start to end"""
+        key = (start, end)
+        bits = self._bitmaps.get(key)
+        if bits is None:
+            first, last = start.toordinal(), end.toordinal()
+            bits = 0
+            for day in self._dates:
+                ordinal = day.toordinal()
+                if first <= ordinal <= last:
+                    bits |= 1 << (ordinal - first)
+            self._bitmaps[key] = bits
+        return bits
+
+    def count_between(self, start: date, end: date) -> int:
+        """Number of closed dates from start to end inclusive"""
+        return bin(self.bitmap(start, end)).count("1")
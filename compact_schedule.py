@@ -0,0 +1,138 @@
+"""
+Compact Weekly Schedules
+
+WeeklySchedule keeps one DaySchedule attribute per weekday and a list of
+TimeSlot objects per day, which is convenient to edit and serialize but slow
+to query: ``get_day_schedule`` resolves a day name on every call and
+``get_available_courts_at_time`` scans the slot list.  Those lookups run for
+every candidate (facility, date, time) of a scheduling run.
+
+CompactWeeklySchedule is a read-only snapshot of a WeeklySchedule:
+
+- days are indexed by ``date.weekday()`` (0 = Monday ... 6 = Sunday), so the
+  day of a date needs no ``strftime('%A')``
+- each CompactDaySchedule holds its slots as sorted tuples of start times,
+  minutes since midnight and courts, so a slot is O(1) by index or by exact
+  time and O(log n) by minute (bisect)
+
+``DaySchedule.compact()`` and ``WeeklySchedule.compact()`` build the
+snapshots on first use and rebuild them when a day's slot list is replaced
+or changes length; slots are not edited in place anywhere in the code base.
+"""
+
+from bisect import bisect_left, bisect_right
+from datetime import date
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from time_of_day import minutes_to_time, time_to_minutes
+
+WEEKDAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Lower-case day name -> weekday index (as returned by date.weekday())
+WEEKDAY_INDEX: Dict[str, int] = {name.lower(): index for index, name in enumerate(WEEKDAYS)}
+
+
+def weekday_index(day: str) -> int:
+    """
+    Weekday index of a day name (case-insensitive)
+
+    Raises:
+        ValueError: If the name is not a day of the week
+    """
+    try:
+        return WEEKDAY_INDEX[day.lower()]
+    except KeyError:
+        raise ValueError(f"Invalid day: {day}. Must be one of: {list(WEEKDAY_INDEX)}")
+
+
+class CompactDaySchedule:
+    """Start times of one weekday as sorted arrays of times, minutes and courts"""
+
+    __slots__ = ("times", "minutes", "courts", "_index")
+
+    def __init__(self, slots: Iterable[Tuple[str, int]]):
+        """
+        Args:
+            slots: (HH:MM start time, available courts) pairs in any order
+        """
+        ordered = sorted(((time_to_minutes(time_str), time_str, int(courts)) for time_str, courts in slots))
+        self.minutes: Tuple[int, ...] = tuple(minute for minute, _, _ in ordered)
+        self.times: Tuple[str, ...] = tuple(time_str for _, time_str, _ in ordered)
+        self.courts: Tuple[int, ...] = tuple(courts for _, _, courts in ordered)
+        self._index: Dict[str, int] = {}
+        for position, time_str in enumerate(self.times):
+            self._index.setdefault(time_str, position)
+
+    def __len__(self) -> int:
+        return len(self.times)
+
+    @property
+    def slots(self) -> List[Tuple[str, int]]:
+        """(time, courts) per start time, in time order"""
+        return list(zip(self.times, self.courts))
+
+    @property
+    def total_courts(self) -> int:
+        """Courts summed over all start times"""
+        return sum(self.courts)
+
+    @property
+    def max_courts(self) -> int:
+        """Most courts available at any start time (0 without slots)"""
+        return max(self.courts, default=0)
+
+    def has_availability(self) -> bool:
+        """True if any start time has a court"""
+        return any(self.courts)
+
+    def slot_index(self, time_str: str) -> Optional[int]:
+        """Index of an exact start time, None if the day has no such slot"""
+        return self._index.get(time_str)
+
+    def courts_at(self, time_str: str) -> Optional[int]:
+        """Courts at an exact start time, None if the day has no such slot"""
+        position = self._index.get(time_str)
+        return None if position is None else self.courts[position]
+
+    def slots_between(self, start: int, end: int) -> range:
+        """Indices of the start times within [start, end) minutes"""
+        return range(bisect_left(self.minutes, start), bisect_left(self.minutes, end))
+
+    def slot_at_or_before(self, minute: int) -> Optional[int]:
+        """Index of the last start time at or before a minute, None if there is none"""
+        position = bisect_right(self.minutes, minute) - 1
+        return position if position >= 0 else None
+
+
+class CompactWeeklySchedule:
+    """Seven CompactDaySchedules indexed by weekday, plus the union of their start times"""
+
+    __slots__ = ("days", "minutes", "times")
+
+    def __init__(self, days: Sequence[CompactDaySchedule]):
+        if len(days) != 7:
+            raise ValueError(f"A weekly schedule needs 7 days, got {len(days)}")
+        self.days: Tuple[CompactDaySchedule, ...] = tuple(days)
+        self.minutes: Tuple[int, ...] = tuple(sorted({minute for day in days for minute in day.minutes}))
+        self.times: Tuple[str, ...] = tuple(minutes_to_time(minute) for minute in self.minutes)
+
+    def day(self, weekday: int) -> CompactDaySchedule:
+        """Day by weekday index (0 = Monday)"""
+        return self.days[weekday]
+
+    def day_named(self, day: str) -> CompactDaySchedule:
+        """
+        Day by name (case-insensitive)
+
+        Raises:
+            ValueError: If the name is not a day of the week
+        """
+        return self.days[weekday_index(day)]
+
+    def for_date(self, date_obj: date) -> CompactDaySchedule:
+        """Day of the week a date falls on"""
+        return self.days[date_obj.weekday()]
+
+    def courts_at(self, date_obj: date, time_str: str) -> Optional[int]:
+        """Courts at a start time on a date's weekday, None if there is no such slot"""
+        return self.days[date_obj.weekday()].courts_at(time_str)
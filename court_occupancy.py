@@ -0,0 +1,243 @@
+"""
+Interval-Based Court Occupancy
+
+Court availability used to be counted by exact ``HH:MM`` matches: a booking at
+09:00 used a court at 09:00 and nowhere else.  The conflict check, on the other
+hand, assumed every match lasts three hours.  This module is the single model
+both now share.
+
+Every scheduled line is a CourtBooking, a half-open interval [start, end) in
+minutes since midnight on one court.  FacilityDayOccupancy keeps the bookings
+of one facility-day in two sorted arrays (starts and ends), so:
+
+- courts in use at minute m:        bisect_right(starts, m) - bisect_right(ends, m)
+- bookings overlapping [s, e):      bisect_left(starts, e) - bisect_right(ends, s)
+
+are both O(log n).  Listing the overlapping bookings bisects a start-sorted
+list and only scans bookings that start within one maximum booking length of
+the query.
+
+How long a booking lasts:
+
+- the league's ``match_duration_minutes`` when it is set
+- otherwise until the facility's next start time that day (or
+  DEFAULT_MATCH_MINUTES after the last one) - which reproduces the old
+  exact-slot counting for leagues that do not configure a duration
+
+Team rest works the same way: a team booking is the match interval padded by
+the rest time, and two bookings of one team conflict when they overlap.
+"""
+
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from time_of_day import minutes_to_time, time_to_minutes
+
+# Match length assumed when a booking has no following start time to end at
+DEFAULT_MATCH_MINUTES = 180
+
+# Rest a team needs between two matches on the same day
+DEFAULT_TEAM_REST_MINUTES = 120
+
+# (match_id, scheduled_times, match_duration_minutes or None)
+MatchBooking = Tuple[int, Sequence[str], Optional[int]]
+
+
+@dataclass(frozen=True)
+class CourtBooking:
+    """One court used by one match line over [start, end) minutes since midnight"""
+
+    match_id: int
+    start: int
+    end: int
+
+    @property
+    def time(self) -> str:
+        return minutes_to_time(self.start)
+
+    def overlaps(self, start: int, end: int) -> bool:
+        return self.start < end and start < self.end
+
+
+class FacilityDayOccupancy:
+    """Court bookings of one facility on one date, indexed by start and end minute"""
+
+    __slots__ = ("slot_times", "slot_minutes", "slot_courts", "bookings",
+                 "_starts", "_ends", "_max_length")
+
+    def __init__(self, slots: Sequence[Tuple[str, int]], bookings: Iterable[CourtBooking] = ()):
+        """
+        Index the bookings of one facility-day
+
+        Args:
+            slots: (start time, courts) of the facility's schedule that day
+            bookings: Court bookings of the day
+        """
+        ordered = sorted((time_to_minutes(time_str), time_str, int(courts)) for time_str, courts in slots)
+        self.slot_minutes = tuple(minute for minute, _, _ in ordered)
+        self.slot_times = tuple(time_str for _, time_str, _ in ordered)
+        self.slot_courts = tuple(courts for _, _, courts in ordered)
+        self._index_bookings(bookings)
+
+    def _index_bookings(self, bookings: Iterable[CourtBooking]) -> None:
+        self.bookings = sorted(bookings, key=lambda booking: (booking.start, booking.end))
+        self._starts = [booking.start for booking in self.bookings]
+        self._ends = sorted(booking.end for booking in self.bookings)
+        self._max_length = max((booking.end - booking.start for booking in self.bookings), default=0)
+
+    @classmethod
+    def from_matches(cls, slots: Sequence[Tuple[str, int]],
+                     matches: Iterable[MatchBooking]) -> 'FacilityDayOccupancy':
+        """
+        Build from scheduled matches (one court per entry in scheduled_times)
+
+        Args:
+            slots: (start time, courts) of the facility's schedule that day
+            matches: (match_id, scheduled_times, match_duration_minutes) per scheduled match
+
+        Returns:
+            FacilityDayOccupancy of the day
+        """
+        occupancy = cls(slots)
+        booking_end = occupancy.booking_end
+        bookings = []
+        for match_id, times, duration in matches:
+            for time_str in times or ():
+                start = time_to_minutes(time_str)
+                bookings.append(CourtBooking(match_id, start, booking_end(start, duration)))
+        occupancy._index_bookings(bookings)
+        return occupancy
+
+    def booking_end(self, start: int, duration: Optional[int] = None) -> int:
+        """End minute of a booking starting at ``start`` (see module docstring)"""
+        if duration:
+            return start + int(duration)
+        index = bisect_right(self.slot_minutes, start)
+        if index < len(self.slot_minutes):
+            return self.slot_minutes[index]
+        return start + DEFAULT_MATCH_MINUTES
+
+    # ========== Queries ==========
+
+    def active_at(self, minute: int) -> int:
+        """Courts in use at a minute"""
+        return bisect_right(self._starts, minute) - bisect_right(self._ends, minute)
+
+    def overlapping_count(self, start: int, end: int) -> int:
+        """Number of bookings overlapping [start, end)"""
+        return bisect_left(self._starts, end) - bisect_right(self._ends, start)
+
+    def overlapping(self, start: int, end: int, exclude_match_id: Optional[int] = None) -> List[CourtBooking]:
+        """Bookings overlapping [start, end), in start order"""
+        low = bisect_right(self._starts, start - self._max_length)
+        high = bisect_left(self._starts, end)
+        return [
+            booking for booking in self.bookings[low:high]
+            if booking.end > start and booking.match_id != exclude_match_id
+        ]
+
+    def courts_at(self, minute: int) -> int:
+        """Courts the facility offers at a minute (those of the latest start time at or before it)"""
+        index = bisect_right(self.slot_minutes, minute) - 1
+        return self.slot_courts[index] if index >= 0 else 0
+
+    def _spare_during(self, start: int, end: int) -> int:
+        """
+        Fewest unused courts at any point of [start, end) (negative when overbooked)
+
+        Usage and capacity only change at start times and booking starts, so
+        the minimum over those points inside the window is exact.
+        """
+        points = {start}
+        points.update(self.slot_minutes[bisect_left(self.slot_minutes, start):bisect_left(self.slot_minutes, end)])
+        points.update(self._starts[bisect_right(self._starts, start):bisect_left(self._starts, end)])
+        return min(self.courts_at(point) - self.active_at(point) for point in points)
+
+    def free_during(self, start: int, end: int) -> int:
+        """Courts free for the whole of [start, end)"""
+        return max(0, self._spare_during(start, end))
+
+    def fits(self, match_id: int, times: Sequence[str], duration: Optional[int] = None) -> bool:
+        """
+        Whether a match's lines can be added without overbooking the day
+
+        Lines of the match that overlap each other (split times with a long
+        duration) count against each other, like any other bookings.
+
+        Args:
+            match_id: Match the lines belong to (must not be booked on the day already)
+            times: Start time of each line
+            duration: League match duration (default: until the next start time)
+
+        Returns:
+            True if no court is overbooked at any point while the lines are played
+        """
+        added = []
+        for time_str in times:
+            start = time_to_minutes(time_str)
+            added.append(CourtBooking(match_id, start, self.booking_end(start, duration)))
+        combined = FacilityDayOccupancy(list(zip(self.slot_times, self.slot_courts)), self.bookings + added)
+        return all(combined._spare_during(booking.start, booking.end) >= 0 for booking in added)
+
+    def covered_slot_times(self, time_str: str, duration: Optional[int] = None) -> Tuple[str, ...]:
+        """Start times of the day that a booking at ``time_str`` keeps a court busy for"""
+        start = time_to_minutes(time_str)
+        end = self.booking_end(start, duration)
+        low = bisect_left(self.slot_minutes, start)
+        high = bisect_left(self.slot_minutes, end)
+        covered = self.slot_times[low:high]
+        return covered if covered else (time_str,)
+
+    def slot_usage(self, duration: Optional[int] = None) -> List[Tuple[str, int, int]]:
+        """
+        (time, total courts, used courts) per start time
+
+        Args:
+            duration: Optional length of the match being placed; when given a
+                court only counts as free if it stays free for that long
+
+        Returns:
+            One entry per start time of the day (used can exceed total when overbooked)
+        """
+        usage = []
+        for time_str, minute, courts in zip(self.slot_times, self.slot_minutes, self.slot_courts):
+            if duration:
+                free = min(courts, self.free_during(minute, minute + int(duration)))
+                used = courts - free
+            else:
+                used = self.active_at(minute)
+            usage.append((time_str, courts, used))
+        return usage
+
+
+def team_rest_conflicts(team_matches: Iterable[Tuple[int, int, int]], start: int, end: int,
+                        rest_minutes: int = DEFAULT_TEAM_REST_MINUTES,
+                        exclude_match_id: Optional[int] = None) -> List[int]:
+    """
+    Matches of one team on one day that leave less than the rest time around [start, end)
+
+    Args:
+        team_matches: (match_id, start minute, end minute) of the team's other matches that day
+        start: Proposed start minute
+        end: Proposed end minute
+        rest_minutes: Minimum minutes between two matches of the team
+        exclude_match_id: Match to ignore (e.g. the one being rescheduled)
+
+    Returns:
+        IDs of the conflicting matches
+    """
+    padded = FacilityDayOccupancy(
+        (), (CourtBooking(match_id, match_start, match_end + rest_minutes)
+             for match_id, match_start, match_end in team_matches if match_id != exclude_match_id)
+    )
+    return sorted({booking.match_id for booking in padded.overlapping(start, end + rest_minutes)})
+
+
+def occupancy_by_match(occupancy: FacilityDayOccupancy) -> Dict[int, Tuple[int, int]]:
+    """(first start, last end) per match of a facility-day"""
+    spans: Dict[int, Tuple[int, int]] = {}
+    for booking in occupancy.bookings:
+        first, last = spans.get(booking.match_id, (booking.start, booking.end))
+        spans[booking.match_id] = (min(first, booking.start), max(last, booking.end))
+    return spans
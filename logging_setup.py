@@ -0,0 +1,145 @@
+"""
+Logging Setup
+
+Library modules only create per-module loggers (``logging.getLogger(__name__)``)
+and log with %-style arguments, so a message below the active level is never
+formatted.  Entry points (simple_cli, the web app) call ``configure_logging``
+once; it installs a QueueHandler on the root logger and a QueueListener that
+writes to stderr from a background thread, so a scheduling run never waits on
+a slow terminal or log pipe.
+
+Worker processes (see schedule_decomposition) call ``configure_worker_logging``
+as their pool initializer: a forked worker inherits the QueueHandler but not
+the listener thread, so its records would go to a queue nothing drains.
+
+Levels:
+
+- INFO (default): progress and summaries
+- DEBUG: per-match trace output (match generation, every scheduled or
+  unscheduled match, web request traces, dry-run operation listings);
+  enabled by ``--verbose`` or the TENNIS_TRACE environment variable
+
+TENNIS_LOG_LEVEL overrides the level (e.g. ``TENNIS_LOG_LEVEL=WARNING``).
+"""
+
+import atexit
+import logging
+import logging.handlers
+import os
+import queue
+import sys
+from typing import IO, Optional, Union
+
+LOG_FORMAT = "%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s"
+
+# Environment variables read by configure_logging
+ENV_LOG_LEVEL = "TENNIS_LOG_LEVEL"
+ENV_TRACE = "TENNIS_TRACE"
+
+_listener: Optional[logging.handlers.QueueListener] = None
+_queue_handler: Optional[logging.handlers.QueueHandler] = None
+
+
+def trace_requested() -> bool:
+    """True if the TENNIS_TRACE environment variable asks for per-match trace output"""
+    return os.environ.get(ENV_TRACE, "").lower() in ("1", "true", "yes", "on")
+
+
+def resolve_level(level: Union[int, str, None] = None, verbose: bool = False) -> int:
+    """
+    Effective log level
+
+    Args:
+        level: Explicit level (name or number); TENNIS_LOG_LEVEL is used when None
+        verbose: Enable per-match trace output (DEBUG)
+
+    Returns:
+        Logging level number
+
+    Raises:
+        ValueError: If the level name is unknown
+    """
+    if level is None:
+        level = os.environ.get(ENV_LOG_LEVEL) or None
+    if level is None:
+        return logging.DEBUG if verbose or trace_requested() else logging.INFO
+    if isinstance(level, str):
+        number = logging.getLevelName(level.upper())
+        if not isinstance(number, int):
+            raise ValueError(f"Unknown log level: {level}")
+        level = number
+    return min(level, logging.DEBUG) if verbose else level
+
+
+def configure_logging(level: Union[int, str, None] = None, verbose: bool = False,
+                      stream: Optional[IO[str]] = None) -> logging.handlers.QueueListener:
+    """
+    Route all logging through a queue to a background writer
+
+    Calling it again only changes the level.
+
+    Args:
+        level: Root level (default: TENNIS_LOG_LEVEL, else INFO)
+        verbose: Enable per-match trace output (DEBUG)
+        stream: Stream the listener writes to (default: stderr)
+
+    Returns:
+        The running QueueListener (stopped automatically at exit)
+    """
+    global _listener, _queue_handler
+
+    root = logging.getLogger()
+    root.setLevel(resolve_level(level, verbose))
+    if _listener is not None:
+        return _listener
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    _queue_handler = logging.handlers.QueueHandler(log_queue)
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    root.addHandler(_queue_handler)
+
+    _listener = logging.handlers.QueueListener(log_queue, output, respect_handler_level=True)
+    _listener.start()
+    atexit.register(shutdown_logging)
+    return _listener
+
+
+def configure_worker_logging(level: int = logging.INFO, stream: Optional[IO[str]] = None) -> None:
+    """
+    Log straight to a stream in a worker process
+
+    Replaces any handler inherited from the parent (the QueueHandler of
+    ``configure_logging``, whose listener thread does not run in the child)
+    with a plain StreamHandler in the same format.
+
+    Args:
+        level: Root level, normally the parent's ``logging.getLogger().level``
+        stream: Stream to write to (default: stderr)
+    """
+    global _listener, _queue_handler
+
+    root = logging.getLogger()
+    for handler in list(root.handlers):
+        root.removeHandler(handler)
+    _listener = None
+    _queue_handler = None
+
+    output = logging.StreamHandler(stream or sys.stderr)
+    output.setFormatter(logging.Formatter(LOG_FORMAT))
+    root.addHandler(output)
+    root.setLevel(level)
+
+
+def shutdown_logging() -> None:
+    """Write out queued records and stop the background writer"""
+    global _listener, _queue_handler
+    if _listener is None:
+        return
+    _listener.stop()
+    logging.getLogger().removeHandler(_queue_handler)
+    _listener = None
+    _queue_handler = None
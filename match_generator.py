@@ -105,15 +105,18 @@ Usage Examples:
     generator.print_matches(matches, include_stats=True)
 """
 
-from typing import List, Dict, Optional, Any, Tuple
+from typing import List, Dict, Optional, Any, Tuple, Union
 import itertools
+import logging
 from collections import defaultdict
 
 # Import USTA classes
 from usta_team import Team
 from usta_league import League
 from usta_facility import Facility
-from usta_match import Match
+from usta_match import Match, MatchSummary
+
+logger = logging.getLogger(__name__)
 
 
 class MatchGenerator:
@@ -220,8 +223,9 @@ class MatchGenerator:
                 original_matches = matches_per_team
                 matches_per_team += 1  # Round up to next even number
                 total_match_slots = len(teams) * matches_per_team
-                print(f"Auto-corrected: {len(teams)} teams × {original_matches} matches would create {len(teams) * original_matches} odd slots.")
-                print(f"Adjusted to: {len(teams)} teams × {matches_per_team} matches = {total_match_slots} slots (even)")
+                logger.info("Auto-corrected: %d teams × %d matches would create %d odd slots; "
+                            "adjusted to %d matches = %d slots (even)", len(teams), original_matches,
+                            len(teams) * original_matches, matches_per_team, total_match_slots)
             else:
                 # Even teams with odd matches - this should work, but let's check
                 raise ValueError(
@@ -229,13 +233,10 @@ class MatchGenerator:
                     f"{total_match_slots} total match slots. This must be even since each match uses exactly 2 slots."
                 )
         
-        print(f"DEBUG: League.generate_matches:")
-        print(f"  teams={len(teams)}")
-        print(f"  league={league.name} (ID: {league.id})")
-        print(f"  matches_per_team={matches_per_team if matches_per_team is not None else 'default (full round-robin)'}")
-        print(f"  starting_match_id={self.starting_match_id}")
-        print(f"  next_match_id={self.next_match_id}")
-        print(f"  league.num_matches={getattr(league, 'num_matches', 'N/A')}")
+        logger.debug("generate_matches: %d teams, league %s (ID: %s), matches_per_team=%s, "
+                     "starting_match_id=%s, next_match_id=%s, league.num_matches=%s",
+                     len(teams), league.name, league.id, matches_per_team, self.starting_match_id,
+                     self.next_match_id, getattr(league, 'num_matches', 'N/A'))
 
         # Generate pairings using the round-robin algorithm
         pairings = self._generate_pairings(teams, matches_per_team)
@@ -253,16 +254,10 @@ class MatchGenerator:
                              f"{len(teams) * matches_per_team / 2} for {len(teams)} teams with "
                              f"{matches_per_team} matches each. Check configuration.")
         if len(pairings) > len(teams) * matches_per_team / 2:
-            print(f"DEBUG: Generated {len(pairings)} pairings, which is more than expected "
-                  f"{len(teams) * matches_per_team / 2}. This may indicate multiple cycles or rematches.")
-        
-        print(f"DEBUG: League.generate_matches:")
-        print(f"  teams={len(teams)}")
-        print(f"  league={league.name} (ID: {league.id})")
-        print(f"  matches_per_team={matches_per_team if matches_per_team is not None else 'default (full round-robin)'}")
-        print(f"  starting_match_id={self.starting_match_id}")
-        print(f"  next_match_id={self.next_match_id}")
-        print(f"  league.num_matches={getattr(league, 'num_matches', 'N/A')}")
+            logger.debug("Generated %d pairings, which is more than expected %s. "
+                         "This may indicate multiple cycles or rematches.",
+                         len(pairings), len(teams) * matches_per_team / 2)
+        
 
         # Calculate total rounds based on pairings and teams
         n = len(teams)
@@ -290,18 +285,12 @@ class MatchGenerator:
             pair_round_counter[pair_key] = pair_round_counter.get(pair_key, 0) + 1
             current_round = pair_round_counter[pair_key]
             
-            # Before creating the match, add debug logging
-            print(f"DEBUG: About to create Match with:")
-            print(f"  id={self.next_match_id} (type: {type(self.next_match_id)})")
-            print(f"  round={current_round}")
-            print(f"  num_rounds={total_rounds}")
-            print(f"  league={league.name} (ID: {league.id})")
-            print(f"  home_team={home_team.name} (ID: {home_team.id})")
-            print(f"  visitor_team={visitor_team.name} (ID: {visitor_team.id})")
+            logger.debug("Creating match %s: round %s of %s, %s (ID: %s) vs %s (ID: %s)",
+                         self.next_match_id, current_round, total_rounds, home_team.name, home_team.id,
+                         visitor_team.name, visitor_team.id)
 
             # Check if next_match_id is valid
             if not isinstance(self.next_match_id, int) or self.next_match_id <= 0:
-                print(f"DEBUG: ❌ Invalid next_match_id: {self.next_match_id}")
                 raise ValueError(f"MatchGenerator next_match_id is invalid: {self.next_match_id}")
 
             try:
@@ -315,11 +304,9 @@ class MatchGenerator:
                     scheduling=None  # Unscheduled - no MatchScheduling object
                 )
                 matches.append(match)
-                print(f"DEBUG: ✅ Successfully created match {match.id}")
                 self.next_match_id += 1
             except Exception as match_error:
-                print(f"DEBUG: ❌ Error creating Match: {match_error}")
-                print(f"DEBUG: self.next_match_id = {self.next_match_id}")
+                logger.error("Error creating match %s: %s", self.next_match_id, match_error)
                 raise
 
             self.next_match_id += 1
@@ -383,7 +370,7 @@ class MatchGenerator:
         # Schedule matches
         schedule = []
         
-        print(f"DEBUG: Generating pairings for {n} teams with {matches_per_team} matches per team")
+        logger.debug("Generating pairings for %d teams with %d matches per team", n, matches_per_team)
 
         # Use round-robin algorithm to ensure even distribution
         if n % 2 == 0:
@@ -397,7 +384,8 @@ class MatchGenerator:
         max_unique_opponents = n - 1
         total_rounds_needed = (matches_per_team + max_unique_opponents - 1) // max_unique_opponents
         
-        print(f"DEBUG: Total rounds needed: {total_rounds_needed} (matches_per_team={matches_per_team}, max_unique_opponents={max_unique_opponents})")
+        logger.debug("Total rounds needed: %d (matches_per_team=%d, max_unique_opponents=%d)",
+                     total_rounds_needed, matches_per_team, max_unique_opponents)
         
         # Cycle through rounds until all teams have enough matches
         for cycle in range(total_rounds_needed):
@@ -712,12 +700,13 @@ class MatchGenerator:
                 if not ba["balance_possible"]:
                     print("Note: Perfect balance impossible with odd number of matches per team")
     
-    def export_matches_csv(self, matches: List[Match], filename: str):
+    def export_matches_csv(self, matches: List[Union[Match, MatchSummary]], filename: str):
         """
         Export matches to a CSV file.
         
         Args:
-            matches: List of Match objects to export
+            matches: List of Match objects, or MatchSummary rows from
+                list_match_summaries (only ids, names and status are used)
             filename: Output filename
         """
         with open(filename, 'w') as f:
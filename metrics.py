@@ -0,0 +1,411 @@
+"""
+In-Process Metrics Registry
+
+Counters, gauges and histograms kept in plain dictionaries and rendered in
+the Prometheus text exposition format by ``web_metrics`` at ``/metrics``.
+There is no client library dependency and no background work: recording a
+value is a dictionary update under a lock, and everything that can be read
+on demand (cache hit counters, entry counts) is collected only when the
+endpoint is scraped.
+
+Metrics recorded here:
+
+- tennis_http_*: request latency per endpoint and in-flight requests (web_metrics)
+- tennis_db_method_*: calls, time and SQL statements per SQL manager method
+  (``instrument_methods``; nested manager calls count toward the outermost one).
+  Only processes that serve ``/metrics`` instrument the managers
+  (``web_metrics.register_routes``), so CLI runs, benchmarks and worker
+  processes call them unwrapped
+- tennis_scheduler_*: scheduler and optimizer runs, their duration and the
+  matches they scheduled or failed to schedule (``scheduler_run``)
+- tennis_cache_*: hits, misses and entries of the availability and
+  statistics caches
+
+Metrics are per process; worker processes of a decomposed scheduling run are
+counted through the run that started them.
+"""
+
+import functools
+import threading
+import time
+from bisect import bisect_left
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+# Request latency buckets (seconds)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+# Scheduler and optimizer run buckets (seconds)
+RUN_BUCKETS = (0.1, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0, 120.0, 300.0, 600.0)
+
+CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+Sample = Tuple[str, Dict[str, str], float]
+
+
+def _escape(value: Any) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == float("inf"):
+        return "+Inf"
+    if float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+def _format_sample(name: str, labels: Dict[str, str], value: float) -> str:
+    if labels:
+        rendered = ",".join(f'{key}="{_escape(val)}"' for key, val in labels.items())
+        return f"{name}{{{rendered}}} {_format_value(value)}"
+    return f"{name} {_format_value(value)}"
+
+
+class _Metric:
+    """Base class: name, help text, label names and a lock"""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _labels(self, values: Tuple) -> Dict[str, str]:
+        return dict(zip(self.labelnames, values))
+
+    def _check(self, values: Tuple) -> Tuple:
+        if len(values) != len(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {values}")
+        return values
+
+    def samples(self) -> List[Sample]:
+        raise NotImplementedError
+
+
+class Counter(_Metric):
+    """Monotonically increasing value per label combination"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        """
+        Add to the counter
+
+        Args:
+            labelvalues: One value per label name, in order
+            amount: Non-negative amount to add
+
+        Raises:
+            ValueError: If amount is negative or the labels do not match
+        """
+        if amount < 0:
+            raise ValueError(f"Counter {self.name} cannot decrease")
+        key = self._check(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, *labelvalues: Any) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Gauge(_Metric):
+    """Value that goes up and down per label combination"""
+
+    kind = "gauge"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        super().__init__(name, documentation, labelnames)
+        self._values: Dict[Tuple, float] = {}
+
+    def set(self, value: float, *labelvalues: Any) -> None:
+        key = self._check(labelvalues)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        key = self._check(labelvalues)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, *labelvalues: Any, amount: float = 1.0) -> None:
+        self.inc(*labelvalues, amount=-amount)
+
+    def value(self, *labelvalues: Any) -> float:
+        with self._lock:
+            return self._values.get(labelvalues, 0.0)
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(self.name, self._labels(key), value) for key, value in items]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, with their sum and count"""
+
+    kind = "histogram"
+
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                 buckets: Sequence[float] = DEFAULT_BUCKETS):
+        super().__init__(name, documentation, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._values: Dict[Tuple, List[float]] = {}  # labels -> [per-bucket counts..., +Inf count, sum]
+
+    def observe(self, value: float, *labelvalues: Any) -> None:
+        """
+        Record one observation
+
+        Args:
+            value: Observed value (seconds for durations)
+            labelvalues: One value per label name, in order
+        """
+        key = self._check(labelvalues)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            entry = self._values.get(key)
+            if entry is None:
+                entry = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            entry[index] += 1
+            entry[-1] += value
+
+    def samples(self) -> List[Sample]:
+        with self._lock:
+            items = [(key, list(entry)) for key, entry in self._values.items()]
+        samples = []
+        for key, entry in items:
+            labels = self._labels(key)
+            cumulative = 0.0
+            for bound, count in zip(self.buckets + (float("inf"),), entry[:-1]):
+                cumulative += count
+                samples.append((f"{self.name}_bucket", dict(labels, le=_format_value(bound)), cumulative))
+            samples.append((f"{self.name}_sum", labels, entry[-1]))
+            samples.append((f"{self.name}_count", labels, cumulative))
+        return samples
+
+
+class Registry:
+    """Metrics plus collectors that produce samples at scrape time"""
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._collectors: List[Callable[[], List[Tuple[_Metric, List[Sample]]]]] = []
+        self._lock = threading.Lock()
+
+    def register(self, metric: _Metric) -> _Metric:
+        """
+        Add a metric
+
+        Raises:
+            ValueError: If a metric of the same name is already registered
+        """
+        with self._lock:
+            if metric.name in self._metrics:
+                raise ValueError(f"Metric {metric.name} is already registered")
+            self._metrics[metric.name] = metric
+        return metric
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        return self.register(Counter(name, documentation, labelnames))
+
+    def gauge(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Gauge:
+        return self.register(Gauge(name, documentation, labelnames))
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (),
+                  buckets: Sequence[float] = DEFAULT_BUCKETS) -> Histogram:
+        return self.register(Histogram(name, documentation, labelnames, buckets))
+
+    def register_collector(self, collector: Callable[[], List[Tuple[_Metric, List[Sample]]]]) -> None:
+        """Add a function returning (metric description, samples) pairs, called on every scrape"""
+        with self._lock:
+            self._collectors.append(collector)
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format"""
+        with self._lock:
+            families = [(metric, metric.samples()) for metric in self._metrics.values()]
+            collectors = list(self._collectors)
+        for collector in collectors:
+            families.extend(collector())
+        lines = []
+        for metric, samples in families:
+            lines.append(f"# HELP {metric.name} {_escape(metric.documentation)}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(_format_sample(name, labels, value) for name, labels, value in samples)
+        return "\n".join(lines) + "\n"
+
+
+REGISTRY = Registry()
+
+HTTP_REQUEST_DURATION = REGISTRY.histogram(
+    "tennis_http_request_duration_seconds", "Web request latency",
+    ("endpoint", "method", "status"))
+HTTP_REQUESTS_IN_FLIGHT = REGISTRY.gauge(
+    "tennis_http_requests_in_flight", "Web requests currently being handled")
+
+DB_METHOD_CALLS = REGISTRY.counter(
+    "tennis_db_method_calls_total", "SQL manager method calls", ("manager", "method"))
+DB_METHOD_SECONDS = REGISTRY.counter(
+    "tennis_db_method_seconds_total", "Time spent in SQL manager methods", ("manager", "method"))
+DB_METHOD_STATEMENTS = REGISTRY.counter(
+    "tennis_db_method_statements_total", "SQL statements issued by SQL manager methods", ("manager", "method"))
+
+SCHEDULER_RUNS = REGISTRY.counter(
+    "tennis_scheduler_runs_total", "Scheduler and optimizer runs", ("operation", "mode", "outcome"))
+SCHEDULER_RUN_DURATION = REGISTRY.histogram(
+    "tennis_scheduler_run_duration_seconds", "Scheduler and optimizer run duration",
+    ("operation", "mode"), buckets=RUN_BUCKETS)
+MATCHES_SCHEDULED = REGISTRY.counter(
+    "tennis_scheduler_matches_scheduled_total", "Matches placed by scheduler and optimizer runs", ("operation",))
+MATCHES_FAILED = REGISTRY.counter(
+    "tennis_scheduler_matches_failed_total", "Matches scheduler and optimizer runs could not place", ("operation",))
+
+_local = threading.local()
+
+
+def instrument_methods(cls: type, manager: str) -> type:
+    """
+    Count calls, time and SQL statements of a SQL manager's public methods
+
+    Statements are read from the ``stats`` of the manager's ProfilingCursor
+    (see query_profiler).  A manager method called by another instrumented
+    method is charged to the outer call only.
+
+    Args:
+        cls: Manager class; public functions defined on it are wrapped in place
+        manager: Value of the ``manager`` label
+
+    Returns:
+        The class (unchanged if it is already instrumented)
+    """
+    for name, function in list(vars(cls).items()):
+        if name.startswith("_") or not callable(function) or isinstance(function, (staticmethod, classmethod, type)):
+            continue
+        if getattr(function, "_metrics_instrumented", False):
+            continue
+        setattr(cls, name, _instrumented(function, manager, name))
+    return cls
+
+
+def _instrumented(function: Callable, manager: str, method: str) -> Callable:
+    @functools.wraps(function)
+    def wrapper(self, *args, **kwargs):
+        if getattr(_local, "db_depth", 0):
+            return function(self, *args, **kwargs)
+        stats = getattr(getattr(self, "cursor", None), "stats", None)
+        statements = stats.count if stats is not None else 0
+        _local.db_depth = 1
+        started = time.perf_counter()
+        try:
+            return function(self, *args, **kwargs)
+        finally:
+            elapsed = time.perf_counter() - started
+            _local.db_depth = 0
+            DB_METHOD_CALLS.inc(manager, method)
+            DB_METHOD_SECONDS.inc(manager, method, amount=elapsed)
+            if stats is not None:
+                DB_METHOD_STATEMENTS.inc(manager, method, amount=max(stats.count - statements, 0))
+    wrapper._metrics_instrumented = True  # type: ignore[attr-defined]
+    return wrapper
+
+
+class _SchedulerRun:
+    """Outcome of one run, filled in by the caller of ``scheduler_run``"""
+
+    __slots__ = ("scheduled", "failed", "outcome")
+
+    def __init__(self):
+        self.scheduled = 0
+        self.failed = 0
+        self.outcome = "ok"
+
+    def record(self, results: Optional[Dict[str, Any]]) -> None:
+        """
+        Take the counts from a result dictionary
+
+        Args:
+            results: auto_schedule_matches results (scheduled/failed) or
+                optimizer results (best_assignments/best_unscheduled_count)
+        """
+        if not results:
+            return
+        if "scheduled" in results:
+            self.scheduled = results.get("scheduled") or 0
+            self.failed = results.get("failed") or 0
+        else:
+            self.scheduled = len(results.get("best_assignments") or [])
+            unscheduled = results.get("best_unscheduled_count")
+            self.failed = unscheduled if isinstance(unscheduled, int) else 0
+        if results.get("error") or results.get("optimization_completed") is False:
+            self.outcome = "error"
+
+
+@contextmanager
+def scheduler_run(operation: str, mode: str) -> Iterator[_SchedulerRun]:
+    """
+    Record a scheduler or optimizer run
+
+    Runs started inside another run on the same thread (the greedy runs of an
+    optimizer, in-process components) are not recorded separately.
+
+    Args:
+        operation: "auto_schedule" or "optimize"
+        mode: Ordering (auto_schedule) or optimization mode (optimize)
+
+    Yields:
+        Object whose ``record(results)`` sets the scheduled and failed counts
+    """
+    run = _SchedulerRun()
+    depth = getattr(_local, "run_depth", 0)
+    _local.run_depth = depth + 1
+    started = time.perf_counter()
+    try:
+        yield run
+    except Exception:
+        run.outcome = "error"
+        raise
+    finally:
+        _local.run_depth = depth
+        if depth == 0:
+            SCHEDULER_RUNS.inc(operation, mode, run.outcome)
+            SCHEDULER_RUN_DURATION.observe(time.perf_counter() - started, operation, mode)
+            MATCHES_SCHEDULED.inc(operation, amount=run.scheduled)
+            MATCHES_FAILED.inc(operation, amount=run.failed)
+
+
+_CACHE_HITS = Counter("tennis_cache_hits_total", "Cache lookups served from the cache", ("cache",))
+_CACHE_MISSES = Counter("tennis_cache_misses_total", "Cache lookups that had to be rebuilt", ("cache",))
+_CACHE_ENTRIES = Gauge("tennis_cache_entries", "Entries currently held by a cache", ("cache",))
+_CACHE_HIT_RATIO = Gauge("tennis_cache_hit_ratio", "Share of lookups served from the cache since start",
+                         ("cache",))
+
+
+def _collect_caches() -> List[Tuple[_Metric, List[Sample]]]:
+    import availability_cache
+    import stats_cache
+
+    caches = {"availability": availability_cache.cache_stats(), "stats_snapshot": stats_cache.cache_stats()}
+    hits, misses, entries, ratios = [], [], [], []
+    for cache, stats in caches.items():
+        labels = {"cache": cache}
+        lookups = stats["hits"] + stats["misses"]
+        hits.append((_CACHE_HITS.name, labels, stats["hits"]))
+        misses.append((_CACHE_MISSES.name, labels, stats["misses"]))
+        entries.append((_CACHE_ENTRIES.name, labels, stats["entries"]))
+        ratios.append((_CACHE_HIT_RATIO.name, labels, stats["hits"] / lookups if lookups else 0.0))
+    return [(_CACHE_HITS, hits), (_CACHE_MISSES, misses), (_CACHE_ENTRIES, entries), (_CACHE_HIT_RATIO, ratios)]
+
+
+REGISTRY.register_collector(_collect_caches)
@@ -0,0 +1,334 @@
+"""
+SQL Query Plan Auditor
+
+The SQL managers write their statements inline, and nothing checks that
+they can use the indexes created in ``_initialize_schema``.  The auditor
+captures every distinct statement a workload executes (through the
+ProfilingCursor of query_profiler), runs ``EXPLAIN QUERY PLAN`` on each
+against the live schema and reports:
+
+- full_scan:   a table is read row by row (``SCAN table``)
+- index_scan:  a whole index is read instead of searched (``SCAN table USING INDEX``)
+- temp_btree:  rows are sorted or de-duplicated in a temporary B-tree
+  (ORDER BY, GROUP BY, DISTINCT without a usable index)
+- weak_index:  an index is searched only on columns with so few distinct
+  values that a lookup still reads a large share of the table (the
+  OR-predicate team queries fall back to ``idx_matches_status`` this way)
+- unused indexes: indexes no captured statement's plan used
+- suggested indexes for the flagged statements: equality columns first
+  (most selective first), then one range or ORDER BY column, extended to a
+  covering index when the statement reads only a few columns; an OR of
+  columns gets one index per column so SQLite can use a MULTI-INDEX OR plan
+
+Suggestions are derived from the statement text and are a starting point,
+not a guarantee that the planner will pick the index.
+
+Usage from the CLI:
+    simple_cli --db-path tennis.db audit-sql
+
+Usage in a test (as a fixture around the code under test):
+    with capture_statements(db) as audit:
+        db.list_matches()
+    assert not audit.report()["flagged"]
+"""
+
+import re
+import sqlite3
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple
+
+from query_profiler import normalize_sql
+
+# Statements that have no query plan worth auditing
+_SKIPPED_PREFIXES = ("PRAGMA", "BEGIN", "COMMIT", "ROLLBACK", "SAVEPOINT", "RELEASE", "CREATE", "ALTER",
+                     "DROP", "EXPLAIN", "ANALYZE", "VACUUM", "<SCRIPT>")
+
+_SCAN = re.compile(r"^SCAN (?:TABLE )?(\w+)(?: AS \w+)?(?: USING (?:COVERING )?INDEX (\w+))?")
+_SEARCH_INDEX = re.compile(r"USING (?:COVERING )?INDEX (\w+)")
+_TEMP_BTREE = re.compile(r"USE TEMP B-TREE FOR (.+)$")
+_TABLE_REF = re.compile(r"\b(?:FROM|JOIN|UPDATE|INTO)\s+(\w+)(?:\s+(?:AS\s+)?(\w+))?", re.IGNORECASE)
+_PREDICATE = re.compile(r"(?:(\w+)\.)?(\w+)\s*(=|\bIN\b|<=|>=|<|>|\bBETWEEN\b|\bLIKE\b)", re.IGNORECASE)
+_CLAUSE_END = re.compile(r"\b(?:GROUP BY|ORDER BY|LIMIT|HAVING|RETURNING)\b", re.IGNORECASE)
+_ORDER_BY = re.compile(r"\bORDER BY\s+(.+?)(?:\bLIMIT\b|$)", re.IGNORECASE)
+_SELECT_LIST = re.compile(r"^SELECT\s+(?:DISTINCT\s+)?(.+?)\s+FROM\s", re.IGNORECASE)
+_KEYWORDS = {"WHERE", "JOIN", "LEFT", "RIGHT", "INNER", "OUTER", "CROSS", "ON", "GROUP", "ORDER", "LIMIT",
+             "SET", "VALUES", "SELECT", "AND", "OR", "USING", "NATURAL", "HAVING", "UNION", "AS"}
+
+# Most columns a suggested covering index may have
+MAX_COVERING_COLUMNS = 5
+
+# An index search is weak when it is expected to return more than this share of
+# a table of at least WEAK_INDEX_MIN_ROWS rows
+WEAK_INDEX_SHARE = 0.25
+WEAK_INDEX_MIN_ROWS = 100
+
+_SEARCH = re.compile(r"^SEARCH (\w+)(?: AS \w+)? USING (?:COVERING )?INDEX (\w+) \(([^)]*)\)")
+_OR_GROUP = re.compile(r"\(([^()]*\bOR\b[^()]*)\)", re.IGNORECASE)
+
+
+class QueryAudit:
+    """Statements captured from a database's ProfilingCursor, audited with EXPLAIN QUERY PLAN"""
+
+    def __init__(self, db):
+        self.db = db
+        self.samples: Dict[str, List[Any]] = {}
+
+    def report(self) -> Dict[str, Any]:
+        """
+        Audit the captured statements
+
+        Returns:
+            Dictionary with ``statements`` (one entry per distinct statement:
+            sql, count, time, plan, flags, error), ``flagged`` (entries with
+            flags), ``unused_indexes``, ``suggested_indexes`` and ``table_rows``
+        """
+        return audit_statements(self.db, self.samples)
+
+
+@contextmanager
+def capture_statements(db) -> Iterator[QueryAudit]:
+    """
+    Capture the distinct statements executed through ``db`` while the block runs
+
+    Args:
+        db: SQLiteTennisDB (its query_stats must belong to a ProfilingCursor)
+
+    Yields:
+        QueryAudit whose report() audits what was captured
+
+    Raises:
+        ValueError: If the database does not profile its statements
+    """
+    stats = getattr(db, "query_stats", None)
+    if stats is None:
+        raise ValueError("The database does not record its statements (no query_stats)")
+    audit = QueryAudit(db)
+    previous, stats.samples = stats.samples, audit.samples
+    try:
+        yield audit
+    finally:
+        stats.samples = previous
+
+
+class _Schema:
+    """Tables, columns, indexes and row/distinct counts of the live database"""
+
+    def __init__(self, conn: sqlite3.Connection):
+        self.conn = conn
+        tables = [row[0] for row in conn.execute(
+            "SELECT name FROM sqlite_master WHERE type = 'table' AND name NOT LIKE 'sqlite_%'")]
+        self.columns: Dict[str, List[str]] = {}
+        self.primary_keys: Dict[str, Optional[str]] = {}
+        for table in tables:
+            info = conn.execute(f"PRAGMA table_info({table})").fetchall()
+            self.columns[table] = [row[1] for row in info]
+            keys = [row[1] for row in info if row[5]]
+            self.primary_keys[table] = keys[0] if len(keys) == 1 else None
+        # Indexes created explicitly (automatic UNIQUE indexes have no SQL)
+        self.indexes: Dict[str, Tuple[str, List[str]]] = {
+            name: (table, [row[2] for row in conn.execute(f"PRAGMA index_info({name})")])
+            for name, table in conn.execute(
+                "SELECT name, tbl_name FROM sqlite_master WHERE type = 'index' AND sql IS NOT NULL")}
+        self.rows = {table: conn.execute(f"SELECT COUNT(*) FROM {table}").fetchone()[0] for table in tables}
+        self._distinct: Dict[Tuple[str, str], int] = {}
+
+    def distinct(self, table: str, column: str) -> int:
+        """Number of distinct values of a column (at least 1)"""
+        key = (table, column)
+        if key not in self._distinct:
+            self._distinct[key] = max(1, self.conn.execute(
+                f"SELECT COUNT(DISTINCT {column}) FROM {table}").fetchone()[0])
+        return self._distinct[key]
+
+    def has_index(self, table: str, key: List[str]) -> bool:
+        """True if an existing index starts with these columns"""
+        return any(index_table == table and columns[:len(key)] == key
+                   for index_table, columns in self.indexes.values())
+
+
+def _explain(conn: sqlite3.Connection, sql: str, parameters: Any) -> List[str]:
+    """Plan detail lines of a statement (parameters missing from the capture are bound as NULL)"""
+    if parameters is None:
+        parameters = [None] * sql.count("?")
+    return [row[3] for row in conn.execute(f"EXPLAIN QUERY PLAN {sql}", parameters).fetchall()]
+
+
+def _table_aliases(sql: str) -> Dict[str, str]:
+    """Alias (or table name) -> table for the tables a statement reads or writes"""
+    aliases = {}
+    for table, alias in _TABLE_REF.findall(sql):
+        aliases[table] = table
+        if alias and alias.upper() not in _KEYWORDS:
+            aliases[alias] = table
+    return aliases
+
+
+def _plan_flags(plan: Sequence[str], aliases: Dict[str, str], schema: _Schema) -> List[Dict[str, str]]:
+    """Findings of one plan, each with its kind, plan line and table (None if unknown)"""
+    tables = set(aliases.values())
+    single_table = next(iter(tables)) if len(tables) == 1 else None
+    flags = []
+    for detail in plan:
+        scan = _SCAN.match(detail)
+        if scan and scan.group(1) != "CONSTANT":
+            flags.append({"kind": "index_scan" if scan.group(2) else "full_scan", "detail": detail,
+                          "table": aliases.get(scan.group(1), scan.group(1))})
+        if _TEMP_BTREE.search(detail):
+            flags.append({"kind": "temp_btree", "detail": detail, "table": single_table})
+        search = _SEARCH.match(detail)
+        if search:
+            table = aliases.get(search.group(1), search.group(1))
+            constraints = [term.strip() for term in search.group(3).split(" AND ")]
+            if table in schema.rows and constraints and all(term.endswith("=?") for term in constraints):
+                rows = schema.rows[table]
+                expected = rows
+                for term in constraints:
+                    expected /= schema.distinct(table, term[:-2])
+                if rows >= WEAK_INDEX_MIN_ROWS and expected > rows * WEAK_INDEX_SHARE:
+                    flags.append({"kind": "weak_index", "detail": detail, "table": table})
+    return flags
+
+
+def _where_clause(sql: str) -> str:
+    upper = sql.upper()
+    position = upper.find(" WHERE ")
+    if position < 0:
+        return ""
+    clause = sql[position + 7:]
+    end = _CLAUSE_END.search(clause)
+    return clause[:end.start()] if end else clause
+
+
+def _suggest(sql: str, table: str, aliases: Dict[str, str], schema: _Schema) -> List[Dict[str, Any]]:
+    """Index suggestions for one flagged table of a statement (none if it is not filtered)"""
+    table_columns = schema.columns.get(table)
+    if not table_columns:
+        return []
+    primary_key = schema.primary_keys.get(table)
+
+    def own(qualifier: str, column: str) -> bool:
+        if column not in table_columns or column == primary_key:
+            return False
+        return not qualifier or aliases.get(qualifier) == table
+
+    def predicates(clause: str) -> Tuple[List[str], List[str]]:
+        equality, ranges = [], []
+        for qualifier, column, operator in _PREDICATE.findall(clause):
+            if own(qualifier, column) and column not in equality and column not in ranges:
+                (equality if operator.upper() in ("=", "IN") else ranges).append(column)
+        return equality, ranges
+
+    where = _where_clause(sql)
+    equality, ranges = predicates(where)
+    if not equality and not ranges:
+        return []
+    equality.sort(key=lambda column: schema.distinct(table, column), reverse=True)
+
+    or_columns = []
+    for group in _OR_GROUP.findall(where) or ([where] if re.search(r"\bOR\b", where, re.IGNORECASE) else []):
+        or_columns.extend(column for column in predicates(group)[0] if column not in or_columns)
+    if len(or_columns) > 1:
+        others = [column for column in equality if column not in or_columns]
+        candidates = [([column] + others, "one index per OR'ed column allows a MULTI-INDEX OR plan")
+                      for column in or_columns]
+    else:
+        order_by = []
+        order_match = _ORDER_BY.search(sql)
+        if order_match:
+            for term in order_match.group(1).split(","):
+                parts = term.split()[0].split(".") if term.split() else []
+                if parts and own(parts[0] if len(parts) == 2 else "", parts[-1]) and parts[-1] not in equality:
+                    order_by.append(parts[-1])
+        key = equality + (ranges[:1] or order_by[:1] if not equality else ranges[:1] or order_by)
+        reason = "most selective equality columns first, then the range/ORDER BY column"
+        selected = _SELECT_LIST.match(sql)
+        if selected and "*" not in selected.group(1):
+            read = [column for qualifier, column, _ in
+                    re.findall(r"(?:(\w+)\.)?(\w+)(\s*(?:,|$))", selected.group(1)) if own(qualifier, column)]
+            covering = key + [column for column in read if column not in key]
+            if len(key) < len(covering) <= MAX_COVERING_COLUMNS:
+                key, reason = covering, reason + "; covers the selected columns"
+        candidates = [(key, reason)]
+
+    suggestions = []
+    for key, reason in candidates:
+        if schema.has_index(table, key):
+            continue
+        suggestions.append({"table": table, "columns": key, "reason": reason,
+                            "sql": f"CREATE INDEX IF NOT EXISTS idx_{table}_{'_'.join(key)} "
+                                   f"ON {table}({', '.join(key)})"})
+    return suggestions
+
+
+def audit_statements(db, samples: Dict[str, List[Any]]) -> Dict[str, Any]:
+    """
+    Run EXPLAIN QUERY PLAN on captured statements and collect findings
+
+    Args:
+        db: Connected SQLiteTennisDB the statements ran against
+        samples: Normalized SQL -> [SQL as executed, parameters or None, count, seconds]
+
+    Returns:
+        See QueryAudit.report
+    """
+    conn = db.conn
+    schema = _Schema(conn)
+
+    used_indexes = set()
+    statements = []
+    suggestions: Dict[str, Dict[str, Any]] = {}
+    for normalized, (sql, parameters, count, seconds) in samples.items():
+        if normalized.upper().startswith(_SKIPPED_PREFIXES):
+            continue
+        entry = {"sql": normalized, "count": count, "time": round(seconds, 6), "plan": [], "flags": [],
+                 "error": None}
+        statements.append(entry)
+        try:
+            entry["plan"] = _explain(conn, sql, parameters)
+        except sqlite3.Error as e:
+            entry["error"] = str(e)
+            continue
+        for detail in entry["plan"]:
+            used_indexes.update(_SEARCH_INDEX.findall(detail))
+        aliases = _table_aliases(sql)
+        entry["flags"] = _plan_flags(entry["plan"], aliases, schema)
+        for table in {flag["table"] for flag in entry["flags"] if flag["table"]}:
+            for suggestion in _suggest(sql, table, aliases, schema):
+                target = suggestions.setdefault(suggestion["sql"], dict(suggestion, statements=0, executions=0))
+                target["statements"] += 1
+                target["executions"] += count
+
+    statements.sort(key=lambda entry: entry["time"], reverse=True)
+    return {
+        "statements": statements,
+        "flagged": [entry for entry in statements if entry["flags"]],
+        "unused_indexes": sorted(name for name in schema.indexes if name not in used_indexes),
+        "suggested_indexes": sorted(suggestions.values(), key=lambda item: item["executions"], reverse=True),
+        "table_rows": schema.rows,
+    }
+
+
+def format_audit(report: Dict[str, Any], limit: Optional[int] = None) -> str:
+    """Text report: flagged statements with their plans, unused indexes and suggestions"""
+    flagged = report["flagged"][:limit] if limit else report["flagged"]
+    lines = [f"Audited {len(report['statements'])} distinct statements, "
+             f"{len(report['flagged'])} flagged"]
+    for entry in flagged:
+        sql = entry["sql"] if len(entry["sql"]) <= 160 else entry["sql"][:157] + "..."
+        kinds = ", ".join(sorted({flag["kind"] for flag in entry["flags"]}))
+        lines.append(f"\n[{kinds}] {entry['count']}x {entry['time'] * 1000:.1f} ms")
+        lines.append(f"  {sql}")
+        lines.extend(f"    {detail}" for detail in entry["plan"])
+    errors = [entry for entry in report["statements"] if entry["error"]]
+    if errors:
+        lines.append(f"\nCould not explain {len(errors)} statements:")
+        lines.extend(f"  {entry['sql'][:120]}: {entry['error']}" for entry in errors)
+    lines.append("\nUnused indexes: " + (", ".join(report["unused_indexes"]) or "none"))
+    if report["suggested_indexes"]:
+        lines.append("\nSuggested indexes:")
+        for suggestion in report["suggested_indexes"]:
+            rows = report["table_rows"].get(suggestion["table"], 0)
+            lines.append(f"  {suggestion['sql']};")
+            lines.append(f"      -- {suggestion['statements']} statement(s), {suggestion['executions']} executions, "
+                         f"{rows} rows; {suggestion['reason']}")
+    return "\n".join(lines)
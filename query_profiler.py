@@ -0,0 +1,208 @@
+"""
+SQL Statement Profiling
+
+All SQL managers (SQLMatchManager, SQLTeamManager, SQLFacilityManager,
+SQLLeagueManager) share the one cursor of their SQLiteTennisDB, so wrapping
+that cursor sees every statement a request or command issues.
+
+ProfilingCursor forwards to the sqlite3 cursor and records into a QueryStats:
+
+- number of statements and their total time (execution plus fetching, since
+  SQLite does most of a SELECT's work while rows are fetched)
+- rows fetched
+- per normalized statement (literals replaced by ``?``, IN lists collapsed,
+  whitespace squeezed): count, time and rows, so the same query issued once
+  per match shows up as one line with a large count
+
+The web app reports the totals in ``X-DB-Queries`` and ``Server-Timing``
+headers (and a debug footer), and ``simple_cli --profile-sql`` prints the top
+statements after a command.  An N+1 pattern is visible as a statement whose
+count grows with the number of rows of the page or scope.
+"""
+
+import re
+import sqlite3
+import time
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Optional
+
+# Statements shown by default in summaries
+DEFAULT_TOP_STATEMENTS = 10
+
+_STRING_LITERAL = re.compile(r"'(?:[^']|'')*'")
+_NUMBER_LITERAL = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?\b")
+_IN_LIST = re.compile(r"\bIN\s*\(\s*\?(?:\s*,\s*\?)*\s*\)", re.IGNORECASE)
+_WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=2048)
+def normalize_sql(sql: str) -> str:
+    """
+    Reduce a statement to its shape
+
+    Args:
+        sql: SQL text as executed
+
+    Returns:
+        Statement with literals replaced by ``?``, ``IN (?, ?, ...)`` collapsed
+        to ``IN (?...)`` and whitespace squeezed to single spaces
+    """
+    normalized = _STRING_LITERAL.sub("?", sql)
+    normalized = _NUMBER_LITERAL.sub("?", normalized)
+    normalized = _WHITESPACE.sub(" ", normalized).strip()
+    return _IN_LIST.sub("IN (?...)", normalized)
+
+
+class QueryStats:
+    """Statement counters of one database connection"""
+
+    __slots__ = ("count", "total_time", "rows", "statements", "samples", "_current")
+
+    def __init__(self):
+        # Normalized SQL -> [first SQL as executed, its parameters, count, seconds];
+        # only kept while a query audit captures statements (see query_audit), survives reset()
+        self.samples: Optional[Dict[str, List[Any]]] = None
+        self.reset()
+
+    def reset(self) -> None:
+        """Start counting from zero (e.g. at the start of a request)"""
+        self.count = 0
+        self.total_time = 0.0
+        self.rows = 0
+        self.statements: Dict[str, List[float]] = {}  # normalized SQL -> [count, seconds, rows]
+        self._current: Optional[List[float]] = None
+
+    def record(self, sql: str, seconds: float, parameters: Any = None) -> None:
+        """Count one executed statement"""
+        normalized = normalize_sql(sql)
+        entry = self.statements.setdefault(normalized, [0, 0.0, 0])
+        if self.samples is not None:
+            sample = self.samples.setdefault(normalized, [sql, parameters, 0, 0.0])
+            sample[2] += 1
+            sample[3] += seconds
+        entry[0] += 1
+        entry[1] += seconds
+        self.count += 1
+        self.total_time += seconds
+        self._current = entry
+
+    def record_fetch(self, rows: int, seconds: float) -> None:
+        """Add fetched rows (and the time fetching took) to the last statement"""
+        self.rows += rows
+        self.total_time += seconds
+        if self._current is not None:
+            self._current[1] += seconds
+            self._current[2] += rows
+
+    def top(self, limit: int = DEFAULT_TOP_STATEMENTS, by: str = "time") -> List[Dict[str, Any]]:
+        """
+        Most expensive normalized statements
+
+        Args:
+            limit: Number of statements to return
+            by: "time" or "count"
+
+        Returns:
+            Dictionaries with sql, count, time (seconds) and rows
+        """
+        if by not in ("time", "count"):
+            raise ValueError(f"Unknown sort key: {by}")
+        ordered = sorted(self.statements.items(), key=lambda item: item[1][1 if by == "time" else 0],
+                         reverse=True)
+        return [
+            {"sql": sql, "count": int(entry[0]), "time": round(entry[1], 6), "rows": int(entry[2])}
+            for sql, entry in ordered[:limit]
+        ]
+
+    def summary(self, top: int = DEFAULT_TOP_STATEMENTS) -> Dict[str, Any]:
+        """Totals plus the ``top`` most expensive statements"""
+        return {
+            "queries": self.count,
+            "time_ms": round(self.total_time * 1000, 3),
+            "rows": self.rows,
+            "distinct_statements": len(self.statements),
+            "top_statements": self.top(top),
+        }
+
+    def header_values(self) -> Dict[str, str]:
+        """``X-DB-Queries`` and ``Server-Timing`` response header values"""
+        time_ms = self.total_time * 1000
+        return {
+            "X-DB-Queries": str(self.count),
+            "Server-Timing": f'db;dur={time_ms:.2f};desc="{self.count} queries, {self.rows} rows"',
+        }
+
+
+def format_summary(stats: QueryStats, top: int = DEFAULT_TOP_STATEMENTS) -> str:
+    """Text report of a QueryStats for the command line"""
+    summary = stats.summary(top)
+    lines = [
+        f"SQL: {summary['queries']} statements ({summary['distinct_statements']} distinct), "
+        f"{summary['time_ms']:.1f} ms, {summary['rows']} rows fetched"
+    ]
+    for statement in summary["top_statements"]:
+        sql = statement["sql"] if len(statement["sql"]) <= 100 else statement["sql"][:97] + "..."
+        lines.append(f"  {statement['count']:>7}x {statement['time'] * 1000:>9.1f} ms "
+                     f"{statement['rows']:>8} rows  {sql}")
+    return "\n".join(lines)
+
+
+class ProfilingCursor:
+    """sqlite3 cursor wrapper that records statements, time and fetched rows into a QueryStats"""
+
+    def __init__(self, cursor: sqlite3.Cursor, stats: Optional[QueryStats] = None):
+        self._cursor = cursor
+        self.stats = stats if stats is not None else QueryStats()
+
+    def execute(self, sql: str, parameters: Iterable[Any] = ()) -> 'ProfilingCursor':
+        started = time.perf_counter()
+        try:
+            self._cursor.execute(sql, parameters)
+        finally:
+            self.stats.record(sql, time.perf_counter() - started, parameters)
+        return self
+
+    def executemany(self, sql: str, seq_of_parameters: Iterable[Iterable[Any]]) -> 'ProfilingCursor':
+        started = time.perf_counter()
+        try:
+            self._cursor.executemany(sql, seq_of_parameters)
+        finally:
+            self.stats.record(sql, time.perf_counter() - started)
+        return self
+
+    def executescript(self, sql_script: str) -> 'ProfilingCursor':
+        started = time.perf_counter()
+        try:
+            self._cursor.executescript(sql_script)
+        finally:
+            self.stats.record("<script>", time.perf_counter() - started)
+        return self
+
+    def fetchone(self) -> Optional[sqlite3.Row]:
+        started = time.perf_counter()
+        row = self._cursor.fetchone()
+        self.stats.record_fetch(0 if row is None else 1, time.perf_counter() - started)
+        return row
+
+    def fetchmany(self, size: Optional[int] = None) -> List[sqlite3.Row]:
+        started = time.perf_counter()
+        rows = self._cursor.fetchmany(size) if size is not None else self._cursor.fetchmany()
+        self.stats.record_fetch(len(rows), time.perf_counter() - started)
+        return rows
+
+    def fetchall(self) -> List[sqlite3.Row]:
+        started = time.perf_counter()
+        rows = self._cursor.fetchall()
+        self.stats.record_fetch(len(rows), time.perf_counter() - started)
+        return rows
+
+    def __iter__(self) -> Iterator[sqlite3.Row]:
+        while True:
+            row = self.fetchone()
+            if row is None:
+                return
+            yield row
+
+    def __getattr__(self, name: str) -> Any:
+        # rowcount, lastrowid, description, close, ...
+        return getattr(self._cursor, name)
@@ -0,0 +1,213 @@
+"""
+On-Demand Run Profiling
+
+StageProfiler (see scheduling_profile) says which scheduling stage a run
+spends its time in, but not which functions.  RunProfile wraps a whole
+scheduler or optimizer run with a function-level profiler when asked to
+(``--profile`` on ``auto-schedule``/``optimize-schedule``, the admin-only
+``profile`` flag of the web bulk endpoints) and does nothing otherwise:
+callers only create one when profiling was requested.
+
+Two profilers are available:
+
+- cprofile: deterministic cProfile; writes ``<run_id>.pstats`` (open with
+  ``python -m pstats`` or snakeviz)
+- sampling: samples the running thread's stack every few milliseconds;
+  writes ``<run_id>.collapsed`` (one ``frame;frame;frame count`` line per
+  stack, the input of flamegraph.pl and speedscope).  Much lower overhead
+  than cProfile on the hot per-slot loops, but statistical; samples are
+  taken when the sampler gets the GIL, so code that releases it (SQLite
+  calls) tends to be over-represented
+
+Both put a summary of the top functions by cumulative time in
+``RunProfile.summary``, which the CLI prints and the web endpoints return as
+``run_profile``.  Only the calling thread is profiled: worker processes of
+``auto_schedule_components`` are not (use one worker to profile them).
+
+Files are written to TENNIS_PROFILE_DIR, default ``profiles/``.  The web
+flag is honoured only with the ``X-Profile-Token`` header matching
+TENNIS_PROFILE_TOKEN (see web_matches).
+"""
+
+import cProfile
+import logging
+import os
+import pstats
+import sys
+import threading
+import time
+import uuid
+from collections import Counter
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+logger = logging.getLogger(__name__)
+
+PROFILERS = ("cprofile", "sampling")
+
+# Environment variable naming the output directory of profile files
+ENV_PROFILE_DIR = "TENNIS_PROFILE_DIR"
+DEFAULT_PROFILE_DIR = "profiles"
+
+# Functions listed in a summary
+DEFAULT_TOP_FUNCTIONS = 15
+
+# Seconds between two stack samples of the sampling profiler
+DEFAULT_SAMPLE_INTERVAL = 0.005
+
+
+def new_run_id(operation: str) -> str:
+    """Unique run ID: operation, local start time and a random suffix"""
+    return f"{operation}-{datetime.now().strftime('%Y%m%d-%H%M%S')}-{uuid.uuid4().hex[:6]}"
+
+
+def _frame_label(code) -> str:
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class _StackSampler:
+    """Background thread counting the stacks of one thread below its profiled frame"""
+
+    def __init__(self, thread_id: int, interval: float, root):
+        self.thread_id = thread_id
+        self.root = root
+        self.interval = interval
+        self.stacks: Counter = Counter()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, name="run-profile-sampler", daemon=True)
+
+    def start(self) -> None:
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._thread.join()
+
+    def _run(self) -> None:
+        while not self._stop.wait(self.interval):
+            frame = sys._current_frames().get(self.thread_id)
+            labels = []
+            while frame is not None:
+                labels.append(_frame_label(frame.f_code))
+                frame = None if frame is self.root else frame.f_back
+            if labels:
+                self.stacks[";".join(reversed(labels))] += 1
+
+
+class RunProfile:
+    """
+    Context manager profiling one scheduler or optimizer run
+
+    Args:
+        operation: Name of the run (auto_schedule, optimize, ...), the prefix of the run ID
+        profiler: One of PROFILERS
+        output_dir: Directory of the profile files (default: TENNIS_PROFILE_DIR or profiles/)
+        top: Number of functions in the summary
+        run_id: Run ID to name the files by (default: new_run_id(operation))
+        sample_interval: Seconds between two stack samples (sampling profiler)
+
+    Raises:
+        ValueError: If the profiler is unknown
+    """
+
+    def __init__(self, operation: str, profiler: str = "cprofile", output_dir: Optional[str] = None,
+                 top: int = DEFAULT_TOP_FUNCTIONS, run_id: Optional[str] = None,
+                 sample_interval: float = DEFAULT_SAMPLE_INTERVAL):
+        if profiler not in PROFILERS:
+            raise ValueError(f"Unknown profiler '{profiler}', expected one of {', '.join(PROFILERS)}")
+        self.operation = operation
+        self.profiler = profiler
+        self.output_dir = output_dir or os.environ.get(ENV_PROFILE_DIR) or DEFAULT_PROFILE_DIR
+        self.top = top
+        self.run_id = run_id or new_run_id(operation)
+        self.sample_interval = sample_interval
+        self.summary: Optional[Dict[str, Any]] = None
+        self._profile: Optional[cProfile.Profile] = None
+        self._sampler: Optional[_StackSampler] = None
+        self._started = 0.0
+
+    def __enter__(self) -> 'RunProfile':
+        if self.profiler == "cprofile":
+            self._profile = cProfile.Profile()
+        else:
+            self._sampler = _StackSampler(threading.get_ident(), self.sample_interval, sys._getframe(1))
+            self._sampler.start()
+        self._started = time.perf_counter()
+        if self._profile is not None:
+            self._profile.enable()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        if self._profile is not None:
+            self._profile.disable()
+        elapsed = time.perf_counter() - self._started
+        if self._sampler is not None:
+            self._sampler.stop()
+        try:
+            self.summary = self._finish(elapsed)
+        except OSError as e:
+            # A profile that cannot be written must not fail the run it profiled
+            logger.warning("Could not write the profile of run %s: %s", self.run_id, e)
+            self.summary = {"run_id": self.run_id, "operation": self.operation, "profiler": self.profiler,
+                            "elapsed": round(elapsed, 6), "error": str(e), "top_functions": []}
+
+    def _finish(self, elapsed: float) -> Dict[str, Any]:
+        os.makedirs(self.output_dir, exist_ok=True)
+        summary = {
+            "run_id": self.run_id,
+            "operation": self.operation,
+            "profiler": self.profiler,
+            "elapsed": round(elapsed, 6),
+        }
+        if self._profile is not None:
+            path = os.path.join(self.output_dir, f"{self.run_id}.pstats")
+            self._profile.dump_stats(path)
+            stats = pstats.Stats(self._profile)
+            summary.update(path=path, total_calls=stats.total_calls, top_functions=_top_cprofile(stats, self.top))
+        else:
+            path = os.path.join(self.output_dir, f"{self.run_id}.collapsed")
+            stacks = self._sampler.stacks
+            with open(path, "w") as f:
+                for stack, count in sorted(stacks.items()):
+                    f.write(f"{stack} {count}\n")
+            summary.update(path=path, samples=sum(stacks.values()),
+                           top_functions=_top_sampled(stacks, self.sample_interval, self.top))
+        logger.info("Profile of run %s written to %s", self.run_id, path)
+        return summary
+
+
+def _top_cprofile(stats: pstats.Stats, top: int) -> List[Dict[str, Any]]:
+    """Functions with the largest cumulative time of a cProfile run"""
+    rows = []
+    for (filename, line, name), (primitive, calls, tottime, cumtime, _) in stats.stats.items():
+        label = name if filename == "~" else f"{name} ({os.path.basename(filename)}:{line})"
+        rows.append({"function": label, "calls": calls, "primitive_calls": primitive,
+                     "tottime": round(tottime, 6), "cumtime": round(cumtime, 6)})
+    rows.sort(key=lambda row: row["cumtime"], reverse=True)
+    return rows[:top]
+
+
+def _top_sampled(stacks: Counter, interval: float, top: int) -> List[Dict[str, Any]]:
+    """Functions on the most sampled stacks (cumulative) and at their top (self time)"""
+    cumulative: Counter = Counter()
+    own: Counter = Counter()
+    for stack, count in stacks.items():
+        frames = stack.split(";")
+        own[frames[-1]] += count
+        for label in set(frames):
+            cumulative[label] += count
+    return [{"function": label, "samples": count, "tottime": round(own[label] * interval, 6),
+             "cumtime": round(count * interval, 6)}
+            for label, count in cumulative.most_common(top)]
+
+
+def format_run_profile(summary: Dict[str, Any], limit: Optional[int] = None) -> List[str]:
+    """Text lines of a summary: where it was written, then one line per top function"""
+    if summary.get("error"):
+        return [f"Profile of run {summary['run_id']} not written: {summary['error']}"]
+    lines = [f"Profile {summary['run_id']} ({summary['profiler']}, {summary['elapsed']:.3f}s): {summary['path']}"]
+    counted = "calls" if summary["profiler"] == "cprofile" else "samples"
+    lines.append(f"  {'cumtime':>9} {'tottime':>9} {counted:>9}  function")
+    for row in summary["top_functions"][:limit]:
+        lines.append(f"  {row['cumtime']:>9.3f} {row['tottime']:>9.3f} {row[counted]:>9}  {row['function']}")
+    return lines
@@ -0,0 +1,501 @@
+"""
+Simulated-Annealing Schedule Optimizer
+
+``optimize_auto_schedule`` in seed mode runs independent greedy passes and keeps
+the best.  ScheduleAnnealer instead starts from one greedy solution and
+improves it with local search on an in-memory schedule model:
+
+- move:       place a match on another candidate (facility, date, time),
+              ejecting whatever blocks it (the ejected matches become unscheduled)
+- swap:       exchange the placements of two scheduled matches
+- time shift: move a scheduled match to another time on the same facility-day
+
+Solutions are compared lexicographically on (unscheduled matches, total
+quality penalty), where a scheduled match's penalty is ``100 - quality score``.
+Moves are accepted with the Metropolis rule on a weighted cost so the search
+can temporarily eject matches to escape local minima.
+
+The model is built once from the facility availability of the matches'
+candidate facility-days; the database is not touched until the best solution
+is committed with ``SchedulingManager.apply_assignments``.
+"""
+
+import logging
+import math
+import random
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from usta import Match, Facility
+from slot_search import find_line_distributions, SAME_TIME, SPLIT_TIMES
+
+logger = logging.getLogger(__name__)
+
+# A match's quality score is at most 100; its penalty is the distance from that
+MAX_QUALITY = 100
+
+# Cost of one unscheduled match relative to quality penalty during annealing
+UNSCHEDULED_WEIGHT = 250
+
+# How often (in iterations) progress is reported and the clock is checked
+PROGRESS_INTERVAL = 500
+
+
+class Placement:
+    """One way to place a match: facility, date, per-line times and its quality penalty"""
+
+    __slots__ = ("facility", "date", "times", "penalty", "usage")
+
+    def __init__(self, facility: Facility, date_obj: date, times: Tuple[str, ...], penalty: int,
+                 covered: Optional[Dict[str, Tuple[str, ...]]] = None):
+        self.facility = facility
+        self.date = date_obj
+        self.times = times
+        self.penalty = penalty
+        # A line holds its court at every start time its match duration covers (just its own by default)
+        usage: Dict[str, int] = defaultdict(int)
+        for time_str in times:
+            for covered_time in (covered or {}).get(time_str, (time_str,)):
+                usage[covered_time] += 1
+        self.usage = dict(usage)
+
+    @property
+    def key(self) -> Tuple[int, date, Tuple[str, ...]]:
+        return (self.facility.id, self.date, self.times)
+
+
+class ScheduleAnnealer:
+    """Simulated annealing over an in-memory model of facility capacity and team days"""
+
+    def __init__(self, db, matches: List[Match], seed: Optional[int] = None,
+                 initial_temperature: float = 40.0, final_temperature: float = 0.5):
+        """
+        Build the schedule model
+
+        Args:
+            db: Database used to read facility availability (read-only)
+            matches: Unscheduled matches to optimize
+            seed: Optional random seed
+            initial_temperature: Starting temperature (in penalty points)
+            final_temperature: Temperature reached at the end of the time budget
+        """
+        self.db = db
+        self.matches = matches
+        self.rng = random.Random(seed)
+        self.seed = seed
+        self.initial_temperature = initial_temperature
+        self.final_temperature = final_temperature
+
+        self.candidates: List[List[Placement]] = []
+        self.capacity: Dict[Tuple[int, date, str], int] = {}
+        self._build_model()
+
+        self.assignment: List[Optional[Placement]] = [None] * len(matches)
+        self.usage: Dict[Tuple[int, date, str], int] = defaultdict(int)
+        self.team_days: Dict[Tuple[int, date], int] = {}
+        self.unscheduled = len(matches)
+        self.penalty = 0
+
+    # ========== Model ==========
+
+    def _build_model(self) -> None:
+        """Collect candidate placements per match and baseline court capacity per facility-day-time"""
+        slots_by_match = []
+        dates_by_facility: Dict[int, set] = defaultdict(set)
+        facilities: Dict[int, Facility] = {}
+
+        for match in self.matches:
+            slots = []
+            for option in match.get_prioritized_scheduling_options(num_dates=None):
+                if option.facility:
+                    slots.append((option.facility, option.date, MAX_QUALITY - option.qscore))
+                    dates_by_facility[option.facility.id].add(option.date)
+                    facilities[option.facility.id] = option.facility
+            slots_by_match.append(slots)
+
+        availability: Dict[Tuple[int, date], Any] = {}
+        for facility_id, dates in dates_by_facility.items():
+            dates = sorted(dates)
+            for info in self.db.get_facility_availability(
+                facility=facilities[facility_id], dates=dates, max_days=len(dates)
+            ):
+                if not info.available:
+                    continue
+                availability[(facility_id, info.date)] = info
+                for slot in info.time_slots:
+                    self.capacity[(facility_id, info.date, slot.time)] = slot.available_courts
+
+        for match, slots in zip(self.matches, slots_by_match):
+            lines = match.league.num_lines_per_match
+            placements = []
+            for facility, date_obj, penalty in slots:
+                info = availability.get((facility.id, date_obj))
+                if info is None:
+                    continue
+                placements.extend(self._placements_for(match, facility, date_obj, penalty, info, lines))
+            self.candidates.append(placements)
+
+    @staticmethod
+    def _placements_for(match: Match, facility: Facility, date_obj: date, penalty: int,
+                        info, lines: int) -> List[Placement]:
+        """Same-time placements, or split placements when the league allows them and no same-time slot fits"""
+        time_slots = info.match_time_slots(match)
+        distributions = find_line_distributions(time_slots, lines, (SAME_TIME,))
+        if not distributions and match.league.allow_split_lines:
+            distributions = find_line_distributions(time_slots, lines, (SPLIT_TIMES,))
+
+        covered = None
+        duration = match.league.match_duration_minutes
+        if duration and info.occupancy is not None:
+            covered = {slot.time: info.occupancy.covered_slot_times(slot.time, duration) for slot in time_slots}
+        return [
+            Placement(facility, date_obj, tuple(distribution.times), penalty, covered)
+            for distribution in distributions
+        ]
+
+    # ========== State changes ==========
+
+    def _place(self, index: int, placement: Placement) -> None:
+        match = self.matches[index]
+        self.assignment[index] = placement
+        for time_str, count in placement.usage.items():
+            self.usage[(placement.facility.id, placement.date, time_str)] += count
+        self.team_days[(match.home_team.id, placement.date)] = index
+        self.team_days[(match.visitor_team.id, placement.date)] = index
+        self.unscheduled -= 1
+        self.penalty += placement.penalty
+
+    def _remove(self, index: int) -> Optional[Placement]:
+        placement = self.assignment[index]
+        if placement is None:
+            return None
+        match = self.matches[index]
+        self.assignment[index] = None
+        for time_str, count in placement.usage.items():
+            self.usage[(placement.facility.id, placement.date, time_str)] -= count
+        self.team_days.pop((match.home_team.id, placement.date), None)
+        self.team_days.pop((match.visitor_team.id, placement.date), None)
+        self.unscheduled += 1
+        self.penalty -= placement.penalty
+        return placement
+
+    def _fits(self, index: int, placement: Placement) -> bool:
+        """Whether a placement is feasible for a (currently unplaced) match"""
+        match = self.matches[index]
+        if (match.home_team.id, placement.date) in self.team_days:
+            return False
+        if (match.visitor_team.id, placement.date) in self.team_days:
+            return False
+        for time_str, count in placement.usage.items():
+            key = (placement.facility.id, placement.date, time_str)
+            if self.usage[key] + count > self.capacity.get(key, 0):
+                return False
+        return True
+
+    def _blockers(self, index: int, placement: Placement) -> Optional[List[int]]:
+        """Placed matches that must be ejected for a placement to fit, None if ejecting cannot free the courts"""
+        match = self.matches[index]
+        blockers = set()
+        for team_id in (match.home_team.id, match.visitor_team.id):
+            other = self.team_days.get((team_id, placement.date))
+            if other is not None and other != index:
+                blockers.add(other)
+
+        for time_str, count in placement.usage.items():
+            key = (placement.facility.id, placement.date, time_str)
+            excess = self.usage[key] + count - self.capacity.get(key, 0)
+            if excess <= 0:
+                continue
+            occupants = [
+                other for other, other_placement in enumerate(self.assignment)
+                if other_placement is not None and other != index and other not in blockers
+                and other_placement.facility.id == placement.facility.id
+                and other_placement.date == placement.date and time_str in other_placement.usage
+            ]
+            self.rng.shuffle(occupants)
+            for other in occupants:
+                if excess <= 0:
+                    break
+                blockers.add(other)
+                excess -= self.assignment[other].usage[time_str]
+            if excess > 0:
+                return None
+        return list(blockers)
+
+    def cost(self) -> float:
+        return self.unscheduled * UNSCHEDULED_WEIGHT + self.penalty
+
+    def score(self) -> Tuple[int, int]:
+        """Lexicographic score: (unscheduled matches, total quality penalty)"""
+        return (self.unscheduled, self.penalty)
+
+    # ========== Neighborhoods ==========
+
+    def _move(self) -> Optional[List[Tuple[int, Optional[Placement]]]]:
+        """Place a match (unscheduled ones preferred) on a random candidate, ejecting blockers"""
+        unscheduled = [i for i, p in enumerate(self.assignment) if p is None and self.candidates[i]]
+        if unscheduled and self.rng.random() < 0.6:
+            index = self.rng.choice(unscheduled)
+        else:
+            index = self.rng.randrange(len(self.matches))
+        if not self.candidates[index]:
+            return None
+
+        placement = self.rng.choice(self.candidates[index])
+        if placement is self.assignment[index]:
+            return None
+
+        undo = [(index, self._remove(index))]
+        blockers = self._blockers(index, placement)
+        if blockers is None:
+            self._restore(undo)
+            return None
+        for other in blockers:
+            undo.append((other, self._remove(other)))
+        self._place(index, placement)
+        return undo
+
+    def _swap(self) -> Optional[List[Tuple[int, Optional[Placement]]]]:
+        """Exchange the placements of two scheduled matches"""
+        scheduled = [i for i, p in enumerate(self.assignment) if p is not None]
+        if len(scheduled) < 2:
+            return None
+        first, second = self.rng.sample(scheduled, 2)
+        first_placement = self.assignment[first]
+        second_placement = self.assignment[second]
+
+        # Each match needs an equivalent candidate (same facility, date and times) of the other's slot
+        first_target = self._find_candidate(first, second_placement.key)
+        second_target = self._find_candidate(second, first_placement.key)
+        if first_target is None or second_target is None:
+            return None
+
+        undo = [(first, self._remove(first)), (second, self._remove(second))]
+        if not self._fits(first, first_target):
+            self._restore(undo)
+            return None
+        self._place(first, first_target)
+        if not self._fits(second, second_target):
+            self._restore(undo)
+            return None
+        self._place(second, second_target)
+        return undo
+
+    def _time_shift(self) -> Optional[List[Tuple[int, Optional[Placement]]]]:
+        """Move a scheduled match to another time on the same facility-day"""
+        scheduled = [i for i, p in enumerate(self.assignment) if p is not None]
+        if not scheduled:
+            return None
+        index = self.rng.choice(scheduled)
+        current = self.assignment[index]
+        same_day = [
+            p for p in self.candidates[index]
+            if p.facility.id == current.facility.id and p.date == current.date and p.times != current.times
+        ]
+        if not same_day:
+            return None
+
+        target = self.rng.choice(same_day)
+        undo = [(index, self._remove(index))]
+        if not self._fits(index, target):
+            self._restore(undo)
+            return None
+        self._place(index, target)
+        return undo
+
+    def _find_candidate(self, index: int, key) -> Optional[Placement]:
+        for placement in self.candidates[index]:
+            if placement.key == key:
+                return placement
+        return None
+
+    def _restore(self, undo: List[Tuple[int, Optional[Placement]]]) -> None:
+        """Revert a neighborhood move from its undo log (list of (match index, previous placement))"""
+        for index, _ in undo:
+            self._remove(index)
+        for index, previous in undo:
+            if previous is not None:
+                self._place(index, previous)
+
+    # ========== Search ==========
+
+    def load_solution(self, matches: List[Match]) -> None:
+        """Start from the placements currently assigned to the Match objects (e.g. a greedy run)"""
+        for index, match in enumerate(matches):
+            if not match.is_scheduled():
+                continue
+            key = (match.facility.id, match.date, tuple(match.get_scheduled_times()))
+            placement = self._find_candidate(index, key)
+            if placement is None:
+                quality, _ = match.calculate_quality_score()
+                placement = Placement(match.facility, match.date, key[2], MAX_QUALITY - quality)
+                self.candidates[index].append(placement)
+            if self._fits(index, placement):
+                self._place(index, placement)
+
+    def load_assignments(self, assignments: List[Dict[str, Any]]) -> int:
+        """
+        Start from saved assignments (e.g. the best solution of a checkpoint)
+
+        An assignment whose facility-day is no longer a candidate of its match,
+        or that no longer fits, is skipped and its match stays unscheduled.
+
+        Args:
+            assignments: List of {match_id, facility_id, date (YYYY-MM-DD), times}
+
+        Returns:
+            Number of assignments that could not be loaded
+        """
+        index_by_id = {match.id: index for index, match in enumerate(self.matches)}
+        skipped = 0
+        for assignment in assignments:
+            index = index_by_id.get(assignment["match_id"])
+            if index is None or self.assignment[index] is not None:
+                skipped += 1
+                continue
+            key = (assignment["facility_id"], date.fromisoformat(assignment["date"]), tuple(assignment["times"]))
+            placement = self._find_candidate(index, key)
+            if placement is None:
+                # Same facility-day with a line distribution the search does not generate (e.g. a custom one)
+                same_day = next((p for p in self.candidates[index] if p.key[:2] == key[:2]), None)
+                if same_day is not None:
+                    placement = Placement(same_day.facility, key[1], key[2], same_day.penalty)
+                    self.candidates[index].append(placement)
+            if placement is None or not self._fits(index, placement):
+                skipped += 1
+                continue
+            self._place(index, placement)
+        if skipped:
+            logger.info(f"{skipped} of {len(assignments)} saved assignments could not be loaded")
+        return skipped
+
+    def assignments(self, assignment: Optional[List[Optional[Placement]]] = None) -> List[Dict[str, Any]]:
+        """apply_assignments entries of a solution (the current one by default)"""
+        if assignment is None:
+            assignment = self.assignment
+        return [
+            {
+                "match_id": match.id,
+                "facility_id": placement.facility.id,
+                "date": placement.date.isoformat(),
+                "times": list(placement.times),
+            }
+            for match, placement in zip(self.matches, assignment) if placement is not None
+        ]
+
+    def _quality(self, score: Tuple[int, int]) -> float:
+        """Average quality score of the scheduled matches of a solution with this score"""
+        scheduled = len(self.matches) - score[0]
+        return (MAX_QUALITY * scheduled - score[1]) / scheduled if scheduled else 0
+
+    def run(self, time_budget: float, progress_callback: Optional[Callable[[Dict[str, Any]], None]] = None,
+            max_iterations: Optional[int] = None,
+            checkpoint_callback: Optional[Callable[[Dict[str, Any]], None]] = None) -> Dict[str, Any]:
+        """
+        Anneal until the time budget (or iteration limit) is used up
+
+        Args:
+            time_budget: Wall-clock seconds to search
+            progress_callback: Optional callback receiving progress dictionaries
+            max_iterations: Optional iteration limit (useful for reproducible runs)
+            checkpoint_callback: Optional callback receiving the best solution
+                (score, best_assignments, iterations, elapsed) at progress points
+                where it improved; see schedule_checkpoint.CheckpointWriter
+
+        Returns:
+            Dictionary with the best score, its assignments and the progress history
+        """
+        start = time.monotonic()
+        best_score = self.score()
+        best_assignment = list(self.assignment)
+        initial_score = best_score
+        checkpointed_score = None
+        history = []
+        iteration = 0
+        accepted = 0
+        temperature = self.initial_temperature
+        neighborhoods = (self._move, self._move, self._swap, self._time_shift)
+
+        while True:
+            iteration += 1
+            if max_iterations is not None and iteration > max_iterations:
+                break
+
+            if iteration % PROGRESS_INTERVAL == 0:
+                elapsed = time.monotonic() - start
+                if elapsed >= time_budget:
+                    break
+                fraction = elapsed / time_budget if time_budget > 0 else 1.0
+                temperature = self.initial_temperature * (
+                    (self.final_temperature / self.initial_temperature) ** fraction
+                )
+                update = self._progress(iteration, elapsed, time_budget, temperature, best_score, accepted)
+                history.append(update)
+                if progress_callback:
+                    progress_callback(update)
+                if checkpoint_callback and best_score != checkpointed_score:
+                    checkpoint_callback(self._best(best_score, best_assignment, iteration, elapsed))
+                    checkpointed_score = best_score
+
+            before = self.cost()
+            undo = self.rng.choice(neighborhoods)()
+            if undo is None:
+                continue
+
+            delta = self.cost() - before
+            if delta <= 0 or self.rng.random() < math.exp(-delta / max(temperature, 1e-9)):
+                accepted += 1
+                score = self.score()
+                if score < best_score:
+                    best_score = score
+                    best_assignment = list(self.assignment)
+            else:
+                self._restore(undo)
+
+        elapsed = time.monotonic() - start
+        final = self._progress(iteration, elapsed, time_budget, temperature, best_score, accepted)
+        history.append(final)
+        if progress_callback:
+            progress_callback(final)
+
+        result = self._best(best_score, best_assignment, iteration, elapsed)
+        if checkpoint_callback:
+            checkpoint_callback(result)
+        result.update({
+            "initial_unscheduled_count": initial_score[0],
+            "initial_total_penalty": initial_score[1],
+            "accepted_moves": accepted,
+            "seed": self.seed,
+            "results_history": history,
+        })
+        return result
+
+    def _best(self, best_score: Tuple[int, int], best_assignment: List[Optional[Placement]],
+              iteration: int, elapsed: float) -> Dict[str, Any]:
+        return {
+            "best_unscheduled_count": best_score[0],
+            "best_total_penalty": best_score[1],
+            "best_quality_score": self._quality(best_score),
+            "best_assignments": self.assignments(best_assignment),
+            "iterations": iteration,
+            "elapsed": round(elapsed, 3),
+        }
+
+    def _progress(self, iteration: int, elapsed: float, time_budget: float, temperature: float,
+                  best_score: Tuple[int, int], accepted: int) -> Dict[str, Any]:
+        return {
+            "iteration": iteration,
+            "max_iterations": None,
+            "elapsed": round(elapsed, 2),
+            "time_budget": time_budget,
+            "temperature": round(temperature, 3),
+            "current_unscheduled_count": self.unscheduled,
+            "current_total_penalty": self.penalty,
+            "best_unscheduled_count": best_score[0],
+            "best_total_penalty": best_score[1],
+            "best_quality_score": self._quality(best_score),
+            "accepted_moves": accepted,
+            "best_seed": None,
+        }
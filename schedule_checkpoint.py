@@ -0,0 +1,238 @@
+"""
+Optimizer Checkpoints
+
+``optimize_auto_schedule`` used to keep everything in memory: the best
+solution was lost when a run ended, and committing it meant re-running the
+winning seed.  A checkpoint is a small JSON file holding the best solution of
+a run so far:
+
+- the assignments (``apply_assignments`` entries), so the schedule can be
+  committed directly without recomputation
+- its score: unscheduled matches, total quality penalty, average quality
+- the seed and parameters of the run that produced it
+- the scope (match IDs) and the committed schedule of that scope when the run
+  started, so a commit can tell whether the database moved on since
+
+CheckpointWriter saves the best solution at most once per interval while a
+run goes on and always at the end; files are written to a temporary file and
+renamed, so an interrupted write never leaves a broken checkpoint behind.
+A checkpoint can be resumed by a later run (annealing and exact modes start
+from its assignments, seeds mode has to beat it) and built on across restarts.
+"""
+
+import json
+import logging
+import os
+import time
+from dataclasses import dataclass, field, asdict
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from usta import Match
+
+logger = logging.getLogger(__name__)
+
+CHECKPOINT_VERSION = 1
+
+# Seconds between two checkpoint writes during a run
+DEFAULT_CHECKPOINT_INTERVAL = 60.0
+
+
+def assignments_from_matches(matches: List[Match]) -> List[Dict[str, Any]]:
+    """apply_assignments entries for the scheduled matches of a list"""
+    return [
+        {
+            "match_id": match.id,
+            "facility_id": match.facility.id,
+            "date": match.date.isoformat(),
+            "times": list(match.get_scheduled_times()),
+        }
+        for match in matches if match.is_scheduled()
+    ]
+
+
+def committed_schedule(matches: List[Match]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """Current placement of each match (None when unscheduled), keyed by match ID as a string"""
+    placements = {str(assignment["match_id"]): assignment for assignment in assignments_from_matches(matches)}
+    return {str(match.id): placements.get(str(match.id)) for match in matches}
+
+
+@dataclass
+class ScheduleCheckpoint:
+    """Best solution of an optimization run"""
+
+    mode: str
+    seed: Optional[int]
+    params: Dict[str, Any]
+    match_ids: List[int]
+    best_unscheduled_count: int
+    best_total_penalty: int
+    best_quality_score: float
+    best_assignments: List[Dict[str, Any]]
+    baseline: Dict[str, Optional[Dict[str, Any]]] = field(default_factory=dict)
+    iterations: int = 0
+    elapsed: float = 0.0
+    created_at: str = ""
+    updated_at: str = ""
+    version: int = CHECKPOINT_VERSION
+
+    @property
+    def score(self) -> Tuple[int, int]:
+        """Lexicographic score: (unscheduled matches, total quality penalty), lower is better"""
+        return (self.best_unscheduled_count, self.best_total_penalty)
+
+    def to_dict(self) -> Dict[str, Any]:
+        return asdict(self)
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> 'ScheduleCheckpoint':
+        """
+        Create a checkpoint from its saved dictionary
+
+        Raises:
+            ValueError: If the data is not a checkpoint of a supported version
+        """
+        if not isinstance(data, dict):
+            raise ValueError("Checkpoint data must be a dictionary")
+        version = data.get("version")
+        if version != CHECKPOINT_VERSION:
+            raise ValueError(f"Unsupported checkpoint version {version} (expected {CHECKPOINT_VERSION})")
+        known = set(cls.__dataclass_fields__)
+        missing = [name for name in ("mode", "match_ids", "best_assignments") if name not in data]
+        if missing:
+            raise ValueError(f"Checkpoint is missing {', '.join(missing)}")
+        return cls(**{key: value for key, value in data.items() if key in known})
+
+    def stale_match_ids(self, matches: List[Match]) -> List[int]:
+        """
+        Matches whose committed placement changed since the run started
+
+        Args:
+            matches: Current Match objects of the checkpoint's scope
+
+        Returns:
+            Sorted IDs of matches placed differently than in the baseline (or missing)
+        """
+        if not self.baseline:
+            return []
+        current = committed_schedule(matches)
+        return sorted(int(match_id) for match_id, placement in self.baseline.items()
+                      if current.get(match_id, "missing") != placement)
+
+
+def save_checkpoint(path: str, checkpoint: ScheduleCheckpoint) -> None:
+    """
+    Write a checkpoint atomically (temporary file, then rename)
+
+    Raises:
+        RuntimeError: If the file cannot be written
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    temporary = f"{path}.tmp"
+    try:
+        os.makedirs(directory, exist_ok=True)
+        with open(temporary, "w") as f:
+            json.dump(checkpoint.to_dict(), f, indent=2)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temporary, path)
+    except OSError as e:
+        raise RuntimeError(f"Error writing checkpoint {path}: {e}")
+
+
+def load_checkpoint(path: str) -> ScheduleCheckpoint:
+    """
+    Read a checkpoint file
+
+    Raises:
+        ValueError: If the file does not exist or is not a valid checkpoint
+    """
+    try:
+        with open(path) as f:
+            data = json.load(f)
+    except FileNotFoundError:
+        raise ValueError(f"Checkpoint {path} not found")
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Error reading checkpoint {path}: {e}")
+    return ScheduleCheckpoint.from_dict(data)
+
+
+class CheckpointWriter:
+    """Keeps the best solution of a run and saves it to a checkpoint file at intervals"""
+
+    def __init__(self, path: str, mode: str, seed: Optional[int], params: Dict[str, Any],
+                 matches: List[Match], interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                 baseline: Optional[ScheduleCheckpoint] = None):
+        """
+        Args:
+            path: Checkpoint file to write
+            mode: Optimization mode of the run
+            seed: Seed of the run
+            params: Parameters of the run (ordering, time budget, ...)
+            matches: Matches of the run's scope, in their current (committed) state
+            interval: Minimum seconds between two writes during the run
+            baseline: Checkpoint the run resumed from; only solutions at least as good replace it
+        """
+        self.path = path
+        self.interval = interval
+        now = datetime.now().isoformat(timespec="seconds")
+        self.checkpoint = ScheduleCheckpoint(
+            mode=mode,
+            seed=seed,
+            params=dict(params),
+            match_ids=sorted(match.id for match in matches),
+            best_unscheduled_count=baseline.best_unscheduled_count if baseline else len(matches) + 1,
+            best_total_penalty=baseline.best_total_penalty if baseline else 0,
+            best_quality_score=baseline.best_quality_score if baseline else 0.0,
+            best_assignments=list(baseline.best_assignments) if baseline else [],
+            baseline=committed_schedule(matches),
+            created_at=baseline.created_at if baseline and baseline.created_at else now,
+            updated_at=now,
+        )
+        self.writes = 0
+        self._dirty = False
+        self._last_write = time.monotonic()
+
+    def record(self, result: Dict[str, Any], iterations: int = 0, elapsed: float = 0.0,
+               force: bool = False) -> bool:
+        """
+        Offer a solution; it is kept if at least as good as the best so far
+
+        Args:
+            result: Dictionary with best_unscheduled_count, best_total_penalty,
+                best_quality_score, best_assignments and optionally best_seed
+            iterations: Iterations (or seeds) run so far
+            elapsed: Seconds the run has taken so far
+            force: Write now instead of waiting for the interval
+
+        Returns:
+            True if the checkpoint file was written
+        """
+        score = (result["best_unscheduled_count"], result["best_total_penalty"])
+        self.checkpoint.iterations = iterations
+        self.checkpoint.elapsed = round(elapsed, 3)
+        if score <= self.checkpoint.score:
+            self.checkpoint.best_unscheduled_count = score[0]
+            self.checkpoint.best_total_penalty = score[1]
+            self.checkpoint.best_quality_score = result["best_quality_score"]
+            self.checkpoint.best_assignments = list(result["best_assignments"])
+            if result.get("best_seed") is not None:
+                self.checkpoint.seed = result["best_seed"]
+            self._dirty = True
+
+        if self._dirty and (force or time.monotonic() - self._last_write >= self.interval):
+            return self.flush()
+        return False
+
+    def flush(self) -> bool:
+        """Write the best solution if it changed since the last write"""
+        if not self._dirty:
+            return False
+        self.checkpoint.updated_at = datetime.now().isoformat(timespec="seconds")
+        save_checkpoint(self.path, self.checkpoint)
+        self._dirty = False
+        self._last_write = time.monotonic()
+        self.writes += 1
+        logger.info(f"Checkpoint {self.path}: {self.checkpoint.best_unscheduled_count} unscheduled, "
+                    f"penalty {self.checkpoint.best_total_penalty}")
+        return True
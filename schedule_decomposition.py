@@ -0,0 +1,256 @@
+"""
+Facility-Disjoint Decomposition of Auto-Scheduling Scopes
+
+Scheduling every unscheduled match of every league as one list makes the
+solve time grow with the whole region, even though many leagues never share
+a team or a facility (e.g. the NNM and PHO regions in ``testing/``).
+
+A match only interacts with other matches through its league (same-league
+date penalties), its two teams (one match per team-day) and the facilities
+its home team may play at (court capacity).  ``find_components`` builds that
+league-team-facility graph and splits the matches into its connected
+components; components cannot affect each other, so ``schedule_components``
+schedules each one independently - in its own worker process when the
+database can be reopened from a path - and merges the per-component reports
+into one auto_schedule_matches-shaped report.
+
+Workers always run in dry-run mode and return their assignments; in execute
+mode the parent commits all of them in a single transaction with
+``SchedulingManager.apply_assignments``.
+"""
+
+import logging
+import os
+import random
+import time
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple
+
+from logging_setup import configure_worker_logging
+from schedule_checkpoint import assignments_from_matches
+from scheduling_profile import merge_profiles
+from usta import Match, MatchType
+
+logger = logging.getLogger(__name__)
+
+Node = Tuple[str, int]
+
+
+def _match_nodes(match: Match) -> List[Node]:
+    """Graph nodes a match touches: its league, both teams and its candidate facilities"""
+    nodes = [("league", match.league.id), ("team", match.home_team.id), ("team", match.visitor_team.id)]
+    nodes.extend(("facility", facility.id) for facility in match.home_team.preferred_facilities if facility)
+    return nodes
+
+
+def find_components(matches: List[Match]) -> List[List[Match]]:
+    """
+    Split matches into independent groups (connected components of the
+    league-team-facility interaction graph)
+
+    Args:
+        matches: Matches to split
+
+    Returns:
+        Lists of matches, largest component first (ties by smallest match ID)
+    """
+    parent: Dict[Node, Node] = {}
+
+    def find(node: Node) -> Node:
+        root = node
+        while parent[root] != root:
+            root = parent[root]
+        while parent[node] != root:
+            parent[node], node = root, parent[node]
+        return root
+
+    for match in matches:
+        nodes = _match_nodes(match)
+        for node in nodes:
+            parent.setdefault(node, node)
+        first = find(nodes[0])
+        for node in nodes[1:]:
+            root = find(node)
+            if root != first:
+                parent[root] = first
+
+    groups: Dict[Node, List[Match]] = {}
+    for match in matches:
+        groups.setdefault(find(("league", match.league.id)), []).append(match)
+
+    return sorted(groups.values(), key=lambda group: (-len(group), min(m.id for m in group)))
+
+
+def describe_component(matches: List[Match]) -> Dict[str, Any]:
+    """League, team and facility IDs of a component"""
+    leagues, teams, facilities = set(), set(), set()
+    for match in matches:
+        for kind, node_id in _match_nodes(match):
+            {"league": leagues, "team": teams, "facility": facilities}[kind].add(node_id)
+    return {
+        "matches": len(matches),
+        "league_ids": sorted(leagues),
+        "team_count": len(teams),
+        "facility_ids": sorted(facilities),
+    }
+
+
+def _schedule_in_process(scheduling_manager, matches: List[Match], seed: int,
+                         ordering: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Dry-run one component on the caller's database and match objects"""
+    start = time.time()
+    report = scheduling_manager.auto_schedule_matches(matches, dry_run=True, seed=seed, ordering=ordering)
+    assignments = assignments_from_matches(matches)
+    for match in matches:
+        if match.is_scheduled():
+            match.unschedule()
+    report["elapsed"] = round(time.time() - start, 3)
+    return report, assignments
+
+
+def _schedule_in_worker(backend_class, config: Dict[str, Any], league_ids: List[int], match_ids: List[int],
+                        seed: int, ordering: str) -> Tuple[Dict[str, Any], List[Dict[str, Any]]]:
+    """Worker process entry point: reopen the database, load the component's matches and dry-run them"""
+    from scheduling_manager import SchedulingManager
+
+    db = backend_class(config)
+    db.connect()
+    try:
+        wanted = set(match_ids)
+        matches = []
+        for league_id in league_ids:
+            league = db.get_league(league_id)
+            matches.extend(m for m in db.list_matches(league=league, match_type=MatchType.UNSCHEDULED)
+                           if m.id in wanted)
+        position = {match_id: index for index, match_id in enumerate(match_ids)}
+        matches.sort(key=lambda m: position[m.id])
+        return _schedule_in_process(SchedulingManager(db), matches, seed, ordering)
+    finally:
+        db.disconnect()
+
+
+def _merge_reports(matches: List[Match], reports: List[Dict[str, Any]], dry_run: bool) -> Dict[str, Any]:
+    merged = {
+        "total_matches": len(matches),
+        "scheduled": 0,
+        "failed": 0,
+        "scheduling_details": [],
+        "errors": [],
+        "dry_run": dry_run,
+        "options_cache_stats": {},
+        "repair": {"attempted": 0, "repaired": 0, "repaired_match_ids": [], "elapsed": 0.0},
+    }
+    for report in reports:
+        merged["scheduled"] += report.get("scheduled", 0)
+        merged["failed"] += report.get("failed", 0)
+        merged["scheduling_details"].extend(report.get("scheduling_details", []))
+        merged["errors"].extend(report.get("errors", []))
+        for key, value in report.get("options_cache_stats", {}).items():
+            merged["options_cache_stats"][key] = merged["options_cache_stats"].get(key, 0) + value
+        repair = report.get("repair")
+        if repair:
+            merged["repair"]["attempted"] += repair.get("attempted", 0)
+            merged["repair"]["repaired"] += repair.get("repaired", 0)
+            merged["repair"]["repaired_match_ids"].extend(repair.get("repaired_match_ids", []))
+            merged["repair"]["elapsed"] += repair.get("elapsed", 0.0)
+    merged["profile"] = merge_profiles(report.get("profile") for report in reports)
+    return merged
+
+
+def schedule_components(scheduling_manager, matches: List[Match], dry_run: bool = True,
+                        seed: Optional[int] = None, ordering: str = "best_option",
+                        max_workers: Optional[int] = None) -> Dict[str, Any]:
+    """
+    Auto-schedule independent components separately and merge the results
+
+    Args:
+        scheduling_manager: SchedulingManager of the caller's database
+        matches: Unscheduled matches (any number of leagues)
+        dry_run: If True, only simulate scheduling without committing changes
+        seed: Optional seed; each component gets a seed derived from it
+        ordering: Match ordering mode passed to auto_schedule_matches
+        max_workers: Worker process limit (default: CPU count); 1 runs in-process
+
+    Returns:
+        Merged auto_schedule_matches results plus ``assignments``, per-component
+        ``components`` entries and a ``decomposition`` summary
+
+    Raises:
+        RuntimeError: If a component fails to schedule or the commit fails
+    """
+    start = time.time()
+    components = find_components(matches)
+    rng = random.Random(seed)
+    seeds = [rng.randint(1, 2**31 - 1) for _ in components]
+
+    db = scheduling_manager.db
+    db_path = getattr(db, "db_path", None)
+    if max_workers is None:
+        max_workers = len(os.sched_getaffinity(0)) if hasattr(os, "sched_getaffinity") else (os.cpu_count() or 1)
+    workers = min(max_workers, len(components))
+    parallel = workers > 1 and db_path is not None
+
+    mode = f"{workers} worker processes" if parallel else "in-process"
+    logger.info(f"Scheduling {len(matches)} matches as {len(components)} independent components ({mode})")
+
+    try:
+        if parallel:
+            with ProcessPoolExecutor(max_workers=workers, initializer=configure_worker_logging,
+                                     initargs=(logging.getLogger().getEffectiveLevel(),)) as pool:
+                futures = [
+                    pool.submit(_schedule_in_worker, type(db), {"db_path": db_path},
+                                describe_component(component)["league_ids"],
+                                [m.id for m in component], component_seed, ordering)
+                    for component, component_seed in zip(components, seeds)
+                ]
+                outcomes = [future.result() for future in futures]
+        else:
+            outcomes = [
+                _schedule_in_process(scheduling_manager, component, component_seed, ordering)
+                for component, component_seed in zip(components, seeds)
+            ]
+    except Exception as e:
+        raise RuntimeError(f"Error scheduling independent components: {e}")
+
+    reports = [report for report, _ in outcomes]
+    assignments = [assignment for _, component_assignments in outcomes for assignment in component_assignments]
+    results = _merge_reports(matches, reports, dry_run)
+
+    rejected_ids = set()
+    if not dry_run:
+        apply_start = time.perf_counter()
+        applied = scheduling_manager.apply_assignments(matches, assignments, dry_run=False)
+        # The commit re-checks every placement, so the counts are the commit's; the
+        # components' own errors keep the reasons of the matches they could not place
+        assigned_ids = {assignment["match_id"] for assignment in assignments}
+        rejected = [error for error in applied["errors"] if error["match_id"] in assigned_ids]
+        rejected_ids = {error["match_id"] for error in rejected}
+        results["scheduled"] = applied["scheduled"]
+        results["failed"] = applied["failed"]
+        results["errors"] = results["errors"] + rejected
+        results["scheduling_details"] = applied["scheduling_details"]
+        # Components are dry runs; the commit of their placements is the run's write stage
+        writes = results["profile"]["stages"]["writes"]
+        writes["calls"] += len(assignments)
+        writes["time"] = round(writes["time"] + time.perf_counter() - apply_start, 6)
+        results["profile"]["profiled_time"] = round(
+            sum(entry["time"] for entry in results["profile"]["stages"].values()), 6)
+
+    results["ordering"] = ordering
+    results["seed"] = seed
+    results["assignments"] = assignments
+    results["components"] = []
+    for index, (component, component_seed, report) in enumerate(zip(components, seeds, reports)):
+        rejected_count = sum(1 for match in component if match.id in rejected_ids)
+        results["components"].append(dict(
+            describe_component(component), index=index, seed=component_seed,
+            scheduled=report.get("scheduled", 0) - rejected_count, failed=report.get("failed", 0) + rejected_count,
+            elapsed=report.get("elapsed")))
+    results["decomposition"] = {
+        "components": len(components),
+        "largest_component": len(components[0]) if components else 0,
+        "workers": workers if parallel else 1,
+        "parallel": parallel,
+        "elapsed": round(time.time() - start, 3),
+    }
+    return results
@@ -0,0 +1,232 @@
+"""
+Repair Phase for Auto-Scheduling
+
+After the greedy pass of auto_schedule_matches some matches are left with
+``no_scheduling_options`` or ``no_available_scheduling``.  ScheduleRepairer
+tries to place each of them with a bounded-depth ejection chain:
+
+1. Try to place the failed match directly.
+2. Otherwise, for each candidate (facility, date) of the failed match, eject
+   one already-placed match that blocks it (same facility-day, or one of the
+   teams plays that day), place the failed match there and re-place the
+   ejected match - directly, or recursively by ejecting another match, up to
+   ``max_depth`` links.
+
+Every attempt runs inside a database savepoint, so in dry-run mode the
+in-memory SchedulingState is restored on failure and in execute mode the
+SQLite transaction is rolled back to the savepoint.  Successful chains are
+written to the operations log so the dry-run summary shows each move.
+"""
+
+import logging
+import time
+from datetime import date
+from typing import Any, Dict, List, Optional, Set
+
+from usta import Match, Facility
+from usta_match import MatchScheduling
+from scheduling_options import SchedulingOptions, DateOption
+from season_calendar import calendar_day
+
+logger = logging.getLogger(__name__)
+
+
+class ScheduleRepairer:
+    """Bounded-depth ejection-chain repair for matches the greedy pass could not place"""
+
+    def __init__(self, scheduling_manager, placed_matches: Dict[int, Match],
+                 max_depth: int = 2, time_budget: float = 5.0,
+                 max_candidate_slots: int = 20, max_blockers: int = 4):
+        """
+        Initialize the repairer
+
+        Args:
+            scheduling_manager: SchedulingManager used for options and availability
+            placed_matches: Matches placed in this run, by ID (the only matches that may be moved)
+            max_depth: Maximum number of ejections in one chain
+            time_budget: Seconds available for the whole repair phase
+            max_candidate_slots: Candidate (facility, date) slots tried per match
+            max_blockers: Blocking matches tried per candidate slot
+        """
+        self.scheduling_manager = scheduling_manager
+        self.db = scheduling_manager.db
+        self.placed = placed_matches
+        self.max_depth = max_depth
+        self.time_budget = time_budget
+        self.max_candidate_slots = max_candidate_slots
+        self.max_blockers = max_blockers
+        self._deadline = 0.0
+
+    def _out_of_time(self) -> bool:
+        return time.monotonic() >= self._deadline
+
+    def repair(self, failed_matches: List[Match]) -> Dict[str, Any]:
+        """
+        Try to place every failed match within the time budget
+
+        Args:
+            failed_matches: Unscheduled matches left by the greedy pass
+
+        Returns:
+            Dictionary with attempted/repaired counts, the repaired match IDs,
+            the chains of moves and the elapsed time
+        """
+        start = time.monotonic()
+        self._deadline = start + self.time_budget
+        report = {
+            "attempted": 0,
+            "repaired": 0,
+            "repaired_match_ids": [],
+            "chains": [],
+            "timed_out": False,
+        }
+
+        for match in failed_matches:
+            if self._out_of_time():
+                report["timed_out"] = True
+                break
+            report["attempted"] += 1
+
+            moves = self._place(match, origin=None, depth=self.max_depth, in_chain={match.id})
+            if moves is None:
+                continue
+
+            report["repaired"] += 1
+            report["repaired_match_ids"].append(match.id)
+            report["chains"].append({"match_id": match.id, "moves": moves})
+            self._record_chain(match, moves)
+
+        report["elapsed"] = round(time.monotonic() - start, 3)
+        logger.info(f"Repair phase placed {report['repaired']} of {report['attempted']} failed matches "
+                    f"in {report['elapsed']}s")
+        return report
+
+    def _place(self, match: Match, origin: Optional[MatchScheduling], depth: int,
+               in_chain: Set[int]) -> Optional[List[Dict[str, Any]]]:
+        """
+        Place an unscheduled match, ejecting blockers up to ``depth`` levels deep
+
+        Returns:
+            The list of moves that placed it, or None (with all changes undone)
+        """
+        scheduling = self._best_scheduling(match)
+        if scheduling is not None:
+            self._book(match, scheduling)
+            return [self._move(match, origin, scheduling)]
+
+        if depth <= 0:
+            return None
+
+        for facility, date_obj in self._candidate_slots(match):
+            for blocker in self._blockers(match, facility, date_obj, in_chain):
+                if self._out_of_time():
+                    return None
+
+                savepoint = self.db.create_savepoint()
+                blocker_origin = blocker.scheduling
+
+                self._unbook(blocker)
+                scheduling = self._best_scheduling(match, facility.id, date_obj)
+                if scheduling is not None:
+                    self._book(match, scheduling)
+                    sub_moves = self._place(blocker, blocker_origin, depth - 1,
+                                            in_chain | {match.id, blocker.id})
+                    if sub_moves is not None:
+                        self.db.release_savepoint(savepoint)
+                        return [self._move(match, origin, scheduling)] + sub_moves
+
+                # Undo this attempt: database/state first, then the in-memory objects
+                self.db.rollback_to_savepoint(savepoint)
+                match.unschedule()
+                blocker.assign_scheduling(blocker_origin)
+
+        return None
+
+    def _candidate_slots(self, match: Match) -> List[tuple]:
+        """Preferred (facility, date) slots of a match, best quality first"""
+        slots = []
+        for option in match.get_prioritized_scheduling_options():
+            if option.facility:
+                slots.append((option.facility, option.date))
+            if len(slots) >= self.max_candidate_slots:
+                break
+        return slots
+
+    def _blockers(self, match: Match, facility: Facility, date_obj: date,
+                  in_chain: Set[int]) -> List[Match]:
+        """Placed matches that occupy the facility-day or a team-day the match needs"""
+        team_ids = {match.home_team.id, match.visitor_team.id}
+        team_blockers = []
+        facility_blockers = []
+        for placed in self.placed.values():
+            if placed.id in in_chain or not placed.is_scheduled() or placed.date != date_obj:
+                continue
+            if {placed.home_team.id, placed.visitor_team.id} & team_ids:
+                team_blockers.append(placed)
+            elif placed.facility and placed.facility.id == facility.id:
+                facility_blockers.append(placed)
+
+        # A team conflict can only be cleared by moving that match, so only it is worth trying
+        if team_blockers:
+            return team_blockers[:1] if len(team_blockers) == 1 else []
+        return facility_blockers[:self.max_blockers]
+
+    def _best_scheduling(self, match: Match, facility_id: Optional[int] = None,
+                         date_obj: Optional[date] = None) -> Optional[MatchScheduling]:
+        """Best scheduling for a match, optionally restricted to one facility-day"""
+        options = self.scheduling_manager.get_scheduling_options(match)
+        if facility_id is not None and date_obj is not None:
+            date_option = options.get_date_option(date_obj)
+            facility_option = date_option.get_facility_option(facility_id) if date_option else None
+            if facility_option is None:
+                return None
+            options = SchedulingOptions(match=match)
+            options.add_date_option(DateOption(
+                date=date_obj,
+                day_of_week=calendar_day(date_obj).day_name,
+                facility_options=[facility_option]
+            ))
+
+        scheduling = options.get_best_match_scheduling("same_time")
+        if scheduling is None and match.league.allow_split_lines:
+            scheduling = options.get_best_match_scheduling("split_times")
+        return scheduling
+
+    def _book(self, match: Match, scheduling: MatchScheduling) -> None:
+        match.assign_scheduling(scheduling)
+        self.db.update_match(match)
+
+    def _unbook(self, match: Match) -> None:
+        match.unschedule()
+        self.db.update_match(match)
+
+    @staticmethod
+    def _describe(scheduling: Optional[MatchScheduling]) -> Optional[Dict[str, Any]]:
+        if scheduling is None:
+            return None
+        return {
+            "facility": scheduling.facility.name,
+            "date": scheduling.date.isoformat(),
+            "times": list(scheduling.scheduled_times),
+        }
+
+    def _move(self, match: Match, origin: Optional[MatchScheduling],
+              scheduling: MatchScheduling) -> Dict[str, Any]:
+        return {
+            "match_id": match.id,
+            "from": self._describe(origin),
+            "to": self._describe(scheduling),
+        }
+
+    def _record_chain(self, match: Match, moves: List[Dict[str, Any]]) -> None:
+        """Write each move of a successful chain to the operations log"""
+        for step, move in enumerate(moves, 1):
+            target = move["to"]
+            where = f"{target['date']} at {target['facility']} ({', '.join(target['times'])})"
+            if move["from"] is None:
+                description = f"Repair chain for match {match.id}, step {step}: place match {move['match_id']} on {where}"
+            else:
+                origin = move["from"]
+                description = (f"Repair chain for match {match.id}, step {step}: move match {move['match_id']} "
+                               f"from {origin['date']} at {origin['facility']} to {where}")
+            self.db.record_operation("repair", description, match_id=move["match_id"], chain_for=match.id)
@@ -0,0 +1,282 @@
+"""
+Exact Schedule Solver
+
+For leagues with a few dozen matches a provably optimal schedule is within
+reach.  ExactScheduleSolver turns the schedule model built by
+ScheduleAnnealer (candidate placements per match, court capacity per
+facility-day-time) into an integer program:
+
+- x[m, p] = 1 when match m uses candidate placement p, u[m] = 1 when m stays unscheduled
+- every match is placed once or left unscheduled:  sum_p x[m, p] + u[m] = 1
+- court capacity:  sum of the lines placed at (facility, date, time) <= available courts
+- team-day exclusivity:  each team plays at most one match per date
+- objective:  minimize W * sum u + sum penalty(p) * x[m, p], where the penalty is
+  ``100 - quality score`` and W exceeds any total penalty, so fewer unscheduled
+  matches always wins (the same lexicographic order the annealer uses)
+
+The program is handed to a locally installed solver - OR-Tools CP-SAT or PuLP
+(CBC) - with a time limit.  Neither library is required: when none is
+installed, the time left is too short to run one, the solver fails or it finds
+no solution in time, ``solve`` returns None and the caller falls back to the
+heuristic engine.
+"""
+
+import logging
+import time
+from collections import defaultdict
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+
+from usta import Match
+from schedule_annealer import ScheduleAnnealer, Placement, MAX_QUALITY
+
+logger = logging.getLogger(__name__)
+
+try:
+    from ortools.sat.python import cp_model
+except ImportError:
+    cp_model = None
+
+try:
+    import pulp
+except ImportError:
+    pulp = None
+
+# Backend names accepted by ExactScheduleSolver.solve, in "auto" preference order
+SOLVER_BACKENDS = ("cp_sat", "cbc")
+
+# Seconds below which a solver is not started (CBC fails outright on a ~0 time limit)
+MIN_SOLVER_TIME = 1.0
+
+# Errors of a backend run that mean "no solution" rather than a bug in the caller.
+# OR-Tools reports solver failures as RuntimeError; CBC as PulpSolverError
+# (a missing or crashing cbc binary) or OSError (the binary cannot be started).
+SOLVER_ERRORS: Tuple[type, ...] = (RuntimeError, OSError)
+if pulp is not None:
+    SOLVER_ERRORS += (pulp.PulpSolverError,)
+
+
+def available_backends() -> List[str]:
+    """Exact solver backends whose library is installed"""
+    backends = []
+    if cp_model is not None:
+        backends.append("cp_sat")
+    if pulp is not None:
+        backends.append("cbc")
+    return backends
+
+
+class ExactScheduleSolver:
+    """Integer-programming formulation of the auto-scheduling problem"""
+
+    def __init__(self, db, matches: List[Match], seed: Optional[int] = None):
+        """
+        Build the schedule model
+
+        Args:
+            db: Database used to read facility availability (read-only)
+            matches: Unscheduled matches to schedule
+            seed: Optional seed for the heuristic fallback
+        """
+        self.matches = matches
+        # The annealer owns the model; it also serves as the heuristic fallback
+        self.model = ScheduleAnnealer(db, matches, seed=seed)
+        self.candidates: List[List[Placement]] = self.model.candidates
+        self.capacity = self.model.capacity
+
+        self.unscheduled_weight = 1 + sum(
+            max((p.penalty for p in placements), default=0) for placements in self.candidates
+        )
+
+    def size(self) -> Dict[str, int]:
+        """Number of matches, placement variables and capacity rows"""
+        return {
+            "matches": len(self.matches),
+            "variables": sum(len(placements) for placements in self.candidates) + len(self.matches),
+            "capacity_constraints": len(self.capacity),
+        }
+
+    def _capacity_rows(self) -> Dict[Tuple[int, date, str], List[Tuple[int, int, int]]]:
+        """(facility, date, time) -> [(match index, placement index, courts used)]"""
+        rows = defaultdict(list)
+        for index, placements in enumerate(self.candidates):
+            for option, placement in enumerate(placements):
+                for time_str, count in placement.usage.items():
+                    rows[(placement.facility.id, placement.date, time_str)].append((index, option, count))
+        return rows
+
+    def _team_day_rows(self) -> Dict[Tuple[int, date], List[Tuple[int, int]]]:
+        """(team, date) -> [(match index, placement index)]"""
+        rows = defaultdict(list)
+        for index, (match, placements) in enumerate(zip(self.matches, self.candidates)):
+            for option, placement in enumerate(placements):
+                rows[(match.home_team.id, placement.date)].append((index, option))
+                rows[(match.visitor_team.id, placement.date)].append((index, option))
+        return rows
+
+    def _hint(self) -> Dict[int, int]:
+        """Placement index per match for the solution loaded into the model (warm start)"""
+        hint = {}
+        for index, placement in enumerate(self.model.assignment):
+            if placement is not None:
+                hint[index] = self.candidates[index].index(placement)
+        return hint
+
+    def solve(self, time_limit: float = 30.0, backend: str = "auto") -> Optional[Dict[str, Any]]:
+        """
+        Solve the integer program
+
+        Args:
+            time_limit: Wall-clock seconds the solver may use
+            backend: "auto", "cp_sat" or "cbc"
+
+        Returns:
+            Dictionary with backend, status, runtime, objective, bound, gap, the
+            (unscheduled, penalty) score and best_assignments, or None when no
+            backend is available, time_limit is below MIN_SOLVER_TIME, the
+            backend fails or no feasible solution was found in time
+
+        Raises:
+            ValueError: If the backend name is unknown
+        """
+        if backend != "auto" and backend not in SOLVER_BACKENDS:
+            raise ValueError(f"Unknown solver backend '{backend}'. Valid: auto, {', '.join(SOLVER_BACKENDS)}")
+
+        installed = available_backends()
+        chosen = next((name for name in installed if backend in ("auto", name)), None)
+        if chosen is None:
+            logger.info(f"No exact solver backend available (requested '{backend}', installed: {installed or 'none'})")
+            return None
+
+        if time_limit < MIN_SOLVER_TIME:
+            logger.info(f"Only {time_limit:.2f}s left for the exact solver (minimum {MIN_SOLVER_TIME}s); not starting it")
+            return None
+
+        start = time.monotonic()
+        try:
+            if chosen == "cp_sat":
+                solution = self._solve_cp_sat(time_limit)
+            else:
+                solution = self._solve_cbc(time_limit)
+        except SOLVER_ERRORS as e:
+            logger.warning(f"Exact solver backend '{chosen}' failed: {e}")
+            return None
+        if solution is None:
+            return None
+
+        chosen_options, status, objective, bound = solution
+        runtime = time.monotonic() - start
+        return self._report(chosen, status, runtime, chosen_options, objective, bound)
+
+    def _solve_cp_sat(self, time_limit: float):
+        model = cp_model.CpModel()
+        x = [[model.NewBoolVar(f"x_{i}_{j}") for j in range(len(placements))]
+             for i, placements in enumerate(self.candidates)]
+        u = [model.NewBoolVar(f"u_{i}") for i in range(len(self.matches))]
+
+        for i in range(len(self.matches)):
+            model.Add(sum(x[i]) + u[i] == 1)
+        for key, entries in self._capacity_rows().items():
+            model.Add(sum(count * x[i][j] for i, j, count in entries) <= self.capacity.get(key, 0))
+        for entries in self._team_day_rows().values():
+            if len(entries) > 1:
+                model.Add(sum(x[i][j] for i, j in entries) <= 1)
+
+        model.Minimize(
+            self.unscheduled_weight * sum(u)
+            + sum(p.penalty * x[i][j] for i, placements in enumerate(self.candidates)
+                  for j, p in enumerate(placements))
+        )
+        for i, j in self._hint().items():
+            model.AddHint(x[i][j], 1)
+
+        solver = cp_model.CpSolver()
+        solver.parameters.max_time_in_seconds = float(time_limit)
+        status = solver.Solve(model)
+        if status not in (cp_model.OPTIMAL, cp_model.FEASIBLE):
+            return None
+
+        chosen = {}
+        for i, row in enumerate(x):
+            for j, var in enumerate(row):
+                if solver.Value(var):
+                    chosen[i] = j
+        status_name = "optimal" if status == cp_model.OPTIMAL else "feasible"
+        return chosen, status_name, solver.ObjectiveValue(), solver.BestObjectiveBound()
+
+    def _solve_cbc(self, time_limit: float):
+        problem = pulp.LpProblem("auto_schedule", pulp.LpMinimize)
+        x = [[pulp.LpVariable(f"x_{i}_{j}", cat="Binary") for j in range(len(placements))]
+             for i, placements in enumerate(self.candidates)]
+        u = [pulp.LpVariable(f"u_{i}", cat="Binary") for i in range(len(self.matches))]
+
+        problem += (
+            self.unscheduled_weight * pulp.lpSum(u)
+            + pulp.lpSum(p.penalty * x[i][j] for i, placements in enumerate(self.candidates)
+                         for j, p in enumerate(placements))
+        )
+        for i in range(len(self.matches)):
+            problem += pulp.lpSum(x[i]) + u[i] == 1
+        for key, entries in self._capacity_rows().items():
+            problem += pulp.lpSum(count * x[i][j] for i, j, count in entries) <= self.capacity.get(key, 0)
+        for entries in self._team_day_rows().values():
+            if len(entries) > 1:
+                problem += pulp.lpSum(x[i][j] for i, j in entries) <= 1
+
+        hint = self._hint()
+        for i, row in enumerate(x):
+            for j, var in enumerate(row):
+                var.setInitialValue(1 if hint.get(i) == j else 0)
+        for i, var in enumerate(u):
+            var.setInitialValue(0 if i in hint else 1)
+
+        solver = pulp.PULP_CBC_CMD(msg=False, timeLimit=time_limit, warmStart=bool(hint))
+        problem.solve(solver)
+        # sol_status: 1 optimal, 2 feasible (stopped by the time limit)
+        if problem.sol_status not in (pulp.LpSolutionOptimal, pulp.LpSolutionIntegerFeasible):
+            return None
+
+        chosen = {}
+        for i, row in enumerate(x):
+            for j, var in enumerate(row):
+                if (var.value() or 0) > 0.5:
+                    chosen[i] = j
+        objective = pulp.value(problem.objective)
+        if problem.sol_status == pulp.LpSolutionOptimal:
+            return chosen, "optimal", objective, objective
+        # CBC's command-line interface does not return the best bound
+        return chosen, "feasible", objective, None
+
+    def _report(self, backend: str, status: str, runtime: float, chosen: Dict[int, int],
+                objective: float, bound: Optional[float]) -> Dict[str, Any]:
+        placements = {i: self.candidates[i][j] for i, j in chosen.items()}
+        unscheduled = len(self.matches) - len(placements)
+        penalty = sum(p.penalty for p in placements.values())
+        scheduled = len(placements)
+
+        gap = None
+        if bound is not None and objective:
+            gap = round(max(0.0, (objective - bound) / abs(objective)), 6)
+        elif bound is not None:
+            gap = 0.0
+
+        return {
+            "backend": backend,
+            "status": status,
+            "runtime": round(runtime, 3),
+            "objective": objective,
+            "bound": bound,
+            "gap": gap,
+            "best_unscheduled_count": unscheduled,
+            "best_total_penalty": penalty,
+            "best_quality_score": (MAX_QUALITY * scheduled - penalty) / scheduled if scheduled else 0,
+            "best_assignments": [
+                {
+                    "match_id": self.matches[i].id,
+                    "facility_id": placement.facility.id,
+                    "date": placement.date.isoformat(),
+                    "times": list(placement.times),
+                }
+                for i, placement in sorted(placements.items())
+            ],
+        }
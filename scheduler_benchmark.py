@@ -0,0 +1,673 @@
+"""
+Scheduler Benchmark Suite
+
+Times the operations that dominate scheduling at scale on synthetic seasons
+(see season_generator) of 1x, 10x and 100x the default size:
+
+- list_matches (all matches)
+- get_facility_availability over the whole season for sampled facilities
+- get_scheduling_options for sampled unscheduled matches
+- auto_schedule_matches (dry run) of the holdout leagues
+- optimize_auto_schedule (seeds mode) of one holdout league
+- facility_statistics for sampled facilities
+- the calendar and utilization endpoints through the Flask test client
+
+Datasets are generated once per scale and spec and kept in a data directory.
+Every league except the HOLDOUT_LEAGUES first ones is scheduled when the
+dataset is built, so reads see a populated season and the scheduling
+operations always work on the same number of matches: their timings across
+scales show how cost grows with the size of the database, not with the size
+of the request.
+
+Results are written as JSON (with the git commit they were measured at) so
+that runs can be compared between commits.
+
+The regression gate (``run_gate``, used by ``simple_cli bench``) measures a
+fixed set of workloads on any database, with the SQL statement count and
+peak memory next to the wall time, and ``compare_with_baseline`` reports
+the metrics that grew past a threshold since a saved baseline.
+
+``measure_match_model`` measures construction time, memory and to_dict
+time of the Match class itself at 50k matches (``--match-model``).
+
+Usage:
+    python scheduler_benchmark.py --scales 1,10 --output bench.json
+    python scheduler_benchmark.py --match-model 50000 --data-dir benchmark_data
+"""
+
+import hashlib
+import json
+import logging
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import time
+import tracemalloc
+from datetime import date, datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+import availability_cache
+import stats_cache
+from logging_setup import configure_logging
+from season_generator import (FACILITY_ID_BASE, SeasonSpec, build_season_database, generate_season,
+                              write_season_yaml)
+
+logger = logging.getLogger(__name__)
+
+BENCHMARK_VERSION = 1
+DEFAULT_SCALES = (1, 10, 100)
+DEFAULT_DATA_DIR = "benchmark_data"
+
+# Leagues left unscheduled when a dataset is built (the scheduling benchmarks work on them)
+HOLDOUT_LEAGUES = 2
+
+# Seed of the scheduling done while building a dataset and of the timed scheduling runs
+SCHEDULE_SEED = 1
+
+
+def time_operation(operation: Callable[[], Any], repeats: int = 3,
+                   setup: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """
+    Run an operation several times and summarize its wall-clock time
+
+    Args:
+        operation: Callable to time; if it returns a sized result its length is reported
+        repeats: Number of timed runs
+        setup: Optional untimed callable run before each run
+
+    Returns:
+        Dictionary with runs, min, median and max seconds and the result size of the last run
+    """
+    timings = []
+    result = None
+    for _ in range(max(1, repeats)):
+        if setup:
+            setup()
+        started = time.perf_counter()
+        result = operation()
+        timings.append(time.perf_counter() - started)
+    summary = {
+        "runs": len(timings),
+        "min": round(min(timings), 6),
+        "median": round(statistics.median(timings), 6),
+        "max": round(max(timings), 6),
+    }
+    if isinstance(result, int) and not isinstance(result, bool):
+        summary["items"] = result
+    elif hasattr(result, "__len__"):
+        summary["items"] = len(result)
+    return summary
+
+
+def _git_commit() -> Optional[str]:
+    """Commit of the working tree, or None outside a git checkout"""
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def _spec_key(spec: SeasonSpec) -> str:
+    return hashlib.sha1(json.dumps(spec.to_dict(), sort_keys=True).encode()).hexdigest()[:10]
+
+
+# ========== Datasets ==========
+
+def prepare_dataset(scale: int, data_dir: str = DEFAULT_DATA_DIR,
+                    spec: Optional[SeasonSpec] = None) -> Dict[str, Any]:
+    """
+    Generate (or reuse) the season database of one scale
+
+    Args:
+        scale: Scale factor applied to the spec
+        data_dir: Directory the YAML and database files are kept in
+        spec: 1x season spec (default: SeasonSpec())
+
+    Returns:
+        Dictionary with the database path, entity counts and build time
+        (build time is None when the dataset was reused)
+
+    Raises:
+        RuntimeError: If the dataset cannot be generated or scheduled
+    """
+    from sqlite_tennis_db import SQLiteTennisDB
+    from usta import MatchType
+
+    spec = (spec or SeasonSpec()).scaled(scale)
+    base = os.path.join(data_dir, f"season_{scale}x_{_spec_key(spec)}")
+    db_path, meta_path = f"{base}.db", f"{base}.json"
+    if os.path.exists(db_path) and os.path.exists(meta_path):
+        with open(meta_path) as f:
+            return dict(json.load(f), db_path=db_path, build_seconds=None)
+
+    os.makedirs(data_dir, exist_ok=True)
+    for path in (db_path, meta_path):
+        if os.path.exists(path):
+            os.remove(path)
+
+    started = time.perf_counter()
+    season = generate_season(spec)
+    write_season_yaml(season, f"{base}.yaml")
+    build_season_database(f"{base}.yaml", db_path)
+
+    holdout = sorted(league["id"] for league in season["leagues"])[:HOLDOUT_LEAGUES]
+    db = SQLiteTennisDB({"db_path": db_path})
+    db.connect()
+    try:
+        to_schedule = [match for match in db.list_matches(match_type=MatchType.UNSCHEDULED)
+                       if match.league.id not in holdout]
+        results = db.scheduling_manager.auto_schedule_components(to_schedule, dry_run=False,
+                                                                 seed=SCHEDULE_SEED, max_workers=1)
+        if results.get("error"):
+            raise RuntimeError(f"Scheduling the {scale}x dataset failed: {results['error']}")
+    finally:
+        db.disconnect()
+
+    meta = {
+        "scale": scale,
+        "spec": spec.to_dict(),
+        "leagues": len(season["leagues"]),
+        "teams": len(season["teams"]),
+        "facilities": len(season["facilities"]),
+        "matches": len(season["matches"]),
+        "scheduled": results.get("scheduled", 0),
+        "holdout_league_ids": holdout,
+    }
+    with open(meta_path, "w") as f:
+        json.dump(meta, f, indent=2)
+    return dict(meta, db_path=db_path, build_seconds=round(time.perf_counter() - started, 3))
+
+
+# ========== Benchmarks ==========
+
+def _season_dates(start: date, end: date) -> List[date]:
+    return [start + timedelta(days=offset) for offset in range((end - start).days + 1)]
+
+
+def _checked(result: Dict[str, Any]) -> Dict[str, Any]:
+    """Raise the error a scheduling result reports instead of timing a failure"""
+    if result.get("error"):
+        raise RuntimeError(f"Benchmark run failed: {result['error']}")
+    return result
+
+
+def benchmark_database(dataset: Dict[str, Any], repeats: int = 3, sample_size: int = 5,
+                       optimize_iterations: int = 2) -> Dict[str, Dict[str, Any]]:
+    """
+    Time the database and scheduling operations on a prepared dataset
+
+    Args:
+        dataset: Result of prepare_dataset
+        repeats: Timed runs per operation (scheduling runs are timed once)
+        sample_size: Facilities and matches sampled for the per-entity operations
+        optimize_iterations: Seeds tried by optimize_auto_schedule
+
+    Returns:
+        Timing summaries by operation name
+    """
+    from sqlite_tennis_db import SQLiteTennisDB
+    from usta import MatchType
+
+    spec = dataset["spec"]
+    start = date.fromisoformat(spec["start_date"])
+    dates = _season_dates(start, start + timedelta(weeks=spec["weeks"]) - timedelta(days=1))
+    rng = random.Random(SCHEDULE_SEED)
+
+    db = SQLiteTennisDB({"db_path": dataset["db_path"]})
+    db.connect()
+    try:
+        facilities = sorted(db.list_facilities(), key=lambda facility: facility.id)
+        sampled_facilities = rng.sample(facilities, min(sample_size, len(facilities)))
+        holdout = [db.get_league(league_id) for league_id in dataset["holdout_league_ids"]]
+        holdout_matches = [match for league in holdout
+                           for match in db.list_matches(league=league, match_type=MatchType.UNSCHEDULED)]
+        sampled_matches = rng.sample(holdout_matches, min(sample_size, len(holdout_matches)))
+        manager = db.scheduling_manager
+
+        operations = {
+            "list_matches": lambda: db.list_matches(match_type=MatchType.ALL),
+            "get_facility_availability": lambda: sum(
+                len(db.get_facility_availability(facility=facility, dates=dates, max_days=len(dates)))
+                for facility in sampled_facilities),
+            "get_scheduling_options": lambda: [manager.get_scheduling_options(match)
+                                               for match in sampled_matches],
+            "facility_statistics": lambda: [db.facility_manager.facility_statistics(facility)
+                                            for facility in sampled_facilities],
+        }
+        # Every run starts from an empty availability cache, so reads are timed against the database
+        results = {name: time_operation(operation, repeats, setup=availability_cache.invalidate)
+                   for name, operation in operations.items()}
+
+        results["auto_schedule_matches"] = time_operation(
+            lambda: _checked(manager.auto_schedule_matches(holdout_matches, dry_run=True,
+                                                           seed=SCHEDULE_SEED))["scheduled"], 1)
+        # The dry run leaves its placements on the Match objects; optimize fresh copies
+        optimize_matches = db.list_matches(league=holdout[0], match_type=MatchType.UNSCHEDULED)
+        results["optimize_auto_schedule"] = time_operation(
+            lambda: _checked(manager.optimize_auto_schedule(optimize_matches, max_iterations=optimize_iterations,
+                                                            seed=SCHEDULE_SEED))["best_assignments"], 1)
+    finally:
+        db.disconnect()
+    return results
+
+
+def benchmark_web(dataset: Dict[str, Any], repeats: int = 3, sample_size: int = 5) -> Dict[str, Dict[str, Any]]:
+    """
+    Time the calendar and utilization endpoints through the Flask test client
+
+    Args:
+        dataset: Result of prepare_dataset
+        repeats: Timed runs per endpoint
+        sample_size: Facilities whose utilization is requested
+
+    Returns:
+        Timing summaries by endpoint name (empty if Flask is not installed)
+
+    Raises:
+        RuntimeError: If an endpoint does not answer with HTTP 200
+    """
+    try:
+        import web_app
+        from web_database import init_db
+    except ImportError as e:
+        logger.warning(f"Skipping web benchmarks: {e}")
+        return {}
+    from sqlite_tennis_db import SQLiteTennisDB
+
+    if not init_db(SQLiteTennisDB, db_path=dataset["db_path"]):
+        raise RuntimeError(f"Could not open {dataset['db_path']} for the web benchmarks")
+    client = web_app.app.test_client()
+
+    spec = dataset["spec"]
+    start = date.fromisoformat(spec["start_date"])
+    end = start + timedelta(weeks=spec["weeks"]) - timedelta(days=1)
+    facility_ids = list(range(FACILITY_ID_BASE, FACILITY_ID_BASE + dataset["facilities"]))
+    sampled = random.Random(SCHEDULE_SEED).sample(facility_ids, min(sample_size, len(facility_ids)))
+
+    endpoints = {
+        "calendar_data": [f"/api/calendar-data?month={start.month}&year={start.year}"],
+        "matches_calendar_view": [f"/matches?view_type=calendar&month={start.month}&year={start.year}"],
+        "facility_utilization": [
+            f"/api/facilities/{facility_id}/utilization?start_date={start.isoformat()}&end_date={end.isoformat()}"
+            for facility_id in sampled],
+        "facility_utilization_monthly": [
+            f"/api/facilities/{facility_id}/utilization/monthly?year={start.year}&month={start.month}"
+            for facility_id in sampled],
+    }
+
+    def request_all(urls: Sequence[str]) -> int:
+        for url in urls:
+            response = client.get(url)
+            if response.status_code != 200:
+                raise RuntimeError(f"{url} answered HTTP {response.status_code}")
+        return len(urls)
+
+    return {name: time_operation(lambda urls=urls: request_all(urls), repeats, setup=availability_cache.invalidate)
+            for name, urls in endpoints.items()}
+
+
+def run_benchmarks(scales: Sequence[int] = DEFAULT_SCALES, data_dir: str = DEFAULT_DATA_DIR,
+                   repeats: int = 3, sample_size: int = 5, include_web: bool = True,
+                   spec: Optional[SeasonSpec] = None) -> Dict[str, Any]:
+    """
+    Run the whole suite
+
+    Args:
+        scales: Scale factors to benchmark
+        data_dir: Directory for the generated datasets
+        repeats: Timed runs per read operation
+        sample_size: Facilities and matches sampled per operation
+        include_web: Also time the web endpoints
+        spec: 1x season spec (default: SeasonSpec())
+
+    Returns:
+        JSON-serializable results with run metadata and per-scale timings
+    """
+    report: Dict[str, Any] = {
+        "version": BENCHMARK_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "repeats": repeats,
+        "sample_size": sample_size,
+        "scales": {},
+    }
+    for scale in scales:
+        logger.info(f"Benchmarking {scale}x")
+        dataset = prepare_dataset(scale, data_dir, spec)
+        operations = benchmark_database(dataset, repeats, sample_size)
+        if include_web:
+            operations.update({f"web_{name}": timing
+                               for name, timing in benchmark_web(dataset, repeats, sample_size).items()})
+        report["scales"][str(scale)] = {
+            "dataset": {key: value for key, value in dataset.items() if key not in ("spec", "db_path")},
+            "operations": operations,
+        }
+    return report
+
+
+def write_report(report: Dict[str, Any], path: str) -> None:
+    """Write benchmark results as JSON"""
+    with open(path, "w") as f:
+        json.dump(report, f, indent=2)
+
+
+def format_report(report: Dict[str, Any]) -> str:
+    """Median seconds per operation and scale as a text table"""
+    scales = list(report["scales"])
+    names = sorted({name for data in report["scales"].values() for name in data["operations"]})
+    lines = [f"{'operation':<34}" + "".join(f"{scale + 'x':>12}" for scale in scales)]
+    for name in names:
+        cells = []
+        for scale in scales:
+            timing = report["scales"][scale]["operations"].get(name)
+            cells.append(f"{timing['median']:>12.4f}" if timing else f"{'-':>12}")
+        lines.append(f"{name:<34}" + "".join(cells))
+    return "\n".join(lines)
+
+
+# ========== Match representation ==========
+
+# Matches built by measure_match_model
+DEFAULT_MATCH_COUNT = 50000
+
+
+def measure_match_model(db, count: int = DEFAULT_MATCH_COUNT, repeats: int = 3) -> Dict[str, Any]:
+    """
+    Construction time, memory and to_dict time of ``count`` Match objects
+
+    Every other match is scheduled (one MatchScheduling each) like a season in
+    progress; ``match_bytes`` counts the Match objects alone.
+
+    Args:
+        db: Connected database with at least one league, two teams and a facility
+        count: Number of matches to build
+        repeats: Timed constructions (the fastest is reported)
+
+    Returns:
+        Dictionary with count, construct_seconds, bytes_per_match (all
+        allocations), match_bytes (per Match object) and to_dict_seconds
+
+    Raises:
+        ValueError: If the database has no league with two teams and a facility
+    """
+    from usta import Match
+    from usta_match import MatchScheduling
+
+    league = next((league for league in db.list_leagues() if len(db.list_teams(league=league)) >= 2), None)
+    facilities = db.list_facilities()
+    if league is None or not facilities:
+        raise ValueError("The database needs a league with two teams and a facility")
+    home, visitor = db.list_teams(league=league)[:2]
+    play_date = league.start_date or date.today()
+
+    def build() -> List[Any]:
+        return [Match(id=index + 1, round=1, num_rounds=1, league=league, home_team=home, visitor_team=visitor,
+                      scheduling=MatchScheduling(facility=facilities[0], date=play_date,
+                                                 scheduled_times=["18:00"]) if index % 2 else None)
+                for index in range(count)]
+
+    construct = time_operation(build, repeats=repeats)
+    tracemalloc.start()
+    matches = build()
+    allocated = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    match = matches[0]
+    match_bytes = sys.getsizeof(match) + (sys.getsizeof(match.__dict__) if hasattr(match, "__dict__") else 0)
+    started = time.perf_counter()
+    for match in matches:
+        match.to_dict()
+    return {
+        "count": count,
+        "construct_seconds": construct["min"],
+        "bytes_per_match": round(allocated / count),
+        "match_bytes": match_bytes,
+        "to_dict_seconds": round(time.perf_counter() - started, 6),
+    }
+
+
+# ========== Regression gate ==========
+
+GATE_VERSION = 1
+
+# Relative increase of a metric over its baseline that counts as a regression
+DEFAULT_THRESHOLD = 0.2
+
+# Absolute increases below these are noise and never count as a regression
+MIN_DELTAS = {"seconds": 0.01, "queries": 0, "peak_memory": 256 * 1024}
+
+GATE_METRICS = ("seconds", "queries", "peak_memory")
+
+
+def measure_workload(db, operation: Callable[[], Any], repeats: int = 3,
+                     setup: Optional[Callable[[], None]] = None) -> Dict[str, Any]:
+    """
+    Time an operation and measure the SQL statements and peak memory of one more run
+
+    The extra run is traced with tracemalloc, which slows it down, so it is
+    not part of the timing.
+
+    Args:
+        db: Database the operation works on (its query_stats are read if present)
+        operation: Callable to measure
+        repeats: Timed runs
+        setup: Optional untimed callable run before every run
+
+    Returns:
+        time_operation summary plus ``seconds`` (median), ``queries`` and
+        ``peak_memory`` (bytes allocated by Python at the peak of the run)
+    """
+    summary = time_operation(operation, repeats, setup)
+    if setup:
+        setup()
+    stats = getattr(db, "query_stats", None)
+    if stats is not None:
+        stats.reset()
+    tracemalloc.start()
+    try:
+        operation()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    summary["seconds"] = summary["median"]
+    summary["queries"] = stats.count if stats is not None else None
+    summary["peak_memory"] = peak
+    return summary
+
+
+def _season_span(db) -> Tuple[date, date]:
+    """First and last day of the leagues' seasons (12 weeks from today if no league has dates)"""
+    leagues = db.list_leagues()
+    starts = [league.start_date for league in leagues if league.start_date]
+    ends = [league.end_date for league in leagues if league.end_date]
+    start = min(starts) if starts else date.today()
+    end = max(ends) if ends else start + timedelta(weeks=12) - timedelta(days=1)
+    return start, max(start, end)
+
+
+def run_gate(db, repeats: int = 3) -> Dict[str, Any]:
+    """
+    Measure the fixed regression gate workloads on a database
+
+    Workloads:
+    - hydrate_matches: every match as a Match object
+    - facility_availability: every facility on every day of the season
+    - auto_schedule_dry_run: auto_schedule_matches of all unscheduled matches
+      (fetched fresh each run), dry run with SCHEDULE_SEED
+    - facility_statistics: every facility
+    - calendar_month: the matches calendar of the season's first month
+
+    Args:
+        db: Connected database
+        repeats: Timed runs per workload (the scheduling run is timed once)
+
+    Returns:
+        JSON-serializable report with run metadata and a summary per workload
+        (see measure_workload)
+    """
+    from usta import MatchType
+    from web_matches_calendar import create_calendar_context
+
+    start, end = _season_span(db)
+    dates = _season_dates(start, end)
+    facilities = sorted(db.list_facilities(), key=lambda facility: facility.id)
+    manager = db.scheduling_manager
+
+    def reset_caches() -> None:
+        availability_cache.invalidate()
+        stats_cache.invalidate()
+
+    workloads = {
+        "hydrate_matches": (lambda: db.list_matches(match_type=MatchType.ALL), repeats),
+        "facility_availability": (lambda: sum(
+            len(db.get_facility_availability(facility=facility, dates=dates, max_days=len(dates)))
+            for facility in facilities), repeats),
+        "auto_schedule_dry_run": (lambda: _checked(manager.auto_schedule_matches(
+            db.list_matches(match_type=MatchType.UNSCHEDULED), dry_run=True, seed=SCHEDULE_SEED))["scheduled"], 1),
+        "facility_statistics": (lambda: [db.facility_manager.facility_statistics(facility)
+                                         for facility in facilities], repeats),
+        "calendar_month": (lambda: len(create_calendar_context(db, start.month, start.year)["calendar_weeks"]),
+                           repeats),
+    }
+    report: Dict[str, Any] = {
+        "version": GATE_VERSION,
+        "created_at": datetime.now().isoformat(timespec="seconds"),
+        "git_commit": _git_commit(),
+        "python": platform.python_version(),
+        "repeats": repeats,
+        "season": {"start": start.isoformat(), "end": end.isoformat()},
+        "workloads": {},
+    }
+    # The dry run's operation listing would be timed along with it
+    dry_run_summary = getattr(db, "dry_run_summary", None)
+    if dry_run_summary is not None:
+        db.dry_run_summary = False
+    try:
+        for name, (operation, runs) in workloads.items():
+            logger.debug(f"Measuring {name}")
+            report["workloads"][name] = measure_workload(db, operation, runs, setup=reset_caches)
+    finally:
+        if dry_run_summary is not None:
+            db.dry_run_summary = dry_run_summary
+    return report
+
+
+def load_baseline(path: str) -> Dict[str, Any]:
+    """
+    Read a gate report saved as baseline
+
+    Raises:
+        ValueError: If the file is missing, not JSON or not a gate report
+    """
+    try:
+        with open(path) as f:
+            baseline = json.load(f)
+    except (OSError, json.JSONDecodeError) as e:
+        raise ValueError(f"Cannot read baseline {path}: {e}")
+    if not isinstance(baseline, dict) or baseline.get("version") != GATE_VERSION or "workloads" not in baseline:
+        raise ValueError(f"{path} is not a version {GATE_VERSION} benchmark baseline")
+    return baseline
+
+
+def compare_with_baseline(report: Dict[str, Any], baseline: Dict[str, Any],
+                          threshold: float = DEFAULT_THRESHOLD) -> List[Dict[str, Any]]:
+    """
+    Metrics that grew past the threshold
+
+    Args:
+        report: Result of run_gate
+        baseline: Earlier run_gate result
+        threshold: Allowed relative increase (0.2 = 20%)
+
+    Returns:
+        One dictionary per regression with workload, metric, baseline,
+        current and change (relative increase)
+    """
+    regressions = []
+    for name, current in report["workloads"].items():
+        previous = baseline["workloads"].get(name)
+        if not previous:
+            continue
+        for metric in GATE_METRICS:
+            old, new = previous.get(metric), current.get(metric)
+            if old is None or new is None or new - old <= MIN_DELTAS[metric]:
+                continue
+            change = (new - old) / old if old else float("inf")
+            if change > threshold:
+                regressions.append({"workload": name, "metric": metric, "baseline": old,
+                                    "current": new, "change": change})
+    return regressions
+
+
+def _change(current: Optional[float], previous: Optional[float]) -> str:
+    if current is None or previous is None:
+        return "-"
+    if not previous:
+        return "new" if current else "0%"
+    return f"{(current - previous) / previous * 100:+.0f}%"
+
+
+def format_gate(report: Dict[str, Any], baseline: Optional[Dict[str, Any]] = None) -> str:
+    """Seconds, statements and peak memory per workload, with the change against a baseline"""
+    lines = [f"{'workload':<24}{'seconds':>10}{'queries':>10}{'peak MB':>10}"
+             + (f"{'seconds':>10}{'queries':>10}{'memory':>10}" if baseline else "")]
+    for name, current in report["workloads"].items():
+        queries = current.get("queries")
+        line = (f"{name:<24}{current['seconds']:>10.3f}{queries if queries is not None else '-':>10}"
+                f"{current['peak_memory'] / 2**20:>10.1f}")
+        if baseline:
+            previous = baseline["workloads"].get(name, {})
+            line += "".join(f"{_change(current.get(metric), previous.get(metric)):>10}" for metric in GATE_METRICS)
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def main() -> int:
+    """Command-line interface: run the suite and write the results as JSON"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Benchmark the scheduler on synthetic seasons")
+    parser.add_argument("--scales", default=",".join(str(scale) for scale in DEFAULT_SCALES),
+                        help="Comma-separated scale factors (default: 1,10,100)")
+    parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR, help="Directory for generated datasets")
+    parser.add_argument("--repeats", type=int, default=3, help="Timed runs per read operation")
+    parser.add_argument("--sample-size", type=int, default=5, help="Facilities/matches sampled per operation")
+    parser.add_argument("--seed", type=int, default=1, help="Season generation seed")
+    parser.add_argument("--no-web", action="store_true", help="Skip the web endpoint benchmarks")
+    parser.add_argument("--output", default="benchmark_results.json", help="JSON file to write")
+    parser.add_argument("--match-model", nargs="?", type=int, const=DEFAULT_MATCH_COUNT, metavar="COUNT",
+                        help="Only measure building COUNT Match objects on the 1x dataset "
+                             f"(default COUNT: {DEFAULT_MATCH_COUNT})")
+    args = parser.parse_args()
+
+    configure_logging(level=logging.WARNING)
+    logger.setLevel(logging.INFO)
+    if args.match_model:
+        from sqlite_tennis_db import SQLiteTennisDB
+        dataset = prepare_dataset(1, args.data_dir, SeasonSpec(seed=args.seed))
+        db = SQLiteTennisDB({"db_path": dataset["db_path"]})
+        try:
+            print(json.dumps(measure_match_model(db, args.match_model, args.repeats), indent=2))
+        finally:
+            db.disconnect()
+        return 0
+    try:
+        scales = [int(scale) for scale in args.scales.split(",") if scale.strip()]
+        report = run_benchmarks(scales, args.data_dir, args.repeats, args.sample_size,
+                                include_web=not args.no_web, spec=SeasonSpec(seed=args.seed))
+        write_report(report, args.output)
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}", file=sys.stderr)
+        return 1
+    print(format_report(report))
+    print(f"Results written to {args.output}")
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
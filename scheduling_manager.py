@@ -8,14 +8,35 @@ This is a generic implementation that uses TennisDBInterface for database access
 making it backend-agnostic and easily testable.
 """
 
-from typing import List, Optional, Dict, Any
+import heapq
+import logging
+from contextlib import contextmanager, nullcontext
+from typing import List, Optional, Dict, Any, Tuple
 from datetime import date
 
 from usta import Match, League, Facility
 from usta_match import MatchScheduling
 from scheduling_options import SchedulingOptions, DateOption, FacilityOption, TimeSlotInfo
+from season_calendar import calendar_day
+from scheduling_options_cache import SchedulingOptionsCache
+from schedule_repair import ScheduleRepairer
+from schedule_annealer import ScheduleAnnealer, MAX_QUALITY
+from schedule_checkpoint import (CheckpointWriter, ScheduleCheckpoint, DEFAULT_CHECKPOINT_INTERVAL,
+                                 assignments_from_matches, load_checkpoint)
+from schedule_solver import ExactScheduleSolver, available_backends
+from schedule_decomposition import schedule_components
+from scheduling_profile import StageProfiler, merge_profiles
+import metrics
 from tennis_db_interface import TennisDBInterface
 
+logger = logging.getLogger(__name__)
+
+# Match ordering modes for auto-scheduling:
+#   best_option       - best current option first (seeded shuffle breaks ties)
+#   most_constrained  - smallest feasible domain first, deterministic (seed is ignored)
+#   random            - seeded shuffle order only
+ORDERINGS = ("best_option", "most_constrained", "random")
+
 
 class SchedulingManager:
     """Generic scheduling manager that uses TennisDBInterface for database operations"""
@@ -28,6 +49,13 @@ class SchedulingManager:
             db: TennisDBInterface implementation for database operations
         """
         self.db = db
+        self.profiler: Optional[StageProfiler] = None  # Set while auto_schedule_matches runs
+
+    def _stage(self, name: str, match_id: Optional[int] = None):
+        """Time a block as a scheduling stage when a run is being profiled (see scheduling_profile)"""
+        if self.profiler is None:
+            return nullcontext()
+        return self.profiler.stage(name, match_id)
 
     def get_scheduling_options(self, match: Match,
                                     max_dates: int = 365,
@@ -56,7 +84,8 @@ class SchedulingManager:
                 raise NotImplementedError("Filtering league and team preferences is not implemented")
 
             # Get preferred scheduling options (dates, facility, priority) based on team and league preferences
-            prioritized_match_scheduling = match.get_prioritized_scheduling_options()
+            with self._stage("candidate_generation", match.id):
+                prioritized_match_scheduling = match.get_prioritized_scheduling_options()
             if not prioritized_match_scheduling:
                 # Return empty SchedulingOptions if no dates found
                 return SchedulingOptions(match=match)
@@ -68,100 +97,54 @@ class SchedulingManager:
 
             # Filter out dates where either team has conflicts
             if not ignore_conflicts:
-                dates = self.filter_team_conflicts(match, dates)
+                with self._stage("team_conflicts", match.id):
+                    dates = self.filter_team_conflicts(match, dates)
                 if not dates:
                     # If no valid dates after filtering, return empty SchedulingOptions
                     return SchedulingOptions(match=match)
 
-            # extract the facilities from the match scheduling options
-            facilities = [option.facility for option in prioritized_match_scheduling if option.facility]
+            # extract the distinct facilities from the match scheduling options
+            facilities = list({option.facility.id: option.facility
+                               for option in prioritized_match_scheduling if option.facility}.values())
 
             # get facilities availability for the range of dates
             if not facilities:
                 raise ValueError("No facilities available for match scheduling")
 
             # Get availability information for each facility
-            # This will return a dictionary of facility ID to availability info
+            # This will return a dictionary of facility ID to {date: availability info}
             filter_availability_info = {}
-            for facility in facilities:
-                availability = self.db.get_facility_availability(
-                    facility=facility,
-                    dates=dates
-                )
-                filter_availability_info[facility.id] = availability
-
-            filtered_availability = []
-
-            for option in prioritized_match_scheduling:
-                # get the list for this facility
-                facility_availability_list = filter_availability_info.get(option.facility.id, [])
+            with self._stage("availability", match.id):
+                for facility in facilities:
+                    availability = self.db.get_facility_availability(
+                        facility=facility,
+                        dates=dates
+                    )
+                    filter_availability_info[facility.id] = {info.date: info for info in availability}
 
-                # get the facility_info for this date
-                facility_info = next((info for info in facility_availability_list if info.date == option.date), None)
+            with self._stage("options_construction", match.id):
+                # Group the options that the facility can accommodate by date
+                from collections import defaultdict
+                date_groups = defaultdict(list)
 
-                if not facility_info:
-                    # If no availability info for this date, skip this option
-                    continue
+                for option in prioritized_match_scheduling:
+                    # get the facility_info for this facility and date
+                    facility_info = filter_availability_info.get(option.facility.id, {}).get(option.date)
 
-                can_accommodate, _ = facility_info.can_accommodate_match(match) 
-                if not can_accommodate:
-                    continue  # Skip this facility if it can't accommodate the match
+                    if not facility_info:
+                        # If no availability info for this date, skip this option
+                        continue
 
-                # If it can accommodate, add the option to the filtered list
-                option.scheduled_times = facility_info.get_available_times(match.league.num_lines_per_match)
-                filtered_availability.append(option)
+                    facility_option = self.build_facility_option(match, option.date, option.facility, facility_info)
+                    if facility_option:
+                        date_groups[option.date].append(facility_option)
 
-            # Create and return SchedulingOptions by building DateOptions from the filtered availability
-            scheduling_options = SchedulingOptions(match=match)
-            
-            # Group filtered options by date to create DateOption objects
-            from collections import defaultdict
-            date_groups = defaultdict(list)
-            
-            for option in filtered_availability:
-                date_groups[option.date].append(option)
-            
-            # Create DateOption objects for each date with multiple facilities
-            for date_obj, options_for_date in date_groups.items():
-                day_of_week = date_obj.strftime("%A")
-                
-                # Create FacilityOption objects for each facility on this date
-                facility_options = []
-                for option in options_for_date:
-                    # Get facility availability info for quality scoring and time slots
-                    facility_availability_list = filter_availability_info.get(option.facility.id, [])
-                    facility_info = next((info for info in facility_availability_list if info.date == option.date), None)
-                    
-                    if facility_info:
-                        # Convert time slots
-                        time_slots = []
-                        for slot in facility_info.time_slots:
-                            time_slot = TimeSlotInfo(
-                                time=slot.time,
-                                total_courts=slot.total_courts,
-                                available_courts=slot.available_courts,
-                                used_courts=slot.used_courts
-                            )
-                            time_slots.append(time_slot)
-                        
-                        # Calculate quality score for this facility on this date
-                        quality_score, conflicts = match.calculate_quality_score(option.date) if match else (0, [])
-                        
-                        facility_option = FacilityOption(
-                            facility_id=option.facility.id,
-                            facility_name=option.facility.name,
-                            time_slots=time_slots,
-                            quality_score=quality_score,
-                            conflicts=conflicts if isinstance(conflicts, list) else [],
-                            facility=option.facility
-                        )
-                        facility_options.append(facility_option)
-                
-                # Create DateOption with all facility options for this date
-                if facility_options:
+                # Create DateOption objects for each date with multiple facilities
+                scheduling_options = SchedulingOptions(match=match)
+                for date_obj, facility_options in date_groups.items():
                     date_option = DateOption(
                         date=date_obj,
-                        day_of_week=day_of_week,
+                        day_of_week=calendar_day(date_obj).day_name,
                         facility_options=facility_options
                     )
                     scheduling_options.add_date_option(date_option)
@@ -172,6 +155,46 @@ class SchedulingManager:
             raise RuntimeError(f"Error getting scheduling options: {e}")
         
 
+    def build_facility_option(self, match: Match, option_date: date, facility: Facility,
+                              facility_info: 'FacilityAvailabilityInfo') -> Optional[FacilityOption]:
+        """
+        Build the FacilityOption for a match at one facility on one date
+
+        Args:
+            match: Match being scheduled
+            option_date: Candidate date
+            facility: Candidate facility
+            facility_info: Availability of the facility on that date
+
+        Returns:
+            FacilityOption, or None if the facility cannot accommodate the match on that date
+        """
+        can_accommodate, _ = facility_info.can_accommodate_match(match)
+        if not can_accommodate:
+            return None
+
+        time_slots = [
+            TimeSlotInfo(
+                time=slot.time,
+                total_courts=slot.total_courts,
+                available_courts=slot.available_courts,
+                used_courts=slot.used_courts
+            )
+            for slot in facility_info.match_time_slots(match)
+        ]
+
+        # Calculate quality score for this facility on this date
+        quality_score, conflicts = match.calculate_quality_score(option_date) if match else (0, [])
+
+        return FacilityOption(
+            facility_id=facility.id,
+            facility_name=facility.name,
+            time_slots=time_slots,
+            quality_score=quality_score,
+            conflicts=conflicts if isinstance(conflicts, list) else [],
+            facility=facility
+        )
+
     def filter_team_conflicts(self, match: Match, dates: List[date]) -> List[date]:
         """
         Filter out dates where either team is already scheduled
@@ -217,6 +240,11 @@ class SchedulingManager:
             # Get the dates from the scheduling options
             dates = [option.date for option in scheduling_options]
 
+            # First option per (date, facility ID)
+            options_by_key = {}
+            for option in scheduling_options:
+                options_by_key.setdefault((option.date, option.facility.id), option)
+
             # Get our facilities from the home team
             facilities = [match.home_team.get_primary_facility()] if match.home_team.preferred_facilities else []
 
@@ -241,7 +269,7 @@ class SchedulingManager:
 
                     if success:
                         # get the option that matches this date and facility
-                        option = next((opt for opt in scheduling_options if opt.date == availability_info.date and opt.facility.id == facility.id), None)
+                        option = options_by_key.get((availability_info.date, facility.id))
 
                         # If we found an option that matches this date and facility
                         # and it can accommodate the match, add it to the filtered list
@@ -253,7 +281,7 @@ class SchedulingManager:
                             filtered_options.append(option)
                     else:
                         # Log the reason for filtering out this date
-                        print(f"Filtering out date {availability_info.date} for match {match.id}: {desc}")
+                        logger.debug("Filtering out date %s for match %s: %s", availability_info.date, match.id, desc)
 
             # Return the filtered options
             return filtered_options
@@ -289,7 +317,7 @@ class SchedulingManager:
             can_schedule = scheduling_manager.is_schedulable(match, date(2025, 6, 25), facility)
         """
         try:
-            print(f"\n\n IS_SCHEDULABLE: Checking {date_obj}\n\n")
+            logger.debug("is_schedulable: checking match %s on %s", getattr(match, "id", None), date_obj)
             
             if not isinstance(match, Match):
                 return False
@@ -311,7 +339,7 @@ class SchedulingManager:
                                                     date_obj=date_obj):
                     return False
             except Exception as date_error:
-                print(f"\n\n ==== Team Conflict error: {date_error}\n\n")
+                logger.error("Team conflict check failed for match %s on %s: %s", match.id, date_obj, date_error)
                 raise date_error
             
             # STEP 2: Check facility availability           
@@ -335,8 +363,8 @@ class SchedulingManager:
                     if facility_availability and facility_availability[0].available:
                         can_accommodate, _ = facility_availability[0].can_accommodate_match(match)
                         
-                        print(f"\n\n === {can_accommodate}: Checked to see if facility {facility.short_name} "
-                              f"can accommodate match {match.id}, allow_split_lines={allow_split_lines}")
+                        logger.debug("Facility %s can accommodate match %s: %s (allow_split_lines=%s)",
+                                     facility.short_name, match.id, can_accommodate, allow_split_lines)
         
                         if can_accommodate:
                             return True
@@ -345,13 +373,13 @@ class SchedulingManager:
                 
             except Exception as accom_err:
                 # Any unexpected error means we can't schedule
-                print(f"\n\n ==== Error calling can_accommodate: {accom_err}")
+                logger.error("can_accommodate failed for match %s on %s: %s", match.id, date_obj, accom_err)
                 raise accom_err
             
             
         except Exception as e:
             # Any unexpected error means we can't schedule
-            print(f"Error in is_schedulable: {e}")
+            logger.error("Error in is_schedulable: %s", e)
             raise e
 
     def schedule_match(self, match: Match) -> bool:
@@ -364,8 +392,10 @@ class SchedulingManager:
                 raise ValueError("Match is not ready to be scheduled. Check match details and scheduling options.")
             
             # Update the match scheduling in the database
-            print(f"Scheduling match {match.id} for teams {match.home_team_name} vs {match.visitor_team_name} "
-                  f"on {match.date} at {match.facility_name} with times {match.get_scheduled_times()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Scheduling match %s for teams %s vs %s on %s at %s with times %s",
+                             match.id, match.home_team_name, match.visitor_team_name, match.date,
+                             match.facility_name, match.get_scheduled_times())
             
             return self.db.update_match(match)
 
@@ -373,8 +403,49 @@ class SchedulingManager:
             raise RuntimeError(f"Error scheduling match {match.id}: {e}")
 
 
+    @staticmethod
+    def _option_priority(scheduling_options: SchedulingOptions, ordering: str = "best_option") -> Tuple:
+        """
+        Queue priority of a pending match, derived from its current options
+
+        Matches without options sort first so they are reported immediately.
+        For "best_option" the highest best-option quality is scheduled first, and
+        among equal quality the match with the fewest remaining dates goes first.
+        For "most_constrained" the match with the fewest feasible
+        facility-date-time options goes first (ties: higher best quality).
+        For "random" the queue keeps the shuffled order.
+        """
+        if ordering == "random":
+            return (0,)
+
+        best_dates = scheduling_options.get_best_dates(limit=1)
+        if not best_dates:
+            return (float("-inf"), 0)
+        best_quality = best_dates[0].overall_quality_score
+
+        if ordering == "most_constrained":
+            return (scheduling_options.get_domain_size(), -best_quality)
+        return (-best_quality, len(scheduling_options.date_options))
+
+    @staticmethod
+    def _scheduling_detail(match: Match, dry_run: bool) -> Dict[str, Any]:
+        """Result entry for a match placed by auto-scheduling"""
+        quality_score, _ = match.calculate_quality_score()
+        return {
+            "match_id": match.id,
+            "status": "would_be_scheduled" if dry_run else "scheduled",
+            "home_team": match.home_team_name,
+            "visitor_team": match.visitor_team_name,
+            "facility": match.facility_name,
+            "date": match.date,
+            "times": match.get_scheduled_times(),
+            "quality_score": quality_score,
+        }
+
     def auto_schedule_matches(
-        self, matches: List[Match], dry_run: bool = True, seed: int = None
+        self, matches: List[Match], dry_run: bool = True, seed: int = None,
+        ordering: str = "best_option", repair: bool = True,
+        repair_time_budget: float = 5.0, repair_max_depth: int = 2
     ) -> Dict[str, Any]:
         """
         Auto-schedule multiple matches using Match class methods
@@ -382,10 +453,33 @@ class SchedulingManager:
             matches: List of Match objects to schedule
             dry_run: If True, only simulate scheduling without committing changes
             seed: Optional random seed for reproducibility
+            ordering: Match ordering mode, one of ORDERINGS
+            repair: If True, run the ejection-chain repair phase for matches the
+                greedy pass could not place
+            repair_time_budget: Seconds available for the repair phase
+            repair_max_depth: Maximum number of ejected matches per repair chain
         Returns:
-            A dictionary with scheduling results
+            A dictionary with scheduling results; ``profile`` holds the time and
+            calls per stage and the slowest matches (see scheduling_profile)
         """
+        previous_profiler, self.profiler = self.profiler, StageProfiler()
+        try:
+            with metrics.scheduler_run("auto_schedule", ordering) as run:
+                results = self._auto_schedule_matches(matches, dry_run, seed, ordering, repair,
+                                                      repair_time_budget, repair_max_depth)
+                run.record(results)
+                return results
+        finally:
+            self.profiler = previous_profiler
+
+    def _auto_schedule_matches(self, matches: List[Match], dry_run: bool, seed: Optional[int],
+                               ordering: str, repair: bool, repair_time_budget: float,
+                               repair_max_depth: int) -> Dict[str, Any]:
+        """auto_schedule_matches with self.profiler set for the run"""
         try:
+            if ordering not in ORDERINGS:
+                raise ValueError(f"Unknown ordering '{ordering}', expected one of {', '.join(ORDERINGS)}")
+
             results = {
                 "total_matches": len(matches),
                 "scheduled": 0,
@@ -393,12 +487,14 @@ class SchedulingManager:
                 "scheduling_details": [],
                 "errors": [],
                 "dry_run": dry_run,
+                "ordering": ordering,
             }
 
             # Filter unscheduled matches
             unscheduled_matches = [m for m in matches if m.is_unscheduled()]
 
             if not unscheduled_matches:
+                results["profile"] = self.profiler.report()
                 return results
 
             # Begin transaction if database supports it
@@ -416,15 +512,38 @@ class SchedulingManager:
                 shuffled_matches = unscheduled_matches.copy()
                 random.shuffle(shuffled_matches)
 
+                # Build the options of every pending match once and keep them up to date
+                # incrementally; the queue is re-ranked as bookings consume capacity
+                options_cache = SchedulingOptionsCache(self)
+                pending_by_id = {m.id: m for m in shuffled_matches}
+                if ordering == "most_constrained":
+                    # Deterministic: ties are broken by match ID, not by the shuffle
+                    shuffle_order = {m.id: m.id for m in shuffled_matches}
+                else:
+                    shuffle_order = {m.id: index for index, m in enumerate(shuffled_matches)}
+                queue = []
+
+                def enqueue(pending_match: Match) -> None:
+                    pending_options = options_cache.get(pending_match)
+                    with self._stage("selection", pending_match.id):
+                        heapq.heappush(queue, (
+                            self._option_priority(pending_options, ordering),
+                            shuffle_order[pending_match.id],
+                            options_cache.version(pending_match),
+                            pending_match,
+                        ))
+
                 for match in shuffled_matches:
+                    enqueue(match)
 
-                    # Get scheduling options for the match.  
-                    scheduling_options = self.get_scheduling_options(
-                        match,
-                        ignore_conflicts=False,  # Do not ignore conflicts for auto-scheduling
-                        ignore_league_preferences=False,
-                        ignore_team_preferences=False,
-                    )
+                while queue:
+                    _, _, version, match = heapq.heappop(queue)
+
+                    # Skip entries superseded by a newer version of the match's options
+                    if match not in options_cache or version != options_cache.version(match):
+                        continue
+
+                    scheduling_options = options_cache.get(match)
 
                     # For the auto-scheduling, we use the highest first option which should
                     # be the most preferred date based on team and league preferences
@@ -439,14 +558,16 @@ class SchedulingManager:
                                 "reason": "No scheduling options available",
                             }
                         )
+                        options_cache.discard(match)
                         continue
 
                     # The scheduling options should already be sorted by priority
                     # and we can use the first option as the preferred date
-                    match_scheduling = scheduling_options.get_best_match_scheduling("same_time")
+                    with self._stage("selection", match.id):
+                        match_scheduling = scheduling_options.get_best_match_scheduling("same_time")
 
-                    if not match_scheduling and match.league.allow_split_lines:
-                        match_scheduling = scheduling_options.get_best_match_scheduling("split_times")
+                        if not match_scheduling and match.league.allow_split_lines:
+                            match_scheduling = scheduling_options.get_best_match_scheduling("split_times")
 
                     if not match_scheduling:
                         results["failed"] += 1
@@ -459,34 +580,27 @@ class SchedulingManager:
                                 "reason": "No available scheduling options found",
                             }
                         )
+                        options_cache.discard(match)
                         continue
 
                     # assign the match scheduling to the match
                     match.assign_scheduling(match_scheduling)
 
                     # Schedule the match using the database interface
-                    success = self.schedule_match(match)
-
+                    with self._stage("writes", match.id):
+                        success = self.schedule_match(match)
 
                     if success:
+                        # Refresh only the pending options that depend on this facility-day and team-days;
+                        # the refresh is charged to the booked match
+                        with self._stage("options_construction", match.id):
+                            for affected_id in options_cache.on_match_booked(match):
+                                enqueue(pending_by_id[affected_id])
+
                         results["scheduled"] += 1
-                        # Calculate quality score for scheduled match
-                        quality_score, _ = match.calculate_quality_score()
-                        results["scheduling_details"].append(
-                            {
-                                "match_id": match.id,
-                                "status": (
-                                    "would_be_scheduled" if dry_run else "scheduled"
-                                ),
-                                "home_team": match.home_team_name,
-                                "visitor_team": match.visitor_team_name,
-                                "facility": match.facility_name,
-                                "date": match.date,
-                                "times": match.get_scheduled_times(),
-                                "quality_score": quality_score,
-                            }
-                        )
+                        results["scheduling_details"].append(self._scheduling_detail(match, dry_run))
                     else:
+                        options_cache.discard(match)
                         results["failed"] += 1
                         results["errors"].append(
                             {
@@ -498,9 +612,18 @@ class SchedulingManager:
                             }
                         )
 
+                results["options_cache_stats"] = dict(options_cache.stats)
+
+                if repair:
+                    with self._stage("repair"):
+                        self._repair_failed_matches(results, shuffled_matches, dry_run,
+                                                    repair_time_budget, repair_max_depth)
+
                 # Commit transaction if database supports it
                 if hasattr(self.db, 'commit_transaction'):
-                    self.db.commit_transaction()
+                    with self._stage("writes"):
+                        self.db.commit_transaction()
+                results["profile"] = self.profiler.report()
                 return results
 
             except Exception as e:
@@ -518,13 +641,60 @@ class SchedulingManager:
                 self.db.rollback_transaction()
             raise RuntimeError(f"Error in auto_schedule_matches: {e}")
 
+    def _repair_failed_matches(self, results: Dict[str, Any], matches: List[Match], dry_run: bool,
+                               time_budget: float, max_depth: int) -> None:
+        """
+        Run the ejection-chain repair phase and fold its outcome into the results
+
+        Args:
+            results: Results dictionary of auto_schedule_matches (updated in place)
+            matches: Matches handled by this auto-scheduling run
+            dry_run: Whether the run is a dry run
+            time_budget: Seconds available for the repair phase
+            max_depth: Maximum number of ejected matches per chain
+        """
+        matches_by_id = {m.id: m for m in matches}
+        failed_matches = [
+            matches_by_id[error["match_id"]] for error in results["errors"]
+            if error.get("status") in ("no_scheduling_options", "no_available_scheduling")
+            and error.get("match_id") in matches_by_id
+        ]
+        if not failed_matches:
+            return
+
+        placed = {m.id: m for m in matches if m.is_scheduled()}
+        repairer = ScheduleRepairer(self, placed, max_depth=max_depth, time_budget=time_budget)
+        report = repairer.repair(failed_matches)
+        results["repair"] = report
+
+        repaired_ids = set(report["repaired_match_ids"])
+        if not repaired_ids:
+            return
+
+        results["errors"] = [e for e in results["errors"] if e.get("match_id") not in repaired_ids]
+        results["failed"] -= len(repaired_ids)
+        results["scheduled"] += len(repaired_ids)
+
+        # Matches moved by a chain get refreshed details; repaired matches get new ones
+        moved_ids = {move["match_id"] for chain in report["chains"] for move in chain["moves"]}
+        results["scheduling_details"] = [
+            self._scheduling_detail(matches_by_id[detail["match_id"]], dry_run)
+            if detail["match_id"] in moved_ids else detail
+            for detail in results["scheduling_details"]
+        ]
+        for match_id in report["repaired_match_ids"]:
+            detail = self._scheduling_detail(matches_by_id[match_id], dry_run)
+            detail["repaired"] = True
+            results["scheduling_details"].append(detail)
+
     def unschedule_match(self, match: Match) -> bool:
         """Unschedule a match using the database interface"""
         try:
             if match.is_scheduled():
                 match.unschedule()  # Clear match scheduling details
                 # Log the unscheduling action
-                print(f"Unscheduling match {match.id} for teams {match.home_team_name} vs {match.visitor_team_name}")
+                logger.debug("Unscheduling match %s for teams %s vs %s",
+                             match.id, match.home_team_name, match.visitor_team_name)
 
             # update the database to remove the match scheduling
             return self.db.update_match(match)
@@ -741,19 +911,102 @@ class SchedulingManager:
 
 
 
+    def auto_schedule_components(self, matches: List['Match'], dry_run: bool = True, seed: Optional[int] = None,
+                                 ordering: str = "best_option", max_workers: Optional[int] = None) -> Dict[str, Any]:
+        """
+        Auto-schedule a multi-league scope as independent components (see schedule_decomposition)
+
+        Leagues that share no team or facility cannot affect each other, so each
+        connected component of the league-team-facility graph is scheduled on its
+        own, in parallel worker processes when possible.
+
+        Args:
+            matches: Unscheduled matches to schedule
+            dry_run: If True, only simulate scheduling without committing changes
+            seed: Optional seed; each component gets a seed derived from it
+            ordering: Match ordering mode, one of ORDERINGS
+            max_workers: Worker process limit (default: CPU count)
+
+        Returns:
+            auto_schedule_matches-shaped results plus assignments, components and decomposition
+        """
+        with metrics.scheduler_run("auto_schedule", ordering) as run:
+            results = schedule_components(self, matches, dry_run=dry_run, seed=seed, ordering=ordering,
+                                          max_workers=max_workers)
+            run.record(results)
+            return results
+
     def optimize_auto_schedule(self, matches: List['Match'], max_iterations: int = 10, 
-                                progress_callback=None) -> Dict[str, Any]:
+                                progress_callback=None, ordering: str = "best_option",
+                                mode: str = "seeds", time_budget: float = 30.0,
+                                seed: Optional[int] = None, solver_backend: str = "auto",
+                                checkpoint_path: Optional[str] = None,
+                                checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                                resume_from: Optional[str] = None) -> Dict[str, Any]:
             """
             Run auto-schedule optimization with multiple iterations to find best scheduling
+
+            Already scheduled matches in the list (annealing and exact modes) are
+            warm-started from their committed placement and may be moved.
             
             Args:
                 matches: List of matches to schedule
-                max_iterations: Maximum number of iterations to run
+                max_iterations: Maximum number of iterations to run (seeds mode)
                 progress_callback: Optional callback function for progress updates
+                ordering: Match ordering mode passed to auto_schedule_matches. The
+                    deterministic "most_constrained" ordering needs only one iteration.
+                mode: "seeds" (best of independent greedy runs), "annealing"
+                    (simulated annealing starting from one greedy run) or "exact"
+                    (integer program solved by an installed MILP/CP library)
+                time_budget: Wall-clock seconds for annealing mode, time limit for exact mode
+                seed: Optional seed for the greedy start and the annealer (annealing/exact mode)
+                solver_backend: Exact solver backend ("auto", "cp_sat" or "cbc")
+                checkpoint_path: Optional file the best solution is saved to during the run
+                checkpoint_interval: Minimum seconds between two checkpoint writes
+                resume_from: Optional checkpoint file whose best solution the run starts
+                    from (annealing/exact) or has to beat (seeds)
                 
             Returns:
-                Dictionary with optimization results including best seed and quality metrics
+                Dictionary with optimization results including best seed, quality
+                metrics and best_assignments for apply_assignments.
             """
+            with metrics.scheduler_run("optimize", mode) as run:
+                result = self._optimize_auto_schedule(matches, max_iterations, progress_callback, ordering, mode,
+                                                      time_budget, seed, solver_backend, checkpoint_path,
+                                                      checkpoint_interval, resume_from)
+                run.record(result)
+                return result
+
+    def _optimize_auto_schedule(self, matches: List['Match'], max_iterations: int, progress_callback,
+                                ordering: str, mode: str, time_budget: float, seed: Optional[int],
+                                solver_backend: str, checkpoint_path: Optional[str],
+                                checkpoint_interval: float, resume_from: Optional[str]) -> Dict[str, Any]:
+            """optimize_auto_schedule without run metrics"""
+            try:
+                resume = load_checkpoint(resume_from) if resume_from else None
+            except ValueError as e:
+                return {'optimization_completed': False, 'error': str(e), 'results_history': []}
+
+            if mode in ("annealing", "exact"):
+                if mode == "annealing":
+                    result = self._optimize_with_annealing(matches, time_budget, progress_callback, ordering,
+                                                           seed, checkpoint_path, checkpoint_interval, resume)
+                else:
+                    result = self._optimize_with_solver(matches, time_budget, progress_callback, ordering,
+                                                        seed, solver_backend, checkpoint_path,
+                                                        checkpoint_interval, resume)
+                if result.get('optimization_completed'):
+                    result['resumed_from'] = resume_from
+                return result
+            if mode != "seeds":
+                return {'optimization_completed': False, 'error': f"Unknown optimization mode '{mode}'",
+                        'results_history': []}
+            if any(m.is_scheduled() for m in matches):
+                return {'optimization_completed': False,
+                        'error': "Seeds mode only schedules unscheduled matches; use annealing or exact mode "
+                                 "to warm-start from the committed schedule",
+                        'results_history': []}
+
             try:
                 import random
                 import time
@@ -762,8 +1015,20 @@ class SchedulingManager:
                 best_seed = None
                 best_unscheduled_count = float('inf')
                 best_quality_score = 0
+                best_assignments = []
+                if resume is not None:
+                    # A seed has to beat the resumed checkpoint to replace it
+                    best_seed = resume.seed
+                    best_unscheduled_count = resume.best_unscheduled_count
+                    best_quality_score = resume.best_quality_score
+                    best_assignments = resume.best_assignments
+
+                writer = self._checkpoint_writer(checkpoint_path, checkpoint_interval, "seeds", seed, matches,
+                                                 resume, ordering=ordering, max_iterations=max_iterations)
+                run_start = time.time()
                 
                 results_history = []
+                iteration_profiles = []
 
                 for iteration in range(max_iterations):
 
@@ -776,7 +1041,7 @@ class SchedulingManager:
                     start_time = time.time()
                     
                     # Run auto-schedule in dry-run mode with this seed
-                    result = self.auto_schedule_matches(matches, dry_run=True, seed=seed)
+                    result = self.auto_schedule_matches(matches, dry_run=True, seed=seed, ordering=ordering)
                     
                     iteration_time = time.time() - start_time
                     
@@ -798,10 +1063,12 @@ class SchedulingManager:
                         'scheduled_count': result['scheduled'],
                         'total_quality_score': total_quality_score,
                         'avg_quality_score': avg_quality_score,
-                        'execution_time': iteration_time
+                        'execution_time': iteration_time,
+                        'stage_times': {name: entry['time'] for name, entry in result['profile']['stages'].items()},
                     }
                     
                     results_history.append(iteration_result)
+                    iteration_profiles.append(result['profile'])
                     
                     # Determine if this is the best result so far
                     is_better = False
@@ -818,6 +1085,15 @@ class SchedulingManager:
                         best_seed = seed
                         best_unscheduled_count = unscheduled_count
                         best_quality_score = avg_quality_score
+                        best_assignments = assignments_from_matches(matches)
+                        if writer:
+                            writer.record({
+                                'best_seed': seed,
+                                'best_unscheduled_count': unscheduled_count,
+                                'best_total_penalty': MAX_QUALITY * result['scheduled'] - total_quality_score,
+                                'best_quality_score': avg_quality_score,
+                                'best_assignments': best_assignments,
+                            }, iterations=iteration + 1, elapsed=time.time() - run_start)
                     
                     # Call progress callback if provided
                     if progress_callback:
@@ -834,17 +1110,30 @@ class SchedulingManager:
                     for match in matches:
                         if match.is_scheduled():
                             match.unschedule()
+
+                    # Every further seed would reproduce the same deterministic schedule
+                    if ordering == "most_constrained":
+                        break
+
+                if writer:
+                    writer.flush()
                 
                 # Return comprehensive results
                 optimization_result = {
                     'optimization_completed': True,
+                    'mode': 'seeds',
                     'max_iterations': max_iterations,
+                    'ordering': ordering,
                     'best_seed': best_seed,
                     'best_result': best_result,
                     'best_unscheduled_count': best_unscheduled_count,
                     'best_quality_score': best_quality_score,
+                    'best_assignments': best_assignments,
                     'results_history': results_history,
-                    'improvement_found': best_seed is not None
+                    'profile': merge_profiles(iteration_profiles),
+                    'improvement_found': best_seed is not None or bool(best_assignments),
+                    'resumed_from': resume_from,
+                    'checkpoint': self._checkpoint_report(writer),
                 }
                 
                 return optimization_result
@@ -856,3 +1145,479 @@ class SchedulingManager:
                     'results_history': results_history if 'results_history' in locals() else []
                 }
 
+    def _optimize_with_annealing(self, matches: List['Match'], time_budget: float,
+                                 progress_callback=None, ordering: str = "best_option",
+                                 seed: Optional[int] = None, checkpoint_path: Optional[str] = None,
+                                 checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                                 resume: Optional[ScheduleCheckpoint] = None) -> Dict[str, Any]:
+        """
+        Improve a greedy schedule with simulated annealing (see schedule_annealer)
+
+        Args:
+            matches: Matches to optimize (scheduled ones start from their committed placement)
+            time_budget: Wall-clock seconds for the search
+            progress_callback: Optional callback function for progress updates
+            ordering: Ordering of the greedy run that seeds the search
+            seed: Optional seed for the greedy run and the annealer
+            checkpoint_path: Optional file the best solution is saved to during the search
+            checkpoint_interval: Minimum seconds between two checkpoint writes
+            resume: Optional checkpoint to start from instead of a greedy run
+
+        Returns:
+            Dictionary with optimization results and best_assignments
+        """
+        try:
+            import random
+            import time
+
+            if seed is None:
+                seed = resume.seed if resume and resume.seed is not None else random.randint(1, 1000000)
+            start_time = time.time()
+            writer = self._checkpoint_writer(checkpoint_path, checkpoint_interval, "annealing", seed, matches,
+                                             resume, ordering=ordering, time_budget=time_budget)
+
+            # The model needs the availability before any of these matches are placed
+            with self._released_schedule(matches):
+                annealer = ScheduleAnnealer(self.db, matches, seed=seed)
+            start = self._load_start(annealer, matches, seed, ordering, resume)
+
+            remaining = max(0.0, time_budget - (time.time() - start_time))
+            search = annealer.run(
+                remaining, progress_callback=progress_callback,
+                checkpoint_callback=(lambda best: writer.record(best, best['iterations'], best['elapsed']))
+                if writer else None
+            )
+            if writer:
+                writer.flush()
+
+            return {
+                'optimization_completed': True,
+                'mode': 'annealing',
+                'ordering': ordering,
+                'time_budget': time_budget,
+                'best_seed': seed,
+                'greedy_unscheduled_count': start['greedy_unscheduled_count'],
+                'best_unscheduled_count': search['best_unscheduled_count'],
+                'best_total_penalty': search['best_total_penalty'],
+                'best_quality_score': search['best_quality_score'],
+                'best_assignments': search['best_assignments'],
+                'iterations': search['iterations'],
+                'accepted_moves': search['accepted_moves'],
+                'execution_time': round(time.time() - start_time, 3),
+                'results_history': search['results_history'],
+                'improvement_found': bool(search['best_assignments']),
+                'skipped_assignments': start['skipped_assignments'],
+                'profile': start['profile'],
+                'checkpoint': self._checkpoint_report(writer),
+            }
+
+        except Exception as e:
+            return {
+                'optimization_completed': False,
+                'error': str(e),
+                'results_history': []
+            }
+
+    @contextmanager
+    def _released_schedule(self, matches: List['Match']):
+        """
+        Dry-run view of the database in which the scheduled matches of a list hold no courts
+
+        Optimization models are built inside it so that committed matches being
+        re-optimized can be moved anywhere, including onto their own courts.
+        """
+        scheduled = [m for m in matches if m.is_scheduled()]
+        if not scheduled:
+            yield
+            return
+        self.db.begin_transaction(dry_run=True)
+        try:
+            for match in scheduled:
+                self.db.scheduling_state.clear_match_bookings(match.id)
+            yield
+        finally:
+            self.db.rollback_transaction()
+
+    def _load_start(self, model: ScheduleAnnealer, matches: List['Match'], seed: int, ordering: str,
+                    resume: Optional[ScheduleCheckpoint]) -> Dict[str, Any]:
+        """
+        Load the starting solution of an optimization model
+
+        A resumed checkpoint's assignments are used as they are.  Otherwise the
+        committed placements of already scheduled matches are kept and the
+        unscheduled ones are placed by a greedy dry run around them.
+
+        Returns:
+            Dictionary with greedy_unscheduled_count (None when resumed),
+            greedy_runtime, skipped_assignments and the greedy run's stage profile
+        """
+        import time
+
+        if resume is not None:
+            skipped = model.load_assignments(resume.best_assignments)
+            return {'greedy_unscheduled_count': None, 'greedy_runtime': 0.0, 'skipped_assignments': skipped,
+                    'profile': None}
+
+        pending = [m for m in matches if not m.is_scheduled()]
+        greedy_start = time.time()
+        greedy = self.auto_schedule_matches(pending, dry_run=True, seed=seed, ordering=ordering) if pending else None
+        greedy_runtime = time.time() - greedy_start
+        model.load_solution(matches)
+        for match in pending:
+            if match.is_scheduled():
+                match.unschedule()
+        return {'greedy_unscheduled_count': greedy['failed'] if greedy else 0, 'greedy_runtime': greedy_runtime,
+                'skipped_assignments': 0, 'profile': greedy['profile'] if greedy else None}
+
+    @staticmethod
+    def _checkpoint_writer(path: Optional[str], interval: float, mode: str, seed: Optional[int],
+                           matches: List['Match'], resume: Optional[ScheduleCheckpoint],
+                           **params) -> Optional[CheckpointWriter]:
+        """CheckpointWriter for a run, or None without a checkpoint path"""
+        if not path:
+            return None
+        params['warm_start'] = "committed" if any(m.is_scheduled() for m in matches) else "greedy"
+        return CheckpointWriter(path, mode, seed, params, matches, interval=interval, baseline=resume)
+
+    @staticmethod
+    def _checkpoint_report(writer: Optional[CheckpointWriter]) -> Optional[Dict[str, Any]]:
+        if writer is None:
+            return None
+        return {
+            'path': writer.path,
+            'writes': writer.writes,
+            'best_unscheduled_count': writer.checkpoint.best_unscheduled_count,
+            'best_total_penalty': writer.checkpoint.best_total_penalty,
+        }
+
+    def _optimize_with_solver(self, matches: List['Match'], time_limit: float,
+                              progress_callback=None, ordering: str = "best_option",
+                              seed: Optional[int] = None, backend: str = "auto",
+                              checkpoint_path: Optional[str] = None,
+                              checkpoint_interval: float = DEFAULT_CHECKPOINT_INTERVAL,
+                              resume: Optional[ScheduleCheckpoint] = None) -> Dict[str, Any]:
+        """
+        Solve the schedule exactly (see schedule_solver), falling back to annealing
+
+        The greedy run (or the resumed checkpoint) is always loaded first: it
+        warm-starts the solver and its result is reported next to the solver's
+        so the cost of optimality is visible.
+
+        Args:
+            matches: Matches to optimize (scheduled ones start from their committed placement)
+            time_limit: Wall-clock seconds for the solver (or the fallback search)
+            progress_callback: Optional callback function for fallback progress updates
+            ordering: Ordering of the greedy run
+            seed: Optional seed for the greedy run and the fallback annealer
+            backend: Exact solver backend ("auto", "cp_sat" or "cbc")
+            checkpoint_path: Optional file the best solution is saved to
+            checkpoint_interval: Minimum seconds between two checkpoint writes (fallback search)
+            resume: Optional checkpoint to warm-start from instead of a greedy run
+
+        Returns:
+            Dictionary with optimization results, the solver report and best_assignments
+        """
+        try:
+            import random
+            import time
+
+            if seed is None:
+                seed = resume.seed if resume and resume.seed is not None else random.randint(1, 1000000)
+            start_time = time.time()
+            writer = self._checkpoint_writer(checkpoint_path, checkpoint_interval, "exact", seed, matches,
+                                             resume, ordering=ordering, time_budget=time_limit, backend=backend)
+
+            # The model needs the availability before any of these matches are placed
+            with self._released_schedule(matches):
+                solver = ExactScheduleSolver(self.db, matches, seed=seed)
+
+            start = self._load_start(solver.model, matches, seed, ordering, resume)
+            greedy_runtime = start['greedy_runtime']
+            greedy_score = solver.model.score()
+
+            remaining = max(0.0, time_limit - (time.time() - start_time))
+            solution = solver.solve(remaining, backend=backend)
+
+            if solution is None:
+                logger.info("Exact solver unavailable, failed or without a solution; falling back to annealing")
+                remaining = max(0.0, time_limit - (time.time() - start_time))
+                search = solver.model.run(
+                    remaining, progress_callback=progress_callback,
+                    checkpoint_callback=(lambda best: writer.record(best, best['iterations'], best['elapsed']))
+                    if writer else None
+                )
+                solver_report = {
+                    'backend': None,
+                    'status': 'fallback',
+                    'fallback': 'annealing',
+                    'available_backends': available_backends(),
+                    'runtime': search['elapsed'],
+                    'gap': None,
+                }
+                results_history = search['results_history']
+            else:
+                search = solution
+                solver_report = {key: solution[key] for key in
+                                 ('backend', 'status', 'runtime', 'objective', 'bound', 'gap')}
+                solver_report['fallback'] = None
+                results_history = []
+                if writer:
+                    writer.record(solution, elapsed=solution['runtime'])
+            solver_report.update(solver.size())
+            if writer:
+                writer.flush()
+
+            return {
+                'optimization_completed': True,
+                'mode': 'exact',
+                'ordering': ordering,
+                'time_budget': time_limit,
+                'best_seed': seed,
+                'solver': solver_report,
+                'greedy': {
+                    'unscheduled_count': greedy_score[0],
+                    'total_penalty': greedy_score[1],
+                    'runtime': round(greedy_runtime, 3),
+                },
+                'greedy_unscheduled_count': start['greedy_unscheduled_count'],
+                'best_unscheduled_count': search['best_unscheduled_count'],
+                'best_total_penalty': search['best_total_penalty'],
+                'best_quality_score': search['best_quality_score'],
+                'best_assignments': search['best_assignments'],
+                'execution_time': round(time.time() - start_time, 3),
+                'results_history': results_history,
+                'improvement_found': bool(search['best_assignments']),
+                'skipped_assignments': start['skipped_assignments'],
+                'profile': start['profile'],
+                'checkpoint': self._checkpoint_report(writer),
+            }
+
+        except Exception as e:
+            return {
+                'optimization_completed': False,
+                'error': str(e),
+                'results_history': []
+            }
+
+    def apply_checkpoint(self, checkpoint_path: str, dry_run: bool = True, force: bool = False) -> Dict[str, Any]:
+        """
+        Commit the best solution saved in an optimizer checkpoint without recomputing it
+
+        The baseline only covers the checkpoint's own matches.  Bookings made
+        since the run by matches outside that scope (other leagues on the same
+        facility-days, or the same teams) are caught by apply_assignments,
+        which re-checks every placement: conflicting placements are not
+        written and are listed in conflicting_match_ids.
+
+        Args:
+            checkpoint_path: Checkpoint file written by optimize_auto_schedule
+            dry_run: If True, only simulate scheduling without committing changes
+            force: Apply even if matches of the checkpoint's scope were rescheduled
+                since its run started
+
+        Returns:
+            apply_assignments results plus the checkpoint summary, stale_match_ids
+            and conflicting_match_ids (placements rejected by the re-check)
+
+        Raises:
+            ValueError: If the checkpoint cannot be read, one of its matches no longer
+                exists, or its scope changed since the run started (without force)
+            RuntimeError: If the assignments cannot be applied
+        """
+        checkpoint = load_checkpoint(checkpoint_path)
+        matches = []
+        for match_id in checkpoint.match_ids:
+            match = self.db.get_match(match_id)
+            if match is None:
+                raise ValueError(f"Match {match_id} of checkpoint {checkpoint_path} no longer exists")
+            matches.append(match)
+
+        stale = checkpoint.stale_match_ids(matches)
+        if stale and not force:
+            shown = ', '.join(str(match_id) for match_id in stale[:10])
+            raise ValueError(f"{len(stale)} matches of the checkpoint were rescheduled since its run started "
+                             f"({shown}{', ...' if len(stale) > 10 else ''})")
+
+        results = self.apply_assignments(matches, checkpoint.best_assignments, dry_run=dry_run,
+                                         unschedule_missing=checkpoint.params.get('warm_start') == "committed")
+        results["stale_match_ids"] = stale
+        results["conflicting_match_ids"] = sorted(
+            error["match_id"] for error in results["errors"] if error["status"] == "scheduling_failed")
+        results["checkpoint"] = {
+            'path': checkpoint_path,
+            'mode': checkpoint.mode,
+            'seed': checkpoint.seed,
+            'best_unscheduled_count': checkpoint.best_unscheduled_count,
+            'best_total_penalty': checkpoint.best_total_penalty,
+            'best_quality_score': checkpoint.best_quality_score,
+            'updated_at': checkpoint.updated_at,
+        }
+        return results
+
+    def apply_assignments(self, matches: List['Match'], assignments: List[Dict[str, Any]],
+                          dry_run: bool = True, unschedule_missing: bool = False) -> Dict[str, Any]:
+        """
+        Commit a precomputed schedule (e.g. best_assignments from annealing or a checkpoint)
+
+        Scheduled matches are moved to their assigned placement; those already
+        there are left untouched.  The assignments may be stale (the schedule
+        changed since they were computed) or come from a client, so every new
+        placement is re-checked against the current bookings before it is
+        written: the facility must be open with enough free courts at the
+        assigned times, and neither team may already play that day.  Matches
+        being moved are released first, so assignments that swap placements
+        are accepted.  A rejected placement is counted as a failure; a match
+        that was scheduled before keeps its previous placement when that one
+        is still free.
+
+        Args:
+            matches: Matches the assignments refer to
+            assignments: List of {match_id, facility_id, date (YYYY-MM-DD), times}
+            dry_run: If True, only simulate scheduling without committing changes
+            unschedule_missing: If True, scheduled matches without an assignment are
+                unscheduled (the assignments are the complete schedule of the matches,
+                e.g. one warm-started from the committed schedule)
+
+        Returns:
+            Dictionary with the same shape as auto_schedule_matches results
+
+        Raises:
+            RuntimeError: If the assignments cannot be applied
+        """
+        from datetime import datetime
+
+        results = {
+            "total_matches": len(matches),
+            "scheduled": 0,
+            "failed": 0,
+            "scheduling_details": [],
+            "errors": [],
+            "dry_run": dry_run,
+        }
+        matches_by_id = {m.id: m for m in matches}
+        facilities = {}
+
+        def record_failure(match: Match, status: str, reason: str) -> None:
+            results["failed"] += 1
+            results["errors"].append({
+                "match_id": match.id,
+                "status": status,
+                "home_team": match.home_team_name,
+                "visitor_team": match.visitor_team_name,
+                "reason": reason,
+            })
+
+        try:
+            self.db.begin_transaction(dry_run=dry_run)
+            try:
+                assigned_ids = {a["match_id"] for a in assignments}
+                if unschedule_missing:
+                    for match in matches:
+                        if match.id not in assigned_ids and match.is_scheduled():
+                            self.unschedule_match(match)
+
+                # (match, new placement, previous placement or None) of every match that moves
+                moves = []
+                for assignment in assignments:
+                    match = matches_by_id.get(assignment["match_id"])
+                    if match is None:
+                        raise ValueError(f"Assignment for unknown match {assignment['match_id']}")
+
+                    if match.is_scheduled() and (
+                        match.facility.id == assignment["facility_id"]
+                        and match.date.isoformat() == assignment["date"]
+                        and list(match.get_scheduled_times()) == list(assignment["times"])
+                    ):
+                        results["scheduled"] += 1
+                        results["scheduling_details"].append(self._scheduling_detail(match, dry_run))
+                        continue
+
+                    facility_id = assignment["facility_id"]
+                    if facility_id not in facilities:
+                        facilities[facility_id] = self.db.get_facility(facility_id)
+                    if facilities[facility_id] is None:
+                        raise ValueError(f"Facility {facility_id} not found")
+
+                    placement = MatchScheduling(
+                        facility=facilities[facility_id],
+                        date=datetime.strptime(assignment["date"], "%Y-%m-%d").date(),
+                        scheduled_times=list(assignment["times"])
+                    )
+                    moves.append((match, placement, match.scheduling if match.is_scheduled() else None))
+
+                # Release the courts and team-days of every moving match before placing any
+                for match, _, previous in moves:
+                    if previous is not None:
+                        self.unschedule_match(match)
+
+                rejected = []
+                for match, placement, previous in moves:
+                    conflict = self._placement_conflict(match, placement)
+                    if conflict is None and self._book(match, placement):
+                        results["scheduled"] += 1
+                        results["scheduling_details"].append(self._scheduling_detail(match, dry_run))
+                    else:
+                        rejected.append((match, conflict or "The database did not accept the placement",
+                                         previous))
+
+                for match, reason, previous in rejected:
+                    if previous is not None and self._placement_conflict(match, previous) is None \
+                            and self._book(match, previous):
+                        reason += "; kept its previous placement"
+                    record_failure(match, "scheduling_failed", reason)
+
+                for match in matches:
+                    if match.id not in assigned_ids and not match.is_scheduled():
+                        record_failure(match, "no_available_scheduling", "Not placed by the optimizer")
+
+                self.db.commit_transaction()
+                return results
+
+            except Exception:
+                self.db.rollback_transaction()
+                raise
+
+        except Exception as e:
+            raise RuntimeError(f"Error applying schedule assignments: {e}")
+
+    def _book(self, match: Match, placement: MatchScheduling) -> bool:
+        """Assign a placement to a match and write it (the match is left unscheduled if the write fails)"""
+        match.assign_scheduling(placement)
+        if self.schedule_match(match):
+            return True
+        match.unschedule()
+        return False
+
+    def _placement_conflict(self, match: Match, placement: MatchScheduling) -> Optional[str]:
+        """
+        Check a placement of an unscheduled match against the current bookings
+
+        Args:
+            match: Match to place (its own previous placement must already be released)
+            placement: Facility, date and line times to check
+
+        Returns:
+            Why the placement is not possible, or None if it fits
+        """
+        for team in (match.home_team, match.visitor_team):
+            if self._team_plays_on(team, placement.date):
+                return f"{team.name} already plays on {placement.date}"
+
+        facility = placement.facility
+        availability = self.db.get_facility_availability(facility=facility, dates=[placement.date])
+        info = availability[0] if availability else None
+        if info is None or not info.available:
+            reason = info.reason if info is not None else "no schedule"
+            return f"{facility.name} is not available on {placement.date}: {reason}"
+        if info.occupancy is not None and not info.occupancy.fits(
+                match.id, placement.scheduled_times, match.league.match_duration_minutes):
+            return f"{facility.name} has not enough free courts on {placement.date} at " \
+                   f"{', '.join(sorted(set(placement.scheduled_times)))}"
+        return None
+
+    def _team_plays_on(self, team, date_obj: date) -> bool:
+        """Whether a team has a match on a date (in the dry-run view during a dry run)"""
+        state = getattr(self.db, "scheduling_state", None)
+        if getattr(self.db, "dry_run_active", False) and state is not None:
+            return state.has_team_conflict(team.id, date_obj)
+        return self.db.check_team_date_conflict(team, date_obj)
@@ -11,7 +11,9 @@ from dataclasses import dataclass, field
 from typing import List, Dict, Optional, Any, TYPE_CHECKING, Iterator
 from datetime import datetime, timedelta, date
 
-import math
+from slot_search import CourtCapacityVector, find_line_distributions, LINE_MODES, CUSTOM
+from season_calendar import calendar_day
+from time_of_day import time_to_minutes
 
 # Use TYPE_CHECKING for imports to avoid circular dependencies
 if TYPE_CHECKING:
@@ -39,15 +41,7 @@ class TimeSlotInfo:
         if not isinstance(self.time, str):
             raise ValueError("Time must be a string")
         
-        try:
-            parts = self.time.split(":")
-            if len(parts) != 2:
-                raise ValueError("Invalid time format")
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError("Invalid time values")
-        except (ValueError, IndexError):
-            raise ValueError(f"Invalid time format: '{self.time}'. Expected HH:MM format")
+        time_to_minutes(self.time)
         
         # Validate court numbers
         if self.total_courts < 0:
@@ -302,6 +296,17 @@ class DateOption:
         if self.facility_options:
             self.overall_quality_score = max(opt.quality_score for opt in self.facility_options)
     
+    def remove_facility_option(self, facility_id: int) -> Optional[FacilityOption]:
+        """Remove and return the facility option for a facility ID (None if not present)"""
+        for index, facility_option in enumerate(self.facility_options):
+            if facility_option.facility_id == facility_id:
+                removed = self.facility_options.pop(index)
+                self.overall_quality_score = max(
+                    (opt.quality_score for opt in self.facility_options), default=0
+                )
+                return removed
+        return None
+    
     @classmethod
     def from_facility_info(cls, facility_info: 'FacilityAvailabilityInfo', match: 'Match') -> 'DateOption':
         """
@@ -316,7 +321,7 @@ class DateOption:
         """
         
         # Convert date to get day of week
-        day_of_week = facility_info.date.strftime("%A")
+        day_of_week = calendar_day(facility_info.date).day_name
         
         # Convert time slots
         time_slots = []
@@ -515,6 +520,21 @@ class SchedulingOptions:
                 return option
         return None
     
+    def remove_date_option(self, date_obj: date) -> Optional[DateOption]:
+        """
+        Remove the DateOption for a specific date.
+        
+        Args:
+            date_obj: Date object
+            
+        Returns:
+            The removed DateOption, or None if there was no option for the date
+        """
+        for index, option in enumerate(self.date_options):
+            if option.date == date_obj:
+                return self.date_options.pop(index)
+        return None
+    
     def get_total_scheduling_possibilities(self) -> int:
         """
         Get total number of possible scheduling time slots across all dates.
@@ -530,6 +550,31 @@ class SchedulingOptions:
         
         return total
     
+    def get_domain_size(self) -> int:
+        """
+        Count the feasible (facility, date, times) options for the match.
+        
+        Every same-time slot that can host all lines counts; for leagues that
+        allow split lines, a facility-day without one counts its valid split
+        distributions instead.
+        
+        Returns:
+            Number of feasible facility-date-times options
+        """
+        league = self.match.league if self.match else None
+        courts_needed = league.num_lines_per_match if league else 1
+        allow_split = bool(league and league.allow_split_lines)
+        
+        total = 0
+        for date_option in self.date_options:
+            for facility_option in date_option.facility_options:
+                capacity = CourtCapacityVector.from_time_slots(facility_option.time_slots)
+                full = sum(1 for _ in capacity.same_time(courts_needed))
+                if full == 0 and allow_split:
+                    full = sum(1 for _ in capacity.split_times(courts_needed))
+                total += full
+        return total
+    
     def get_dates_without_conflicts(self) -> List[DateOption]:
         """Get all date options that have no scheduling conflicts"""
         return [option for option in self.date_options if not option.has_conflicts()]
@@ -655,87 +700,49 @@ class SchedulingOptions:
         """
         if not self.date_options:
             return None
-            
+
+        if scheduling_mode not in LINE_MODES:
+            raise ValueError(f"Unknown scheduling mode: {scheduling_mode}")
+
         # Get the best date option based on quality score and availability
         best_dates = self.get_best_dates(limit=1)
         if not best_dates:
             return None
-            
+
         best_date_option = best_dates[0]
-        
+        courts_needed = self.match.league.num_lines_per_match if self.match.league else 1
 
-            
-        # Convert time slots to list of time strings based on scheduling mode
-        if scheduling_mode == "same_time":
+        # "custom" accepts any distribution, so same-time and even splits still rank first
+        modes = LINE_MODES if scheduling_mode == CUSTOM else (scheduling_mode,)
 
-            # For same_time, we need to find the best time slots that can accommodate all courts
-            courts_needed = self.match.league.num_lines_per_match if self.match.league else 1
-            best_time_slots = best_date_option.get_best_time_slots(courts_needed, limit=3)
-            if not best_time_slots:
-                return None
+        # Search the facilities of the best date, best quality first; the times
+        # always come from the facility that is booked
+        facility_options = sorted(best_date_option.facility_options,
+                                  key=lambda opt: opt.quality_score, reverse=True)
+        if self.facility:
+            facility_options = [opt for opt in facility_options if opt.facility_id == self.facility.id]
 
-            # For same_time, we just need one time slot that can accommodate all courts
-            suitable_slots = [slot for slot in best_time_slots if slot.can_accommodate(courts_needed)]
-            if not suitable_slots:
-                return None
-            # Use the first suitable slot. The MatchScheduling needs an array of times. For same_time,
-            # we can just repeat the first time slot for all courts.
-            selected_times = [suitable_slots[0].time] * courts_needed
+        for facility_option in facility_options:
+            facility_to_use = self.facility or facility_option.facility
+            if not facility_to_use:
+                continue  # Cannot create MatchScheduling without a facility
 
-        elif scheduling_mode == "split_times":
+            distributions = find_line_distributions(facility_option.time_slots, courts_needed, modes, limit=1)
+            if not distributions:
+                continue
 
-            # For split_times, we need to find multiple time slots that can accommodate the courts
-            total_courts = self.match.league.num_lines_per_match if self.match.league else 1
+            # Import here to avoid circular imports
+            from usta_match import MatchScheduling
 
-            # for split times, we need half the courts in one slot and half in another
-            # Get the best time slots that can accommodate at least half the courts each
-            courts_needed = math.ceil(total_courts / 2)  # Half the courts for split times
-            best_time_slots = best_date_option.get_best_time_slots(courts_needed, limit=3)
-            if not best_time_slots and len(best_time_slots) < 2:
-                return None
-            
-            
-            # For split_times, we need at least 2 time slots that can accommodate half
-            # of the courts each
-            suitable_slots = [slot for slot in best_time_slots if slot.can_accommodate(math.ceil(courts_needed / 2))]
-            if len(suitable_slots) < 2:
-                return None
-            # Use the first two available time slots, we need a selected time for each court
-            selected_times = [suitable_slots[0].time, suitable_slots[1].time] * math.ceil(courts_needed / 2)
-            # If we have more courts than slots, repeat the last time slot
-            if len(selected_times) < courts_needed:
-                selected_times += [suitable_slots[-1].time] * (courts_needed - len(selected_times))
-                # If we still don't have enough times, we can't schedule
-                if len(selected_times) < courts_needed:
-                    return None
+            return MatchScheduling(
+                facility=facility_to_use,
+                date=best_date_option.date,
+                scheduled_times=distributions[0].times,
+                qscore=best_date_option.overall_quality_score
+            )
 
-        elif scheduling_mode == "custom":
-            # We need sum of available courts across all time slots to accommodate the required number of courts
-            # For custom, use all available time slots
-            selected_times = [slot.time for slot in best_time_slots]
+        return None
 
-        else:
-            raise ValueError(f"Unknown scheduling mode: {scheduling_mode}")
-        
-        # Import here to avoid circular imports
-        from usta_match import MatchScheduling
-        
-        # Determine the facility to use
-        facility_to_use = self.facility
-        if not facility_to_use:
-            best_facility_option = best_date_option.get_best_facility_option()
-            facility_to_use = best_facility_option.facility if best_facility_option else None
-        
-        if not facility_to_use:
-            return None  # Cannot create MatchScheduling without a facility
-        
-        return MatchScheduling(
-            facility=facility_to_use,
-            date=best_date_option.date,
-            scheduled_times=selected_times,
-            qscore=best_date_option.overall_quality_score
-        )
-    
     def get_all_match_scheduling_options(self, limit: int = 10) -> List['MatchScheduling']:
         """
         Get multiple MatchScheduling objects for different dates/times/facilities.
@@ -0,0 +1,192 @@
+"""
+Incremental Scheduling Options Cache
+
+Auto-scheduling used to rebuild the full SchedulingOptions tree for every
+match (prioritized dates, team conflict filtering, facility availability and
+the DateOption/FacilityOption/TimeSlotInfo objects) even though booking one
+match only changes one facility-day and two team-days.
+
+SchedulingOptionsCache keeps the options of every pending match and records
+which (facility, date) and (team, date) keys each option depends on.  When a
+match is booked only the options that depend on the booked keys are touched:
+
+- (team, date): either team now plays on that date, so dependent matches lose
+  the whole DateOption for that date.
+- (facility, date): the facility-day availability is fetched once and the
+  FacilityOption of every dependent match is rebuilt (or dropped when the
+  facility can no longer accommodate it).
+
+Bookings only ever remove capacity, so options never have to grow back.
+"""
+
+import logging
+from collections import defaultdict
+from datetime import date
+from typing import Dict, List, Optional, Set, Tuple, TYPE_CHECKING
+
+from scheduling_options import SchedulingOptions
+
+if TYPE_CHECKING:
+    from usta import Match
+    from scheduling_manager import SchedulingManager
+
+logger = logging.getLogger(__name__)
+
+DependencyKey = Tuple[str, int, date]
+
+
+class SchedulingOptionsCache:
+    """Per-match SchedulingOptions with (facility, date) and (team, date) dependency tracking"""
+
+    def __init__(self, scheduling_manager: 'SchedulingManager'):
+        """
+        Initialize the cache
+
+        Args:
+            scheduling_manager: SchedulingManager used to build options and query availability
+        """
+        self.scheduling_manager = scheduling_manager
+        self.db = scheduling_manager.db
+        self._matches: Dict[int, 'Match'] = {}
+        self._options: Dict[int, SchedulingOptions] = {}
+        self._versions: Dict[int, int] = {}
+        self._dependents: Dict[DependencyKey, Set[int]] = defaultdict(set)
+        self.stats = {"full_builds": 0, "date_drops": 0, "facility_refreshes": 0}
+
+    @staticmethod
+    def _facility_key(facility_id: int, date_obj: date) -> DependencyKey:
+        return ("facility", facility_id, date_obj)
+
+    @staticmethod
+    def _team_key(team_id: int, date_obj: date) -> DependencyKey:
+        return ("team", team_id, date_obj)
+
+    def __contains__(self, match: 'Match') -> bool:
+        return match.id in self._options
+
+    def get(self, match: 'Match') -> SchedulingOptions:
+        """
+        Get the current scheduling options for a pending match, building them on first use
+
+        Args:
+            match: Pending match
+
+        Returns:
+            SchedulingOptions reflecting every booking reported through on_match_booked
+        """
+        options = self._options.get(match.id)
+        if options is None:
+            options = self.scheduling_manager.get_scheduling_options(match)
+            self.stats["full_builds"] += 1
+            self._matches[match.id] = match
+            self._options[match.id] = options
+            self._versions[match.id] = 0
+            self._register(match, options)
+        return options
+
+    def version(self, match: 'Match') -> int:
+        """Number of incremental updates applied to a match's options"""
+        return self._versions.get(match.id, 0)
+
+    def _register(self, match: 'Match', options: SchedulingOptions) -> None:
+        """Record the dependency keys of every date/facility option of a match"""
+        for date_option in options.date_options:
+            self._dependents[self._team_key(match.home_team.id, date_option.date)].add(match.id)
+            self._dependents[self._team_key(match.visitor_team.id, date_option.date)].add(match.id)
+            for facility_option in date_option.facility_options:
+                self._dependents[self._facility_key(facility_option.facility_id, date_option.date)].add(match.id)
+
+    def discard(self, match: 'Match') -> None:
+        """Stop tracking a match (booked or abandoned)"""
+        options = self._options.pop(match.id, None)
+        self._matches.pop(match.id, None)
+        self._versions.pop(match.id, None)
+        if options is None:
+            return
+        for date_option in options.date_options:
+            for team in (match.home_team, match.visitor_team):
+                self._dependents.get(self._team_key(team.id, date_option.date), set()).discard(match.id)
+            for facility_option in date_option.facility_options:
+                self._dependents.get(
+                    self._facility_key(facility_option.facility_id, date_option.date), set()
+                ).discard(match.id)
+
+    def on_match_booked(self, match: 'Match') -> Set[int]:
+        """
+        Update the options that depend on a newly booked match
+
+        Args:
+            match: Match that was just scheduled (facility, date and times assigned)
+
+        Returns:
+            IDs of pending matches whose options changed
+        """
+        self.discard(match)
+
+        booked_date = match.date
+        if booked_date is None or match.facility is None:
+            return set()
+
+        affected: Set[int] = set()
+
+        # Team-days: dependents can no longer use this date at all
+        for team in (match.home_team, match.visitor_team):
+            for match_id in list(self._dependents.pop(self._team_key(team.id, booked_date), ())):
+                options = self._options.get(match_id)
+                if options is None:
+                    continue
+                removed = options.remove_date_option(booked_date)
+                if removed is not None:
+                    self._unregister_date_option(self._matches[match_id], removed)
+                    self.stats["date_drops"] += 1
+                    affected.add(match_id)
+
+        # Facility-day: re-read availability once and rebuild each dependent facility option
+        facility_key = self._facility_key(match.facility.id, booked_date)
+        dependents = [mid for mid in self._dependents.get(facility_key, ()) if mid in self._options]
+        if dependents:
+            with self.scheduling_manager._stage("availability"):
+                availability = self.db.get_facility_availability(
+                    facility=match.facility, dates=[booked_date], max_days=1
+                )
+            facility_info = next((info for info in availability if info.date == booked_date), None)
+
+            for match_id in dependents:
+                pending = self._matches[match_id]
+                date_option = self._options[match_id].get_date_option(booked_date)
+                if date_option is None:
+                    continue
+                date_option.remove_facility_option(match.facility.id)
+                rebuilt = None
+                if facility_info is not None:
+                    rebuilt = self.scheduling_manager.build_facility_option(
+                        pending, booked_date, match.facility, facility_info
+                    )
+                if rebuilt is not None:
+                    date_option.add_facility_option(rebuilt)
+                else:
+                    self._dependents[facility_key].discard(match_id)
+                    if not date_option.facility_options:
+                        removed = self._options[match_id].remove_date_option(booked_date)
+                        self._unregister_date_option(pending, removed)
+                self.stats["facility_refreshes"] += 1
+                affected.add(match_id)
+
+        for match_id in affected:
+            self._versions[match_id] += 1
+
+        logger.debug(f"Booking match {match.id} on {booked_date} updated options of {len(affected)} pending matches")
+        return affected
+
+    def _unregister_date_option(self, match: 'Match', date_option) -> None:
+        """Drop the dependency keys of a removed DateOption"""
+        for team in (match.home_team, match.visitor_team):
+            self._dependents.get(self._team_key(team.id, date_option.date), set()).discard(match.id)
+        for facility_option in date_option.facility_options:
+            self._dependents.get(
+                self._facility_key(facility_option.facility_id, date_option.date), set()
+            ).discard(match.id)
+
+    def pending_matches(self) -> List['Match']:
+        """Matches currently tracked by the cache"""
+        return list(self._matches.values())
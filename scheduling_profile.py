@@ -0,0 +1,176 @@
+"""
+Scheduler Stage Profiling
+
+``auto_schedule_matches`` used to report only counts, and
+``optimize_auto_schedule`` one execution time per iteration, so there was no
+way to tell which part of the pipeline a slow dataset is spending its time in.
+
+StageProfiler measures the stages of a scheduling run:
+
+- candidate_generation: prioritized (date, facility) candidates of a match
+- team_conflicts:       dropping dates either team already plays on
+- availability:         facility availability queries
+- options_construction: FacilityOption/DateOption building and refreshes
+- selection:            queue ranking and picking the best option
+- writes:               storing a placement
+- repair:               the ejection-chain repair phase
+
+Stages nest (options construction calls the availability query, repair
+builds options), and each stage is charged only its exclusive time, so the
+stage times add up to the profiled time.  Time is also charged to the match
+being worked on (refreshing other matches' options after a booking counts
+against the booked match), which gives the slowest matches of a run.
+
+Reports are plain dictionaries, so worker processes can return them and
+``merge_profiles`` can add up the reports of components or iterations.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+STAGES = (
+    "candidate_generation",
+    "team_conflicts",
+    "availability",
+    "options_construction",
+    "selection",
+    "writes",
+    "repair",
+)
+
+# Slowest matches listed in a report
+DEFAULT_SLOWEST_MATCHES = 10
+
+
+class _Stage:
+    """Context manager timing one stage entry (created by StageProfiler.stage)"""
+
+    __slots__ = ("profiler", "name", "match_id", "started", "children")
+
+    def __init__(self, profiler: 'StageProfiler', name: str, match_id: Optional[int]):
+        self.profiler = profiler
+        self.name = name
+        self.match_id = match_id
+        self.started = 0.0
+        self.children = 0.0
+
+    def __enter__(self) -> '_Stage':
+        stack = self.profiler._stack
+        if self.match_id is None and stack:
+            self.match_id = stack[-1].match_id
+        stack.append(self)
+        self.started = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        elapsed = time.perf_counter() - self.started
+        profiler = self.profiler
+        profiler._stack.pop()
+        if profiler._stack:
+            profiler._stack[-1].children += elapsed
+        profiler._charge(self.name, self.match_id, elapsed - self.children)
+
+
+class StageProfiler:
+    """Cumulative time and call counts per scheduling stage and per match"""
+
+    def __init__(self):
+        self.stages: Dict[str, List[float]] = {name: [0, 0.0] for name in STAGES}  # name -> [calls, seconds]
+        self.match_times: Dict[int, float] = {}
+        self._stack: List[_Stage] = []
+        self._started = time.perf_counter()
+
+    def stage(self, name: str, match_id: Optional[int] = None) -> _Stage:
+        """
+        Time a block as one call of a stage
+
+        Args:
+            name: Stage name, one of STAGES
+            match_id: Match the work is for (default: the match of the enclosing stage)
+
+        Returns:
+            Context manager
+        """
+        if name not in self.stages:
+            raise ValueError(f"Unknown scheduling stage '{name}', expected one of {', '.join(STAGES)}")
+        return _Stage(self, name, match_id)
+
+    def _charge(self, name: str, match_id: Optional[int], seconds: float) -> None:
+        entry = self.stages[name]
+        entry[0] += 1
+        entry[1] += seconds
+        if match_id is not None:
+            self.match_times[match_id] = self.match_times.get(match_id, 0.0) + seconds
+
+    def report(self, slowest: int = DEFAULT_SLOWEST_MATCHES) -> Dict[str, Any]:
+        """
+        Summary of the run so far
+
+        Args:
+            slowest: Number of slowest matches to list
+
+        Returns:
+            Dictionary with ``stages`` ({name: {calls, time}}), ``profiled_time``
+            (sum of stage times), ``elapsed`` (since the profiler was created)
+            and ``slowest_matches`` ([{match_id, time}], slowest first)
+        """
+        ordered = sorted(self.match_times.items(), key=lambda item: item[1], reverse=True)[:slowest]
+        return {
+            "stages": {name: {"calls": int(calls), "time": round(seconds, 6)}
+                       for name, (calls, seconds) in self.stages.items()},
+            "profiled_time": round(sum(seconds for _, seconds in self.stages.values()), 6),
+            "elapsed": round(time.perf_counter() - self._started, 6),
+            "slowest_matches": [{"match_id": match_id, "time": round(seconds, 6)} for match_id, seconds in ordered],
+        }
+
+
+def merge_profiles(profiles: Iterable[Optional[Dict[str, Any]]],
+                   slowest: int = DEFAULT_SLOWEST_MATCHES) -> Dict[str, Any]:
+    """
+    Add up StageProfiler reports (components of one run, or iterations)
+
+    Args:
+        profiles: Reports to merge (None entries are skipped)
+        slowest: Number of slowest matches to keep
+
+    Returns:
+        Report of the same shape; a match appearing in several reports keeps its slowest time
+    """
+    merged = {
+        "stages": {name: {"calls": 0, "time": 0.0} for name in STAGES},
+        "profiled_time": 0.0,
+        "elapsed": 0.0,
+        "slowest_matches": [],
+    }
+    match_times: Dict[int, float] = {}
+    for profile in profiles:
+        if not profile:
+            continue
+        for name, entry in profile.get("stages", {}).items():
+            target = merged["stages"].setdefault(name, {"calls": 0, "time": 0.0})
+            target["calls"] += entry["calls"]
+            target["time"] = round(target["time"] + entry["time"], 6)
+        merged["profiled_time"] = round(merged["profiled_time"] + profile.get("profiled_time", 0.0), 6)
+        merged["elapsed"] = round(merged["elapsed"] + profile.get("elapsed", 0.0), 6)
+        for entry in profile.get("slowest_matches", []):
+            match_times[entry["match_id"]] = max(match_times.get(entry["match_id"], 0.0), entry["time"])
+    ordered = sorted(match_times.items(), key=lambda item: item[1], reverse=True)[:slowest]
+    merged["slowest_matches"] = [{"match_id": match_id, "time": seconds} for match_id, seconds in ordered]
+    return merged
+
+
+def format_profile(profile: Dict[str, Any], slowest: int = 5) -> List[str]:
+    """Text lines of a report: one per stage with calls, seconds and share, then the slowest matches"""
+    total = profile.get("profiled_time") or 0.0
+    lines = []
+    for name, entry in profile["stages"].items():
+        if not entry["calls"]:
+            continue
+        share = entry["time"] / total * 100 if total else 0.0
+        lines.append(f"  {name:<22} {entry['calls']:>8} calls {entry['time']:>9.3f}s {share:>5.1f}%")
+    lines.append(f"  {'total':<22} {'':>14} {total:>9.3f}s")
+    if profile.get("slowest_matches"):
+        slow = ", ".join(f"{entry['match_id']} ({entry['time']:.3f}s)"
+                         for entry in profile["slowest_matches"][:slowest])
+        lines.append(f"  slowest matches: {slow}")
+    return lines
@@ -6,14 +6,11 @@ import os
 from typing import Dict, Any, Optional, List, Tuple
 import logging
 from dataclasses import dataclass, field
-from datetime import date
+from datetime import date, datetime
 
 from usta import Match, MatchType, League, Team, Facility
+from time_of_day import sort_times
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 try:
@@ -23,11 +20,19 @@ except ImportError as e:
     sys.exit(1)
 
 
+def _as_date(value) -> date:
+    """Normalize a booking date (date object or YYYY-MM-DD string) to a date object"""
+    if isinstance(value, str):
+        return datetime.strptime(value, '%Y-%m-%d').date()
+    return value
+
+
 @dataclass
 class SchedulingState:
     """In-memory scheduling state for conflict detection"""
     facility_bookings: Dict[Tuple[int, date, str], List[int]] = field(default_factory=dict)  # (facility_id, date, time) -> [match_id1, match_id2, ...]
     team_bookings: Dict[Tuple[int, date], int] = field(default_factory=dict)            # (team_id, date) -> match_id
+    match_durations: Dict[int, Optional[int]] = field(default_factory=dict)              # match_id -> league match_duration_minutes
     operations: List[Dict] = field(default_factory=list)
     
     def initialize_from_database(self, db):
@@ -44,6 +49,8 @@ class SchedulingState:
                             self.facility_bookings[booking_key] = []
                         self.facility_bookings[booking_key].append(match.id)
                     
+                    self.match_durations[match.id] = getattr(match.league, 'match_duration_minutes', None)
+
                     # Record team bookings
                     self.team_bookings[(match.home_team.id, match.date)] = match.id
                     self.team_bookings[(match.visitor_team.id, match.date)] = match.id
@@ -52,7 +59,7 @@ class SchedulingState:
     
     def is_time_available(self, facility_id: int, date: date, time: str, courts_needed: int = 1) -> bool:
         """Check if time slot is available for the requested number of courts"""
-        booking_key = (facility_id, date, time)
+        booking_key = (facility_id, _as_date(date), time)
         if booking_key not in self.facility_bookings:
             return True
         
@@ -64,7 +71,7 @@ class SchedulingState:
     
     def has_team_conflict(self, team_id: int, date: date) -> bool:
         """Check if team has conflict on this date"""
-        return (team_id, date) in self.team_bookings
+        return (team_id, _as_date(date)) in self.team_bookings
 
     def has_facility_conflict(self, facility: Facility, date: date, time: str, courts_needed: int = 1) -> bool:
         """
@@ -91,7 +98,7 @@ class SchedulingState:
             return True
 
         # Check how many courts are already booked at this specific time
-        booking_key = (facility.id, date, time)
+        booking_key = (facility.id, _as_date(date), time)
         if booking_key in self.facility_bookings:
             booked_courts = len(self.facility_bookings[booking_key])
             available_courts = reservable_courts - booked_courts
@@ -107,7 +114,7 @@ class SchedulingState:
     
     def book_time_slot(self, match_id: int, facility_id: int, date: date, time: str):
         """Book a time slot"""
-        booking_key = (facility_id, date, time)
+        booking_key = (facility_id, _as_date(date), time)
         if booking_key not in self.facility_bookings:
             self.facility_bookings[booking_key] = []
         bookings = self.facility_bookings[booking_key]
@@ -115,7 +122,7 @@ class SchedulingState:
     
     def book_team_date(self, match_id: int, team_id: int, date: date):
         """Book a team date"""
-        self.team_bookings[(team_id, date)] = match_id
+        self.team_bookings[(team_id, _as_date(date))] = match_id
     
     def schedule_match(self, match: Match, facility_id: int, date: date, times: List[str]):
         """
@@ -130,6 +137,7 @@ class SchedulingState:
         # Book facility time slots
         for time in times:
             self.book_time_slot(match.id, facility_id, date, time)
+        self.match_durations[match.id] = getattr(match.league, 'match_duration_minutes', None)
         
         # Book team dates
         self.book_team_date(match.id, match.home_team.id, date)
@@ -158,9 +166,10 @@ class SchedulingState:
         for time in match.scheduled_times:
             booking_key = (match.facility.id, match.date, time)
             if booking_key in self.facility_bookings:
-                # Remove this match from the list
-                if match.id in self.facility_bookings[booking_key]:
-                    self.facility_bookings[booking_key].remove(match.id)
+                # Remove this match's lines from the list
+                self.facility_bookings[booking_key] = [
+                    booked for booked in self.facility_bookings[booking_key] if booked != match.id
+                ]
                 # If no more matches at this time, remove the key entirely
                 if not self.facility_bookings[booking_key]:
                     del self.facility_bookings[booking_key]
@@ -189,7 +198,10 @@ class SchedulingState:
                 keys_to_update.append(booking_key)
         
         for booking_key in keys_to_update:
-            self.facility_bookings[booking_key].remove(match_id)
+            # A match holds one entry per line booked at this time
+            self.facility_bookings[booking_key] = [
+                booked for booked in self.facility_bookings[booking_key] if booked != match_id
+            ]
             # If no more matches at this time, remove the key entirely
             if not self.facility_bookings[booking_key]:
                 del self.facility_bookings[booking_key]
@@ -204,7 +216,8 @@ class SchedulingState:
             del self.team_bookings[team_key]
 
     def update_match_bookings(self, match_id: int, facility_id: int, date: str, 
-                              times: List[str], home_team_id: int, visitor_team_id: int):
+                              times: List[str], home_team_id: int, visitor_team_id: int,
+                              duration_minutes: Optional[int] = None):
         """
         Atomically update bookings for a match to avoid race conditions during scheduling.
         This method clears existing bookings and adds new ones in a single operation.
@@ -214,26 +227,62 @@ class SchedulingState:
         
         # Book new time slots and team dates
         if times:
+            self.match_durations[match_id] = duration_minutes
             for time in times:
                 self.book_time_slot(match_id, facility_id, date, time)
             self.book_team_date(match_id, home_team_id, date)
             self.book_team_date(match_id, visitor_team_id, date)
     
+    def snapshot(self) -> Dict[str, Any]:
+        """Capture the current bookings and operation count so they can be restored"""
+        return {
+            'facility_bookings': {key: match_ids.copy() for key, match_ids in self.facility_bookings.items()},
+            'team_bookings': dict(self.team_bookings),
+            'match_durations': dict(self.match_durations),
+            'operations': len(self.operations),
+        }
+    
+    def restore(self, snapshot: Dict[str, Any]):
+        """Restore bookings and truncate operations to a snapshot taken with snapshot()"""
+        self.facility_bookings = {key: match_ids.copy() for key, match_ids in snapshot['facility_bookings'].items()}
+        self.team_bookings = dict(snapshot['team_bookings'])
+        self.match_durations = dict(snapshot.get('match_durations', {}))
+        del self.operations[snapshot['operations']:]
+    
+    def record_operation(self, operation_type: str, description: str, **details):
+        """Append a descriptive entry (e.g. a repair move) to the operations log"""
+        self.operations.append({'type': operation_type, 'description': description, **details})
+    
     def clear(self):
         """Clear all bookings and operations"""
         self.facility_bookings.clear()
         self.team_bookings.clear()
+        self.match_durations.clear()
         self.operations.clear()
         
     
     def get_facility_usage(self, facility_id: int, date: date) -> List[str]:
         """Get all booked times for a facility on a specific date (with duplicates for multiple matches)"""
         booked_times = []
+        date = _as_date(date)
         for (fid, dt, time), match_ids in self.facility_bookings.items():
             if fid == facility_id and dt == date:
                 # Add the time once for each match booked at this time
                 booked_times.extend([time] * len(match_ids))
-        return sorted(booked_times)
+        return sort_times(booked_times)
+    
+    def get_facility_bookings(self, facility_id: int, date: date) -> List[Tuple[int, List[str], Optional[int]]]:
+        """Get (match_id, booked times, match_duration_minutes) per match booked at a facility on a date"""
+        times_by_match: Dict[int, List[str]] = {}
+        date = _as_date(date)
+        for (fid, dt, time), match_ids in self.facility_bookings.items():
+            if fid == facility_id and dt == date:
+                for match_id in match_ids:
+                    times_by_match.setdefault(match_id, []).append(time)
+        return [
+            (match_id, sort_times(times), self.match_durations.get(match_id))
+            for match_id, times in sorted(times_by_match.items())
+        ]
     
     def get_team_schedule(self, team_id: int) -> List[str]:
         """Get all dates when a team is scheduled"""
@@ -245,7 +294,7 @@ class SchedulingState:
     
     def get_facility_usage_count(self, facility_id: int, date: date, time: str) -> int:
         """Get the number of matches booked at a specific facility, date, and time"""
-        booking_key = (facility_id, date, time)
+        booking_key = (facility_id, _as_date(date), time)
         if booking_key in self.facility_bookings:
             return len(self.facility_bookings[booking_key])
         return 0
@@ -259,6 +308,7 @@ class SchedulingState:
     def get_all_facility_bookings(self, facility_id: int, date: date) -> Dict[str, List[int]]:
         """Get all bookings for a facility on a specific date, organized by time"""
         bookings = {}
+        date = _as_date(date)
         for (fid, dt, time), match_ids in self.facility_bookings.items():
             if fid == facility_id and dt == date:
                 bookings[time] = match_ids.copy()  # Return a copy to prevent modification
@@ -0,0 +1,152 @@
+"""
+Season Calendar Index
+
+Scoring and availability look at every candidate date of a league window
+and used to derive the same facts per call: the weekday name
+(``strftime('%A')``), the database key (``strftime('%Y-%m-%d')``) and the
+round window (date arithmetic with timedelta).  SeasonCalendar computes them
+once per league window:
+
+- CalendarDay per date: ordinal, weekday index, day name and string key
+- ``by_date`` / ``by_key`` dicts, so mapping database rows back to dates is
+  a dict lookup
+- per round count, the day offsets of each round window and the round index
+  of each date
+
+Calendars are cached by (start, end); ``calendar_day`` covers dates outside
+any league window (facility availability for arbitrary dates).
+"""
+
+from datetime import date, timedelta
+from functools import lru_cache
+from typing import Dict, Iterator, List, NamedTuple, Optional, Tuple
+
+from compact_schedule import WEEKDAYS
+
+
+class CalendarDay(NamedTuple):
+    """Precomputed facts of one date"""
+
+    date: date
+    ordinal: int  # date.toordinal()
+    weekday: int  # 0 = Monday ... 6 = Sunday
+    day_name: str  # "Monday" ... "Sunday"
+    key: str  # "YYYY-MM-DD", as stored in the database
+
+
+def _make_day(date_obj: date) -> CalendarDay:
+    weekday = date_obj.weekday()
+    return CalendarDay(date_obj, date_obj.toordinal(), weekday, WEEKDAYS[weekday], date_obj.isoformat())
+
+
+@lru_cache(maxsize=4096)
+def calendar_day(date_obj: date) -> CalendarDay:
+    """CalendarDay of any date (memoized)"""
+    return _make_day(date_obj)
+
+
+class SeasonCalendar:
+    """
+    Index of the dates from ``start`` to ``end`` (inclusive, empty if end is before start)
+
+    Args:
+        start: First date of the window
+        end: Last date of the window
+    """
+
+    def __init__(self, start: date, end: date):
+        self.start = start
+        self.end = end
+        self.start_ordinal = start.toordinal()
+        self.days: Tuple[CalendarDay, ...] = tuple(
+            calendar_day(start + timedelta(days=offset)) for offset in range((end - start).days + 1)
+        )
+        self.by_date: Dict[date, CalendarDay] = {day.date: day for day in self.days}
+        self.by_key: Dict[str, CalendarDay] = {day.key: day for day in self.days}
+        self._rounds: Dict[float, Tuple[int, Tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self.days)
+
+    def __iter__(self) -> Iterator[CalendarDay]:
+        return iter(self.days)
+
+    def __contains__(self, date_obj: object) -> bool:
+        return date_obj in self.by_date
+
+    @property
+    def length_days(self) -> int:
+        """Days from start to end (the league length used for round windows)"""
+        return (self.end - self.start).days
+
+    def day(self, date_obj: date) -> CalendarDay:
+        """CalendarDay of a date, inside the window or not"""
+        day = self.by_date.get(date_obj)
+        return day if day is not None else calendar_day(date_obj)
+
+    def date_for_key(self, key: str) -> Optional[date]:
+        """Date of a YYYY-MM-DD key inside the window, None otherwise"""
+        day = self.by_key.get(key)
+        return day.date if day is not None else None
+
+    def offset(self, date_obj: date) -> int:
+        """Days from the window start to a date (negative before the start)"""
+        return date_obj.toordinal() - self.start_ordinal
+
+    def dates_between(self, start: date, end: date) -> List[date]:
+        """Dates from ``start`` to ``end`` inclusive (the window's own when inside it)"""
+        if start > end:
+            return []
+        first, last = self.offset(start), self.offset(end)
+        if 0 <= first and last < len(self.days):
+            return [day.date for day in self.days[first:last + 1]]
+        return [start + timedelta(days=offset) for offset in range(last - first + 1)]
+
+    # ========== Rounds ==========
+
+    def days_per_round(self, num_rounds: float) -> int:
+        """
+        Length of a round window: the season length divided by the rounds, rounded up
+
+        Raises:
+            ZeroDivisionError: If num_rounds is 0
+        """
+        return self._round_table(num_rounds)[0]
+
+    def _round_table(self, num_rounds: float) -> Tuple[int, Tuple[int, ...]]:
+        table = self._rounds.get(num_rounds)
+        if table is None:
+            league_days = self.length_days
+            days_per_round = league_days // num_rounds
+            if league_days % num_rounds != 0:
+                days_per_round += 1
+            days_per_round = int(days_per_round)
+            round_index = tuple(offset // days_per_round + 1 if days_per_round else 1
+                                for offset in range(len(self.days)))
+            table = (days_per_round, round_index)
+            self._rounds[num_rounds] = table
+        return table
+
+    def round_index(self, date_obj: date, num_rounds: float) -> Optional[int]:
+        """Round of a date inside the season (the later one on a shared boundary day), None outside it"""
+        offset = self.offset(date_obj)
+        if not 0 <= offset < len(self.days):
+            return None
+        return self._round_table(num_rounds)[1][offset]
+
+    def round_bounds(self, round_num: int, num_rounds: float) -> Tuple[int, int]:
+        """(first, last) day offsets of a round window; consecutive windows share their boundary day"""
+        days_per_round = self._round_table(num_rounds)[0]
+        first = (round_num - 1) * days_per_round
+        return first, first + days_per_round
+
+    def in_round(self, date_obj: date, round_num: int, num_rounds: float) -> bool:
+        """True if a date falls in a round's window (boundary days count for both rounds)"""
+        first, last = self.round_bounds(round_num, num_rounds)
+        return first <= self.offset(date_obj) <= last
+
+
+@lru_cache(maxsize=64)
+def season_calendar(start: date, end: date) -> SeasonCalendar:
+    """Shared SeasonCalendar of a league window (cached by its dates)"""
+    return SeasonCalendar(start, end)
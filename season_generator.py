@@ -0,0 +1,351 @@
+"""
+Synthetic Season Generator
+
+The YAML seasons under ``testing/`` top out at a few dozen teams, which is
+too small to see how the scheduler behaves at production scale.  This module
+generates seasons of any size from a SeasonSpec:
+
+- leagues with a number of teams, lines per match and preferred/backup days
+- facilities with weekday-evening and weekend start times, a configurable
+  range of courts and a share of blacked-out dates
+- teams spread over neighbouring facilities ("regions"), with preferred days
+  drawn from a weighted distribution
+- round-robin matches from MatchGenerator
+
+The result is the same dictionary shape ``import_from_yaml`` reads
+(facilities, leagues, teams, matches), so it can be written as YAML and
+loaded into SQLite through the normal import path.  ``SeasonSpec.scaled``
+multiplies leagues and facilities (so 10x is ten times the teams, courts and
+matches with the same density) and generation is deterministic per seed.
+
+Usage:
+    python season_generator.py --scale 10 --yaml season_10x.yaml --db season_10x.db
+"""
+
+import logging
+import random
+from dataclasses import dataclass, field, asdict, replace
+from datetime import date, timedelta
+from typing import Any, Dict, List, Optional, Tuple
+
+import yaml
+
+from usta_constants import USTA_AGE_GROUPS, USTA_DIVISIONS, USTA_REGIONS
+from usta_facility import Facility
+from usta_league import League
+from usta_team import Team
+
+logger = logging.getLogger(__name__)
+
+DAYS = ("Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday")
+
+# Share of teams preferring each day (a team draws up to two distinct days)
+DEFAULT_DAY_WEIGHTS = {
+    "Monday": 0.05, "Tuesday": 0.10, "Wednesday": 0.05, "Thursday": 0.10,
+    "Friday": 0.05, "Saturday": 0.35, "Sunday": 0.30,
+}
+
+# First IDs used for generated entities (kept clear of the testing/ datasets)
+FACILITY_ID_BASE = 10000
+LEAGUE_ID_BASE = 10000
+TEAM_ID_BASE = 100000
+MATCH_ID_BASE = 1000000
+
+
+@dataclass
+class SeasonSpec:
+    """Size and shape of a generated season (the defaults are the 1x season)"""
+
+    leagues: int = 6
+    teams_per_league: int = 8
+    matches_per_team: int = 6
+    lines_per_match: Tuple[int, ...] = (3, 5)
+    facilities: int = 6
+    courts: Tuple[int, int] = (3, 8)
+    facilities_per_team: Tuple[int, int] = (1, 2)
+    region_size: int = 4
+    start_date: date = date(2025, 3, 1)
+    weeks: int = 10
+    day_weights: Dict[str, float] = field(default_factory=lambda: dict(DEFAULT_DAY_WEIGHTS))
+    no_preference_share: float = 0.25
+    blackout_share: float = 0.04
+    allow_split_share: float = 0.25
+    seed: int = 1
+
+    def scaled(self, factor: int) -> 'SeasonSpec':
+        """Copy with ``factor`` times the leagues and facilities (same density)"""
+        if factor < 1:
+            raise ValueError(f"Scale factor must be at least 1, got: {factor}")
+        return replace(self, leagues=self.leagues * factor, facilities=self.facilities * factor)
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        data["start_date"] = self.start_date.isoformat()
+        data["lines_per_match"] = list(self.lines_per_match)
+        data["courts"] = list(self.courts)
+        data["facilities_per_team"] = list(self.facilities_per_team)
+        return data
+
+    def validate(self) -> None:
+        """
+        Raises:
+            ValueError: If the spec cannot produce a valid season
+        """
+        if self.leagues < 1 or self.facilities < 1:
+            raise ValueError("A season needs at least one league and one facility")
+        if self.teams_per_league < 2:
+            raise ValueError("Leagues need at least 2 teams")
+        if (self.teams_per_league * self.matches_per_team) % 2:
+            raise ValueError("teams_per_league × matches_per_team must be even")
+        if not 1 <= self.courts[0] <= self.courts[1]:
+            raise ValueError(f"Invalid court range: {self.courts}")
+        if not self.lines_per_match or not all(1 <= lines <= 10 for lines in self.lines_per_match):
+            raise ValueError(f"Lines per match must be between 1 and 10: {self.lines_per_match}")
+        unknown = set(self.day_weights) - set(DAYS)
+        if unknown:
+            raise ValueError(f"Unknown day names in day_weights: {sorted(unknown)}")
+        if self.weeks < 1:
+            raise ValueError("A season lasts at least one week")
+
+    @property
+    def end_date(self) -> date:
+        return self.start_date + timedelta(weeks=self.weeks) - timedelta(days=1)
+
+
+class SeasonGenerator:
+    """Builds import_from_yaml-shaped season data from a SeasonSpec"""
+
+    def __init__(self, spec: SeasonSpec):
+        spec.validate()
+        self.spec = spec
+        self.rng = random.Random(spec.seed)
+
+    # ========== Entities ==========
+
+    def _facility(self, index: int) -> Dict[str, Any]:
+        low, high = self.spec.courts
+        courts = self.rng.randint(low, high)
+        schedule = {}
+        for day in DAYS:
+            if day in ("Saturday", "Sunday"):
+                times = ["09:00", "11:00", "13:00", "15:00"][:self.rng.randint(2, 4)]
+            elif self.rng.random() < 0.8:
+                times = ["18:00"] + (["19:30"] if self.rng.random() < 0.4 else [])
+            else:
+                times = []
+            schedule[day] = {"start_times": [{"time": t, "available_courts": courts} for t in times]}
+
+        season_days = self.spec.weeks * 7
+        blackouts = sorted(self.rng.sample(range(season_days), int(season_days * self.spec.blackout_share)))
+        facility_id = FACILITY_ID_BASE + index
+        return {
+            "id": facility_id,
+            "name": f"Synthetic Tennis Club {index + 1}",
+            "short_name": f"STC{index + 1}",
+            "location": f"Region {index // self.spec.region_size + 1}",
+            "total_courts": courts,
+            "schedule": schedule,
+            "unavailable_dates": [(self.spec.start_date + timedelta(days=d)).isoformat() for d in blackouts],
+        }
+
+    def _days(self, count: int) -> List[str]:
+        """Up to ``count`` distinct days drawn from the day weights"""
+        days, weights = zip(*self.spec.day_weights.items())
+        chosen: List[str] = []
+        for _ in range(count * 4):
+            day = self.rng.choices(days, weights)[0]
+            if day not in chosen:
+                chosen.append(day)
+            if len(chosen) == count:
+                break
+        return sorted(chosen, key=DAYS.index)
+
+    def _league(self, index: int) -> Dict[str, Any]:
+        preferred = self._days(2)
+        backup = [day for day in self._days(2) if day not in preferred][:1]
+        return {
+            "id": LEAGUE_ID_BASE + index,
+            "name": f"Synthetic League {index + 1}",
+            "year": self.spec.start_date.year,
+            "section": "Southwest",
+            "region": USTA_REGIONS[index % len(USTA_REGIONS)],
+            "age_group": USTA_AGE_GROUPS[index % len(USTA_AGE_GROUPS)],
+            "division": USTA_DIVISIONS[index % len(USTA_DIVISIONS)],
+            "num_lines_per_match": self.rng.choice(self.spec.lines_per_match),
+            "num_matches": self.spec.matches_per_team,
+            "allow_split_lines": self.rng.random() < self.spec.allow_split_share,
+            "preferred_days": preferred,
+            "backup_days": backup,
+            "start_date": self.spec.start_date.isoformat(),
+            "end_date": self.spec.end_date.isoformat(),
+        }
+
+    def _region_facilities(self, league_index: int) -> List[int]:
+        """Facility IDs of the region a league plays in (leagues are spread evenly over facilities)"""
+        spec = self.spec
+        center = league_index * spec.facilities // spec.leagues
+        first = max(0, min(center - spec.region_size // 2, spec.facilities - spec.region_size))
+        return [FACILITY_ID_BASE + i for i in range(first, min(spec.facilities, first + spec.region_size))]
+
+    def _teams(self, league: Dict[str, Any], league_index: int, next_id: int) -> List[Dict[str, Any]]:
+        region = self._region_facilities(league_index)
+        low, high = self.spec.facilities_per_team
+        teams = []
+        for position in range(self.spec.teams_per_league):
+            count = min(len(region), self.rng.randint(low, high))
+            preferred_days = [] if self.rng.random() < self.spec.no_preference_share else self._days(
+                self.rng.randint(1, 2))
+            teams.append({
+                "id": next_id + position,
+                "name": f"{league['name']} Team {position + 1}",
+                "league_id": league["id"],
+                "preferred_facility_ids": self.rng.sample(region, count),
+                "captain": f"Captain {next_id + position}",
+                "preferred_days": preferred_days,
+            })
+        return teams
+
+    def _matches(self, league: Dict[str, Any], teams: List[Dict[str, Any]],
+                 facilities: Dict[int, Facility], next_id: int) -> List[Dict[str, Any]]:
+        """Round-robin pairings of a league (MatchGenerator), renumbered to be unique across leagues"""
+        from match_generator import MatchGenerator
+
+        league_obj = League(**dict(league, start_date=self.spec.start_date, end_date=self.spec.end_date))
+        team_objs = [
+            Team(id=team["id"], name=team["name"], league=league_obj,
+                 preferred_facilities=[facilities[fid] for fid in team["preferred_facility_ids"]],
+                 captain=team["captain"], preferred_days=team["preferred_days"])
+            for team in teams
+        ]
+        generated = MatchGenerator().generate_matches(team_objs, league_obj)
+        return [
+            {
+                "id": next_id + position,
+                "league_id": league["id"],
+                "home_team_id": match.home_team.id,
+                "visitor_team_id": match.visitor_team.id,
+                "round": match.round,
+                "num_rounds": match.num_rounds,
+            }
+            for position, match in enumerate(generated)
+        ]
+
+    # ========== Season ==========
+
+    def generate(self) -> Dict[str, Any]:
+        """
+        Generate the season
+
+        Returns:
+            Dictionary with metadata, facilities, leagues, teams and matches
+            in the import_from_yaml format
+        """
+        spec = self.spec
+        facilities = [self._facility(i) for i in range(spec.facilities)]
+        facility_objs = {record["id"]: Facility.from_yaml_dict(record) for record in facilities}
+
+        leagues, teams, matches = [], [], []
+        for index in range(spec.leagues):
+            league = self._league(index)
+            league_teams = self._teams(league, index, TEAM_ID_BASE + len(teams))
+            matches.extend(self._matches(league, league_teams, facility_objs, MATCH_ID_BASE + len(matches)))
+            leagues.append(league)
+            teams.extend(league_teams)
+
+        logger.info(f"Generated {len(leagues)} leagues, {len(teams)} teams, {len(facilities)} facilities "
+                    f"and {len(matches)} matches (seed {spec.seed})")
+        return {
+            "metadata": {"generator": "season_generator", "spec": spec.to_dict()},
+            "facilities": facilities,
+            "leagues": leagues,
+            "teams": teams,
+            "matches": matches,
+        }
+
+
+def generate_season(spec: Optional[SeasonSpec] = None, scale: int = 1) -> Dict[str, Any]:
+    """Generate a season from a spec (default: the 1x spec), multiplied by ``scale``"""
+    return SeasonGenerator((spec or SeasonSpec()).scaled(scale)).generate()
+
+
+def write_season_yaml(season: Dict[str, Any], path: str) -> None:
+    """Write season data as a YAML file ``simple_cli load`` and the web import accept"""
+    with open(path, "w", encoding="utf-8") as f:
+        yaml.safe_dump(season, f, default_flow_style=False, sort_keys=False, width=120)
+
+
+def build_season_database(yaml_path: str, db_path: str) -> Dict[str, Any]:
+    """
+    Load a season YAML file into a new SQLite database
+
+    Args:
+        yaml_path: Season YAML file (see write_season_yaml)
+        db_path: SQLite database to create
+
+    Returns:
+        import_from_yaml statistics
+
+    Raises:
+        ValueError: If the database file already exists
+        RuntimeError: If the import reports errors
+    """
+    import os
+    from sqlite_tennis_db import SQLiteTennisDB
+
+    if os.path.exists(db_path):
+        raise ValueError(f"Database {db_path} already exists")
+
+    db = SQLiteTennisDB({"db_path": db_path})
+    db.connect()
+    try:
+        stats = db.import_from_yaml(yaml_path, skip_existing=False)
+    finally:
+        db.disconnect()
+    if stats["total_errors"]:
+        raise RuntimeError(f"Season import reported {stats['total_errors']} errors")
+    return stats
+
+
+def main() -> int:
+    """Command-line interface: generate a season and write it as YAML and/or SQLite"""
+    import argparse
+
+    parser = argparse.ArgumentParser(description="Generate a synthetic tennis season")
+    parser.add_argument("--scale", type=int, default=1, help="Multiply leagues and facilities (default: 1)")
+    parser.add_argument("--leagues", type=int, help="Leagues at 1x (default: %d)" % SeasonSpec.leagues)
+    parser.add_argument("--teams-per-league", type=int, help="Teams per league")
+    parser.add_argument("--facilities", type=int, help="Facilities at 1x")
+    parser.add_argument("--min-courts", type=int, help="Fewest courts per facility")
+    parser.add_argument("--max-courts", type=int, help="Most courts per facility")
+    parser.add_argument("--weeks", type=int, help="Season length in weeks")
+    parser.add_argument("--blackout-share", type=float, help="Share of season dates each facility is closed")
+    parser.add_argument("--seed", type=int, default=1, help="Random seed (default: 1)")
+    parser.add_argument("--yaml", required=True, help="YAML file to write")
+    parser.add_argument("--db", help="Optional SQLite database to create from the YAML file")
+    args = parser.parse_args()
+
+    spec = SeasonSpec(seed=args.seed)
+    overrides = {
+        "leagues": args.leagues, "teams_per_league": args.teams_per_league, "facilities": args.facilities,
+        "weeks": args.weeks, "blackout_share": args.blackout_share,
+    }
+    spec = replace(spec, **{key: value for key, value in overrides.items() if value is not None})
+    if args.min_courts or args.max_courts:
+        spec = replace(spec, courts=(args.min_courts or spec.courts[0], args.max_courts or spec.courts[1]))
+
+    try:
+        season = generate_season(spec, args.scale)
+        write_season_yaml(season, args.yaml)
+        print(f"Wrote {args.yaml}: {len(season['leagues'])} leagues, {len(season['teams'])} teams, "
+              f"{len(season['facilities'])} facilities, {len(season['matches'])} matches")
+        if args.db:
+            stats = build_season_database(args.yaml, args.db)
+            print(f"Created {args.db}: {stats['total_imported']} records in {stats['duration_seconds']}s")
+    except (ValueError, RuntimeError) as e:
+        print(f"Error: {e}")
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(main())
@@ -36,14 +36,19 @@ from typing import Dict, Any, Optional, List, Tuple
 import logging
 from dataclasses import dataclass, field
 
-from scheduling_manager import SchedulingManager
+from scheduling_manager import SchedulingManager, ORDERINGS
+from schedule_solver import SOLVER_BACKENDS
+from schedule_checkpoint import DEFAULT_CHECKPOINT_INTERVAL
+from query_profiler import DEFAULT_TOP_STATEMENTS, format_summary
+from scheduling_profile import format_profile
+from run_profiler import PROFILERS, RunProfile, format_run_profile
+from query_audit import capture_statements, format_audit
+from scheduler_benchmark import (DEFAULT_DATA_DIR, DEFAULT_THRESHOLD, compare_with_baseline, format_gate,
+                                 load_baseline, prepare_dataset, run_gate, write_report)
+from logging_setup import configure_logging
 import scheduling_manager
 from usta import Match, MatchType, League, Team, Facility
 
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-)
 logger = logging.getLogger(__name__)
 
 try:
@@ -86,14 +91,28 @@ Examples:
   tennis_cli.py --db-path tennis.db auto-schedule
   tennis_cli.py --db-path tennis.db auto-schedule --execute
   
+  # Profile a run (writes profiles/<run id>.pstats, prints the top functions)
+  tennis_cli.py --db-path tennis.db auto-schedule --workers 1 --profile
+  tennis_cli.py --db-path tennis.db optimize-schedule --profile sampling
+  
   # Test functionality
   tennis_cli.py --db-path tennis.db test --comprehensive
+  
+  # Performance regression gate (exits 1 when a metric grew past the threshold)
+  tennis_cli.py --db-path tennis.db bench --save-baseline bench_baseline.json
+  tennis_cli.py --db-path tennis.db bench --baseline bench_baseline.json --threshold 0.25
             """
         )
         
         # Database arguments
         parser.add_argument('--db-path', required=True, help='SQLite database path')
-        parser.add_argument('--verbose', '-v', action='store_true', help='Verbose output')
+        parser.add_argument('--verbose', '-v', action='store_true',
+                            help='Verbose output, including per-match trace logging '
+                                 '(also enabled by TENNIS_TRACE=1)')
+        parser.add_argument('--profile-sql', nargs='?', type=int, const=DEFAULT_TOP_STATEMENTS, metavar='TOP',
+                            help='Print SQL statement count, time and the TOP most expensive statements '
+                                 f'after the command (default TOP: {DEFAULT_TOP_STATEMENTS}; '
+                                 'statements of parallel scheduling workers are not included)')
         
         subparsers = parser.add_subparsers(dest="command", help="Available commands")
         
@@ -168,6 +187,13 @@ Examples:
                                          help="ACTUALLY execute scheduling (default is dry-run)")
         auto_schedule_parser.add_argument("--progress", action="store_true", help="Show progress")
         auto_schedule_parser.add_argument("--seed", type=int, help="Seed for reproducible scheduling (optional)")
+        auto_schedule_parser.add_argument("--ordering", choices=ORDERINGS, default="best_option",
+                                         help="Match ordering (default: best_option; most_constrained is deterministic)")
+        auto_schedule_parser.add_argument("--workers", type=int,
+                                         help="Worker processes for independent league groups when no league is "
+                                              "given (default: CPU count, 1 = in-process)")
+        self._add_profile_arguments(auto_schedule_parser,
+                                    hint="worker processes are not profiled, use --workers 1")
         
         # Optimize command - find best auto-schedule with multiple iterations
         optimize_parser = subparsers.add_parser("optimize-schedule", help="Run auto-schedule optimization with multiple iterations")
@@ -179,6 +205,32 @@ Examples:
         optimize_parser.add_argument("--execute", action="store_true", 
                                    help="Execute with best seed after optimization (default is dry-run)")
         optimize_parser.add_argument("--progress", action="store_true", help="Show progress")
+        optimize_parser.add_argument("--ordering", choices=ORDERINGS, default="best_option",
+                                   help="Match ordering used by each iteration (default: best_option)")
+        optimize_parser.add_argument("--mode", choices=["seeds", "annealing", "exact"], default="seeds",
+                                   help="seeds: best of independent greedy runs; annealing: improve one greedy run; "
+                                        "exact: integer program via an installed MILP/CP solver")
+        optimize_parser.add_argument("--time-budget", type=float, default=30.0,
+                                   help="Wall-clock seconds for annealing mode, time limit for exact mode (default: 30)")
+        optimize_parser.add_argument("--seed", type=int, help="Seed for annealing/exact mode (optional)")
+        optimize_parser.add_argument("--solver", choices=["auto"] + list(SOLVER_BACKENDS), default="auto",
+                                   help="Exact solver backend (default: auto, first installed)")
+        optimize_parser.add_argument("--checkpoint", metavar="PATH",
+                                   help="Save the best solution to this checkpoint file during the run")
+        optimize_parser.add_argument("--checkpoint-interval", type=float, default=DEFAULT_CHECKPOINT_INTERVAL,
+                                   help=f"Seconds between checkpoint writes (default: {DEFAULT_CHECKPOINT_INTERVAL:.0f})")
+        optimize_parser.add_argument("--resume", metavar="PATH",
+                                   help="Start from the best solution of a checkpoint file")
+        optimize_parser.add_argument("--warm-start", choices=["greedy", "committed"], default="greedy",
+                                   help="greedy: optimize unscheduled matches only; committed: also re-optimize "
+                                        "the scope's scheduled matches, starting from the committed schedule "
+                                        "(annealing/exact mode)")
+        optimize_parser.add_argument("--commit-checkpoint", metavar="PATH",
+                                   help="Apply the best solution of a checkpoint without optimizing "
+                                        "(dry-run unless --execute)")
+        optimize_parser.add_argument("--force", action="store_true",
+                                   help="With --commit-checkpoint: apply even if the scope changed since the run")
+        self._add_profile_arguments(optimize_parser)
         
         # Schedule command - DRY-RUN BY DEFAULT
         schedule_parser = subparsers.add_parser("schedule", help="Schedule specific match (DRY-RUN by default)")
@@ -219,6 +271,30 @@ Examples:
         # Health command
         health_parser = subparsers.add_parser("health", help="Check database health")
         
+        # Bench command - performance regression gate
+        bench_parser = subparsers.add_parser("bench", help="Measure fixed workloads and compare with a baseline")
+        bench_parser.add_argument("--baseline", help="Baseline JSON to compare with; exits 1 on a regression")
+        bench_parser.add_argument("--save-baseline", metavar="PATH", help="Write the results as a new baseline")
+        bench_parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                                  help="Allowed relative increase of a metric over the baseline "
+                                       f"(default: {DEFAULT_THRESHOLD})")
+        bench_parser.add_argument("--repeats", type=int, default=3, help="Timed runs per workload (default: 3)")
+        bench_parser.add_argument("--scale", type=int,
+                                  help="Measure a generated season of this scale instead of --db-path")
+        bench_parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR,
+                                  help=f"Directory for generated seasons (default: {DEFAULT_DATA_DIR})")
+        
+        # Audit-sql command - EXPLAIN QUERY PLAN of the statements a workload executes
+        audit_parser = subparsers.add_parser("audit-sql",
+                                             help="Audit the query plans of the statements the bench workloads run")
+        audit_parser.add_argument("--scale", type=int,
+                                  help="Audit a generated season of this scale instead of --db-path")
+        audit_parser.add_argument("--data-dir", default=DEFAULT_DATA_DIR,
+                                  help=f"Directory for generated seasons (default: {DEFAULT_DATA_DIR})")
+        audit_parser.add_argument("--limit", type=int, help="Show at most this many flagged statements")
+        audit_parser.add_argument("--output", choices=["json", "summary"], default="summary",
+                                  help="Output format (default: summary)")
+        
         # Facility requirements command
         facility_req_parser = subparsers.add_parser("facility-requirements", 
                                                    help="Calculate facility requirements for a league")
@@ -230,12 +306,14 @@ Examples:
                                         help="Output format (default: summary)")
         
         args = parser.parse_args()
+        configure_logging(verbose=args.verbose)
         
         if not args.command:
             parser.print_help()
             return 1
         
         # Connect to database
+        db = None
         try:
             backend_enum = DatabaseBackend('sqlite')
             config = {'db_path': args.db_path}
@@ -252,9 +330,9 @@ Examples:
             elif args.command == "generate-matches":
                 return self.handle_generate_matches(args, db)
             elif args.command == "auto-schedule":
-                return self.handle_auto_schedule(args, db)
+                return self._run_profiled(args, "auto_schedule", self.handle_auto_schedule, db)
             elif args.command == "optimize-schedule":
-                return self.handle_optimize_schedule(args, db)
+                return self._run_profiled(args, "optimize", self.handle_optimize_schedule, db)
             elif args.command == "schedule":
                 return self.handle_schedule(args, db)
             elif args.command == "unschedule":
@@ -269,6 +347,10 @@ Examples:
                 return self.handle_health(args, db)
             elif args.command == "facility-requirements":
                 return self.handle_facility_requirements(args, db)
+            elif args.command == "bench":
+                return self.handle_bench(args, db)
+            elif args.command == "audit-sql":
+                return self.handle_audit_sql(args, db)
             else:
                 print(f"Unknown command: {args.command}")
                 return 1
@@ -279,6 +361,9 @@ Examples:
                 traceback.print_exc()
             return 1
         finally:
+            if args.profile_sql is not None and getattr(db, 'query_stats', None) is not None:
+                print()
+                print(format_summary(db.query_stats, top=args.profile_sql))
             if self.db_manager:
                 try:
                     self.db_manager.disconnect()
@@ -845,9 +930,9 @@ Examples:
                 if not league:
                     print(f"League {args.league_id} not found")
                     return 1
-                matches = db.list_matches(league=league, match_type=match_type)
+                matches = db.list_match_summaries(league=league, match_type=match_type)
             else:
-                matches = db.list_matches(match_type=match_type)
+                matches = db.list_match_summaries(match_type=match_type)
             
             if args.format == 'json':
                 matches_data = [
@@ -863,7 +948,7 @@ Examples:
                     }
                     for match in matches
                 ]
-                print(json.dumps(matches_data, indent=2))
+                print(json.dumps(matches_data, indent=2, default=str))
             else:
                 self._pretty_print_matches(matches, args.league_id)
             
@@ -1022,7 +1107,25 @@ Examples:
             # Auto-schedule all matches at once
             try:
                 scheduling_manager = SchedulingManager(db)
-                results = scheduling_manager.auto_schedule_matches(all_unscheduled_matches, dry_run=dry_run, seed=seed)
+                if args.ordering != "best_option":
+                    print(f"Match ordering: {args.ordering}")
+                if target_league_ids is None and not args.max_matches:
+                    # All leagues: schedule groups that share no team or facility independently
+                    results = scheduling_manager.auto_schedule_components(all_unscheduled_matches, dry_run=dry_run,
+                                                                          seed=seed, ordering=args.ordering,
+                                                                          max_workers=args.workers)
+                    decomposition = results['decomposition']
+                    print(f"Independent components: {decomposition['components']} "
+                          f"(largest: {decomposition['largest_component']} matches, "
+                          f"workers: {decomposition['workers']})")
+                    if args.progress:
+                        for component in results['components']:
+                            print(f"  Component {component['index'] + 1}: leagues {component['league_ids']} - "
+                                  f"{component['scheduled']}/{component['matches']} scheduled "
+                                  f"in {component['elapsed']:.2f}s")
+                else:
+                    results = scheduling_manager.auto_schedule_matches(all_unscheduled_matches, dry_run=dry_run,
+                                                                       seed=seed, ordering=args.ordering)
 
                 scheduled_count = results.get('scheduled', 0)
                 failed_count = results.get('failed', 0)
@@ -1063,6 +1166,11 @@ Examples:
                         
                         if len(scheduling_errors) > 3:
                             print(f"  ... and {len(scheduling_errors) - 3} more failures")
+
+                if args.progress and results.get('profile'):
+                    print("Time by stage:")
+                    for line in format_profile(results['profile']):
+                        print(line)
                 
             except Exception as e:
                 print(f"❌ Error auto-scheduling matches: {e}")
@@ -1093,13 +1201,196 @@ Examples:
                 traceback.print_exc()
             return 1
     
+    @staticmethod
+    def _add_profile_arguments(subparser, hint: str = ""):
+        """--profile and --profile-dir of the scheduling commands (hint: extra sentence of the --profile help)"""
+        subparser.add_argument("--profile", nargs="?", choices=PROFILERS, const="cprofile",
+                               help="Profile the run (default profiler: cprofile) and print the top functions "
+                                    "by cumulative time" + (f"; {hint}" if hint else ""))
+        subparser.add_argument("--profile-dir", metavar="DIR",
+                               help="Directory of the <run id>.pstats/.collapsed file "
+                                    "(default: TENNIS_PROFILE_DIR or profiles/)")
+
+    @staticmethod
+    def _run_profiled(args, operation, handler, db):
+        """Run a command handler, under RunProfile when --profile was given"""
+        if not args.profile:
+            return handler(args, db)
+        with RunProfile(operation, profiler=args.profile, output_dir=args.profile_dir) as profile:
+            result = handler(args, db)
+        print()
+        for line in format_run_profile(profile.summary):
+            print(line)
+        return result
+
+    @staticmethod
+    def _checkpoint_options(args) -> Dict[str, Any]:
+        """optimize_auto_schedule checkpoint keyword arguments from the command line"""
+        return {
+            'checkpoint_path': args.checkpoint,
+            'checkpoint_interval': args.checkpoint_interval,
+            'resume_from': args.resume,
+        }
+
+    @staticmethod
+    def _print_checkpoint(result: Dict[str, Any]):
+        if result.get('resumed_from'):
+            skipped = result.get('skipped_assignments') or 0
+            print(f"  Resumed from: {result['resumed_from']}"
+                  + (f" ({skipped} saved assignments no longer fit)" if skipped else ""))
+        checkpoint = result.get('checkpoint')
+        if checkpoint:
+            print(f"  Checkpoint: {checkpoint['path']} ({checkpoint['writes']} writes, best "
+                  f"{checkpoint['best_unscheduled_count']} unscheduled / penalty {checkpoint['best_total_penalty']})")
+            print(f"  Commit it later with: optimize-schedule --commit-checkpoint {checkpoint['path']} --execute")
+
+    def _apply_best(self, scheduling_manager, matches, result, args):
+        """Commit best_assignments of an optimization result"""
+        print("\n🚀 EXECUTING best schedule...")
+        applied = scheduling_manager.apply_assignments(matches, result['best_assignments'], dry_run=False,
+                                                       unschedule_missing=args.warm_start == "committed")
+        print(f"\n✅ EXECUTION COMPLETED:")
+        print(f"  Scheduled: {applied['scheduled']} matches")
+        print(f"  Failed: {applied['failed']} matches")
+        return applied
+
+    def _run_annealing_optimization(self, args, db, matches, dry_run):
+        """Run the simulated-annealing optimizer and optionally commit its best schedule"""
+        start = f"checkpoint {args.resume}" if args.resume else "a greedy run"
+        print(f"Annealing for {args.time_budget:.0f}s starting from {start}...")
+        print("-" * 60)
+
+        last_reported = {'second': -1}
+
+        def progress_callback(update):
+            # Report at most once per second of search time
+            if args.progress and int(update['elapsed']) > last_reported['second']:
+                last_reported['second'] = int(update['elapsed'])
+                print(f"  {update['elapsed']:6.1f}s | iter {update['iteration']:8d} | "
+                      f"T={update['temperature']:7.3f} | best unscheduled {update['best_unscheduled_count']:3d} | "
+                      f"best penalty {update['best_total_penalty']:6d}")
+
+        scheduling_manager = SchedulingManager(db)
+        result = scheduling_manager.optimize_auto_schedule(
+            matches=matches,
+            progress_callback=progress_callback,
+            ordering=args.ordering,
+            mode="annealing",
+            time_budget=args.time_budget,
+            seed=args.seed,
+            **self._checkpoint_options(args)
+        )
+
+        if not result.get('optimization_completed', False):
+            print(f"❌ Optimization failed: {result.get('error', 'Unknown optimization error')}")
+            return 1
+
+        print(f"✅ Annealing completed: {result['iterations']} iterations, "
+              f"{result['accepted_moves']} accepted moves in {result['execution_time']:.1f}s")
+        print(f"  Seed: {result['best_seed']}")
+        if result['greedy_unscheduled_count'] is not None:
+            print(f"  Greedy start unscheduled: {result['greedy_unscheduled_count']}")
+        print(f"  Best unscheduled matches: {result['best_unscheduled_count']}")
+        print(f"  Best total quality penalty: {result['best_total_penalty']}")
+        print(f"  Average quality score: {result['best_quality_score']:.1f}")
+        self._print_checkpoint(result)
+
+        if dry_run:
+            print("\nUse --execute to commit the best schedule found")
+            return 0
+
+        self._apply_best(scheduling_manager, matches, result, args)
+        return 0
+
+    def _run_exact_optimization(self, args, db, matches, dry_run):
+        """Solve the schedule with an exact solver (annealing fallback) and optionally commit it"""
+        print(f"Solving exactly with a {args.time_budget:.0f}s limit (solver: {args.solver})...")
+        print("-" * 60)
+
+        scheduling_manager = SchedulingManager(db)
+        result = scheduling_manager.optimize_auto_schedule(
+            matches=matches,
+            ordering=args.ordering,
+            mode="exact",
+            time_budget=args.time_budget,
+            seed=args.seed,
+            solver_backend=args.solver,
+            **self._checkpoint_options(args)
+        )
+
+        if not result.get('optimization_completed', False):
+            print(f"❌ Optimization failed: {result.get('error', 'Unknown optimization error')}")
+            return 1
+
+        solver = result['solver']
+        greedy = result['greedy']
+        if solver['status'] == 'fallback':
+            installed = ', '.join(solver['available_backends']) or 'none installed'
+            print(f"⚠️  No exact solution (backends: {installed}); used the {solver['fallback']} heuristic")
+        gap = f"{solver['gap'] * 100:.2f}%" if solver['gap'] is not None else "n/a"
+
+        print(f"{'':10} {'Unscheduled':>12} {'Penalty':>10} {'Runtime':>10} {'Gap':>8}")
+        print(f"{('Resumed' if args.resume else 'Greedy'):10} {greedy['unscheduled_count']:>12} "
+              f"{greedy['total_penalty']:>10} {greedy['runtime']:>9.2f}s {'':>8}")
+        print(f"{(solver['backend'] or solver['fallback']):10} {result['best_unscheduled_count']:>12} "
+              f"{result['best_total_penalty']:>10} {solver['runtime']:>9.2f}s {gap:>8}")
+        print(f"  Status: {solver['status']} | {solver['variables']} variables, "
+              f"{solver['capacity_constraints']} capacity constraints")
+        print(f"  Average quality score: {result['best_quality_score']:.1f}")
+        self._print_checkpoint(result)
+
+        if dry_run:
+            print("\nUse --execute to commit the best schedule found")
+            return 0
+
+        self._apply_best(scheduling_manager, matches, result, args)
+        return 0
+
+    def _commit_checkpoint(self, args, db):
+        """Apply the best solution of a checkpoint file without optimizing"""
+        dry_run = not args.execute
+        scheduling_manager = SchedulingManager(db)
+        try:
+            applied = scheduling_manager.apply_checkpoint(args.commit_checkpoint, dry_run=dry_run, force=args.force)
+        except ValueError as e:
+            print(f"❌ Cannot commit checkpoint: {e}")
+            if "rescheduled" in str(e):
+                print("Use --force to apply it anyway")
+            return 1
+
+        checkpoint = applied['checkpoint']
+        print(f"Checkpoint {checkpoint['path']} ({checkpoint['mode']} mode, seed {checkpoint['seed']}, "
+              f"saved {checkpoint['updated_at']})")
+        print(f"  Best unscheduled matches: {checkpoint['best_unscheduled_count']}")
+        print(f"  Best total quality penalty: {checkpoint['best_total_penalty']}")
+        if applied['stale_match_ids']:
+            print(f"⚠️  {len(applied['stale_match_ids'])} matches were rescheduled since the run (--force)")
+        if applied['conflicting_match_ids']:
+            print(f"⚠️  {len(applied['conflicting_match_ids'])} placements conflict with bookings made since the run "
+                  f"and were skipped:")
+            for error in applied['errors']:
+                if error['status'] == "scheduling_failed":
+                    print(f"  - Match {error['match_id']}: {error['reason']}")
+        label = "Would schedule" if dry_run else "Scheduled"
+        print(f"\n{'🧪' if dry_run else '✅'} {label}: {applied['scheduled']} matches")
+        print(f"  Failed: {applied['failed']} matches")
+        if dry_run:
+            print("\nUse --execute to commit this checkpoint")
+        return 0
+
     def handle_optimize_schedule(self, args, db):
         """Handle auto-schedule optimization with multiple iterations"""
         try:
+            if args.commit_checkpoint:
+                return self._commit_checkpoint(args, db)
+
             # Validate iterations parameter
             if args.iterations < 1 or args.iterations > 100:
                 print("Error: iterations must be between 1 and 100")
                 return 1
+            if args.warm_start == "committed" and args.mode == "seeds":
+                print("Error: --warm-start committed needs --mode annealing or exact")
+                return 1
             
             # Parse target leagues
             target_league_ids = None
@@ -1112,25 +1403,29 @@ Examples:
                     print("Error: Invalid league IDs format")
                     return 1
             
-            # Get all unscheduled matches at once
+            # Get all unscheduled matches at once (and the scheduled ones when warm-starting from them)
             from usta import MatchType
+            match_type = MatchType.ALL if args.warm_start == "committed" else MatchType.UNSCHEDULED
             if target_league_ids:
                 # Get matches for specific leagues
                 all_unscheduled_matches = []
                 for league_id in target_league_ids:
                     league = db.get_league(league_id)
                     if league:
-                        league_matches = db.list_matches(league=league, match_type=MatchType.UNSCHEDULED)
+                        league_matches = db.list_matches(league=league, match_type=match_type)
                         all_unscheduled_matches.extend(league_matches)
                     else:
                         print(f"Warning: League {league_id} not found")
             else:
                 # Get all unscheduled matches from all leagues
-                all_unscheduled_matches = db.list_matches(match_type=MatchType.UNSCHEDULED)
+                all_unscheduled_matches = db.list_matches(match_type=match_type)
             
             if not all_unscheduled_matches:
                 print("No unscheduled matches found")
                 return 0
+            if args.warm_start == "committed":
+                committed = sum(1 for m in all_unscheduled_matches if m.is_scheduled())
+                print(f"Warm start: {committed} scheduled matches start from their committed placement")
             
             # Apply max limit if specified
             if args.max_matches and len(all_unscheduled_matches) > args.max_matches:
@@ -1147,14 +1442,22 @@ Examples:
                 print(f"🚀 EXECUTING: Optimizing auto-schedule for {len(all_unscheduled_matches)} matches")
                 print("Will execute with best seed after optimization")
             
+            if args.mode == "annealing":
+                return self._run_annealing_optimization(args, db, all_unscheduled_matches, dry_run)
+            if args.mode == "exact":
+                return self._run_exact_optimization(args, db, all_unscheduled_matches, dry_run)
+
             print(f"Running {args.iterations} optimization iterations...")
             print("-" * 60)
             
             # Run optimization
             try:
-                optimization_result = db.optimize_auto_schedule(
+                scheduling_manager = SchedulingManager(db)
+                optimization_result = scheduling_manager.optimize_auto_schedule(
                     matches=all_unscheduled_matches, 
-                    max_iterations=args.iterations
+                    max_iterations=args.iterations,
+                    ordering=args.ordering,
+                    **self._checkpoint_options(args)
                 )
                 
                 if not optimization_result.get('optimization_completed', False):
@@ -1169,7 +1472,8 @@ Examples:
                 results_history = optimization_result.get('results_history', [])
                 improvement_found = optimization_result.get('improvement_found', False)
                 
-                print(f"✅ Optimization completed after {args.iterations} iterations")
+                print(f"✅ Optimization completed after {len(results_history)} iterations")
+                self._print_checkpoint(optimization_result)
                 print("-" * 60)
                 
                 if improvement_found:
@@ -1194,21 +1498,10 @@ Examples:
                             marker = " *" if is_best else ""
                             print(f"{iteration:9d} | {seed:9d} | {scheduled:11d} | {unscheduled:11d} | {quality:7.1f}{marker}")
                     
-                    # Execute with best seed if requested
+                    # Execute the best schedule if requested (its assignments, not a re-run of the seed)
                     if not dry_run:
-                        print(f"\n🚀 EXECUTING with best seed {best_seed}...")
-                        execute_result = db.auto_schedule_matches(
-                            all_unscheduled_matches, 
-                            dry_run=False, 
-                            seed=best_seed
-                        )
-                        
-                        scheduled_count = execute_result.get('scheduled', 0)
-                        failed_count = execute_result.get('failed', 0)
-                        
-                        print(f"\n✅ EXECUTION COMPLETED:")
-                        print(f"  Scheduled: {scheduled_count} matches")
-                        print(f"  Failed: {failed_count} matches")
+                        execute_result = self._apply_best(scheduling_manager, all_unscheduled_matches,
+                                                          optimization_result, args)
                         
                         if args.progress and execute_result.get('scheduling_details'):
                             print("\nSample scheduled matches:")
@@ -1230,6 +1523,8 @@ Examples:
                             cmd_parts.append(f"--league-ids {args.league_ids}")
                         if args.max_matches:
                             cmd_parts.append(f"--max-matches {args.max_matches}")
+                        if args.ordering != "best_option":
+                            cmd_parts.append(f"--ordering {args.ordering}")
                         cmd_parts.append("--execute")
                         print(f"   {' '.join(cmd_parts)} (with seed {best_seed})")
                 else:
@@ -1453,55 +1748,55 @@ Examples:
             print("📊 TENNIS DATABASE STATISTICS")
             print("=" * 60)
             
-            # Get basic counts
-            leagues = db.list_leagues()
-            facilities = db.list_facilities()
-            teams = db.list_teams()
-            matches = db.list_matches()
-            
-            print("\n📋 BASIC STATISTICS")
-            print("-" * 30)
-            print(f"Total Leagues: {len(leagues)}")
-            print(f"Total Facilities: {len(facilities)}")
-            print(f"Total Teams: {len(teams)}")
-            print(f"Total Matches: {len(matches)}")
-            
             # Filter by league if specified
+            target_league = None
             if args.league_id:
                 target_league = db.get_league(args.league_id)
                 if not target_league:
                     print(f"\nError: League {args.league_id} not found")
                     return 1
-                leagues = [target_league]
+            
+            # Everything below comes from one cached snapshot (rebuilt only when the DB changes)
+            from stats_cache import get_stats_snapshot
+            snapshot = get_stats_snapshot(db, league=target_league)
+            facilities = snapshot['facilities']
+            
+            print("\n📋 BASIC STATISTICS")
+            print("-" * 30)
+            print(f"Total Leagues: {snapshot['leagues_count']}")
+            print(f"Total Facilities: {snapshot['facilities_count']}")
+            print(f"Total Teams: {snapshot['teams_count']}")
+            print(f"Total Matches: {snapshot['matches_count']}")
+            
+            if target_league:
                 print(f"\n🎯 FILTERED BY LEAGUE: {target_league.name}")
             
             # League Statistics
             print("\n🏆 LEAGUE STATISTICS")
             print("-" * 30)
             
-            for league in leagues:
-                league_teams = db.list_teams(league)
-                league_matches = db.list_matches(league=league)
-                scheduled_matches = [m for m in league_matches if m.is_scheduled()]
-                unscheduled_matches = [m for m in league_matches if not m.is_scheduled()]
+            for league_stats in snapshot['league_breakdown']:
+                league = league_stats['league']
+                league_matches_count = league_stats['matches_count']
+                scheduled_count = league_stats['scheduled_count']
                 
                 print(f"\nLeague: {league.name} (ID: {league.id})")
                 print(f"  Year: {league.year}")
                 print(f"  Section: {league.section}, Region: {league.region}")
                 print(f"  Age Group: {league.age_group}, Division: {league.division}")
-                print(f"  Teams: {len(league_teams)}")
-                print(f"  Matches: {len(league_matches)} total")
-                print(f"    Scheduled: {len(scheduled_matches)}")
-                print(f"    Unscheduled: {len(unscheduled_matches)}")
+                print(f"  Teams: {league_stats['teams_count']}")
+                print(f"  Matches: {league_matches_count} total")
+                print(f"    Scheduled: {scheduled_count}")
+                print(f"    Unscheduled: {league_stats['unscheduled_count']}")
                 
-                if len(league_matches) > 0:
-                    completion_rate = (len(scheduled_matches) / len(league_matches)) * 100
+                if league_matches_count > 0:
+                    completion_rate = (scheduled_count / league_matches_count) * 100
                     print(f"  Completion Rate: {completion_rate:.1f}%")
                 
                 # Lines per match info
                 if hasattr(league, 'num_lines_per_match'):
                     print(f"  Lines per Match: {league.num_lines_per_match}")
-                    total_court_hours = len(scheduled_matches) * league.num_lines_per_match
+                    total_court_hours = scheduled_count * league.num_lines_per_match
                     print(f"  Total Court Hours Used: {total_court_hours}")
             
             # Facility Statistics
@@ -1517,15 +1812,9 @@ Examples:
                 
                 # Get facility statistics using the unified method
                 try:
-                    # Get comprehensive facility statistics
-                    facility_stats = db.facility_manager.facility_statistics(
-                        facility=facility,
-                        league=target_league if args.league_id else None,
-                        include_league_breakdown=True,
-                        include_per_day_utilization=True,
-                        include_peak_demand=True,
-                        include_requirements=False
-                    )
+                    facility_stats = snapshot['facility_stats'].get(facility.id, {})
+                    if 'error' in facility_stats:
+                        raise RuntimeError(facility_stats['error'])
                     
                     # Display overall utilization
                     total_utilization = facility_stats.get("total_utilization", 0.0)
@@ -1577,14 +1866,11 @@ Examples:
                     print(f"  Error calculating statistics: {e}")
                 
                 # Count teams using this facility
-                teams_using_facility = [
-                    team for team in teams 
-                    if team.preferred_facilities and facility in team.preferred_facilities
-                ]
+                teams_using_facility = snapshot['facility_team_names'].get(facility.id, [])
                 if teams_using_facility:
                     print(f"  Teams Using Facility: {len(teams_using_facility)}")
-                    for team in teams_using_facility[:3]:  # Show first 3
-                        print(f"    • {team.name}")
+                    for team_name in teams_using_facility[:3]:  # Show first 3
+                        print(f"    • {team_name}")
                     if len(teams_using_facility) > 3:
                         print(f"    ... and {len(teams_using_facility) - 3} more")
             
@@ -1596,16 +1882,9 @@ Examples:
             total_system_slots = 0
             total_system_used = 0
             
-            for facility in facilities:
-                try:
-                    facility_stats = db.facility_manager.facility_statistics(
-                        facility=facility,
-                        league=target_league if args.league_id else None
-                    )
-                    total_system_slots += facility_stats.get("total_available_slots", 0)
-                    total_system_used += facility_stats.get("total_time_slots_used", 0)
-                except Exception:
-                    pass
+            for facility_stats in snapshot['facility_stats'].values():
+                total_system_slots += facility_stats.get("total_available_slots", 0)
+                total_system_used += facility_stats.get("total_time_slots_used", 0)
             
             if total_system_slots > 0:
                 system_utilization = (total_system_used / total_system_slots) * 100
@@ -1615,11 +1894,11 @@ Examples:
                 print(f"Available Capacity: {total_system_slots - total_system_used} slots")
             
             # Match scheduling statistics
-            all_scheduled = sum(1 for m in matches if m.is_scheduled())
-            all_unscheduled = sum(1 for m in matches if not m.is_scheduled())
+            all_scheduled = snapshot['scheduled_count']
+            all_unscheduled = snapshot['unscheduled_count']
             
-            if len(matches) > 0:
-                overall_completion = (all_scheduled / len(matches)) * 100
+            if snapshot['matches_count'] > 0:
+                overall_completion = (all_scheduled / snapshot['matches_count']) * 100
                 print(f"Overall Match Completion: {overall_completion:.1f}%")
                 print(f"Scheduling Backlog: {all_unscheduled} unscheduled matches")
             
@@ -1654,6 +1933,76 @@ Examples:
             print(f"Error: {e}")
             return 1
 
+    def _workload_db(self, args, db):
+        """The connected database, or a generated season's database when --scale is given"""
+        if not args.scale:
+            return db
+        from sqlite_tennis_db import SQLiteTennisDB
+        dataset = prepare_dataset(args.scale, args.data_dir)
+        print(f"Using generated {args.scale}x season: {dataset['db_path']}")
+        workload_db = SQLiteTennisDB({'db_path': dataset['db_path']})
+        workload_db.connect()
+        return workload_db
+
+    def handle_bench(self, args, db):
+        """Handle the performance regression gate"""
+        try:
+            baseline = load_baseline(args.baseline) if args.baseline else None
+            bench_db = self._workload_db(args, db)
+            try:
+                report = run_gate(bench_db, repeats=args.repeats)
+            finally:
+                if bench_db is not db:
+                    bench_db.disconnect()
+            report["database"] = bench_db.db_path
+
+            print(format_gate(report, baseline))
+            if args.save_baseline:
+                write_report(report, args.save_baseline)
+                print(f"Baseline written to {args.save_baseline}")
+            if baseline is None:
+                return 0
+
+            regressions = compare_with_baseline(report, baseline, args.threshold)
+            if not regressions:
+                print(f"✅ No regressions beyond {args.threshold:.0%} against {args.baseline}")
+                return 0
+            print(f"❌ {len(regressions)} regression(s) beyond {args.threshold:.0%} against {args.baseline}:")
+            for regression in regressions:
+                print(f"  {regression['workload']} {regression['metric']}: "
+                      f"{regression['baseline']} -> {regression['current']} ({regression['change']:+.0%})")
+            return 1
+
+        except (ValueError, RuntimeError) as e:
+            print(f"Error running benchmark: {e}")
+            if args.verbose:
+                traceback.print_exc()
+            return 1
+
+    def handle_audit_sql(self, args, db):
+        """Handle the query plan audit of the bench workloads"""
+        try:
+            audit_db = self._workload_db(args, db)
+            try:
+                with capture_statements(audit_db) as audit:
+                    run_gate(audit_db, repeats=1)
+                report = audit.report()
+            finally:
+                if audit_db is not db:
+                    audit_db.disconnect()
+
+            if args.output == "json":
+                print(json.dumps(report, indent=2))
+            else:
+                print(format_audit(report, limit=args.limit))
+            return 0
+
+        except (ValueError, RuntimeError) as e:
+            print(f"Error auditing SQL: {e}")
+            if args.verbose:
+                traceback.print_exc()
+            return 1
+
     def handle_facility_requirements(self, args, db):
         """Handle facility requirements calculation"""
         try:
@@ -1789,7 +2138,7 @@ Examples:
                 times_str = ", ".join(match.scheduled_times) if match.scheduled_times else "No times"
                 print(f"    Status: {status} | Facility: {facility_name} | Date: {match.date} | Times: {times_str}")
             else:
-                expected_lines = match.league.num_lines_per_match
+                expected_lines = match.get_expected_lines()
                 print(f"    Status: {status} | Expected lines: {expected_lines}")
             
             print()
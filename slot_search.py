@@ -0,0 +1,240 @@
+"""
+Line Distribution Search
+
+A match needs one court per line.  The lines can all start at the same time
+("same_time"), be split evenly over two start times ("split_times"), or be
+spread over several start times in any other way ("custom").
+
+CourtCapacityVector stores a facility-day as a compact vector: start times in
+minutes since midnight, sorted, and the free courts at each start time.  It
+also keeps one bitmask per court count k, with bit i set when slot i has at
+least k free courts.  Same-time candidates are then the bits of mask[n], and
+split candidates are pairs drawn from mask[ceil(n/2)] and mask[floor(n/2)].
+
+``find_line_distributions`` enumerates every valid distribution, keeps
+consecutive start times at least ``min_gap_minutes`` apart, and ranks them:
+
+1. fewer distinct start times
+2. more balanced line counts
+3. more free courts left where the lines go (higher availability ratio)
+4. earlier first start time
+
+The same search backs SchedulingOptions.get_best_match_scheduling,
+FacilityAvailabilityInfo.can_accommodate_match and get_scheduling_suggestions,
+and the annealer's candidate placements.
+"""
+
+import math
+from dataclasses import dataclass
+from typing import Any, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from time_of_day import time_to_minutes
+
+SAME_TIME = "same_time"
+SPLIT_TIMES = "split_times"
+CUSTOM = "custom"
+LINE_MODES = (SAME_TIME, SPLIT_TIMES, CUSTOM)
+
+# Minimum minutes between two start times used by one match (as in split-time validation)
+MIN_SLOT_GAP_MINUTES = 60
+
+# Most distinct start times a custom distribution may use
+MAX_CUSTOM_SLOTS = 3
+
+
+@dataclass(frozen=True)
+class LineDistribution:
+    """One way to put a match's lines on a facility-day: (time, lines) per start time"""
+
+    mode: str
+    counts: Tuple[Tuple[str, int], ...]
+    availability: float = 1.0  # Lowest free/total court ratio among the start times used
+
+    @property
+    def times(self) -> List[str]:
+        """One start time per line, in time order (the MatchScheduling.scheduled_times format)"""
+        return [time_str for time_str, count in self.counts for _ in range(count)]
+
+    @property
+    def imbalance(self) -> int:
+        counts = [count for _, count in self.counts]
+        return max(counts) - min(counts)
+
+    def rank_key(self) -> Tuple:
+        return (len(self.counts), self.imbalance, -self.availability, time_to_minutes(self.counts[0][0]))
+
+    def to_dict(self) -> dict:
+        return {
+            "mode": self.mode,
+            "times": self.times,
+            "counts": [{"time": time_str, "lines": count} for time_str, count in self.counts],
+        }
+
+
+class CourtCapacityVector:
+    """Free courts per start time of one facility-day, with bitmasks by court count"""
+
+    __slots__ = ("times", "minutes", "free", "total", "_masks")
+
+    def __init__(self, times: Sequence[str], free: Sequence[int], total: Optional[Sequence[int]] = None):
+        minutes = [time_to_minutes(time_str) for time_str in times]
+        order = sorted(range(len(times)), key=minutes.__getitem__)
+        self.times = tuple(times[i] for i in order)
+        self.minutes = tuple(minutes[i] for i in order)
+        self.free = tuple(max(0, int(free[i])) for i in order)
+        self.total = tuple(int(total[i]) for i in order) if total is not None else self.free
+
+        # _masks[k]: bit i set when slot i has at least k free courts
+        masks = [0] * (max(self.free, default=0) + 1)
+        for index, free_courts in enumerate(self.free):
+            for k in range(free_courts + 1):
+                masks[k] |= 1 << index
+        self._masks = masks
+
+    @classmethod
+    def from_time_slots(cls, time_slots: Iterable[Any]) -> 'CourtCapacityVector':
+        """Build from TimeSlotInfo / TimeSlotAvailability objects (anything with time and available_courts)"""
+        slots = list(time_slots)
+        return cls(
+            [slot.time for slot in slots],
+            [slot.available_courts for slot in slots],
+            [getattr(slot, "total_courts", slot.available_courts) for slot in slots],
+        )
+
+    def mask(self, courts: int) -> int:
+        """Bitmask of slots with at least ``courts`` free courts"""
+        if courts < 0:
+            courts = 0
+        return self._masks[courts] if courts < len(self._masks) else 0
+
+    @staticmethod
+    def indices(mask: int) -> Iterator[int]:
+        index = 0
+        while mask:
+            if mask & 1:
+                yield index
+            mask >>= 1
+            index += 1
+
+    def _availability(self, index: int) -> float:
+        total = self.total[index]
+        return self.free[index] / total if total else 0.0
+
+    def _distribution(self, mode: str, placed: Sequence[Tuple[int, int]]) -> LineDistribution:
+        placed = sorted(placed)
+        return LineDistribution(
+            mode=mode,
+            counts=tuple((self.times[i], count) for i, count in placed),
+            availability=min(self._availability(i) for i, _ in placed),
+        )
+
+    def _gap_ok(self, indices: Sequence[int], min_gap: int) -> bool:
+        minutes = sorted(self.minutes[i] for i in indices)
+        return all(later - earlier >= min_gap for earlier, later in zip(minutes, minutes[1:]))
+
+    # ========== Enumeration ==========
+
+    def same_time(self, lines: int) -> Iterator[LineDistribution]:
+        for index in self.indices(self.mask(lines)):
+            yield self._distribution(SAME_TIME, [(index, lines)])
+
+    def split_times(self, lines: int, min_gap: int = MIN_SLOT_GAP_MINUTES) -> Iterator[LineDistribution]:
+        larger = math.ceil(lines / 2)
+        smaller = lines - larger
+        if smaller <= 0:
+            return
+        seen = set()
+        for first in self.indices(self.mask(larger)):
+            for second in self.indices(self.mask(smaller)):
+                if first == second or not self._gap_ok((first, second), min_gap):
+                    continue
+                key = tuple(sorted(((first, larger), (second, smaller))))
+                if key in seen:
+                    continue
+                seen.add(key)
+                yield self._distribution(SPLIT_TIMES, key)
+
+    def custom(self, lines: int, min_gap: int = MIN_SLOT_GAP_MINUTES,
+               max_slots: int = MAX_CUSTOM_SLOTS) -> Iterator[LineDistribution]:
+        """Distributions over 2..max_slots start times that are neither same-time nor an even split"""
+        larger = math.ceil(lines / 2)
+        usable = list(self.indices(self.mask(1)))
+
+        def extend(start: int, remaining: int, placed: List[Tuple[int, int]]):
+            if remaining == 0:
+                if len(placed) >= 2:
+                    counts = sorted(count for _, count in placed)
+                    if not (len(placed) == 2 and counts == [lines - larger, larger]):
+                        yield self._distribution(CUSTOM, placed)
+                return
+            if len(placed) >= max_slots:
+                return
+            for position in range(start, len(usable)):
+                index = usable[position]
+                if placed and self.minutes[index] - self.minutes[placed[-1][0]] < min_gap:
+                    continue
+                # Leave at least one line for later slots unless this one can finish the match
+                for count in range(min(self.free[index], remaining), 0, -1):
+                    if count == lines:
+                        continue
+                    placed.append((index, count))
+                    yield from extend(position + 1, remaining - count, placed)
+                    placed.pop()
+
+        yield from extend(0, lines, [])
+
+    def distributions(self, lines: int, modes: Iterable[str] = (SAME_TIME,),
+                      min_gap: int = MIN_SLOT_GAP_MINUTES,
+                      max_slots: int = MAX_CUSTOM_SLOTS) -> Iterator[LineDistribution]:
+        """Unranked distributions of the requested modes"""
+        if lines <= 0:
+            return
+        modes = set(modes)
+        if SAME_TIME in modes:
+            yield from self.same_time(lines)
+        if SPLIT_TIMES in modes:
+            yield from self.split_times(lines, min_gap)
+        if CUSTOM in modes:
+            yield from self.custom(lines, min_gap, max_slots)
+
+    def can_fit(self, lines: int, modes: Iterable[str] = (SAME_TIME,),
+                min_gap: int = MIN_SLOT_GAP_MINUTES) -> bool:
+        """Whether any distribution of the requested modes exists (stops at the first one)"""
+        return next(self.distributions(lines, modes, min_gap), None) is not None
+
+
+def find_line_distributions(time_slots: Iterable[Any], lines: int, modes: Iterable[str] = (SAME_TIME,),
+                            min_gap_minutes: int = MIN_SLOT_GAP_MINUTES,
+                            max_slots: int = MAX_CUSTOM_SLOTS,
+                            limit: Optional[int] = None) -> List[LineDistribution]:
+    """
+    All valid line distributions of a facility-day, best first
+
+    Args:
+        time_slots: TimeSlotInfo / TimeSlotAvailability objects of one facility-day
+        lines: Number of lines (courts) the match needs
+        modes: Distribution modes to include (see LINE_MODES)
+        min_gap_minutes: Minimum minutes between two start times of one match
+        max_slots: Most distinct start times a custom distribution may use
+        limit: Optional maximum number of distributions returned
+
+    Returns:
+        Ranked list of LineDistribution
+
+    Raises:
+        ValueError: If a mode is unknown
+    """
+    modes = tuple(modes)
+    unknown = [mode for mode in modes if mode not in LINE_MODES]
+    if unknown:
+        raise ValueError(f"Unknown line distribution mode(s): {', '.join(unknown)}")
+
+    vector = CourtCapacityVector.from_time_slots(time_slots)
+    found = sorted(vector.distributions(lines, modes, min_gap_minutes, max_slots),
+                   key=LineDistribution.rank_key)
+    return found[:limit] if limit is not None else found
+
+
+def match_line_modes(allow_split_lines: bool) -> Tuple[str, ...]:
+    """Distribution modes a league allows for automatic scheduling"""
+    return (SAME_TIME, SPLIT_TIMES) if allow_split_lines else (SAME_TIME,)
@@ -11,7 +11,7 @@ Added get_available_dates API for finding available dates for matches.
 from math import log
 import sqlite3
 import json
-from typing import List, Optional, Dict, Any, Tuple
+from typing import List, Optional, Dict, Any, Iterable, Tuple
 from datetime import datetime, timedelta, date
 
 from panel import state
@@ -26,14 +26,16 @@ from usta import (
     Team,
     League,
 )
+from court_occupancy import FacilityDayOccupancy, MatchBooking
+from blackout_dates import BlackoutDates
+from compact_schedule import WEEKDAYS
+from season_calendar import calendar_day
+from time_of_day import sort_times
+import availability_cache
 
 # Logging
 import logging
 
-logging.basicConfig(
-    level=logging.INFO,
-    format="%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s",
-)
 logger = logging.getLogger(__name__)
 
 
@@ -298,7 +300,7 @@ class SQLFacilityManager:
                         unavailable_dates = self._load_facility_unavailable_dates(
                             facility
                         )
-                        if unavailable_dates and isinstance(unavailable_dates, list):
+                        if unavailable_dates:
                             facility.unavailable_dates = unavailable_dates
                             logger.debug(
                                 "Unavailable dates loaded for facility id=%s: %s",
@@ -541,74 +543,93 @@ class SQLFacilityManager:
 
     def add_unavailable_date(self, facility: Facility, date: str) -> bool:
         """Add an unavailable date to a facility"""
+        return self.add_unavailable_range(facility, date, date)
 
-        try:
-            if not isinstance(facility, Facility):
-                raise TypeError(f"Expected Facility object, got: {type(facility)}")
-            facility_id = facility.id
+    def remove_unavailable_date(self, facility: Facility, date: str) -> bool:
+        """Remove an unavailable date from a facility"""
+        return self.remove_unavailable_range(facility, date, date)
 
-            self.cursor.execute(
-                """
-                INSERT OR IGNORE INTO facility_unavailable_dates (facility_id, date)
-                VALUES (?, ?)
-            """,
-                (facility_id, date),
-            )
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Database error adding unavailable date: {e}")
+    def add_unavailable_range(self, facility: Facility, start: str, end: str) -> bool:
+        """
+        Mark a facility unavailable from start to end inclusive (e.g. a holiday closure)
 
-        return True
+        Args:
+            facility: Facility to update (its unavailable_dates are updated too)
+            start: First date (date object or YYYY-MM-DD)
+            end: Last date (date object or YYYY-MM-DD)
 
-    def remove_unavailable_date(self, facility: Facility, date: str) -> bool:
-        """Remove an unavailable date from a facility"""
+        Raises:
+            TypeError: If facility is not a Facility
+            ValueError: If a date is invalid or end is before start
+            RuntimeError: If there is a database error
+        """
+        return self._update_unavailable_range(facility, start, end, add=True)
 
-        try:
-            if not isinstance(facility, Facility):
-                raise TypeError(f"Expected Facility object, got: {type(facility)}")
-            facility_id = facility.id
-            # Delete the unavailable date
-            self.cursor.execute(
-                """
-                DELETE FROM facility_unavailable_dates 
-                WHERE facility_id = ? AND date = ?
-            """,
-                (facility_id, date),
-            )
-        except sqlite3.Error as e:
-            raise RuntimeError(f"Database error removing unavailable date: {e}")
+    def remove_unavailable_range(self, facility: Facility, start: str, end: str) -> bool:
+        """
+        Make a facility available again from start to end inclusive
+
+        Args:
+            facility: Facility to update (its unavailable_dates are updated too)
+            start: First date (date object or YYYY-MM-DD)
+            end: Last date (date object or YYYY-MM-DD)
+
+        Raises:
+            TypeError: If facility is not a Facility
+            ValueError: If a date is invalid or end is before start
+            RuntimeError: If there is a database error
+        """
+        return self._update_unavailable_range(facility, start, end, add=False)
+
+    def _update_unavailable_range(self, facility: Facility, start, end, add: bool) -> bool:
+        """Apply a range change to the stored dates and rewrite the facility's ranges"""
+        if not isinstance(facility, Facility):
+            raise TypeError(f"Expected Facility object, got: {type(facility)}")
+
+        blackouts = self._load_facility_unavailable_dates(facility)
+        if add:
+            blackouts.add_range(start, end)
+        else:
+            blackouts.remove_range(start, end)
+        self._insert_facility_unavailable_dates(facility, blackouts)
+        facility.unavailable_dates = blackouts.copy()
         return True
 
     def _insert_facility_unavailable_dates(
-        self, facility: Facility, unavailable_dates: List[str]
+        self, facility: Facility, unavailable_dates: Iterable
     ) -> None:
-        """Insert facility unavailable dates into the database"""
+        """Replace the facility's unavailable dates in the database, one row per contiguous range"""
         try:
             if not isinstance(facility, Facility):
                 raise TypeError(f"Expected Facility object, got: {type(facility)}")
             facility_id = facility.id
 
-            # Clear existing unavailable dates for this facility
+            # Clear existing unavailable dates for this facility (including per-day legacy rows)
             self.cursor.execute(
                 "DELETE FROM facility_unavailable_dates WHERE facility_id = ?",
                 (facility_id,),
             )
+            self.cursor.execute(
+                "DELETE FROM facility_unavailable_ranges WHERE facility_id = ?",
+                (facility_id,),
+            )
 
-            # Insert unavailable dates
-            for date_str in unavailable_dates:
+            # Insert one row per run of consecutive dates
+            for start, end in BlackoutDates(unavailable_dates).ranges():
                 self.cursor.execute(
                     """
-                    INSERT INTO facility_unavailable_dates (facility_id, date)
-                    VALUES (?, ?)
+                    INSERT INTO facility_unavailable_ranges (facility_id, start_date, end_date)
+                    VALUES (?, ?, ?)
                 """,
-                    (facility_id, date_str),
+                    (facility_id, start.isoformat(), end.isoformat()),
                 )
         except sqlite3.Error as e:
             raise RuntimeError(
                 f"Database error inserting facility unavailable dates: {e}"
             )
 
-    def _load_facility_unavailable_dates(self, facility: Facility) -> List[str]:
-        """Load facility unavailable dates from the database"""
+    def _load_facility_unavailable_dates(self, facility: Facility) -> BlackoutDates:
+        """Load facility unavailable dates (ranges and legacy per-day rows) from the database"""
         try:
             if not isinstance(facility, Facility):
                 raise TypeError(f"Expected Facility object, got: {type(facility)}")
@@ -616,15 +637,21 @@ class SQLFacilityManager:
 
             self.cursor.execute(
                 """
-                SELECT date 
-                FROM facility_unavailable_dates 
-                WHERE facility_id = ? 
-                ORDER BY date
+                SELECT start_date, end_date
+                FROM facility_unavailable_ranges
+                WHERE facility_id = ?
+                UNION ALL
+                SELECT date, date
+                FROM facility_unavailable_dates
+                WHERE facility_id = ?
             """,
-                (facility_id,),
+                (facility_id, facility_id),
             )
 
-            return [row["date"] for row in self.cursor.fetchall()]
+            blackouts = BlackoutDates()
+            for row in self.cursor.fetchall():
+                blackouts.add_range(row["start_date"], row["end_date"])
+            return blackouts
         except sqlite3.Error as e:
             raise RuntimeError(
                 f"Database error loading facility unavailable dates: {e}"
@@ -668,21 +695,40 @@ class SQLFacilityManager:
 
             # Only query database for dates when facility is actually available
             if available_dates:
-                # Single database query to get scheduled times for available dates only
-                # This function handles dry run state if enabled
-                scheduled_times_by_date = self._get_scheduled_times_batch(
-                    facility, available_dates
-                )
-
-                for date_obj in available_dates:
-                    # Get scheduled times for this specific date (from batch query)
-                    scheduled_times = scheduled_times_by_date.get(date_obj, [])
+                # Committed availability is shared across requests; dry runs and open
+                # transactions see uncommitted bookings and always read the database
+                cached, stamps = {}, {date_obj: None for date_obj in available_dates}
+                use_cache = not getattr(self.db, "transaction_active", False)
+                if use_cache:
+                    cached, stamps = availability_cache.lookup(
+                        getattr(self.db, "db_path", None), facility.id, available_dates
+                    )
 
-                    # Get availability for this date using cached scheduled times
-                    availability_info = self._get_facility_availability_for_date(
-                        facility, date_obj, scheduled_times
+                built = []
+                if stamps:
+                    # Single database query to get the bookings of the dates not cached
+                    # This function handles dry run state if enabled
+                    missing_dates = [date_obj for date_obj in available_dates if date_obj in stamps]
+                    bookings_by_date = self._get_facility_bookings_batch(
+                        facility, missing_dates
                     )
 
+                    for date_obj in missing_dates:
+                        # Get availability for this date using the pre-fetched bookings
+                        availability_info = self._get_facility_availability_for_date(
+                            facility, date_obj, bookings_by_date.get(date_obj, [])
+                        )
+                        if availability_info:
+                            built.append(availability_info)
+
+                    if use_cache:
+                        availability_cache.store(
+                            getattr(self.db, "db_path", None), facility.id, built, stamps
+                        )
+
+                built_by_date = {info.date: info for info in built}
+                for date_obj in available_dates:
+                    availability_info = cached.get(date_obj) or built_by_date.get(date_obj)
                     if availability_info:
                         facility_availability_info.append(availability_info)
 
@@ -713,9 +759,7 @@ class SQLFacilityManager:
         unavailable_dates_info = []
 
         for date_obj in dates:
-            # Convert date object to string for day name calculation and FacilityAvailabilityInfo
-            date_str = date_obj.strftime('%Y-%m-%d')
-            day_name = date_obj.strftime("%A")
+            day_name = calendar_day(date_obj).day_name
 
             # Check facility unavailable dates first (fastest check)
             if not facility.is_available_on_date(date_obj):
@@ -730,25 +774,13 @@ class SQLFacilityManager:
                 continue
 
             # Check if facility has schedule for this day of week
-            try:
-                day_schedule = facility.schedule.get_day_schedule(day_name)
-                if not day_schedule.start_times:
-                    unavailable_info = FacilityAvailabilityInfo.create_unavailable(
-                        facility_id=facility.id,
-                        facility_name=facility.name,
-                        match_date=date_obj,
-                        day_of_week=day_name,
-                        reason=f"No time slots available on {day_name}",
-                    )
-                    unavailable_dates_info.append(unavailable_info)
-                    continue
-            except ValueError:
+            if not facility.schedule.day_for_date(date_obj).start_times:
                 unavailable_info = FacilityAvailabilityInfo.create_unavailable(
                     facility_id=facility.id,
                     facility_name=facility.name,
                     match_date=date_obj,
                     day_of_week=day_name,
-                    reason=f"No schedule available for {day_name}",
+                    reason=f"No time slots available on {day_name}",
                 )
                 unavailable_dates_info.append(unavailable_info)
                 continue
@@ -789,19 +821,20 @@ class SQLFacilityManager:
 
         # Date objects are already validated by their type, no need for format validation
 
-    def _get_scheduled_times_batch(
+    def _get_facility_bookings_batch(
         self, facility: Facility, dates: List[date]
-    ) -> Dict[date, List[str]]:
+    ) -> Dict[date, List[MatchBooking]]:
         """
-        Get scheduled times for multiple dates in a single database query. This method also 
-        handles dry run state if enabled, allowing for more efficient batch processing.
+        Get the scheduled matches of a facility for multiple dates in a single database
+        query. This method also handles dry run state if enabled, allowing for more
+        efficient batch processing.
 
         Args:
             facility: Facility object
             dates: List of date objects
 
         Returns:
-            Dictionary mapping date -> list of scheduled times for that date
+            Dictionary mapping date -> list of (match_id, scheduled_times, match_duration_minutes)
 
         Raises:
             RuntimeError: If there is a database error
@@ -811,76 +844,115 @@ class SQLFacilityManager:
                 return {}
 
             # Convert date objects to strings for database query
-            date_strings = [date_obj.strftime('%Y-%m-%d') for date_obj in dates]
-            
+            dates_by_string = {calendar_day(date_obj).key: date_obj for date_obj in dates}
+            bookings_by_date: Dict[date, List[MatchBooking]] = {date_obj: [] for date_obj in dates}
+
+            # In dry run mode, use scheduling state instead of database to avoid double-counting
+            # The scheduling state is initialized from database and then updated with new bookings
+            if hasattr(self.db, "dry_run_active") and self.db.dry_run_active and self.db.scheduling_state:
+                for date_obj in dates_by_string.values():
+                    bookings_by_date[date_obj] = self.db.scheduling_state.get_facility_bookings(
+                        facility.id, date_obj
+                    )
+                return bookings_by_date
+
             # Build parameterized query for multiple dates
-            placeholders = ",".join("?" for _ in date_strings)
+            placeholders = ",".join("?" for _ in dates_by_string)
             query = f"""
-                SELECT date, scheduled_times 
-                FROM matches 
-                WHERE facility_id = ? AND date IN ({placeholders}) AND status = 'scheduled'
+                SELECT m.id, m.date, m.scheduled_times, l.match_duration_minutes
+                FROM matches m
+                LEFT JOIN leagues l ON l.id = m.league_id
+                WHERE m.facility_id = ? AND m.date IN ({placeholders}) AND m.status = 'scheduled'
             """
 
             # Execute single query with facility_id + all date strings
-            params = [facility.id] + date_strings
+            params = [facility.id] + list(dates_by_string)
             self.cursor.execute(query, params)
-            rows = self.cursor.fetchall()
-
-            # Parse results and group by date (using original date objects as keys)
-            scheduled_times_by_date = {date_obj: [] for date_obj in dates}
 
             # Rows is positive only if there are matches in the database
-            for row in rows:
-                date_str = row["date"]
+            for row in self.cursor.fetchall():
+                date_obj = dates_by_string.get(row["date"])
                 times_json = row["scheduled_times"]
-                
-                # Find the corresponding date object for this date string
-                date_obj = next((d for d in dates if d.strftime('%Y-%m-%d') == date_str), None)
-                if not date_obj:
+                if not date_obj or not times_json:
                     continue
 
-                if times_json:
-                    try:
-                        import json
-
-                        times = json.loads(times_json)
-                        if isinstance(times, list):
-                            scheduled_times_by_date[date_obj].extend(times)
-
-                    except (json.JSONDecodeError, TypeError):
-                        # Skip invalid JSON, log warning if needed
-                        logger.warning(
-                            f"Invalid scheduled_times JSON for match on {date}: {times_json}"
-                        )
-                        continue
+                try:
+                    times = json.loads(times_json)
+                except (json.JSONDecodeError, TypeError):
+                    # Skip invalid JSON
+                    logger.warning(
+                        f"Invalid scheduled_times JSON for match {row['id']} on {row['date']}: {times_json}"
+                    )
+                    continue
 
-            # In dry run mode, use scheduling state instead of database to avoid double-counting
-            # The scheduling state is initialized from database and then updated with new bookings
-            if hasattr(self.db, "dry_run_active") and self.db.dry_run_active and self.db.scheduling_state:
-                # In dry run mode, replace database results with scheduling state
-                for date_obj in dates:
-                    date_str = date_obj.strftime('%Y-%m-%d')
-                    state_dates = self.db.scheduling_state.get_facility_usage(facility.id, date_str)
-                    scheduled_times_by_date[date_obj] = state_dates  # Replace, don't extend
+                if isinstance(times, list):
+                    bookings_by_date[date_obj].append(
+                        (row["id"], times, row["match_duration_minutes"])
+                    )
 
             logger.debug(
-                f"Retrieved scheduled times for {len(scheduled_times_by_date)} dates for facility {facility.id}"
+                f"Retrieved bookings for {len(bookings_by_date)} dates for facility {facility.id}"
             )
-            # Ensure we only return dates that were requested
-            return scheduled_times_by_date
+            return bookings_by_date
 
         except sqlite3.Error as e:
-            raise RuntimeError(f"Database error getting scheduled times batch: {e}")
+            raise RuntimeError(f"Database error getting facility bookings batch: {e}")
         except Exception as e:
             raise RuntimeError(
-                f"Error getting scheduled times for facility {facility.id}: {e}"
+                f"Error getting facility bookings for facility {facility.id}: {e}"
+            )
+
+    def _get_scheduled_times_batch(
+        self, facility: Facility, dates: List[date]
+    ) -> Dict[date, List[str]]:
+        """
+        Get scheduled times for multiple dates in a single database query (dry run aware)
+
+        Args:
+            facility: Facility object
+            dates: List of date objects
+
+        Returns:
+            Dictionary mapping date -> list of scheduled times for that date
+        """
+        return {
+            date_obj: sort_times(time for _, times, _ in bookings for time in times)
+            for date_obj, bookings in self._get_facility_bookings_batch(facility, dates).items()
+        }
+
+    def get_facility_occupancy(
+        self, facility: Facility, dates: List[date]
+    ) -> Dict[date, FacilityDayOccupancy]:
+        """
+        Get the interval-based court occupancy of a facility for a list of dates
+
+        Args:
+            facility: Facility object
+            dates: List of date objects
+
+        Returns:
+            Dictionary mapping date -> FacilityDayOccupancy (dates without a schedule have no slots)
+
+        Raises:
+            RuntimeError: If there is a database error
+        """
+        bookings_by_date = self._get_facility_bookings_batch(facility, dates)
+        return {
+            date_obj: FacilityDayOccupancy.from_matches(
+                self._day_slots(facility, date_obj), bookings_by_date.get(date_obj, [])
             )
+            for date_obj in dates
+        }
+
+    def _day_slots(self, facility: Facility, date_obj: date) -> List[Tuple[str, int]]:
+        """(time, courts) of the facility's schedule on a date, empty when it has none"""
+        return facility.schedule.day_for_date(date_obj).compact().slots
 
     def _get_facility_availability_for_date(
-        self, facility: Facility, date_obj: date, scheduled_times: List[str]
+        self, facility: Facility, date_obj: date, bookings: List[MatchBooking]
     ) -> Optional["FacilityAvailabilityInfo"]:
         """
-        Get availability information for a facility on a specific date using pre-fetched scheduled times.
+        Get availability information for a facility on a specific date using pre-fetched bookings.
 
         This method assumes the date has already been pre-filtered for basic facility availability,
         so it focuses on building detailed time slot information.
@@ -888,7 +960,7 @@ class SQLFacilityManager:
         Args:
             facility: Facility object to check availability for
             date_obj: Date object (pre-validated as available)
-            scheduled_times: Pre-fetched list of scheduled times for this date
+            bookings: Pre-fetched (match_id, scheduled_times, match_duration_minutes) for this date
 
         Returns:
             FacilityAvailabilityInfo object (should not be None for pre-filtered dates)
@@ -897,26 +969,24 @@ class SQLFacilityManager:
             RuntimeError: If there is an error processing the data
         """
         try:
-            # Convert date object to string for FacilityAvailabilityInfo
-            date_str = date_obj.strftime('%Y-%m-%d')
-            day_name = date_obj.strftime("%A")
+            day_name = calendar_day(date_obj).day_name
             
-            # Get day schedule (should be valid since date was pre-filtered)
-            day_schedule = facility.schedule.get_day_schedule(day_name)
-
-            # Create TimeSlotAvailability objects for each time slot
-            time_slot_availabilities = self._build_time_slot_availabilities(
-                day_schedule, scheduled_times
+            # Index the bookings as court intervals, then count courts in use at each start time
+            occupancy = FacilityDayOccupancy.from_matches(
+                facility.schedule.day_for_date(date_obj).compact().slots, bookings
             )
+            time_slot_availabilities = self._build_time_slot_availabilities(occupancy)
 
             # Create and return the comprehensive availability info
-            return FacilityAvailabilityInfo.from_time_slots(
+            availability_info = FacilityAvailabilityInfo.from_time_slots(
                 facility_id=facility.id,
                 facility_name=facility.name,
                 match_date=date_obj,
                 day_of_week=day_name,
                 time_slots=time_slot_availabilities,
             )
+            availability_info.occupancy = occupancy
+            return availability_info
 
         except Exception as e:
             raise RuntimeError(
@@ -940,49 +1010,20 @@ class SQLFacilityManager:
             return "Unknown"
 
     def _build_time_slot_availabilities(
-        self, day_schedule: "DaySchedule", scheduled_times: List[str]
+        self, occupancy: FacilityDayOccupancy, duration_minutes: Optional[int] = None
     ) -> List["TimeSlotAvailability"]:
         """
-        Build TimeSlotAvailability objects for all time slots in a day schedule
+        Build TimeSlotAvailability objects for all time slots of a facility-day
 
         Args:
-            day_schedule: DaySchedule object containing time slots
-            scheduled_times: List of scheduled times (HH:MM format) for this date
+            occupancy: Court occupancy of the facility-day
+            duration_minutes: Optional length of the match being placed; a court is
+                only counted as available if it stays free for that long
 
         Returns:
             List of TimeSlotAvailability objects
         """
-        time_slot_availabilities = []
-
-        for time_slot in day_schedule.start_times:
-            time = time_slot.time
-            total_courts = time_slot.available_courts
-            used_courts = scheduled_times.count(time)
-            
-            # Ensure used_courts doesn't exceed total_courts (defensive programming)
-            # This can happen if there are data inconsistencies or overbooking
-            if used_courts > total_courts:
-                logger.warning(
-                    f"Over-booking detected: {used_courts} courts used > {total_courts} total courts "
-                    f"at time {time}. Capping used_courts to total_courts."
-                )
-                used_courts = total_courts
-            
-            available_courts = max(0, total_courts - used_courts)
-            utilization_percentage = (
-                (used_courts / total_courts * 100) if total_courts > 0 else 0
-            )
-
-            slot_availability = TimeSlotAvailability(
-                time=time,
-                total_courts=total_courts,
-                used_courts=used_courts,
-                available_courts=available_courts,
-                utilization_percentage=round(utilization_percentage, 1),
-            )
-            time_slot_availabilities.append(slot_availability)
-
-        return time_slot_availabilities
+        return TimeSlotAvailability.from_occupancy(occupancy, duration_minutes)
 
     def facility_statistics(self, 
                           facility: Facility, 
@@ -1227,13 +1268,14 @@ class SQLFacilityManager:
         date_list = []
         current_date = start_date
         while current_date <= end_date:
-            date_list.append(current_date.strftime("%Y-%m-%d"))
+            date_list.append(current_date.date() if isinstance(current_date, datetime) else current_date)
             current_date += timedelta(days=1)
         
         # Get facility availability for all dates
         facility_availability = self.get_facility_availability(
             facility=facility,
-            dates=date_list[:365]  # Limit for performance
+            dates=date_list[:365],  # Limit for performance
+            max_days=365
         )
         
         # Aggregate by day of week
@@ -1309,15 +1351,7 @@ class SQLFacilityManager:
         current_date = start_date
         
         while current_date <= end_date:
-            date_str = current_date.strftime("%Y-%m-%d")
-            day_name = current_date.strftime("%A")
-            
-            # Get schedule for this day
-            if facility.schedule and hasattr(facility.schedule, day_name.lower()):
-                day_schedule = getattr(facility.schedule, day_name.lower())
-                if day_schedule and day_schedule.start_times:
-                    total_slots += len(day_schedule.start_times) * facility.total_courts
-            
+            total_slots += len(facility.schedule.day_for_date(current_date).start_times) * facility.total_courts
             current_date += timedelta(days=1)
         
         return total_slots
@@ -1616,22 +1650,19 @@ class SQLFacilityManager:
             # Get league duration in weeks
             league_duration_weeks = self._calculate_league_duration_weeks(league)
             
-            # Get days that this league can use
-            league_days = league.preferred_days or []
-            if league.backup_days:
-                league_days.extend(league.backup_days)
+            # Get days that this league can use (a copy: the league's own lists must not grow)
+            league_days = list(league.preferred_days or []) + list(league.backup_days or [])
             
             # If no specific days, assume all days are available
             if not league_days:
-                league_days = ["Monday", "Tuesday", "Wednesday", "Thursday", "Friday", "Saturday", "Sunday"]
+                league_days = list(WEEKDAYS)
             
             # Calculate total court-time slots per week
             weekly_slots = 0
             for day_name in league_days:
                 try:
                     day_schedule = facility.schedule.get_day_schedule(day_name)
-                    for time_slot in day_schedule.start_times:
-                        weekly_slots += time_slot.available_courts
+                    weekly_slots += sum(slot.available_courts for slot in day_schedule.start_times)
                 except ValueError:
                     # No schedule for this day, skip
                     continue
@@ -1659,8 +1690,11 @@ class SQLFacilityManager:
         """Calculate the duration of the league in weeks"""
         if league.start_date and league.end_date:
             try:
-                start = datetime.strptime(league.start_date, "%Y-%m-%d")
-                end = datetime.strptime(league.end_date, "%Y-%m-%d")
+                start, end = league.start_date, league.end_date
+                if isinstance(start, str):
+                    start = datetime.strptime(start, "%Y-%m-%d").date()
+                if isinstance(end, str):
+                    end = datetime.strptime(end, "%Y-%m-%d").date()
                 duration_days = (end - start).days
                 return max(duration_days // 7, 1)
             except ValueError:
@@ -47,8 +47,9 @@ class SQLLeagueManager:
             self.cursor.execute("""
                 INSERT INTO leagues (id, year, section, region, age_group, division, name, 
                                    num_lines_per_match, num_matches, allow_split_lines, 
-                                   preferred_days, backup_days, start_date, end_date)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
+                                   preferred_days, backup_days, start_date, end_date,
+                                   match_duration_minutes, team_rest_minutes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)
             """, (
                 league.id,
                 league.year,
@@ -63,7 +64,9 @@ class SQLLeagueManager:
                 preferred_days_str,
                 backup_days_str,
                 league.start_date.isoformat() if league.start_date else None,
-                league.end_date.isoformat() if league.end_date else None
+                league.end_date.isoformat() if league.end_date else None,
+                league.match_duration_minutes,
+                league.team_rest_minutes
             ))
         except sqlite3.IntegrityError as e:
             raise ValueError(f"Database integrity error adding league: {e}")
@@ -170,7 +173,8 @@ class SQLLeagueManager:
                 UPDATE leagues 
                 SET year = ?, section = ?, region = ?, age_group = ?, division = ?, name = ?, 
                     num_lines_per_match = ?, num_matches = ?, allow_split_lines = ?, 
-                    preferred_days = ?, backup_days = ?, start_date = ?, end_date = ?
+                    preferred_days = ?, backup_days = ?, start_date = ?, end_date = ?,
+                    match_duration_minutes = ?, team_rest_minutes = ?
                 WHERE id = ?
             """, (
                 league.year,
@@ -186,6 +190,8 @@ class SQLLeagueManager:
                 backup_days_str,
                 league.start_date.isoformat() if league.start_date else None,
                 league.end_date.isoformat() if league.end_date else None,
+                league.match_duration_minutes,
+                league.team_rest_minutes,
                 league.id
             ))
             
@@ -19,7 +19,10 @@ from datetime import datetime, timedelta, date
 from tennis_db_interface import TennisDBInterface
 from usta import Match, MatchType, Facility, League, Team
 import math
-from usta_match import MatchScheduling
+from usta_match import MatchScheduling, MatchSummary, score_match_date
+from court_occupancy import (DEFAULT_MATCH_MINUTES, DEFAULT_TEAM_REST_MINUTES, occupancy_by_match,
+                             team_rest_conflicts)
+from time_of_day import sort_times, time_to_minutes
 
 
 class SQLMatchManager:
@@ -282,7 +285,8 @@ class SQLMatchManager:
                         self.db.scheduling_state.update_match_bookings(
                             match.id, facility_id, date, 
                             match.scheduling.scheduled_times,
-                            match.home_team.id, match.visitor_team.id
+                            match.home_team.id, match.visitor_team.id,
+                            match.league.match_duration_minutes
                         )
                     else:
                         # Clear bookings if match has no scheduling
@@ -355,77 +359,132 @@ class SQLMatchManager:
         date: str,
         time: str,
         exclude_match_id: Optional[int] = None,
+        duration_minutes: Optional[int] = None,
     ) -> List[Dict]:
-        """Check for conflicts at a specific facility, date, and time"""
-        try:
-            conflicts = []
-            duration_hours = 3  # Standard match duration
+        """
+        Check for conflicts at a specific facility, date, and time
 
-            # Parse the proposed time
-            start_time = datetime.strptime(f"{date} {time}", "%Y-%m-%d %H:%M")
-            end_time = start_time + timedelta(hours=duration_hours)
+        Uses the same court occupancy as facility availability: every scheduled
+        line holds its court for its league's match duration.
 
-            # Query for overlapping matches
-            query = """
-            SELECT m.id, m.scheduled_times, 
-                   ht.name as home_team_name, vt.name as visitor_team_name
-            FROM matches m
-            JOIN teams ht ON m.home_team_id = ht.id
-            JOIN teams vt ON m.visitor_team_id = vt.id
-            WHERE m.facility_id = ? 
-                AND m.date = ?
-                AND m.status = 'scheduled'
-                AND m.scheduled_times IS NOT NULL
-            """
-            params = [facility_id, date]
+        Args:
+            facility_id: Facility to check
+            date: Date in YYYY-MM-DD format
+            time: Proposed start time in HH:MM format
+            exclude_match_id: Match to ignore (e.g. the one being rescheduled)
+            duration_minutes: Length of the proposed match (default: until the next start time)
 
-            if exclude_match_id:
-                query += " AND m.id != ?"
-                params.append(exclude_match_id)
+        Returns:
+            One conflict description per overlapping court booking
+        """
+        try:
+            facility = self.db.facility_manager.get_facility(facility_id)
+            if facility is None:
+                return [{"type": "error", "message": f"Facility {facility_id} not found"}]
 
-            self.cursor.execute(query, params)
+            date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+            occupancy = self.db.facility_manager.get_facility_occupancy(facility, [date_obj])[date_obj]
 
-            for row in self.cursor.fetchall():
-                match_data = self._dictify(row)
-
-                if match_data["scheduled_times"]:
-                    try:
-                        scheduled_times = json.loads(match_data["scheduled_times"])
-                        if isinstance(scheduled_times, list):
-                            for scheduled_time in scheduled_times:
-                                # Check if there's a time overlap
-                                scheduled_start = datetime.strptime(
-                                    f"{date} {scheduled_time}", "%Y-%m-%d %H:%M"
-                                )
-                                scheduled_end = scheduled_start + timedelta(
-                                    hours=duration_hours
-                                )
-
-                                # Check for overlap
-                                if (
-                                    start_time < scheduled_end
-                                    and end_time > scheduled_start
-                                ):
-                                    conflicts.append(
-                                        {
-                                            "type": "facility_time_conflict",
-                                            "match_id": match_data["id"],
-                                            "conflicting_time": scheduled_time,
-                                            "home_team": match_data["home_team_name"],
-                                            "visitor_team": match_data[
-                                                "visitor_team_name"
-                                            ],
-                                            "message": f"Facility already has match at {scheduled_time}",
-                                        }
-                                    )
-                    except (json.JSONDecodeError, TypeError):
-                        continue
+            start = time_to_minutes(time)
+            bookings = occupancy.overlapping(start, occupancy.booking_end(start, duration_minutes), exclude_match_id)
+            team_names = self._get_match_team_names({booking.match_id for booking in bookings})
 
+            conflicts = []
+            for booking in bookings:
+                home_team, visitor_team = team_names.get(booking.match_id, (None, None))
+                conflicts.append(
+                    {
+                        "type": "facility_time_conflict",
+                        "match_id": booking.match_id,
+                        "conflicting_time": booking.time,
+                        "home_team": home_team,
+                        "visitor_team": visitor_team,
+                        "message": f"Facility already has match at {booking.time}",
+                    }
+                )
             return conflicts
 
         except Exception as e:
             return [{"type": "error", "message": f"Error checking conflicts: {e}"}]
 
+    def _check_team_time_conflicts(
+        self,
+        team: Team,
+        date: str,
+        time: str,
+        exclude_match_id: Optional[int] = None,
+        duration_minutes: Optional[int] = None,
+    ) -> List[Dict]:
+        """
+        Check whether a team's other matches on a date leave enough rest around a proposed time
+
+        Args:
+            team: Team to check
+            date: Date in YYYY-MM-DD format
+            time: Proposed start time in HH:MM format
+            exclude_match_id: Match to ignore (e.g. the one being rescheduled)
+            duration_minutes: Length of the proposed match (default: league duration or 3 hours)
+
+        Returns:
+            One conflict description per match that is too close
+        """
+        try:
+            league = team.league
+            rest_minutes = getattr(league, "team_rest_minutes", None)
+            if rest_minutes is None:
+                rest_minutes = DEFAULT_TEAM_REST_MINUTES
+            duration = duration_minutes or getattr(league, "match_duration_minutes", None) or DEFAULT_MATCH_MINUTES
+
+            date_obj = datetime.strptime(date, "%Y-%m-%d").date()
+            team_matches = [
+                m for m in self.list_matches(team=team, date_str=date, match_type=MatchType.SCHEDULED)
+                if m.facility and m.id != exclude_match_id
+            ]
+
+            # Match intervals come from the facility occupancy of each facility the team plays at
+            spans = []
+            for facility_id in {m.facility.id for m in team_matches}:
+                facility = next(m.facility for m in team_matches if m.facility.id == facility_id)
+                occupancy = self.db.facility_manager.get_facility_occupancy(facility, [date_obj])[date_obj]
+                by_match = occupancy_by_match(occupancy)
+                spans.extend(
+                    (m.id,) + by_match[m.id] for m in team_matches
+                    if m.facility.id == facility_id and m.id in by_match
+                )
+
+            start = time_to_minutes(time)
+            conflicting = team_rest_conflicts(spans, start, start + duration, rest_minutes)
+            return [
+                {
+                    "type": "team_rest_conflict",
+                    "match_id": match_id,
+                    "team": team.name,
+                    "message": f"{team.name} needs {rest_minutes} minutes of rest around match {match_id}",
+                }
+                for match_id in conflicting
+            ]
+
+        except Exception as e:
+            return [{"type": "error", "message": f"Error checking team conflicts: {e}"}]
+
+    def _get_match_team_names(self, match_ids) -> Dict[int, tuple]:
+        """(home team name, visitor team name) per match ID"""
+        match_ids = list(match_ids)
+        if not match_ids:
+            return {}
+        placeholders = ",".join("?" for _ in match_ids)
+        self.cursor.execute(
+            f"""
+            SELECT m.id, ht.name as home_team_name, vt.name as visitor_team_name
+            FROM matches m
+            JOIN teams ht ON m.home_team_id = ht.id
+            JOIN teams vt ON m.visitor_team_id = vt.id
+            WHERE m.id IN ({placeholders})
+            """,
+            match_ids,
+        )
+        return {row["id"]: (row["home_team_name"], row["visitor_team_name"]) for row in self.cursor.fetchall()}
+
     # ========== OTHER EXISTING METHODS (unchanged) ==========
 
     def list_matches(
@@ -573,3 +632,161 @@ class SQLMatchManager:
     
     
     
+
+    def list_match_summaries(
+        self,
+        facility: Optional["Facility"] = None,
+        league: Optional["League"] = None,
+        team: Optional["Team"] = None,
+        date_str: Optional[str] = None,
+        match_type: Optional["MatchType"] = MatchType.ALL,
+    ) -> List[MatchSummary]:
+        """List flat match summaries with the same filters as list_matches
+
+        Unlike list_matches, which hydrates every match with its League, Team and
+        Facility objects (several queries per match), this runs one joined query
+        and returns MatchSummary rows. Leagues are loaded once and shared by all
+        rows (they are also needed to compute quality scores).
+
+        Args:
+            facility: Optional Facility object to filter by
+            league: Optional League object to filter by
+            team: Optional Team object to filter by (home or visitor)
+            date_str: Optional date string to filter by (YYYY-MM-DD format)
+            match_type: MatchType enum to filter matches by status
+
+        Returns:
+            List of MatchSummary objects ordered by match ID
+
+        Raises:
+            TypeError: If match_type is not a MatchType enum
+            RuntimeError: If database error occurs
+        """
+        if match_type is None:
+            match_type = MatchType.ALL
+        elif isinstance(match_type, str):
+            try:
+                match_type = MatchType[match_type.upper()]
+            except KeyError:
+                raise ValueError(f"Invalid match_type string: {match_type}")
+        elif not isinstance(match_type, MatchType):
+            raise TypeError(
+                f"match_type must be a MatchType enum, got: {type(match_type)}"
+            )
+
+        where_conditions = []
+        params = []
+
+        if league:
+            where_conditions.append("m.league_id = ?")
+            params.append(league.id)
+        if facility:
+            where_conditions.append("m.facility_id = ?")
+            params.append(facility.id)
+        if team:
+            where_conditions.append("(m.home_team_id = ? OR m.visitor_team_id = ?)")
+            params.extend([team.id, team.id])
+        if date_str:
+            where_conditions.append("m.date = ?")
+            params.append(date_str)
+        if match_type == MatchType.SCHEDULED:
+            where_conditions.append("m.status = 'scheduled'")
+        elif match_type == MatchType.UNSCHEDULED:
+            where_conditions.append("m.status = 'unscheduled'")
+
+        # facility_index is the position of the match facility in the home
+        # team's preferred facility list (same ordering as _get_team_preferred_facilities)
+        query = """
+        SELECT
+            m.id, m.round, m.num_rounds, m.league_id,
+            m.home_team_id, ht.name AS home_team_name, ht.captain AS home_team_captain,
+            ht.preferred_days AS home_preferred_days,
+            m.visitor_team_id, vt.name AS visitor_team_name, vt.captain AS visitor_team_captain,
+            vt.preferred_days AS visitor_preferred_days,
+            m.facility_id, f.name AS facility_name, f.short_name AS facility_short_name,
+            m.date, m.scheduled_times,
+            (SELECT COUNT(*) FROM team_preferred_facilities p
+              WHERE p.team_id = m.home_team_id AND p.priority_order < tpf.priority_order) AS facility_index,
+            tpf.id AS preferred_facility_row
+        FROM matches m
+        JOIN teams ht ON ht.id = m.home_team_id
+        JOIN teams vt ON vt.id = m.visitor_team_id
+        LEFT JOIN facilities f ON f.id = m.facility_id
+        LEFT JOIN team_preferred_facilities tpf
+               ON tpf.team_id = m.home_team_id AND tpf.facility_id = m.facility_id
+        """
+        if where_conditions:
+            query += " WHERE " + " AND ".join(where_conditions)
+        query += " ORDER BY m.id"
+
+        try:
+            leagues_by_id = {l.id: l for l in self.db.league_manager.list_leagues()}
+
+            self.cursor.execute(query, params)
+            rows = self.cursor.fetchall()
+        except sqlite3.Error as e:
+            raise RuntimeError(f"Database error listing match summaries: {e}")
+
+        summaries = []
+        for row in rows:
+            scheduled_times = []
+            if row["scheduled_times"]:
+                try:
+                    parsed_times = json.loads(row["scheduled_times"])
+                    if isinstance(parsed_times, list):
+                        scheduled_times = sort_times(parsed_times)
+                    elif parsed_times is not None:
+                        scheduled_times = [parsed_times]
+                except (ValueError, TypeError):  # Invalid JSON or times
+                    scheduled_times = []
+
+            # Mirror get_match: a match is only scheduled with facility, date and times
+            match_date = None
+            facility_id = None
+            if row["facility_id"] and row["facility_name"] and row["date"] and scheduled_times:
+                match_date = datetime.strptime(row["date"], "%Y-%m-%d").date()
+                facility_id = row["facility_id"]
+            else:
+                scheduled_times = []
+
+            row_league = leagues_by_id[row["league_id"]]
+
+            qscore, penalties = 0, []
+            if match_date is not None:
+                home_days = [d.strip() for d in (row["home_preferred_days"] or "").split(",") if d.strip()]
+                visitor_days = [d.strip() for d in (row["visitor_preferred_days"] or "").split(",") if d.strip()]
+                facility_index = row["facility_index"] if row["preferred_facility_row"] is not None else None
+                try:
+                    qscore, penalties = score_match_date(
+                        league=row_league,
+                        round_num=row["round"],
+                        num_rounds=row["num_rounds"],
+                        home_preferred_days=home_days,
+                        visitor_preferred_days=visitor_days,
+                        target_date=match_date,
+                        facility_index=facility_index,
+                    )
+                except (ValueError, TypeError, ZeroDivisionError):
+                    qscore, penalties = 0, []
+
+            summaries.append(MatchSummary(
+                id=row["id"],
+                round=row["round"],
+                num_rounds=row["num_rounds"],
+                league=row_league,
+                home_team_id=row["home_team_id"],
+                home_team_name=row["home_team_name"],
+                visitor_team_id=row["visitor_team_id"],
+                visitor_team_name=row["visitor_team_name"],
+                home_team_captain=row["home_team_captain"],
+                visitor_team_captain=row["visitor_team_captain"],
+                facility_id=facility_id,
+                facility_name=row["facility_name"] if facility_id else None,
+                facility_short_name=row["facility_short_name"] if facility_id else None,
+                date=match_date,
+                scheduled_times=scheduled_times,
+                qscore=qscore,
+                qscore_penalties=penalties,
+            ))
+
+        return summaries
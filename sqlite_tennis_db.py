@@ -10,13 +10,14 @@ from random import seed
 import sqlite3
 import yaml
 import os
+from contextlib import contextmanager
 from typing import List, Dict, Optional, Tuple, Any
 
 # Import the interface
 from tennis_db_interface import TennisDBInterface
 from scheduling_state import SchedulingState
 
-from usta import League, Team, Match, Facility, MatchType, FacilityAvailabilityInfo, TimeSlotAvailability
+from usta import League, Team, Match, MatchSummary, Facility, MatchType, FacilityAvailabilityInfo, TimeSlotAvailability
 # Import constants for USTA sections, regions, age groups, and divisions
 from usta_constants import USTA_SECTIONS, USTA_REGIONS, USTA_AGE_GROUPS, USTA_DIVISIONS
 
@@ -26,6 +27,9 @@ from sql_league_manager import SQLLeagueManager
 from sql_facility_manager import SQLFacilityManager
 from sql_match_manager import SQLMatchManager
 from scheduling_manager import SchedulingManager
+import stats_cache
+import availability_cache
+from query_profiler import ProfilingCursor, QueryStats
 
 """
 Clean YAML Import/Export Implementation for SQLiteTennisDB
@@ -381,7 +385,8 @@ class YAMLImportExportMixin:
     
     def _import_matches(self, matches_data: List[Dict], stats: Dict, skip_existing: bool) -> None:
         """Import matches from YAML data"""
-        from usta_match import Match
+        from usta_match import Match, MatchScheduling
+        from datetime import date
         
         for i, record in enumerate(matches_data):
             stats['matches']['processed'] += 1
@@ -417,16 +422,26 @@ class YAMLImportExportMixin:
                 # Create match with object references
                 match_data = {
                     'id': record['id'],
+                    'round': record.get('round', 1),
+                    'num_rounds': record.get('num_rounds', 1),
                     'league': league,
                     'home_team': home_team,
                     'visitor_team': visitor_team,
-                    'facility': facility,
-                    'date': record.get('date'),
-                    'scheduled_times': record.get('scheduled_times', [])
                 }
                 
                 match = Match(**match_data)
                 
+                # Scheduled matches carry their facility, date and times
+                match_date = record.get('date')
+                if facility and match_date and record.get('scheduled_times'):
+                    if isinstance(match_date, str):
+                        match_date = date.fromisoformat(match_date)
+                    match.assign_scheduling(MatchScheduling(
+                        facility=facility,
+                        date=match_date,
+                        scheduled_times=list(record['scheduled_times'])
+                    ))
+                
                 if self.add_match(match):
                     stats['matches']['imported'] += 1
                     logger.debug(f"Imported match: {match.id}")
@@ -515,12 +530,17 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         
         self.conn = None
         self.cursor = None
+        self.query_stats = QueryStats()  # Statements issued through self.cursor (see query_profiler)
         
         # Add these instance variables to __init__ method:
         self.transaction_active = False
         self.dry_run_active = False
         self.dry_run_operations = []
+        self.dry_run_summary = True  # Print the operations a dry run would have executed when it ends
         self.scheduling_state = None
+        self.transaction_write_count = 0
+        self.pending_facility_days = set()  # Facility-days changed by the open transaction
+        self._savepoint_counter = 0
 
 
         # Initialize helper managers (will be set after database connection)
@@ -546,7 +566,7 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
                 isolation_level=None
             )
             self.conn.row_factory = sqlite3.Row
-            self.cursor = self.conn.cursor()
+            self.cursor = ProfilingCursor(self.conn.cursor(), self.query_stats)
             
             # Enable foreign key constraints and optimize settings
             self.cursor.execute("PRAGMA foreign_keys = ON")
@@ -571,7 +591,9 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
                 preferred_days TEXT,
                 backup_days TEXT,
                 start_date TEXT,
-                end_date TEXT
+                end_date TEXT,
+                match_duration_minutes INTEGER,
+                team_rest_minutes INTEGER
             );
     
             CREATE TABLE IF NOT EXISTS facilities (
@@ -592,6 +614,7 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
                 UNIQUE(facility_id, day, time)
             );
     
+            -- One row per day, written by older versions: still read, replaced by ranges on the next save
             CREATE TABLE IF NOT EXISTS facility_unavailable_dates (
                 id INTEGER PRIMARY KEY,
                 facility_id INTEGER NOT NULL,
@@ -599,6 +622,15 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
                 FOREIGN KEY (facility_id) REFERENCES facilities(id) ON DELETE CASCADE ON UPDATE CASCADE,
                 UNIQUE(facility_id, date)
             );
+
+            CREATE TABLE IF NOT EXISTS facility_unavailable_ranges (
+                id INTEGER PRIMARY KEY,
+                facility_id INTEGER NOT NULL,
+                start_date TEXT NOT NULL,
+                end_date TEXT NOT NULL,  -- inclusive
+                FOREIGN KEY (facility_id) REFERENCES facilities(id) ON DELETE CASCADE ON UPDATE CASCADE,
+                UNIQUE(facility_id, start_date)
+            );
     
             CREATE TABLE IF NOT EXISTS teams (
                 id INTEGER PRIMARY KEY,
@@ -649,10 +681,28 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
             CREATE INDEX IF NOT EXISTS idx_team_preferred_facilities_facility ON team_preferred_facilities(facility_id);
             CREATE INDEX IF NOT EXISTS idx_team_preferred_facilities_priority ON team_preferred_facilities(team_id, priority_order);
             """)
+
+            self._migrate_schema()
         
         except sqlite3.Error as e:
             raise RuntimeError(f"Database initialization failed: {e}")
 
+    def _migrate_schema(self):
+        """Add columns introduced after a database was created"""
+        added_columns = {
+            'leagues': [
+                ('match_duration_minutes', 'INTEGER'),
+                ('team_rest_minutes', 'INTEGER'),
+            ],
+        }
+        for table, columns in added_columns.items():
+            self.cursor.execute(f"PRAGMA table_info({table})")
+            existing = {row['name'] for row in self.cursor.fetchall()}
+            for column, column_type in columns:
+                if column not in existing:
+                    self.cursor.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+                    logger.info(f"Added column {table}.{column}")
+
     def _initialize_managers(self):
         """Initialize all helper manager classes"""
         self.team_manager = SQLTeamManager(self.cursor, self)
@@ -724,9 +774,19 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         
         try:
             if self.dry_run_active:
-                self._output_dry_run_summary()
+                if self.dry_run_summary:
+                    self._output_dry_run_summary()
             else:
-                self.conn.commit()
+                if self.pending_facility_days:
+                    with availability_cache.track_writes(self.db_path, self.pending_facility_days):
+                        self.conn.commit()
+                else:
+                    self.conn.commit()
+                if self.transaction_write_count:
+                    stats_cache.bump_write_counter(self.db_path, self.transaction_write_count)
+                # Large writes invalidate the stats snapshot; rebuild it off the request path
+                if self.transaction_write_count >= stats_cache.PREWARM_WRITE_THRESHOLD:
+                    stats_cache.schedule_prewarm(self.db_path)
         finally:
             self._reset_transaction_state()
     
@@ -741,6 +801,72 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         finally:
             self._reset_transaction_state()
     
+    def create_savepoint(self) -> Dict[str, Any]:
+        """
+        Mark a point inside the active transaction that can be rolled back to
+
+        In dry-run mode the scheduling state and the recorded operations are
+        snapshotted; otherwise an SQLite SAVEPOINT is created.
+
+        Returns:
+            Savepoint token for rollback_to_savepoint/release_savepoint
+
+        Raises:
+            RuntimeError: If no transaction is active
+        """
+        if not self.transaction_active:
+            raise RuntimeError("No active transaction")
+
+        self._savepoint_counter += 1
+        savepoint = {
+            'name': f"sp_{self._savepoint_counter}",
+            'operations': len(self.dry_run_operations),
+        }
+        if self.dry_run_active:
+            savepoint['state'] = self.scheduling_state.snapshot() if self.scheduling_state else None
+        else:
+            self.cursor.execute(f"SAVEPOINT {savepoint['name']}")
+        return savepoint
+
+    def rollback_to_savepoint(self, savepoint: Dict[str, Any]):
+        """Undo every operation performed since the savepoint was created"""
+        if not self.transaction_active:
+            raise RuntimeError("No active transaction")
+
+        del self.dry_run_operations[savepoint['operations']:]
+        if self.dry_run_active:
+            if self.scheduling_state and savepoint.get('state') is not None:
+                self.scheduling_state.restore(savepoint['state'])
+        else:
+            self.cursor.execute(f"ROLLBACK TO SAVEPOINT {savepoint['name']}")
+            self.cursor.execute(f"RELEASE SAVEPOINT {savepoint['name']}")
+
+    def release_savepoint(self, savepoint: Dict[str, Any]):
+        """Keep the operations performed since the savepoint was created"""
+        if not self.transaction_active:
+            raise RuntimeError("No active transaction")
+
+        if not self.dry_run_active:
+            self.cursor.execute(f"RELEASE SAVEPOINT {savepoint['name']}")
+
+    def record_operation(self, operation_type: str, description: str, **details):
+        """
+        Record a descriptive operation (no SQL) in the transaction's operations log
+
+        Dry runs list it in the summary; executed transactions log it.
+        """
+        if self.dry_run_active:
+            self.dry_run_operations.append({
+                'type': operation_type,
+                'query': '',
+                'params': (),
+                'description': description
+            })
+            if self.scheduling_state:
+                self.scheduling_state.record_operation(operation_type, description, **details)
+        else:
+            logger.info(description)
+
     def _output_dry_run_summary(self):
         """Output summary of operations that would have been executed in dry-run mode"""
         if not self.dry_run_operations:
@@ -794,7 +920,41 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         self.dry_run_active = False
         self.dry_run_operations = []
         self.scheduling_state = None
+        self.transaction_write_count = 0
+        self.pending_facility_days = set()
     
+    @contextmanager
+    def tracking_facility_days(self, facility_days: List[Tuple[Optional[int], Optional[date]]]):
+        """
+        Wrap a write that changes the availability of some facility-days
+
+        Outside a transaction the write commits immediately and the availability
+        cache versions are bumped right after it; inside one they are bumped at
+        commit time.  Dry runs never touch the cache.
+
+        Args:
+            facility_days: (facility_id, date) keys; a None date means every date
+                of the facility, a None facility means everything
+        """
+        if self.dry_run_active:
+            yield
+        elif self.transaction_active:
+            self.pending_facility_days.update(facility_days)
+            yield
+        else:
+            with availability_cache.track_writes(self.db_path, facility_days):
+                yield
+
+    def _stored_facility_day(self, match_id: int) -> List[Tuple[Optional[int], Optional[date]]]:
+        """The facility-day a match is currently booked on in the database (empty if none)"""
+        if self.dry_run_active:
+            return []
+        self.cursor.execute("SELECT facility_id, date FROM matches WHERE id = ?", (match_id,))
+        row = self.cursor.fetchone()
+        if not row or row["facility_id"] is None or not row["date"]:
+            return []
+        return availability_cache.facility_day_keys(row["facility_id"], [row["date"]])
+
     def execute_operation(self, operation_type: str, query: str, params: tuple, 
                          description: str = "") -> bool:
         """Execute operation with dry-run awareness"""
@@ -808,6 +968,11 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
             return True
         else:
             self.cursor.execute(query, params)
+            if self.transaction_active:
+                # Counted toward the stats change token when (and only if) the transaction commits
+                self.transaction_write_count += 1
+            else:
+                stats_cache.bump_write_counter(self.db_path)
             return self.cursor.rowcount > 0
         
         
@@ -845,7 +1010,9 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         return self.league_manager.list_leagues()
 
     def update_league(self, league: League) -> bool:
-        return self.league_manager.update_league(league)
+        # Match durations live on the league, so any facility-day may change
+        with self.tracking_facility_days([(None, None)]):
+            return self.league_manager.update_league(league)
 
     def delete_league(self, league: League) -> bool:
         return self.league_manager.delete_league(league.id)
@@ -862,10 +1029,12 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
         return self.facility_manager.list_facilities()
 
     def update_facility(self, facility: Facility) -> bool:
-        return self.facility_manager.update_facility(facility)
+        with self.tracking_facility_days([(facility.id, None)]):
+            return self.facility_manager.update_facility(facility)
 
     def delete_facility(self, facility: Facility) -> bool:
-        return self.facility_manager.delete_facility(facility)
+        with self.tracking_facility_days([(facility.id, None)]):
+            return self.facility_manager.delete_facility(facility)
 
     def get_facility_availability(self, 
                                   facility: Facility, 
@@ -927,9 +1096,24 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
                                                date_str=date_str,
                                                match_type=match_type)
 
+    def list_match_summaries(
+            self,
+            facility: Optional["Facility"] = None,
+            league: Optional["League"] = None,
+            team: Optional["Team"] = None,
+            date_str: Optional[str] = None,
+            match_type: Optional["MatchType"] = MatchType.ALL,
+        ) -> List[MatchSummary]:
+        return self.match_manager.list_match_summaries(facility=facility,
+                                                       league=league,
+                                                       team=team,
+                                                       date_str=date_str,
+                                                       match_type=match_type)
+
 
     def delete_match(self, match: Match) -> bool:
-        return self.match_manager.delete_match(match.id)
+        with self.tracking_facility_days(self._stored_facility_day(match.id)):
+            return self.match_manager.delete_match(match.id)
 
     def get_matches_on_date(self, date_obj: date) -> List[Match]:
         return self.match_manager.get_matches_on_date(date_obj)
@@ -937,17 +1121,24 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
     # ========== Match Scheduling Operations ==========
 
     def update_match(self, match: Match) -> bool:
-        return self.match_manager.update_match(match)
+        facility_days = self._stored_facility_day(match.id)
+        if not self.dry_run_active and match.is_scheduled() and match.facility and match.date:
+            facility_days.append((match.facility.id, match.date))
+        with self.tracking_facility_days(facility_days):
+            return self.match_manager.update_match(match)
 
 
 
-    def auto_schedule_matches(self, matches: List['Match'], dry_run: bool = True,  seed: int = None) -> Dict:
-        return self.scheduling_manager.auto_schedule_matches(matches=matches, dry_run=dry_run, seed=seed)
+    def auto_schedule_matches(self, matches: List['Match'], dry_run: bool = True,  seed: int = None,
+                              ordering: str = "best_option") -> Dict:
+        return self.scheduling_manager.auto_schedule_matches(matches=matches, dry_run=dry_run, seed=seed,
+                                                             ordering=ordering)
 
     def optimize_auto_schedule(self, matches: List['Match'], max_iterations: int = 10, 
-                             progress_callback=None) -> Dict[str, Any]:
+                             progress_callback=None, ordering: str = "best_option") -> Dict[str, Any]:
         """Run auto-schedule optimization with multiple iterations"""
-        return self.scheduling_manager.optimize_auto_schedule(matches, max_iterations, progress_callback)
+        return self.scheduling_manager.optimize_auto_schedule(matches, max_iterations, progress_callback,
+                                                              ordering=ordering)
 
     def unschedule_match(self, match: Match) -> bool:
         return self.match_manager.unschedule_match(match)
@@ -966,13 +1157,15 @@ class SQLiteTennisDB(YAMLImportExportMixin, TennisDBInterface):
     # ========== Advanced Scheduling Operations ==========
     
     def get_team_conflicts(self, team: Team, date: str, time: str, duration_hours: int = 3) -> List[Dict]:
-        # TODO: Implement team conflict checking if needed
-        return []
+        return self.match_manager._check_team_time_conflicts(
+            team, date, time, duration_minutes=int(duration_hours * 60)
+        )
 
     def get_facility_conflicts(self, facility: Facility, date: str, time: str, duration_hours: int = 3, 
                              exclude_match_id: Optional[int] = None) -> List[Dict]:
-        # TODO: Implement facility conflict checking if needed
-        return []
+        return self.match_manager._check_facility_time_conflicts(
+            facility.id, date, time, exclude_match_id, duration_minutes=int(duration_hours * 60)
+        )
 
     def get_scheduling_summary(self, league: Optional[League] = None) -> Dict[str, Any]:
         return self.scheduling_manager.get_scheduling_summary(league)
@@ -18,6 +18,7 @@ from typing import Type, Dict, Any
 
 # Import the updated web app
 from web_app import app, create_app_with_backend, TennisDBInterface
+from logging_setup import configure_logging
 
 def get_sqlite_backend():
     """Import and return SQLite backend class"""
@@ -194,6 +195,7 @@ def print_startup_info(args, backend_class=None, connection_params=None):
 def main():
     """Main function"""
     args = parse_arguments()
+    configure_logging(verbose=args.debug)
     
     # If backend is specified, validate arguments and configure the app
     if args.backend:
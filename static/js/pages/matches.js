@@ -282,7 +282,22 @@ class MatchesPage {
                                         <div class="tennis-form-text">Multiple iterations to find best scheduling solution</div>
                                     </div>
                                 </div>
+                                <div class="tennis-form-group">
+                                    <label for="ordering" class="tennis-form-label">Match Ordering</label>
+                                    <select class="tennis-form-control" id="ordering" name="ordering">
+                                        <option value="best_option" selected>Best option first</option>
+                                        <option value="most_constrained">Most constrained first (deterministic)</option>
+                                        <option value="random">Random order</option>
+                                    </select>
+                                    <div class="tennis-form-text">Most constrained schedules matches with the fewest options first</div>
+                                </div>
                                 <div class="tennis-form-group" id="optimizedSettings" style="display: none;">
+                                    <label for="optimizer" class="tennis-form-label">Optimizer</label>
+                                    <select class="tennis-form-control" id="optimizer" name="optimizer">
+                                        <option value="seeds" selected>Best of several runs</option>
+                                        <option value="annealing">Simulated annealing (30s)</option>
+                                        <option value="exact">Exact solver (30s limit, falls back to annealing)</option>
+                                    </select>
                                     <label for="iterations" class="tennis-form-label">Optimization Iterations</label>
                                     <select class="tennis-form-control" id="iterations" name="iterations">
                                         <option value="5">5 iterations (Fast)</option>
@@ -474,6 +489,9 @@ class MatchesPage {
         const modal = bootstrap.Modal.getInstance(document.getElementById('bulkAutoScheduleModal'));
         if (modal) modal.hide();
         
+        // Annealing previews return the exact schedule; execution commits it as-is
+        window.lastAutoScheduleAssignments = result.assignments || null;
+
         // Store the seed for reproducible execution
         if (result.seed) {
             window.lastAutoScheduleSeed = result.seed;
@@ -538,6 +556,20 @@ class MatchesPage {
             `;
         }
 
+        if (result.solver) {
+            const solverName = result.solver.backend || `${result.solver.fallback} (no exact solver)`;
+            const gap = result.solver.gap !== null ? `${(result.solver.gap * 100).toFixed(2)}%` : 'n/a';
+            previewHtml += `
+                <div class="alert alert-info">
+                    <i class="fas fa-calculator"></i>
+                    <strong>Greedy:</strong> ${result.solver.greedy.unscheduled_count} unscheduled,
+                    penalty ${result.solver.greedy.total_penalty} in ${result.solver.greedy.runtime}s.
+                    <strong>${solverName}:</strong> status ${result.solver.status},
+                    runtime ${result.solver.runtime}s, gap ${gap}.
+                </div>
+            `;
+        }
+
         if (result.failed > 0) {
             previewHtml += `
                 <div class="alert alert-warning">
@@ -609,6 +641,11 @@ class MatchesPage {
         // Override to execute (not dry-run)
         formData.set('dry_run', 'false');
         
+        // Commit the previewed annealing/exact schedule instead of re-running the optimizer
+        if (window.lastAutoScheduleAssignments) {
+            formData.set('assignments', JSON.stringify(window.lastAutoScheduleAssignments));
+        }
+
         // Use the same seed from the preview for reproducible results
         if (window.lastAutoScheduleSeed) {
             formData.set('seed', window.lastAutoScheduleSeed);
@@ -0,0 +1,259 @@
+"""
+Statistics Snapshot Cache for the Tennis Database
+
+The stats page, the dashboard and the CLI ``stats`` command all walk every
+league, team, match and facility and then compute facility statistics for
+each facility.  None of that changes unless the database changes, so the
+result is captured once as a snapshot and re-used until the database
+*change token* moves.
+
+The change token has two parts:
+
+1. A per-process write counter, bumped by ``SQLiteTennisDB.execute_operation``
+   for every executed (non dry-run) write outside a transaction, and by
+   ``commit_transaction`` for the writes of a committed transaction (writes
+   that are rolled back never move it).
+2. ``PRAGMA data_version`` read from a long-lived sentinel connection.  SQLite
+   changes this value whenever *another* connection commits, which covers
+   writes made by other processes (CLI runs while the web app is up) and
+   direct cursor writes that do not go through ``execute_operation``.
+
+Snapshots built while the database has a transaction open may include
+uncommitted writes, so they are returned but never cached.
+
+After a large write (see ``PREWARM_WRITE_THRESHOLD``) the snapshot is rebuilt
+in a background thread so the next reader gets a cache hit.
+"""
+
+import os
+import sqlite3
+import threading
+import logging
+from datetime import datetime
+from typing import Dict, Any, Optional, Tuple
+
+logger = logging.getLogger(__name__)
+
+# Number of writes in one committed transaction that triggers a background rebuild
+PREWARM_WRITE_THRESHOLD = 50
+
+_lock = threading.RLock()
+_write_counters: Dict[str, int] = {}
+_sentinels: Dict[str, sqlite3.Connection] = {}
+_snapshots: Dict[Tuple[str, Optional[int]], Dict[str, Any]] = {}
+_prewarm_threads: Dict[str, threading.Thread] = {}
+_stats = {"hits": 0, "misses": 0}
+
+
+def _cache_key(db_path: Optional[str]) -> Optional[str]:
+    """Normalize a database path into a cache key (None if the path cannot be cached)"""
+    if not db_path or db_path == ':memory:':
+        return None
+    return os.path.abspath(db_path)
+
+
+def bump_write_counter(db_path: Optional[str], count: int = 1) -> None:
+    """Record that ``count`` writes were executed against ``db_path``"""
+    key = _cache_key(db_path)
+    if key is None:
+        return
+    with _lock:
+        _write_counters[key] = _write_counters.get(key, 0) + count
+
+
+def _data_version(key: str) -> int:
+    """Read PRAGMA data_version from the sentinel connection for ``key``"""
+    with _lock:
+        conn = _sentinels.get(key)
+        if conn is None:
+            conn = sqlite3.connect(key, check_same_thread=False, isolation_level=None)
+            _sentinels[key] = conn
+        return conn.execute("PRAGMA data_version").fetchone()[0]
+
+
+def get_change_token(db_path: Optional[str]) -> Optional[Tuple[int, int]]:
+    """
+    Get the current change token for a database
+
+    Args:
+        db_path: Path of the SQLite database file
+
+    Returns:
+        Tuple of (write counter, data_version), or None if the path cannot be cached
+    """
+    key = _cache_key(db_path)
+    if key is None:
+        return None
+    with _lock:
+        return (_write_counters.get(key, 0), _data_version(key))
+
+
+def invalidate(db_path: Optional[str] = None) -> None:
+    """Drop cached snapshots for one database, or for all databases if no path is given"""
+    key = _cache_key(db_path)
+    with _lock:
+        if db_path is None:
+            _snapshots.clear()
+        else:
+            for cache_key in [k for k in _snapshots if k[0] == key]:
+                del _snapshots[cache_key]
+
+
+def cache_stats() -> Dict[str, int]:
+    """Hit and miss counters plus the current number of cached snapshots"""
+    with _lock:
+        return dict(_stats, entries=len(_snapshots))
+
+
+def build_stats_snapshot(db, league=None, include_facility_stats: bool = True) -> Dict[str, Any]:
+    """
+    Compute a statistics snapshot from the database
+
+    Args:
+        db: Connected database instance
+        league: Optional league to restrict league and facility statistics to
+        include_facility_stats: Whether to compute the (expensive) per-facility statistics
+
+    Returns:
+        Dictionary with entity counts, a per-league breakdown and per-facility statistics
+    """
+    leagues = db.list_leagues()
+    facilities = db.list_facilities()
+    teams = db.list_teams()
+    matches = db.list_matches()
+
+    scheduled_count = sum(1 for m in matches if m.is_scheduled())
+
+    snapshot = {
+        'built_at': datetime.now().isoformat(),
+        'league_id': league.id if league else None,
+        'leagues_count': len(leagues),
+        'facilities_count': len(facilities),
+        'teams_count': len(teams),
+        'matches_count': len(matches),
+        'scheduled_count': scheduled_count,
+        'unscheduled_count': len(matches) - scheduled_count,
+        'facilities': facilities,
+        'league_breakdown': [],
+        'facility_stats': {},
+        'facility_team_names': {},
+        'includes_facility_stats': include_facility_stats,
+    }
+
+    target_leagues = [league] if league else leagues
+    for target in target_leagues:
+        try:
+            league_matches = [m for m in matches if m.league.id == target.id]
+            league_scheduled = sum(1 for m in league_matches if m.is_scheduled())
+            snapshot['league_breakdown'].append({
+                'league': target,
+                'teams_count': sum(1 for t in teams if t.league.id == target.id),
+                'matches_count': len(league_matches),
+                'scheduled_count': league_scheduled,
+                'unscheduled_count': len(league_matches) - league_scheduled,
+            })
+        except Exception as e:
+            logger.warning(f"Could not get stats for league {target.id}: {e}")
+
+    if not include_facility_stats:
+        return snapshot
+
+    for facility in facilities:
+        try:
+            snapshot['facility_stats'][facility.id] = db.facility_manager.facility_statistics(
+                facility=facility,
+                league=league,
+                include_league_breakdown=True,
+                include_per_day_utilization=True,
+                include_peak_demand=True,
+                include_requirements=False
+            )
+        except Exception as e:
+            snapshot['facility_stats'][facility.id] = {'error': str(e)}
+
+        snapshot['facility_team_names'][facility.id] = [
+            team.name for team in teams
+            if team.preferred_facilities and any(f.id == facility.id for f in team.preferred_facilities)
+        ]
+
+    return snapshot
+
+
+def get_stats_snapshot(db, league=None, include_facility_stats: bool = True) -> Dict[str, Any]:
+    """
+    Get a statistics snapshot, re-using the cached one while the change token is unchanged
+
+    Args:
+        db: Connected database instance (must expose ``db_path`` to be cached)
+        league: Optional league to restrict statistics to
+        include_facility_stats: Whether per-facility statistics are needed
+
+    Returns:
+        Statistics snapshot dictionary (see ``build_stats_snapshot``)
+    """
+    key = _cache_key(getattr(db, 'db_path', None))
+    if key is None or getattr(db, 'transaction_active', False):
+        return build_stats_snapshot(db, league, include_facility_stats)
+
+    # A background rebuild of the same data is cheaper to wait for than to duplicate
+    with _lock:
+        pending = _prewarm_threads.get(key)
+    if pending is not None and pending.is_alive() and league is None:
+        pending.join()
+
+    cache_key = (key, league.id if league else None)
+    token = get_change_token(key)
+    with _lock:
+        cached = _snapshots.get(cache_key)
+    if (cached is not None and cached['token'] == token
+            and (cached['snapshot']['includes_facility_stats'] or not include_facility_stats)):
+        logger.debug(f"Stats snapshot cache hit for {cache_key}")
+        with _lock:
+            _stats["hits"] += 1
+        return cached['snapshot']
+
+    logger.debug(f"Stats snapshot cache miss for {cache_key}, rebuilding")
+    with _lock:
+        _stats["misses"] += 1
+    snapshot = build_stats_snapshot(db, league, include_facility_stats)
+    with _lock:
+        _snapshots[cache_key] = {'token': token, 'snapshot': snapshot}
+    return snapshot
+
+
+def schedule_prewarm(db_path: Optional[str]) -> Optional[threading.Thread]:
+    """
+    Rebuild the unfiltered snapshot for ``db_path`` in a background thread
+
+    The thread opens its own connection so it never shares a cursor with the
+    caller.  Returns the started thread, or None if nothing was scheduled.
+    """
+    key = _cache_key(db_path)
+    if key is None:
+        return None
+
+    with _lock:
+        running = _prewarm_threads.get(key)
+        if running is not None and running.is_alive():
+            return running
+
+        def _prewarm():
+            from sqlite_tennis_db import SQLiteTennisDB
+            db = None
+            try:
+                token = get_change_token(key)
+                db = SQLiteTennisDB({'db_path': key})
+                snapshot = build_stats_snapshot(db)
+                with _lock:
+                    _snapshots[(key, None)] = {'token': token, 'snapshot': snapshot}
+                logger.info(f"Pre-warmed stats snapshot for {key}")
+            except Exception as e:
+                logger.warning(f"Stats snapshot pre-warm failed for {key}: {e}")
+            finally:
+                if db is not None:
+                    db.disconnect()
+
+        thread = threading.Thread(target=_prewarm, name="stats-prewarm", daemon=True)
+        _prewarm_threads[key] = thread
+        thread.start()
+        return thread
@@ -14,7 +14,7 @@ from datetime import date
 
 # Use TYPE_CHECKING to avoid circular imports for type hints
 if TYPE_CHECKING:
-    from usta import Team, League, Match, Facility, MatchType
+    from usta import Team, League, Match, Facility, MatchType, MatchSummary
     from usta_facility import FacilityAvailabilityInfo
 
 
@@ -63,6 +63,26 @@ class TennisDBInterface(ABC):
         """Rollback the current transaction"""
         pass
 
+    @abstractmethod
+    def create_savepoint(self) -> Dict[str, Any]:
+        """Mark a point inside the active transaction that can be rolled back to"""
+        pass
+
+    @abstractmethod
+    def rollback_to_savepoint(self, savepoint: Dict[str, Any]):
+        """Undo every operation performed since the savepoint was created"""
+        pass
+
+    @abstractmethod
+    def release_savepoint(self, savepoint: Dict[str, Any]):
+        """Keep the operations performed since the savepoint was created"""
+        pass
+
+    @abstractmethod
+    def record_operation(self, operation_type: str, description: str, **details):
+        """Record a descriptive operation (no SQL) in the transaction's operations log"""
+        pass
+
     # ========== Team Management ==========
     @abstractmethod
     def add_team(self, team: 'Team') -> bool:
@@ -140,6 +160,21 @@ class TennisDBInterface(ABC):
         """List matches, optionally filtered by facility, league, team"""
         pass
 
+    @abstractmethod
+    def list_match_summaries(
+            self,
+            facility: Optional["Facility"] = None,
+            league: Optional["League"] = None,
+            team: Optional["Team"] = None,
+            date_str: Optional[str] = None,
+            match_type: Optional["MatchType"] = MatchType.ALL,
+        ) -> List['MatchSummary']:
+        """
+        List flat MatchSummary rows (ids, names, date, times, status) with the
+        same filters as list_matches. Intended for read-only list/table/export views.
+        """
+        pass
+
 
     @abstractmethod
     def delete_match(self, match: 'Match') -> bool:
@@ -207,7 +242,7 @@ class TennisDBInterface(ABC):
 
     @abstractmethod
     def optimize_auto_schedule(self, matches: List['Match'], max_iterations: int = 10, 
-                             progress_callback=None) -> Dict[str, Any]:
+                             progress_callback=None, ordering: str = "best_option") -> Dict[str, Any]:
         """
         Run auto-schedule optimization with multiple iterations to find best scheduling
         
@@ -215,6 +250,7 @@ class TennisDBInterface(ABC):
             matches: List of matches to schedule
             max_iterations: Maximum number of iterations to run
             progress_callback: Optional callback function for progress updates
+            ordering: Match ordering mode ("best_option", "most_constrained" or "random")
             
         Returns:
             Dictionary with optimization results including best seed and quality metrics
@@ -0,0 +1,58 @@
+"""
+Minute-of-Day Times
+
+Start times are ``"HH:MM"`` strings in the database, the JSON API, forms and
+templates.  Inside the scheduling engine they are integers: minutes since
+midnight (0 - 1439), so comparisons, gaps and overlaps are integer
+arithmetic and sorting needs no key function.
+
+``time_to_minutes`` is the one parser and ``minutes_to_time`` the one
+formatter.  A season only ever uses a few dozen distinct start times, so
+parsed strings are memoized and formatted strings come from a precomputed
+table: converting at the boundary allocates nothing after the first use of
+a time.
+"""
+
+from typing import Dict, Iterable, List
+
+MINUTES_PER_DAY = 24 * 60
+
+# "HH:MM" of every minute of the day, indexed by minute
+_TIME_STRINGS = tuple(f"{minute // 60:02d}:{minute % 60:02d}" for minute in range(MINUTES_PER_DAY))
+
+# Parsed time strings (only valid ones are cached)
+_MINUTES: Dict[str, int] = {time_str: minute for minute, time_str in enumerate(_TIME_STRINGS)}
+
+
+def time_to_minutes(time_str: str) -> int:
+    """
+    Convert 'HH:MM' (24-hour) to minutes since midnight
+
+    Raises:
+        ValueError: If the string is not a valid HH:MM time
+    """
+    minutes = _MINUTES.get(time_str)
+    if minutes is not None:
+        return minutes
+    try:
+        parts = time_str.split(':')
+        if len(parts) != 2:
+            raise ValueError("Invalid time format")
+        hour, minute = int(parts[0]), int(parts[1])
+        if not (0 <= hour <= 23 and 0 <= minute <= 59):
+            raise ValueError("Invalid time values")
+    except (ValueError, IndexError, AttributeError):
+        raise ValueError(f"Invalid time format: '{time_str}'. Expected HH:MM format")
+    minutes = hour * 60 + minute
+    _MINUTES[time_str] = minutes
+    return minutes
+
+
+def minutes_to_time(minutes: int) -> str:
+    """Convert minutes since midnight to 'HH:MM' (wrapping past midnight)"""
+    return _TIME_STRINGS[minutes % MINUTES_PER_DAY]
+
+
+def sort_times(times: Iterable[str]) -> List[str]:
+    """Times in chronological order ('9:00' before '10:00', unlike a string sort)"""
+    return sorted(times, key=time_to_minutes)
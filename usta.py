@@ -23,7 +23,7 @@ from usta_team import Team
 # from usta_line import Line
 
 # Import match last (depends on league, team, facility, and potentially line)
-from usta_match import Match, MatchType
+from usta_match import Match, MatchType, MatchSummary
 
 # Export all classes for easy importing
 __all__ = [
@@ -32,7 +32,8 @@ __all__ = [
     'League',
     'Team',
     'Match',
-    'MatchType'
+    'MatchType',
+    'MatchSummary'
 ]
 
 
@@ -9,22 +9,23 @@ import logging
 from usta_match import Match
 from usta_team import Team
 from usta_constants import USTA_SECTIONS, USTA_REGIONS, USTA_AGE_GROUPS, USTA_DIVISIONS
+from slot_search import (CourtCapacityVector, find_line_distributions, match_line_modes,
+                         SAME_TIME, SPLIT_TIMES, CUSTOM, MIN_SLOT_GAP_MINUTES)
+from court_occupancy import FacilityDayOccupancy
+from compact_schedule import WEEKDAYS, CompactDaySchedule, CompactWeeklySchedule, weekday_index
+from time_of_day import time_to_minutes
+from blackout_dates import BlackoutDates
 
 
 logger = logging.getLogger(__name__)
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format='%(asctime)s - %(levelname)s - %(filename)s:%(lineno)d - %(message)s'
-)
-logger = logging.getLogger(__name__)
-
 
 @dataclass
 class TimeSlot:
     """Represents a time slot with available courts"""
     time: str  # Format: "HH:MM" (24-hour format)
     available_courts: int
+    minutes: int = field(default=0, init=False, repr=False, compare=False)  # Minutes since midnight
     
     def __post_init__(self) -> None:
         """Validate time format and court count"""
@@ -32,15 +33,7 @@ class TimeSlot:
             raise ValueError("Time must be a string")
         
         # Validate time format (HH:MM)
-        try:
-            parts = self.time.split(':')
-            if len(parts) != 2:
-                raise ValueError("Invalid time format")
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError("Invalid time values")
-        except (ValueError, IndexError):
-            raise ValueError(f"Invalid time format: '{self.time}'. Expected HH:MM format")
+        self.minutes = time_to_minutes(self.time)
         
         if not isinstance(self.available_courts, int) or self.available_courts < 0:
             raise ValueError(f"Available courts must be a non-negative integer, got: {self.available_courts}")
@@ -56,21 +49,25 @@ class TimeSlot:
     
     def get_hour(self) -> int:
         """Get the hour component of the time (0-23)"""
-        return int(self.time.split(':')[0])
+        return self.minutes // 60
     
     def get_minute(self) -> int:
         """Get the minute component of the time (0-59)"""
-        return int(self.time.split(':')[1])
+        return self.minutes % 60
     
     def get_time_as_minutes(self) -> int:
         """Get time as total minutes from midnight"""
-        hour, minute = self.get_hour(), self.get_minute()
-        return hour * 60 + minute
+        return self.minutes
 
 @dataclass
 class DaySchedule:
     """Represents the schedule for a single day"""
     start_times: List[TimeSlot] = field(default_factory=list)
+
+    # Snapshot for lookups (see compact()), the list it was built from and its length then
+    _compact: Optional[CompactDaySchedule] = field(default=None, init=False, repr=False, compare=False)
+    _compact_source: Optional[List[TimeSlot]] = field(default=None, init=False, repr=False, compare=False)
+    _compact_length: int = field(default=0, init=False, repr=False, compare=False)
     
     def __post_init__(self) -> None:
         """Validate that all start_times are TimeSlot objects"""
@@ -81,6 +78,20 @@ class DaySchedule:
             if not isinstance(slot, TimeSlot):
                 raise ValueError(f"All items in start_times must be TimeSlot objects, item {i} is {type(slot)}")
     
+    def compact(self) -> CompactDaySchedule:
+        """
+        Read-only snapshot with sorted slot arrays (O(1) lookup by index or exact time)
+
+        Rebuilt when start_times is replaced or changes length.
+        """
+        start_times = self.start_times
+        if (self._compact is None or start_times is not self._compact_source
+                or len(start_times) != self._compact_length):
+            self._compact = CompactDaySchedule((slot.time, slot.available_courts) for slot in start_times)
+            self._compact_source = start_times
+            self._compact_length = len(start_times)
+        return self._compact
+
     # ========== DaySchedule Class Getters ==========
 
     def get_start_times(self) -> List[TimeSlot]:
@@ -93,15 +104,13 @@ class DaySchedule:
     
     def get_earliest_time(self) -> Optional[str]:
         """Get the earliest start time for this day"""
-        if not self.start_times:
-            return None
-        return min(slot.time for slot in self.start_times)
+        times = self.compact().times
+        return times[0] if times else None
     
     def get_latest_time(self) -> Optional[str]:
         """Get the latest start time for this day"""
-        if not self.start_times:
-            return None
-        return max(slot.time for slot in self.start_times)
+        times = self.compact().times
+        return times[-1] if times else None
     
     def get_total_courts_available(self) -> int:
         """Get total courts available across all time slots"""
@@ -140,6 +149,10 @@ class DaySchedule:
             return 0
         return max(slot.available_courts for slot in self.start_times)
 
+# WeeklySchedule attribute of each weekday index (date.weekday())
+_DAY_ATTRIBUTES = tuple(name.lower() for name in WEEKDAYS)
+
+
 @dataclass
 class WeeklySchedule:
     """Represents a weekly schedule for a facility"""
@@ -151,6 +164,25 @@ class WeeklySchedule:
     saturday: DaySchedule = field(default_factory=DaySchedule)
     sunday: DaySchedule = field(default_factory=DaySchedule)
 
+    # Snapshot for lookups (see compact())
+    _compact: Optional[CompactWeeklySchedule] = field(default=None, init=False, repr=False, compare=False)
+
+    def day_for_date(self, date_obj: date) -> DaySchedule:
+        """Get the schedule of the weekday a date falls on"""
+        return getattr(self, _DAY_ATTRIBUTES[date_obj.weekday()])
+
+    def compact(self) -> CompactWeeklySchedule:
+        """
+        Read-only snapshot with weekday-indexed days, sorted slot arrays and capacity matrices
+
+        Rebuilt when one of the days' snapshots is (see DaySchedule.compact).
+        """
+        days = tuple(getattr(self, name).compact() for name in _DAY_ATTRIBUTES)
+        compact = self._compact
+        if compact is None or any(day is not previous for day, previous in zip(days, compact.days)):
+            compact = self._compact = CompactWeeklySchedule(days)
+        return compact
+
     # ========== WeeklySchedule Class Getters ==========
 
     def get_monday(self) -> DaySchedule:
@@ -209,41 +241,11 @@ class WeeklySchedule:
     
     def get_day_schedule(self, day: str) -> DaySchedule:
         """Get schedule for a specific day (case-insensitive)"""
-        day_lower = day.lower()
-        day_mapping = {
-            'monday': self.monday,
-            'tuesday': self.tuesday,
-            'wednesday': self.wednesday,
-            'thursday': self.thursday,
-            'friday': self.friday,
-            'saturday': self.saturday,
-            'sunday': self.sunday
-        }
-        
-        if day_lower not in day_mapping:
-            raise ValueError(f"Invalid day: {day}. Must be one of: {list(day_mapping.keys())}")
-        
-        return day_mapping[day_lower]
+        return getattr(self, _DAY_ATTRIBUTES[weekday_index(day)])
     
     def set_day_schedule(self, day: str, schedule: DaySchedule) -> None:
         """Set schedule for a specific day"""
-        day_lower = day.lower()
-        if day_lower == 'monday':
-            self.monday = schedule
-        elif day_lower == 'tuesday':
-            self.tuesday = schedule
-        elif day_lower == 'wednesday':
-            self.wednesday = schedule
-        elif day_lower == 'thursday':
-            self.thursday = schedule
-        elif day_lower == 'friday':
-            self.friday = schedule
-        elif day_lower == 'saturday':
-            self.saturday = schedule
-        elif day_lower == 'sunday':
-            self.sunday = schedule
-        else:
-            raise ValueError(f"Invalid day: {day}")
+        setattr(self, _DAY_ATTRIBUTES[weekday_index(day)], schedule)
     
     def get_all_days(self) -> Dict[str, DaySchedule]:
         """Get all day schedules as a dictionary"""
@@ -293,15 +295,7 @@ class Line:
         if self.time is not None:
             if not isinstance(self.time, str):
                 raise ValueError("Time must be a string or None")
-            try:
-                parts = self.time.split(':')
-                if len(parts) != 2:
-                    raise ValueError("Invalid time format")
-                hour, minute = int(parts[0]), int(parts[1])
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    raise ValueError("Invalid time values")
-            except (ValueError, IndexError):
-                raise ValueError(f"Invalid time format: '{self.time}'. Expected HH:MM format")
+            time_to_minutes(self.time)
         
         # Validate court_number if provided
         if self.court_number is not None:
@@ -399,8 +393,14 @@ class Facility:
     short_name: Optional[str] = None  # Short name for display (e.g., "VR", "TCA")
     location: Optional[str] = None
     schedule: WeeklySchedule = field(default_factory=WeeklySchedule)
-    unavailable_dates: List[date] = field(default_factory=list)  # List of date objects
+    unavailable_dates: BlackoutDates = field(default_factory=BlackoutDates)  # Dates the facility is closed
     total_courts: int = 0  # Total number of courts at the facility
+
+    def __setattr__(self, name: str, value: Any) -> None:
+        """Keep unavailable_dates a BlackoutDates whatever it is assigned (lists of dates or strings)"""
+        if name == 'unavailable_dates' and not isinstance(value, BlackoutDates):
+            value = BlackoutDates(value if value is not None else ())
+        object.__setattr__(self, name, value)
     
     def __eq__(self, other: Any) -> bool:
         """Check equality based on ID and name"""
@@ -443,19 +443,11 @@ class Facility:
         if not isinstance(self.schedule, WeeklySchedule):
             raise ValueError("Schedule must be a WeeklySchedule object")
         
-        if not isinstance(self.unavailable_dates, list):
-            raise ValueError("Unavailable dates must be a list")
-        
         if not isinstance(self.total_courts, int) or self.total_courts < 0:
             raise ValueError(f"Total courts must be a non-negative integer, got: {self.total_courts}")
         
 
 
-        # Validate date formats in unavailable_dates
-        for date_obj in self.unavailable_dates:
-            if not isinstance(date_obj, date):
-                raise ValueError(f"All unavailable dates must be date objects, got: {type(date_obj)}")
-
         if self.total_courts == 0:
             # make total_courts the maximum of the schedule's available courts for a single time slot
             # This assumes that the schedule has been properly initialized with DaySchedule objects
@@ -492,7 +484,7 @@ class Facility:
     
     def get_unavailable_dates(self) -> List[date]:
         """Get list of unavailable dates"""
-        return self.unavailable_dates.copy()
+        return list(self.unavailable_dates)
     
     def get_total_courts(self) -> int:
         """Get the total number of courts at the facility"""
@@ -647,17 +639,40 @@ class Facility:
         return self.short_name
     
     def add_unavailable_date(self, date_obj: date) -> None:
-        """Add a date to the unavailable dates list"""
+        """Add a date to the unavailable dates"""
         if not isinstance(date_obj, date):
             raise ValueError("Date must be a date object")
         
-        if date_obj not in self.unavailable_dates:
-            self.unavailable_dates.append(date_obj)
+        self.unavailable_dates.add(date_obj)
     
     def remove_unavailable_date(self, date_obj: date) -> None:
-        """Remove a date from the unavailable dates list"""
-        if date_obj in self.unavailable_dates:
-            self.unavailable_dates.remove(date_obj)
+        """Remove a date from the unavailable dates"""
+        if isinstance(date_obj, date):
+            self.unavailable_dates.discard(date_obj)
+
+    def add_unavailable_range(self, start: date, end: date) -> int:
+        """
+        Mark every date from start to end (inclusive) unavailable
+
+        Returns:
+            Number of dates newly marked unavailable
+
+        Raises:
+            ValueError: If end is before start
+        """
+        return self.unavailable_dates.add_range(start, end)
+
+    def remove_unavailable_range(self, start: date, end: date) -> int:
+        """
+        Make every date from start to end (inclusive) available again
+
+        Returns:
+            Number of dates that were unavailable
+
+        Raises:
+            ValueError: If end is before start
+        """
+        return self.unavailable_dates.remove_range(start, end)
     
     def is_available_on_date(self, date_obj: date) -> bool:
         """Check if the facility is available on a specific date"""
@@ -666,25 +681,18 @@ class Facility:
     def get_available_courts_on_day_time(self, day: str, time: str) -> Optional[int]:
         """Get the number of available courts for a specific day and time"""
         try:
-            day_schedule = self.schedule.get_day_schedule(day)
-            return day_schedule.get_available_courts_at_time(time)
+            return self.schedule.get_day_schedule(day).compact().courts_at(time)
         except ValueError:
             return None
         
     def get_available_courts_on_date_time(self, date_obj: date, time: str) -> Optional[int]:
         """Get the number of available courts for a specific date and time"""
-        # Convert date to day of week
-        try:
-            day_of_week = date_obj.strftime('%A')  # Get full weekday name
-            return self.get_available_courts_on_day_time(day_of_week, time)
-        except ValueError:
-            return None
+        return self.schedule.day_for_date(date_obj).compact().courts_at(time)
     
     def has_availability_on_day(self, day: str) -> bool:
         """Check if the facility has any availability on a specific day of the week"""
         try:
-            day_schedule = self.schedule.get_day_schedule(day)
-            return day_schedule.has_availability()
+            return self.schedule.get_day_schedule(day).compact().has_availability()
         except ValueError:
             return False
     
@@ -779,7 +787,7 @@ class Facility:
         if not isinstance(unavailable_dates, list):
             raise ValueError(f"Facility '{name}' unavailable_dates must be a list")
         
-        facility.unavailable_dates = unavailable_dates.copy()
+        facility.unavailable_dates = unavailable_dates
         
         return facility
     
@@ -816,7 +824,7 @@ class Facility:
                 'location': getattr(self, 'location', '') or '',
                 'total_courts': getattr(self, 'total_courts', 0),
                 'schedule': schedule_dict,
-                'unavailable_dates': getattr(self, 'unavailable_dates', []) or []
+                'unavailable_dates': [day.isoformat() for day in self.unavailable_dates]
             }
             logger.debug("Basic facility_dict constructed: %s", facility_dict)
 
@@ -856,6 +864,7 @@ class TimeSlotAvailability:
     used_courts: int  # Courts currently scheduled/booked
     available_courts: int  # Courts still available for booking
     utilization_percentage: float  # Percentage of courts being used (0-100)
+    minutes: int = field(default=0, init=False, repr=False, compare=False)  # Minutes since midnight
     
     def __post_init__(self) -> None:
         """Validate time slot availability data"""
@@ -863,15 +872,7 @@ class TimeSlotAvailability:
         if not isinstance(self.time, str):
             raise ValueError("Time must be a string")
         
-        try:
-            parts = self.time.split(':')
-            if len(parts) != 2:
-                raise ValueError("Invalid time format")
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError("Invalid time values")
-        except (ValueError, IndexError):
-            raise ValueError(f"Invalid time format: '{self.time}'. Expected HH:MM format")
+        self.minutes = time_to_minutes(self.time)
         
         # Validate court counts
         if not isinstance(self.total_courts, int) or self.total_courts < 0:
@@ -934,6 +935,40 @@ class TimeSlotAvailability:
             'has_availability': self.has_availability()
         }
 
+    @classmethod
+    def from_occupancy(cls, occupancy: FacilityDayOccupancy,
+                       duration_minutes: Optional[int] = None) -> List['TimeSlotAvailability']:
+        """
+        Create one TimeSlotAvailability per start time of a facility-day
+
+        Args:
+            occupancy: Court occupancy of the facility-day
+            duration_minutes: Optional length of the match being placed; a court is
+                only counted as available if it stays free for that long
+
+        Returns:
+            List of TimeSlotAvailability objects in time order
+        """
+        time_slots = []
+        for time, total_courts, used_courts in occupancy.slot_usage(duration_minutes):
+            # Ensure used_courts doesn't exceed total_courts (defensive programming)
+            # This can happen if there are data inconsistencies or overbooking
+            if used_courts > total_courts:
+                logger.warning(
+                    f"Over-booking detected: {used_courts} courts used > {total_courts} total courts "
+                    f"at time {time}. Capping used_courts to total_courts."
+                )
+                used_courts = total_courts
+
+            time_slots.append(cls(
+                time=time,
+                total_courts=total_courts,
+                used_courts=used_courts,
+                available_courts=total_courts - used_courts,
+                utilization_percentage=round(used_courts / total_courts * 100, 1) if total_courts > 0 else 0,
+            ))
+        return time_slots
+
 
 
 
@@ -954,6 +989,7 @@ class FacilityAvailabilityInfo:
     available_court_slots: int = 0  # Available court-time slots across all times
     overall_utilization_percentage: float = 0.0  # Overall utilization across all time slots
     reason: Optional[str] = None  # Reason if facility is not available
+    occupancy: Optional[FacilityDayOccupancy] = field(default=None, repr=False, compare=False)  # Court intervals behind time_slots
     
     def __post_init__(self) -> None:
         """Validate facility availability info"""
@@ -1089,6 +1125,23 @@ class FacilityAvailabilityInfo:
             
         return [slot.time for slot in self.time_slots if slot.can_accommodate(courts_needed)]
 
+    def match_time_slots(self, match: 'Match') -> List[TimeSlotAvailability]:
+        """
+        Time slots as seen by a match: when the league sets a match duration, a
+        court only counts as available at a start time if it stays free for the
+        whole match
+
+        Args:
+            match: Match being placed
+
+        Returns:
+            List of TimeSlotAvailability objects
+        """
+        duration = getattr(match.league, 'match_duration_minutes', None)
+        if not duration or self.occupancy is None:
+            return self.time_slots
+        return TimeSlotAvailability.from_occupancy(self.occupancy, duration)
+
     
 
 
@@ -1227,21 +1280,16 @@ class FacilityAvailabilityInfo:
             return False, "Split times mode requires exactly two time slots"
         
         import math
-        from datetime import datetime, timedelta
-        
-        time1, time2 = sorted(times)
-        courts_per_slot = math.ceil(lines_needed / 2)
         
-        # Check time gap
         try:
-            dt1 = datetime.strptime(time1, '%H:%M')
-            dt2 = datetime.strptime(time2, '%H:%M')
-            if dt2 < dt1:
-                dt2 += timedelta(days=1)
-            if dt2 - dt1 < timedelta(hours=1):
-                return False, "Split time slots must be at least 1 hour apart"
+            time1, time2 = sorted(times, key=time_to_minutes)
         except ValueError:
             return False, "Invalid time format"
+        courts_per_slot = math.ceil(lines_needed / 2)
+        
+        # Check time gap
+        if time_to_minutes(time2) - time_to_minutes(time1) < MIN_SLOT_GAP_MINUTES:
+            return False, "Split time slots must be at least 1 hour apart"
         
         # Check availability for both slots
         if not self.check_time_availability(time1, courts_per_slot):
@@ -1288,32 +1336,35 @@ class FacilityAvailabilityInfo:
             suggestions['reason'] = self.reason
             return suggestions
         
-        # Same time suggestions
-        same_time_options = self.get_available_times(lines_needed)
+        # Same time suggestions, most available first
+        same_time = find_line_distributions(self.time_slots, lines_needed, (SAME_TIME,), limit=5)
         suggestions['same_time'] = {
-            'possible': len(same_time_options) > 0,
-            'options': same_time_options[:5]  # Limit to first 5
+            'possible': len(same_time) > 0,
+            'options': [distribution.counts[0][0] for distribution in same_time]
         }
         
-        # Split times suggestions
-        import math
-        courts_per_slot = math.ceil(lines_needed / 2)
-        split_time_options = self.get_available_times(courts_per_slot)
-        
-        if len(split_time_options) >= 2:
+        # Split times suggestions: even two-slot distributions, best first
+        splits = find_line_distributions(self.time_slots, lines_needed, (SPLIT_TIMES,), limit=5)
+        if splits:
             suggestions['split_times'] = {
                 'possible': True,
                 'options': [
-                    {'time1': split_time_options[i], 'time2': split_time_options[j]}
-                    for i in range(len(split_time_options))
-                    for j in range(i+1, min(i+4, len(split_time_options)))  # Limit combinations
-                ][:5],
-                'courts_per_slot': courts_per_slot
+                    {'time1': split.counts[0][0], 'time2': split.counts[1][0],
+                     'lines1': split.counts[0][1], 'lines2': split.counts[1][1]}
+                    for split in splits
+                ],
+                'courts_per_slot': max(count for _, count in splits[0].counts)
             }
         else:
             suggestions['split_times'] = {'possible': False}
-        
-        
+
+        # Custom suggestions: uneven or multi-slot distributions
+        custom = find_line_distributions(self.time_slots, lines_needed, (CUSTOM,), limit=5)
+        suggestions['custom'] = {
+            'possible': len(custom) > 0,
+            'options': [distribution.times for distribution in custom]
+        }
+
         return suggestions
     
 
@@ -1332,19 +1383,13 @@ class FacilityAvailabilityInfo:
             return False, f"Facility not available on {self.date}: {self.reason}"
 
         lines_needed = match.league.num_lines_per_match
+        if not lines_needed:
+            return False, "League has no lines to schedule"
 
-        # first check to see if we can accommodate all lines at the same time
-        if lines_needed and len(self.get_available_times(lines_needed)) > 0:
+        # Same time first, then an even split over two start times when the league allows it
+        capacity = CourtCapacityVector.from_time_slots(self.match_time_slots(match))
+        if capacity.can_fit(lines_needed, match_line_modes(match.league.allow_split_lines)):
             return True, None
-        
-        # if split times are allowed, check if we can accommodate in two time slots
-        if match.league.allow_split_lines:
-            import math
-            courts_per_slot = math.ceil(lines_needed / 2)
-            available_times = self.get_available_times(courts_per_slot)
-            if len(available_times) >= 2:
-                return True, None
 
-        
         # if we reach here, we cannot accommodate the match
         return False, f"Facility cannot accommodate {lines_needed} lines on {self.date}"
\ No newline at end of file
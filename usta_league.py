@@ -36,6 +36,8 @@ class League:
     backup_days: List[str] = field(default_factory=list)  # Backup days for scheduling
     start_date: Optional[date] = None  # League start date
     end_date: Optional[date] = None  # League end date
+    match_duration_minutes: Optional[int] = None  # How long a line occupies its court (None: until the facility's next start time)
+    team_rest_minutes: Optional[int] = None  # Minimum rest between two matches of a team on the same day (None: default)
 
     # Penalty constants for quality scoring (make this configurable?)
     TEAM_PENALTY: int = 80  # Penalty for scheduling on a day not preferred by any team
@@ -74,6 +76,14 @@ class League:
         if self.num_lines_per_match > 10:
             raise ValueError(f"Number of lines per match seems unusually high: {self.num_lines_per_match}. Expected 1-10.")
 
+        if self.match_duration_minutes is not None and (
+                not isinstance(self.match_duration_minutes, int) or not 0 < self.match_duration_minutes <= 12 * 60):
+            raise ValueError(f"Match duration must be between 1 and 720 minutes, got: {self.match_duration_minutes}")
+
+        if self.team_rest_minutes is not None and (
+                not isinstance(self.team_rest_minutes, int) or self.team_rest_minutes < 0):
+            raise ValueError(f"Team rest must be a non-negative number of minutes, got: {self.team_rest_minutes}")
+
     
     def generate_deterministic_start_id(self) -> int:
         """Generate a deterministic starting match ID based on league properties"""
@@ -102,7 +112,9 @@ class League:
             'preferred_days': self.preferred_days,
             'backup_days': self.backup_days,
             'start_date': self.start_date.isoformat() if self.start_date else None,
-            'end_date': self.end_date.isoformat() if self.end_date else None
+            'end_date': self.end_date.isoformat() if self.end_date else None,
+            'match_duration_minutes': self.match_duration_minutes,
+            'team_rest_minutes': self.team_rest_minutes
         }
 
 
@@ -10,7 +10,7 @@ Core fields (id, league, home_team, visitor_team) are immutable after creation.
 
 from __future__ import annotations
 from dataclasses import dataclass, field
-from typing import List, Dict, Optional, Any, Tuple, TYPE_CHECKING
+from typing import List, Dict, Optional, Any, Tuple, NamedTuple, TYPE_CHECKING
 from datetime import date as date_type, datetime, timedelta
 from datetime import date
 from enum import Enum
@@ -20,6 +20,9 @@ from collections import defaultdict
 
 from click import Option
 
+from season_calendar import season_calendar
+from time_of_day import time_to_minutes
+
 # Use TYPE_CHECKING for all USTA classes to avoid circular imports
 if TYPE_CHECKING:
     from usta_league import League
@@ -69,20 +72,10 @@ class MatchScheduling:
                 raise ValueError(
                     f"All scheduled times must be strings, item {i} is {type(time_str)}"
                 )
-            try:
-                parts = time_str.split(":")
-                if len(parts) != 2:
-                    raise ValueError("Invalid time format")
-                hour, minute = int(parts[0]), int(parts[1])
-                if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                    raise ValueError("Invalid time values")
-            except (ValueError, IndexError):
-                raise ValueError(
-                    f"Invalid time format: '{time_str}'. Expected HH:MM format"
-                )
+            time_to_minutes(time_str)
         
-        # Sort times to maintain order
-        self.scheduled_times.sort()
+        # Sort times to maintain (chronological) order
+        self.scheduled_times.sort(key=time_to_minutes)
     
     @property
     def is_complete(self) -> bool:
@@ -95,29 +88,24 @@ class MatchScheduling:
     
     def get_earliest_time(self) -> Optional[str]:
         """Get the earliest scheduled time, or None if no times scheduled"""
-        return min(self.scheduled_times) if self.scheduled_times else None
+        return self.scheduled_times[0] if self.scheduled_times else None
     
     def get_latest_time(self) -> Optional[str]:
         """Get the latest scheduled time, or None if no times scheduled"""
-        return max(self.scheduled_times) if self.scheduled_times else None
+        return self.scheduled_times[-1] if self.scheduled_times else None
+
+    @property
+    def scheduled_minutes(self) -> List[int]:
+        """Scheduled times as minutes since midnight, in time order"""
+        return [time_to_minutes(time_str) for time_str in self.scheduled_times]
     
     def get_duration_hours(self) -> float:
         """Estimate total duration in hours based on earliest and latest times"""
         if len(self.scheduled_times) < 2:
             return 3.0  # Default 3 hours for single time or no times
         
-        earliest = self.get_earliest_time()
-        latest = self.get_latest_time()
-        
-        if not earliest or not latest:
-            return 3.0
-        
-        # Parse times and calculate difference
-        earliest_parts = earliest.split(":")
-        latest_parts = latest.split(":")
-        
-        earliest_minutes = int(earliest_parts[0]) * 60 + int(earliest_parts[1])
-        latest_minutes = int(latest_parts[0]) * 60 + int(latest_parts[1])
+        earliest_minutes = time_to_minutes(self.scheduled_times[0])
+        latest_minutes = time_to_minutes(self.scheduled_times[-1])
         
         duration_minutes = (
             latest_minutes - earliest_minutes + 180
@@ -127,19 +115,11 @@ class MatchScheduling:
     def add_scheduled_time(self, time: str) -> None:
         """Add a scheduled time and maintain sorted order"""
         # Validate time format
-        try:
-            parts = time.split(":")
-            if len(parts) != 2:
-                raise ValueError("Invalid time format")
-            hour, minute = int(parts[0]), int(parts[1])
-            if not (0 <= hour <= 23 and 0 <= minute <= 59):
-                raise ValueError("Invalid time values")
-        except (ValueError, IndexError):
-            raise ValueError(f"Invalid time format: '{time}'. Expected HH:MM format")
+        time_to_minutes(time)
         
         if time not in self.scheduled_times:
             self.scheduled_times.append(time)
-            self.scheduled_times.sort()
+            self.scheduled_times.sort(key=time_to_minutes)
     
     def remove_scheduled_time(self, time: str) -> bool:
         """Remove a scheduled time. Returns True if time was found and removed."""
@@ -203,7 +183,103 @@ class MatchType(Enum):
         )
 
 
-@dataclass
+def score_match_date(
+    league: "League",
+    round_num: int,
+    num_rounds: float,
+    home_preferred_days: List[str],
+    visitor_preferred_days: List[str],
+    target_date: date,
+    facility_index: Optional[int] = None,
+) -> Tuple[int, List[str]]:
+    """
+    Score a date (and optionally a facility) for a match from plain values.
+
+    This is the scoring core shared by Match.calculate_quality_score and the
+    flat MatchSummary rows, which carry team preferences but no Team objects.
+
+    Args:
+        league: League providing preferred/backup days, season dates and penalties
+        round_num: Round number of the match
+        num_rounds: Number of rounds in the league
+        home_preferred_days: Home team preferred days
+        visitor_preferred_days: Visitor team preferred days
+        target_date: Date being scored
+        facility_index: Index of the facility in the home team's preferred facilities, if known
+
+    Returns:
+        Tuple of (quality score, list of penalties applied)
+    """
+    TEAM_PENALTY = league.TEAM_PENALTY
+    LEAGUE_PENALTY = league.LEAGUE_PENALTY
+    ROUND_PENALTY = league.ROUND_PENALTY
+    FACILITY_PENALTY = league.FACILITY_PENALTY
+
+    penalties = []
+
+    # Determine team requirements
+    hp = set(home_preferred_days)
+    vp = set(visitor_preferred_days)
+
+    team_preferred_days = None
+    if hp and vp:
+        team_preferred_days = hp & vp  # Intersection if both have preferences
+    elif hp or vp:
+        team_preferred_days = hp | vp  # Union if only one has preferences
+
+    # Check if the date is within the match's round
+    if not league.start_date or not league.end_date:
+        return (99, [])  # Cannot calculate without league dates
+    calendar = season_calendar(league.start_date, league.end_date)
+    day_name = calendar.day(target_date).day_name
+    in_round = calendar.in_round(target_date, round_num, num_rounds)
+
+    # Start at 100
+    quality = 100  # Default: not preferred by anyone
+
+    # if there are team preferred days and this day is not in them return 20
+    if team_preferred_days is not None:
+        if day_name not in team_preferred_days:
+            quality -= TEAM_PENALTY  # Severe penalty for not preferred day for teams
+            penalties.append(f"team_penalty:{TEAM_PENALTY}")
+
+    # Deal with preferred and backup days first
+    if day_name in league.preferred_days:
+        quality -= 0  # No penalty for league preferred day
+    elif day_name in league.backup_days:
+        quality -= LEAGUE_PENALTY  # League backup day
+        penalties.append(f"league_penalty:{LEAGUE_PENALTY}")
+    else:
+        quality -= 3 * LEAGUE_PENALTY  # outside all preferred and backup days
+        penalties.append(f"league_penalty:{3 * LEAGUE_PENALTY}")
+
+    # Penalty based on index in the home team's preferred facilities
+    if facility_index is not None:
+        quality -= facility_index * FACILITY_PENALTY
+        if facility_index > 0:
+            penalties.append(f"facility_penalty:{facility_index * FACILITY_PENALTY}")
+
+    # Add penalty if outside round
+    if not in_round:
+        quality -= ROUND_PENALTY
+        penalties.append(f"round_penalty:{ROUND_PENALTY}")
+
+    return (quality, penalties)
+
+
+def _read_only(name: str, doc: str) -> property:
+    """Property over the ``_<name>`` slot that refuses assignment"""
+    slot = f"_{name}"
+
+    def fget(self: "Match") -> Any:
+        return getattr(self, slot)
+
+    def fset(self: "Match", value: Any) -> None:
+        raise AttributeError(f"Match {name} is immutable and cannot be changed after creation")
+
+    return property(fget, fset, doc=doc)
+
+
 class Match:
     """
     Represents a tennis match with direct object references
@@ -211,189 +287,157 @@ class Match:
     The match uses a MatchScheduling object to contain facility, date, and scheduled times.
     All lines are assumed to be at the same facility and date, but can have different start times.
 
-    Core fields (id, league, home_team, visitor_team) are immutable after creation.
+    Core fields (id, round, num_rounds, league, home_team, visitor_team) are
+    read-only properties over slots, so they are stored once and cannot be
+    changed after creation; scheduling, score and qscore are plain slots.
+    Matches compare equal when all their fields are equal and are unhashable,
+    like the dataclass this class replaced.
     """
 
-    id: int
-    round: int  # Match round number (immutable)
-    num_rounds: float  # Number of rounds for this league
-    league: "League"  # Direct League object reference (IMMUTABLE)
-    home_team: "Team"  # Direct Team object reference (IMMUTABLE)
-    visitor_team: "Team"  # Direct Team object reference (IMMUTABLE)
-    scheduling: Optional[MatchScheduling] = None  # Scheduling information (mutable)
-
-    # a score field to represent the match score
-    score: int = 0  # Match score, default is 0 (mutable)
-
-    # quality score for scheduled matches based on date assignment
-    qscore: int = (
-        0  # Quality score based on date assignment, default is 0 (mutable)
+    __slots__ = (
+        "_id",
+        "_round",
+        "_num_rounds",
+        "_league",
+        "_home_team",
+        "_visitor_team",
+        "scheduling",  # Scheduling information (mutable)
+        "score",  # Match score (mutable)
+        "qscore",  # Quality score based on date assignment (mutable)
+        "_qscore_penalties",
     )
-    qscore_penalties: List[str] = field(default_factory=list)  # List of penalties applied during quality scoring (mutable)
-
-    # Private storage for immutable fields - use different names to avoid conflicts
-    _immutable_id: Optional[int] = field(init=False, repr=False, default=None)
-    _immutable_league: Optional["League"] = field(init=False, repr=False, default=None)
-    _immutable_home_team: Optional["Team"] = field(init=False, repr=False, default=None)
-    _immutable_visitor_team: Optional["Team"] = field(
-        init=False, repr=False, default=None
-    )
-    _initialized: bool = field(init=False, repr=False, default=False)
 
-    def __post_init__(self) -> None:
-        """Validate match data and set up immutable fields"""
+    __hash__ = None  # type: ignore[assignment]
 
-        # Store immutable values in private fields
-        self._immutable_id = self.id
-        self._immutable_round = self.round
-        self._immutable_num_rounds = self.num_rounds
-        self._immutable_league = self.league
-        self._immutable_home_team = self.home_team
-        self._immutable_visitor_team = self.visitor_team
+    id = _read_only("id", "Match ID (immutable)")
+    round = _read_only("round", "Match round number (immutable)")
+    num_rounds = _read_only("num_rounds", "Number of rounds for this league (immutable)")
+    league = _read_only("league", "Direct League object reference (immutable)")
+    home_team = _read_only("home_team", "Direct Team object reference (immutable)")
+    visitor_team = _read_only("visitor_team", "Direct Team object reference (immutable)")
 
-        # Validation
-        if not isinstance(self.id, int) or self.id <= 0:
-            raise ValueError(f"Match ID must be a positive integer, got: {self.id}")
+    def __init__(
+        self,
+        id: int,
+        round: int,
+        num_rounds: float,
+        league: "League",
+        home_team: "Team",
+        visitor_team: "Team",
+        scheduling: Optional[MatchScheduling] = None,
+        score: int = 0,
+        qscore: int = 0,
+        qscore_penalties: Optional[List[str]] = None,
+    ) -> None:
+        """Validate match data and set up immutable fields"""
+        if not isinstance(id, int) or id <= 0:
+            raise ValueError(f"Match ID must be a positive integer, got: {id}")
 
         # Validate scheduling if provided
-        if self.scheduling is not None:
-            if not isinstance(self.scheduling, MatchScheduling):
-                raise TypeError("scheduling must be a MatchScheduling object or None")
+        if scheduling is not None and not isinstance(scheduling, MatchScheduling):
+            raise TypeError("scheduling must be a MatchScheduling object or None")
+
+        self._id = id
+        self._round = round
+        self._num_rounds = num_rounds
+        self._league = league
+        self._home_team = home_team
+        self._visitor_team = visitor_team
+        self.scheduling = scheduling
+        self.score = score
+        self.qscore = qscore
+        # Created on first use: most matches never record penalties
+        self._qscore_penalties = qscore_penalties
 
-        # Mark as initialized
-        self._initialized = True
+    @property
+    def qscore_penalties(self) -> List[str]:
+        """List of penalties applied during quality scoring (mutable)"""
+        if self._qscore_penalties is None:
+            self._qscore_penalties = []
+        return self._qscore_penalties
+
+    @qscore_penalties.setter
+    def qscore_penalties(self, value: List[str]) -> None:
+        self._qscore_penalties = value
+
+    def _fields(self) -> Tuple[Any, ...]:
+        return (self._id, self._round, self._num_rounds, self._league, self._home_team, self._visitor_team,
+                self.scheduling, self.score, self.qscore, self._qscore_penalties or [])
+
+    def __eq__(self, other: object) -> bool:
+        if other.__class__ is not self.__class__:
+            return NotImplemented
+        return self._fields() == other._fields()  # type: ignore[attr-defined]
+
+    def __repr__(self) -> str:
+        return (f"Match(id={self._id!r}, round={self._round!r}, num_rounds={self._num_rounds!r}, "
+                f"league={self._league!r}, home_team={self._home_team!r}, visitor_team={self._visitor_team!r}, "
+                f"scheduling={self.scheduling!r}, score={self.score!r}, qscore={self.qscore!r}, "
+                f"qscore_penalties={self.qscore_penalties!r})")
 
     # ========== IMMUTABLE PROPERTY PROTECTION ==========
 
     def get_id(self) -> int:
         """Get the match ID (immutable)"""
-        result = self._immutable_id if self._initialized else self.id
-        if result is None:
-            raise ValueError("Match ID is not initialized")
-        return result
+        return self._id
 
     def get_league(self) -> "League":
         """Get the league object (immutable)"""
-        result = self._immutable_league if self._initialized else self.league
-        if result is None:
+        if self._league is None:
             raise ValueError("League is not initialized")
-        return result
+        return self._league
 
     def get_round(self) -> int:
         """Get the match round number (immutable)"""
-        return self._immutable_round if self._initialized else self.round
+        return self._round
 
     def get_num_rounds(self) -> float:
         """Get the number of rounds for this league (immutable)"""
-        return self._immutable_num_rounds if self._initialized else self.num_rounds
+        return self._num_rounds
 
     def get_home_team(self) -> "Team":
         """Get the home team object (immutable)"""
-        result = self._immutable_home_team if self._initialized else self.home_team
-        if result is None:
+        if self._home_team is None:
             raise ValueError("Home team is not initialized")
-        return result
+        return self._home_team
 
     def get_visitor_team(self) -> "Team":
         """Get the visitor team object (immutable)"""
-        result = (
-            self._immutable_visitor_team if self._initialized else self.visitor_team
-        )
-        if result is None:
+        if self._visitor_team is None:
             raise ValueError("Visitor team is not initialized")
-        return result
+        return self._visitor_team
 
     def get_facility(self) -> Optional["Facility"]:
         """Get the facility object (mutable)"""
         return self.scheduling.facility if self.scheduling else None
 
-
-    def __setattr__(self, name: str, value: Any) -> None:
-        """Override setattr to protect immutable fields after initialization"""
-        if hasattr(self, "_initialized") and self._initialized:
-            if name in ("id", "league", "home_team", "visitor_team"):
-                raise AttributeError(
-                    f"Match {name} is immutable and cannot be changed after creation"
-                )
-        super().__setattr__(name, value)
-
     # ========== IMMUTABILITY VERIFICATION METHODS ==========
 
     def verify_immutable_fields(self) -> bool:
-        """Verify that immutable fields haven't been tampered with"""
-        try:
-            return (
-                self._immutable_id == self.id
-                and self._immutable_league is self.league
-                and self._immutable_home_team is self.home_team
-                and self._immutable_visitor_team is self.visitor_team
-            )
-        except AttributeError:
-            return False
+        """Verify that immutable fields are set (they are read-only, so they cannot have been tampered with)"""
+        return all(
+            getattr(self, slot, None) is not None
+            for slot in ("_id", "_league", "_home_team", "_visitor_team")
+        )
 
     def get_immutable_field_info(self) -> Dict[str, Any]:
         """Get information about immutable fields for debugging"""
-        return {
+        info: Dict[str, Any] = {
             "id": {
-                "value": self._immutable_id,
-                "type": type(self._immutable_id).__name__,
-                "is_protected": self._initialized,
-            },
-            "league": {
-                "value": (
-                    getattr(self._immutable_league, "name", "Unknown")
-                    if self._immutable_league
-                    else None
-                ),
-                "id": (
-                    getattr(self._immutable_league, "id", None)
-                    if self._immutable_league
-                    else None
-                ),
-                "type": (
-                    type(self._immutable_league).__name__
-                    if self._immutable_league
-                    else None
-                ),
-                "is_protected": self._initialized,
-            },
-            "home_team": {
-                "value": (
-                    getattr(self._immutable_home_team, "name", "Unknown")
-                    if self._immutable_home_team
-                    else None
-                ),
-                "id": (
-                    getattr(self._immutable_home_team, "id", None)
-                    if self._immutable_home_team
-                    else None
-                ),
-                "type": (
-                    type(self._immutable_home_team).__name__
-                    if self._immutable_home_team
-                    else None
-                ),
-                "is_protected": self._initialized,
-            },
-            "visitor_team": {
-                "value": (
-                    getattr(self._immutable_visitor_team, "name", "Unknown")
-                    if self._immutable_visitor_team
-                    else None
-                ),
-                "id": (
-                    getattr(self._immutable_visitor_team, "id", None)
-                    if self._immutable_visitor_team
-                    else None
-                ),
-                "type": (
-                    type(self._immutable_visitor_team).__name__
-                    if self._immutable_visitor_team
-                    else None
-                ),
-                "is_protected": self._initialized,
+                "value": self._id,
+                "type": type(self._id).__name__,
+                "is_protected": True,
             },
         }
+        for name in ("league", "home_team", "visitor_team"):
+            value = getattr(self, f"_{name}")
+            info[name] = {
+                "value": getattr(value, "name", "Unknown") if value else None,
+                "id": getattr(value, "id", None) if value else None,
+                "type": type(value).__name__ if value else None,
+                "is_protected": True,
+            }
+        return info
 
     # ========== Match Scheduling Status ==========
 
@@ -491,19 +535,17 @@ class Match:
                 # Default to 16 weeks from start
                 search_end = search_start + timedelta(weeks=16)
 
-            # Generate candidate dates using the priority calculation logic
-            start_dt = search_start
-            end_dt = search_end
+            # Generate candidate dates from the season calendar
+            calendar = season_calendar(self.league.start_date, self.league.end_date)
 
             candidate_options = []
-            current = start_dt
+
+            # Closed dates of each facility over the search window, bit i = i-th date
+            closed_bits = {}
 
             # Iterate through each day in the date range
-            while current <= end_dt:
+            for offset, current in enumerate(calendar.dates_between(search_start, search_end)):
                 try:
-                    day_name = current.strftime("%A")
-                    # current_date = current.date()
-
                     # iterate through facilities
                     facilities = self.home_team.preferred_facilities
 
@@ -514,7 +556,10 @@ class Match:
                             )
                         
                         # if the facility is not available on this date, skip it
-                        if not facility.is_available_on_date(current):
+                        closed = closed_bits.get(facility.id)
+                        if closed is None:
+                            closed = closed_bits[facility.id] = facility.unavailable_dates.bitmap(search_start, search_end)
+                        if closed >> offset & 1:
                             continue
                         
                         # Calculate quality score for this date
@@ -530,11 +575,8 @@ class Match:
                             )
                             candidate_options.append(scheduling)
 
-                    current += timedelta(days=1)
-
                 except Exception as date_error:
                     print(f"Error processing date {current}: {date_error}")
-                    current += timedelta(days=1)
                     continue
 
             # If no candidate dates found, return empty list
@@ -563,6 +605,10 @@ class Match:
     def get_scheduled_times(self) -> List[str]:
         """Get the list of scheduled times for this match"""
         return self.scheduling.scheduled_times.copy() if self.scheduling else []
+
+    def get_scheduled_minutes(self) -> List[int]:
+        """Get scheduled times as minutes since midnight, in time order"""
+        return self.scheduling.scheduled_minutes if self.scheduling else []
     
     def get_date_time_strings(self) -> List[str]:
         """Get combined date and time strings for all scheduled lines"""
@@ -650,14 +696,6 @@ class Match:
         # get penalty constants from league
         if not self.league:
             raise ValueError("League must be set to calculate quality score")
-        
-        TEAM_PENALTY = self.league.TEAM_PENALTY
-        LEAGUE_PENALTY = self.league.LEAGUE_PENALTY
-        ROUND_PENALTY = self.league.ROUND_PENALTY
-        FACILITY_PENALTY = self.league.FACILITY_PENALTY
-
-        # Initialize penalties to empty list
-        penalties = []
 
         # Use provided date or fall back to match's current date
         target_date = date_obj or self.date
@@ -668,56 +706,6 @@ class Match:
             return (0, [])  # No date to evaluate
 
         try:
-            # Get the day of week for the target date
-            day_name = target_date.strftime("%A")
-
-            # Determine team requirements
-            hp = set(self.home_team.preferred_days)
-            vp = set(self.visitor_team.preferred_days)
-
-            team_preferred_days = None
-            if hp and vp:
-                team_preferred_days = hp & vp  # Intersection if both have preferences
-            elif hp or vp:
-                team_preferred_days = hp | vp  # Union if only one has preferences
-
-            # Check if the date is within the match's round
-            if not self.league.start_date or not self.league.end_date:
-                return (99, [])  # Cannot calculate without league dates
-            league_start = self.league.start_date
-            league_end = self.league.end_date
-            league_days = (league_end - league_start).days
-            days_per_round = league_days // self.num_rounds
-            if league_days % self.num_rounds != 0:
-                days_per_round += 1
-
-            round_start = league_start + timedelta(
-                days=(self.round - 1) * days_per_round
-            )
-            round_end = round_start + timedelta(days=days_per_round)
-            in_round = round_start <= target_date <= round_end
-
-            # Start at 100
-            quality = 100  # Default: not preferred by anyone
-
-            # if there are team preferred days and this day is not in them return 20
-            if team_preferred_days is not None:
-                if day_name in team_preferred_days:
-                    quality -= 0  # No penalty for team preferred day
-                else:
-                    quality -= TEAM_PENALTY  # Severe penalty for not preferred day for teams
-                    penalties.append(f"team_penalty:{TEAM_PENALTY}")
-
-            # Deal with preferred and backup days first
-            if day_name in self.league.preferred_days:
-                quality -= 0  # No penalty for league preferred day
-            elif day_name in self.league.backup_days:
-                quality -= LEAGUE_PENALTY  # League backup day
-                penalties.append(f"league_penalty:{LEAGUE_PENALTY}")
-            else:
-                quality -= 3 * LEAGUE_PENALTY  # outside all preferred and backup days
-                penalties.append(f"league_penalty:{3 * LEAGUE_PENALTY}")
-
             # Make sure the facility is one of the home team's preferred facilities
             if facility is not None and facility not in self.home_team.preferred_facilities:
                 raise ValueError(
@@ -728,22 +716,23 @@ class Match:
             if facility is None and self.scheduling and self.scheduling.facility:
                 facility = self.scheduling.facility
 
-            # the facility is provided, iterate through the home team's preferred facilities
+            # the facility is provided, find it in the home team's preferred facilities
+            facility_index = None
             if facility is not None and self.home_team.preferred_facilities:
-                facilities = self.home_team.preferred_facilities
-                for i, pref_facility in enumerate(facilities):
+                for i, pref_facility in enumerate(self.home_team.preferred_facilities):
                     if facility.id == pref_facility.id:
-                        quality -= i * FACILITY_PENALTY  # Penalty based on index in preferred facilities
-                        if i > 0:
-                            penalties.append(f"facility_penalty:{i * FACILITY_PENALTY}")
+                        facility_index = i
                         break
 
-            # Add penalty if outside round
-            if not in_round:
-                quality -= ROUND_PENALTY
-                penalties.append(f"round_penalty:{ROUND_PENALTY}")
-
-            return (quality, penalties)
+            return score_match_date(
+                league=self.league,
+                round_num=self.round,
+                num_rounds=self.num_rounds,
+                home_preferred_days=self.home_team.preferred_days,
+                visitor_preferred_days=self.visitor_team.preferred_days,
+                target_date=target_date,
+                facility_index=facility_index,
+            )
 
         except (ValueError, AttributeError) as e:
             # Raise error if there's an issue calculating quality score
@@ -940,18 +929,210 @@ class Match:
 
     def to_dict(self) -> Dict[str, Any]:
         """Convert match to dictionary for serialization"""
+        scheduling = self.scheduling
+        facility = scheduling.facility if scheduling else None
+        scheduled_times = scheduling.scheduled_times.copy() if scheduling else []
+        league, home_team, visitor_team = self._league, self._home_team, self._visitor_team
+        return {
+            "id": self._id,
+            "league_id": league.id,
+            "league_name": league.name,
+            "home_team_id": home_team.id,
+            "home_team_name": home_team.name,
+            "visitor_team_id": visitor_team.id,
+            "visitor_team_name": visitor_team.name,
+            "facility_id": facility.id if facility else None,
+            "facility_name": facility.name if facility else "Unscheduled",
+            "date": scheduling.date if scheduling else None,
+            "scheduled_times": scheduled_times,
+            "status": self.get_status(),
+            "num_scheduled_lines": len(scheduled_times),
+            "expected_lines": league.num_lines_per_match,
+        }
+
+
+class TeamRef(NamedTuple):
+    """Minimal team reference used by MatchSummary in place of a Team object"""
+
+    id: int
+    name: str
+    captain: Optional[str] = None
+
+
+class FacilityRef(NamedTuple):
+    """Minimal facility reference used by MatchSummary in place of a Facility object"""
+
+    id: int
+    name: str
+    short_name: Optional[str] = None
+
+
+class MatchSummary:
+    """
+    Flat, read-only view of a match for list, table and export views.
+
+    Built from a single joined query by list_match_summaries. It carries ids,
+    names, date, times, status and a precomputed quality score instead of the
+    nested Team/Facility graph (with weekly schedules) of a hydrated Match; the
+    League is shared, one object per league. The read-side methods used by
+    templates (is_scheduled, get_status, calculate_quality_score,
+    home_team.name, ...) behave like their Match counterparts.
+    """
+
+    __slots__ = (
+        "id",
+        "round",
+        "num_rounds",
+        "league",
+        "home_team_id",
+        "home_team_name",
+        "home_team_captain",
+        "visitor_team_id",
+        "visitor_team_name",
+        "visitor_team_captain",
+        "facility_id",
+        "facility_name",
+        "facility_short_name_value",
+        "date",
+        "scheduled_times",
+        "qscore",
+        "qscore_penalties",
+    )
+
+    def __init__(
+        self,
+        id: int,
+        round: int,
+        num_rounds: float,
+        league: "League",
+        home_team_id: int,
+        home_team_name: str,
+        visitor_team_id: int,
+        visitor_team_name: str,
+        home_team_captain: Optional[str] = None,
+        visitor_team_captain: Optional[str] = None,
+        facility_id: Optional[int] = None,
+        facility_name: Optional[str] = None,
+        facility_short_name: Optional[str] = None,
+        date: Optional[date_type] = None,
+        scheduled_times: Optional[List[str]] = None,
+        qscore: int = 0,
+        qscore_penalties: Optional[List[str]] = None,
+    ) -> None:
+        self.id = id
+        self.round = round
+        self.num_rounds = num_rounds
+        self.league = league
+        self.home_team_id = home_team_id
+        self.home_team_name = home_team_name
+        self.home_team_captain = home_team_captain
+        self.visitor_team_id = visitor_team_id
+        self.visitor_team_name = visitor_team_name
+        self.visitor_team_captain = visitor_team_captain
+        self.facility_id = facility_id
+        self.facility_name = facility_name
+        self.facility_short_name_value = facility_short_name
+        self.date = date
+        self.scheduled_times = scheduled_times or []
+        self.qscore = qscore
+        self.qscore_penalties = qscore_penalties or []
+
+    # ========== Object-like references for templates ==========
+
+    @property
+    def league_id(self) -> int:
+        return self.league.id
+
+    @property
+    def league_name(self) -> str:
+        return self.league.name
+
+    @property
+    def home_team(self) -> TeamRef:
+        return TeamRef(self.home_team_id, self.home_team_name, self.home_team_captain)
+
+    @property
+    def visitor_team(self) -> TeamRef:
+        return TeamRef(self.visitor_team_id, self.visitor_team_name, self.visitor_team_captain)
+
+    @property
+    def facility(self) -> Optional[FacilityRef]:
+        if not self.is_scheduled():
+            return None
+        return FacilityRef(self.facility_id, self.facility_name, self.facility_short_name_value)
+
+    @property
+    def facility_short_name(self) -> str:
+        """Get facility short name or 'N/A' if no facility"""
+        return self.facility_short_name_value if self.is_scheduled() and self.facility_short_name_value else "N/A"
+
+    # ========== Match Scheduling Status ==========
+
+    def is_scheduled(self) -> bool:
+        """Check if the match is scheduled (facility, date and at least one time)"""
+        return self.facility_id is not None and self.date is not None and len(self.scheduled_times) > 0
+
+    def is_unscheduled(self) -> bool:
+        """Check if the match is unscheduled"""
+        return not self.is_scheduled()
+
+    def is_partially_scheduled(self) -> bool:
+        """Check if the match has some but not all required lines"""
+        return self.is_scheduled() and 0 < len(self.scheduled_times) < self.league.num_lines_per_match
+
+    def is_fully_scheduled(self) -> bool:
+        """Check if the match has all required lines"""
+        return self.is_scheduled() and len(self.scheduled_times) == self.league.num_lines_per_match
+
+    def get_status(self) -> str:
+        """Get the scheduling status of the match"""
+        if self.is_unscheduled():
+            return "unscheduled"
+        elif self.is_partially_scheduled():
+            return "partially_scheduled"
+        elif self.is_fully_scheduled():
+            return "fully_scheduled"
+        else:
+            return "over_scheduled"
+
+    def get_num_scheduled_lines(self) -> int:
+        """Get the number of scheduled lines (times)"""
+        return len(self.scheduled_times) if self.is_scheduled() else 0
+
+    def get_expected_lines(self) -> int:
+        """Get the expected number of lines from the league configuration"""
+        return self.league.num_lines_per_match
+
+    def get_scheduled_times(self) -> List[str]:
+        """Get the list of scheduled times for this match"""
+        return list(self.scheduled_times)
+
+    def calculate_quality_score(self) -> Tuple[int, Optional[List[str]]]:
+        """Get the quality score computed when the summary was loaded"""
+        return (self.qscore, self.qscore_penalties)
+
+    def __str__(self) -> str:
+        """String representation of the match summary"""
+        status = self.get_status()
+        if self.is_scheduled():
+            return f"Match {self.id}: {self.home_team_name} vs {self.visitor_team_name} at {self.facility_name} on {self.date} ({len(self.scheduled_times)} lines, {status})"
+        else:
+            return f"Match {self.id}: {self.home_team_name} vs {self.visitor_team_name} ({status})"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Convert the summary to the same dictionary shape as Match.to_dict"""
         return {
             "id": self.id,
-            "league_id": self.league.id,
-            "league_name": self.league.name,
-            "home_team_id": self.home_team.id,
-            "home_team_name": self.home_team.name,
-            "visitor_team_id": self.visitor_team.id,
-            "visitor_team_name": self.visitor_team.name,
-            "facility_id": self.facility.id if self.facility else None,
-            "facility_name": self.facility_name,
+            "league_id": self.league_id,
+            "league_name": self.league_name,
+            "home_team_id": self.home_team_id,
+            "home_team_name": self.home_team_name,
+            "visitor_team_id": self.visitor_team_id,
+            "visitor_team_name": self.visitor_team_name,
+            "facility_id": self.facility_id if self.is_scheduled() else None,
+            "facility_name": self.facility_name if self.is_scheduled() else "Unscheduled",
             "date": self.date,
-            "scheduled_times": self.scheduled_times.copy(),
+            "scheduled_times": list(self.scheduled_times),
             "status": self.get_status(),
             "num_scheduled_lines": self.get_num_scheduled_lines(),
             "expected_lines": self.get_expected_lines(),
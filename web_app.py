@@ -21,7 +21,8 @@ the startup script (start_tennis_app.py) for automated setup.
 Author: Tennis App Development Team
 """
 
-from flask import Flask
+import os
+from flask import Flask, g
 from typing import Optional, Type, Dict, Any
 import web_import_export
 import web_main
@@ -32,10 +33,15 @@ import web_matches
 import web_schedule_match
 import web_schedule_utilization
 import web_schedule  # Added missing import
+import web_metrics
 from web_database import close_db, db_config, init_db, get_db
 
 app = Flask(__name__)
 app.secret_key = 'tennis_db_secret_key_change_in_production'
+# Show the SQL statement summary in the page footer (always shown in debug mode)
+app.config['SQL_DEBUG'] = os.environ.get('TENNIS_SQL_DEBUG', '').lower() in ('1', 'true', 'yes')
+# Admin token that allows the bulk endpoints' profile flag (profiling is refused when unset)
+app.config['PROFILE_TOKEN'] = os.environ.get('TENNIS_PROFILE_TOKEN') or None
 
 # Register all routes
 web_main.register_routes(app)
@@ -47,6 +53,7 @@ web_schedule.register_routes(app)
 web_import_export.register_routes(app)
 web_schedule_match.add_scheduling_routes_to_app(app)
 web_schedule_utilization.register_routes(app)
+web_metrics.register_routes(app)
 
 # Database cleanup
 app.teardown_appcontext(close_db)
@@ -62,6 +69,22 @@ def inject_db_path():
         return {'db_path': str(db_config['connection_params'])}
     return {'db_path': None}
 
+@app.context_processor
+def inject_query_stats():
+    """Inject the SQL debug footer switch and a summary of the request's statements so far"""
+    def db_query_summary():
+        stats = getattr(g.get('db'), 'query_stats', None)
+        return stats.summary(top=5) if stats is not None else None
+    return {'sql_debug': app.debug or app.config['SQL_DEBUG'], 'db_query_summary': db_query_summary}
+
+@app.after_request
+def add_query_headers(response):
+    """Report the request's SQL statement count and time in X-DB-Queries and Server-Timing headers"""
+    stats = getattr(g.get('db'), 'query_stats', None)
+    if stats is not None:
+        response.headers.update(stats.header_values())
+    return response
+
 # ==================== STARTUP FUNCTIONS ====================
 
 def create_app_with_sqlite(db_path: str):
@@ -81,6 +104,9 @@ def create_app_with_backend(backend_class: Type[TennisDBInterface], **connection
         raise RuntimeError(f"Failed to initialize database with {backend_class.__name__}")
 
 if __name__ == '__main__':
+    from logging_setup import configure_logging
+    configure_logging()
+
     # Print all registered routes for debugging
     print("Registered routes:")
     for rule in app.url_map.iter_rules():
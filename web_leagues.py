@@ -97,6 +97,7 @@ def register_routes(app):
                     'num_matches': request.form.get('num_matches', type=int) or 12,
                     'num_lines_per_match': request.form.get('num_lines_per_match', type=int) or 3,
                     'allow_split_lines': bool(request.form.get('allow_split_lines', type=int)),
+                    'match_duration_minutes': request.form.get('match_duration_minutes', type=int) or None,
                     'start_date': request.form.get('start_date') or None,
                     'end_date': request.form.get('end_date') or None
                 }
@@ -124,6 +125,7 @@ def register_routes(app):
                 league.num_matches = league_data['num_matches']
                 league.num_lines_per_match = league_data['num_lines_per_match']
                 league.allow_split_lines = league_data['allow_split_lines']
+                league.match_duration_minutes = league_data['match_duration_minutes']
                 
                 # Convert date strings to date objects
                 if league_data['start_date']:
@@ -328,6 +330,7 @@ def register_routes(app):
                         'num_matches': request.form.get('num_matches', type=int),
                         'num_lines_per_match': request.form.get('num_lines_per_match', type=int),
                         'allow_split_lines': bool(request.form.get('allow_split_lines', type=int)),
+                        'match_duration_minutes': request.form.get('match_duration_minutes', type=int) or None,
                         'start_date': request.form.get('start_date') or None,
                         'end_date': request.form.get('end_date') or None,
                         # ADD THESE TWO LINES:
@@ -345,6 +348,7 @@ def register_routes(app):
                     league.num_matches = updated_data['num_matches']
                     league.num_lines_per_match = updated_data['num_lines_per_match']
                     league.allow_split_lines = updated_data['allow_split_lines']
+                    league.match_duration_minutes = updated_data['match_duration_minutes']
                     # Convert date strings to date objects
                     if updated_data['start_date']:
                         league.start_date = date.fromisoformat(updated_data['start_date'])
@@ -521,6 +525,7 @@ def register_routes(app):
                 'num_matches': getattr(league, 'num_matches', 0),
                 'num_lines_per_match': getattr(league, 'num_lines_per_match', 0),
                 'allow_split_lines': getattr(league, 'allow_split_lines', False),
+                'match_duration_minutes': getattr(league, 'match_duration_minutes', None),
                 'start_date': getattr(league, 'start_date', None).isoformat() if getattr(league, 'start_date', None) else None,
                 'end_date': getattr(league, 'end_date', None).isoformat() if getattr(league, 'end_date', None) else None,
                 'teams_count': len(teams) if teams else 0,
@@ -78,31 +78,18 @@ def register_routes(app):
         
         try:
             from web_database import db_config
+            from stats_cache import get_stats_snapshot
+            snapshot = get_stats_snapshot(db, include_facility_stats=False)
             stats_data = {
-                'facilities_count': len(db.list_facilities()),
-                'leagues_count': len(db.list_leagues()),
-                'teams_count': len(db.list_teams()),
-                'matches_count': len(db.list_matches()),
-                'db_path': str(db_config['connection_params'])
+                'facilities_count': snapshot['facilities_count'],
+                'leagues_count': snapshot['leagues_count'],
+                'teams_count': snapshot['teams_count'],
+                'matches_count': snapshot['matches_count'],
+                'db_path': str(db_config['connection_params']),
+                'league_breakdown': snapshot['league_breakdown'],
+                'snapshot_built_at': snapshot['built_at']
             }
             
-            # League breakdown
-            leagues_list = db.list_leagues()
-            league_stats = []
-            for league in leagues_list:
-                try:
-                    teams_in_league = len(db.list_teams(league))
-                    matches_in_league = len(db.list_matches(league=league))
-                    league_stats.append({
-                        'league': league,
-                        'teams_count': teams_in_league,
-                        'matches_count': matches_in_league
-                    })
-                except Exception as e:
-                    print(f"Warning: Could not get stats for league {league.id}: {e}")
-            
-            stats_data['league_breakdown'] = league_stats
-            
             return render_template('stats.html', stats=stats_data)
         except Exception as e:
             flash(f'Error loading statistics: {e}', 'error')
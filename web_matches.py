@@ -13,17 +13,24 @@ from flask import (
     current_app,
 )
 from datetime import datetime, date, timedelta
+import functools
+import hmac
 import traceback
 import json
+import logging
 import yaml
 import time
 
-from scheduling_manager import SchedulingManager
+from scheduling_manager import SchedulingManager, ORDERINGS
+from run_profiler import PROFILERS, RunProfile
+from time_of_day import time_to_minutes
 
 import scheduling_manager
 from usta import Match, MatchType, League
 from web_matches_calendar import create_calendar_context
 
+logger = logging.getLogger(__name__)
+
 
 def format_score_description() -> str:
     """Format quality score description as colored HTML list using Match.calculate_quality_score_description()"""
@@ -70,6 +77,45 @@ def format_score_description() -> str:
     return f'<div style="margin:0;padding:0">{items_html}</div>'
 
 
+def profiled(operation):
+    """
+    Decorator running a bulk endpoint under RunProfile when the request asks for it
+
+    The ``profile`` form field (``true``/``cprofile`` or ``sampling``) is an
+    admin flag: it needs the ``X-Profile-Token`` header to match the app's
+    PROFILE_TOKEN.  The summary is added to the JSON response as
+    ``run_profile``.  Requests without the flag run the endpoint unchanged.
+
+    Args:
+        operation: Run name the profile files are prefixed with
+    """
+    def decorator(view):
+        @functools.wraps(view)
+        def wrapper(*args, **kwargs):
+            flag = request.form.get("profile", "").strip().lower()
+            if flag in ("", "0", "false", "no", "off"):
+                return view(*args, **kwargs)
+
+            token = current_app.config.get("PROFILE_TOKEN")
+            supplied = request.headers.get("X-Profile-Token", "")
+            if not token or not hmac.compare_digest(supplied.encode(), token.encode()):
+                return jsonify({"error": "Profiling requires the admin profile token"}), 403
+            profiler = "cprofile" if flag in ("1", "true", "yes", "on") else flag
+            if profiler not in PROFILERS:
+                return jsonify({"error": f"Invalid profiler '{profiler}'"}), 400
+
+            with RunProfile(operation, profiler=profiler) as run_profile:
+                response = current_app.make_response(view(*args, **kwargs))
+            if response.is_json:
+                payload = response.get_json()
+                if isinstance(payload, dict):
+                    payload["run_profile"] = run_profile.summary
+                    response.set_data(current_app.json.dumps(payload))
+            return response
+        return wrapper
+    return decorator
+
+
 def register_routes(app, get_db):
     """Register match-related routes with Flask app"""
 
@@ -98,20 +144,18 @@ def register_routes(app, get_db):
             facility = db.get_facility(facility_id) if facility_id else None  # NEW
             team = db.get_team(team_id) if team_id else None  # NEW
 
-            print(
-                f"Trying to get Matches for League = {league_id}, match_type={match_type_str}"
-            )
+            logger.debug("Trying to get Matches for League = %s, match_type=%s", league_id, match_type_str)
 
             # Convert match_type string to MatchType enum using from_string()
             try:
                 match_type = MatchType.from_string(match_type_str)
             except ValueError as e:
-                print(f"Invalid match_type '{match_type_str}': {e}")
+                logger.warning("Invalid match_type '%s': %s", match_type_str, e)
                 flash(f"Invalid match type: {match_type_str}", "error")
                 match_type = MatchType.ALL  # Default to ALL if invalid
 
-            # Get matches with proper parameters
-            matches_list = db.list_matches(
+            # Flat summaries are all the table and calendar views need
+            matches_list = db.list_match_summaries(
                 facility=facility,
                 league=league,
                 team=team,
@@ -198,7 +242,7 @@ def register_routes(app, get_db):
                         year=year
                     )
                 except Exception as e:
-                    print(f"Error generating calendar context: {str(e)}")
+                    logger.error("Error generating calendar context: %s", e)
                     # Continue without calendar data if there's an error
                     calendar_context = {}
 
@@ -226,7 +270,7 @@ def register_routes(app, get_db):
             )
 
         except Exception as e:
-            print(f"Error in matches route: {str(e)}")
+            logger.error("Error in matches route: %s", e)
             traceback.print_exc()
             flash(f"Error loading matches: {str(e)}", "error")
             return redirect(url_for("dashboard"))
@@ -299,7 +343,7 @@ def register_routes(app, get_db):
     @app.route("/matches/<int:match_id>/schedule", methods=["POST"])
     def schedule_match(match_id):
         """Schedule a match"""
-        print(f"\n=== SCHEDULE MATCH {match_id} ===")
+        logger.debug("=== SCHEDULE MATCH %s ===", match_id)
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -314,9 +358,7 @@ def register_routes(app, get_db):
             date_str = request.form.get("date")
             times = request.form.getlist("times")
 
-            print(
-                f"Scheduling data: facility_id={facility_id}, date={date_str}, times={times}"
-            )
+            logger.debug("Scheduling data: facility_id=%s, date=%s, times=%s", facility_id, date_str, times)
 
             # Validate inputs
             if not facility_id:
@@ -358,7 +400,7 @@ def register_routes(app, get_db):
             if not success:
                 return jsonify({"error": "Failed to save match scheduling to database"}), 500
 
-            print(f"Match {match_id} scheduled successfully")
+            logger.info("Match %s scheduled successfully", match_id)
 
             return jsonify(
                 {
@@ -368,14 +410,14 @@ def register_routes(app, get_db):
             )
 
         except Exception as e:
-            print(f"Schedule match error: {str(e)}")
+            logger.error("Schedule match error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Scheduling failed: {str(e)}"}), 500
 
     @app.route("/matches/<int:match_id>", methods=["DELETE"])
     def delete_match(match_id):
         """Delete an unscheduled match"""
-        print(f"\n=== DELETE MATCH {match_id} ===")
+        logger.debug("=== DELETE MATCH %s ===", match_id)
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -401,7 +443,7 @@ def register_routes(app, get_db):
             return jsonify({"success": True, "message": "Match deleted successfully"})
 
         except Exception as e:
-            print(f"Delete match error: {str(e)}")
+            logger.error("Delete match error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Deletion failed: {str(e)}"}), 500
 
@@ -455,9 +497,10 @@ def register_routes(app, get_db):
     # ==================== Bulk Operations ====================
 
     @app.route("/api/bulk-auto-schedule", methods=["POST"])
+    @profiled("bulk_auto_schedule")
     def bulk_auto_schedule():
         """Bulk auto-schedule matches using db.match_manager.auto_schedule_matches"""
-        print(f"\n=== BULK AUTO-SCHEDULE ===")
+        logger.debug("=== BULK AUTO-SCHEDULE ===")
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -467,7 +510,7 @@ def register_routes(app, get_db):
             scope = request.form.get("scope", "all")
             league_id = request.form.get("league_id", type=int)
 
-            print(f"Bulk auto-schedule scope: {scope}, league_id: {league_id}")
+            logger.debug("Bulk auto-schedule scope: %s, league_id: %s", scope, league_id)
 
             # Get the matches to schedule based on scope
             matches_to_schedule = []
@@ -475,9 +518,7 @@ def register_routes(app, get_db):
             if scope == "all":
                 # All unscheduled matches - use MatchType.UNSCHEDULED directly
                 matches_to_schedule = db.list_matches(match_type=MatchType.UNSCHEDULED)
-                print(
-                    f"Auto-scheduling all unscheduled matches: {len(matches_to_schedule)} found"
-                )
+                logger.debug("Auto-scheduling all unscheduled matches: %s found", len(matches_to_schedule))
 
             elif scope == "league" and league_id:
                 # Specific league only - get unscheduled matches for that league
@@ -488,8 +529,10 @@ def register_routes(app, get_db):
                 matches_to_schedule = db.list_matches(
                     league=league, match_type=MatchType.UNSCHEDULED
                 )
-                print(
-                    f"Auto-scheduling unscheduled matches for league '{league.name}': {len(matches_to_schedule)} found"
+                logger.debug(
+                    "Auto-scheduling unscheduled matches for league '%s': %s found",
+                    league.name,
+                    len(matches_to_schedule),
                 )
 
             elif scope == "selected":
@@ -511,8 +554,9 @@ def register_routes(app, get_db):
                 matches_to_schedule = filter_matches(
                     all_matches, start_date, end_date, search_query
                 )
-                print(
-                    f"Auto-scheduling filtered unscheduled matches: {len(matches_to_schedule)} found"
+                logger.debug(
+                    "Auto-scheduling filtered unscheduled matches: %s found",
+                    len(matches_to_schedule),
                 )
 
             else:
@@ -529,31 +573,72 @@ def register_routes(app, get_db):
                     }
                 )
 
-            print(
-                f"Found {len(matches_to_schedule)} unscheduled matches to auto-schedule"
-            )
+            logger.info("Found %s unscheduled matches to auto-schedule", len(matches_to_schedule))
 
             # Get scheduling mode and parameters
             schedule_mode = request.form.get("schedule_mode", "standard")
             dry_run = request.form.get("dry_run", "true").lower() in ["true", "1", "yes"]
+            ordering = request.form.get("ordering", "best_option")
+            if ordering not in ORDERINGS:
+                return jsonify({"error": f"Invalid ordering '{ordering}'"}), 400
             
-            print(f"Scheduling mode: {schedule_mode}, dry_run: {dry_run}")
+            logger.debug("Scheduling mode: %s, ordering: %s, dry_run: %s", schedule_mode, ordering, dry_run)
             
             # Call the appropriate scheduling method based on mode
             try:
-                if schedule_mode == "optimized":
+                optimized_assignments = None
+                solver_report = None
+                optimization_result = None
+                assignments_json = request.form.get("assignments")
+                if assignments_json:
+                    # Commit a schedule previously returned by the annealing optimizer
+                    seed = None
+                    scheduling_manager = SchedulingManager(db)
+                    scheduling_results = scheduling_manager.apply_assignments(
+                        matches_to_schedule, json.loads(assignments_json), dry_run=dry_run
+                    )
+
+                elif schedule_mode == "optimized" and request.form.get("optimizer") in ("annealing", "exact"):
+                    optimizer = request.form.get("optimizer")
+                    time_budget = request.form.get("time_budget", 30.0, type=float)
+                    logger.debug("Using %s optimizer with a %ss budget", optimizer, time_budget)
+
+                    scheduling_manager = SchedulingManager(db)
+                    optimization_result = scheduling_manager.optimize_auto_schedule(
+                        matches=matches_to_schedule,
+                        ordering=ordering,
+                        mode=optimizer,
+                        time_budget=time_budget,
+                        solver_backend=request.form.get("solver", "auto")
+                    )
+                    if not optimization_result.get('optimization_completed', False):
+                        return jsonify({"error": f"Optimization failed: {optimization_result.get('error', 'Unknown error')}"}), 500
+
+                    seed = optimization_result['best_seed']
+                    optimized_assignments = optimization_result['best_assignments']
+                    if optimizer == "exact":
+                        solver_report = dict(optimization_result['solver'], greedy=optimization_result['greedy'])
+                    scheduling_results = scheduling_manager.apply_assignments(
+                        matches_to_schedule, optimized_assignments, dry_run=dry_run
+                    )
+
+                elif schedule_mode == "optimized":
                     # Use optimizer with multiple iterations
                     iterations = request.form.get("iterations", 10, type=int)
-                    print(f"Using optimized scheduling with {iterations} iterations")
+                    logger.debug("Using optimized scheduling with %s iterations", iterations)
                     
                     # Progress callback for optimizer
                     progress_data = {'current_iteration': 0, 'best_result': None}
                     def progress_callback(update):
                         progress_data['current_iteration'] = update['iteration']
                         progress_data['best_result'] = update
-                        print(f"Optimization iteration {update['iteration']}/{update['max_iterations']}: "
-                              f"unscheduled={update['best_unscheduled_count']}, "
-                              f"quality={update['best_quality_score']:.1f}")
+                        logger.debug(
+                            "Optimization iteration %s/%s: unscheduled=%s, quality=%.1f",
+                            update['iteration'],
+                            update['max_iterations'],
+                            update['best_unscheduled_count'],
+                            update['best_quality_score'],
+                        )
                     
                     # Use SchedulingManager for optimization
                     scheduling_manager = SchedulingManager(db)
@@ -562,25 +647,30 @@ def register_routes(app, get_db):
                     optimization_result = scheduling_manager.optimize_auto_schedule(
                         matches=matches_to_schedule, 
                         max_iterations=iterations,
-                        progress_callback=progress_callback
+                        progress_callback=progress_callback,
+                        ordering=ordering
                     )
                     
                     if optimization_result.get('optimization_completed', False):
                         # Get the best seed from optimization
                         seed = optimization_result['best_seed']
-                        print(f"Optimization completed. Best seed: {seed}")
+                        logger.info("Optimization completed. Best seed: %s", seed)
                         
                         # Always run a single iteration with the best seed for consistent results
-                        print(f"Running {'dry-run' if dry_run else 'execution'} with optimized seed {seed}")
+                        logger.debug(
+                            "Running %s with optimized seed %s",
+                            'dry-run' if dry_run else 'execution',
+                            seed,
+                        )
                         scheduling_results = scheduling_manager.auto_schedule_matches(
-                            matches=matches_to_schedule, dry_run=dry_run, seed=seed
+                            matches=matches_to_schedule, dry_run=dry_run, seed=seed, ordering=ordering
                         )
                     else:
                         return jsonify({"error": f"Optimization failed: {optimization_result.get('error', 'Unknown error')}"}), 500
                         
                 else:
                     # Standard single-iteration scheduling
-                    print(f"Using standard scheduling (single iteration)")
+                    logger.debug("Using standard scheduling (single iteration)")
                     
                     # Generate a random seed for reproducible scheduling
                     import random
@@ -590,21 +680,35 @@ def register_routes(app, get_db):
                     if provided_seed:
                         try:
                             seed = int(provided_seed)
-                            print(f"Using provided seed for reproducible scheduling: {seed}")
+                            logger.debug("Using provided seed for reproducible scheduling: %s", seed)
                         except (ValueError, TypeError):
                             # If provided seed is invalid, generate a new one
                             seed = int(time.time() * 1000) % 2**31
-                            print(f"Invalid provided seed, generated new seed: {seed}")
+                            logger.warning("Invalid provided seed, generated new seed: %s", seed)
                     else:
                         # Generate a new random seed based on current time
                         seed = int(time.time() * 1000) % 2**31
-                        print(f"Generated new seed for reproducible scheduling: {seed}")
+                        logger.debug("Generated new seed for reproducible scheduling: %s", seed)
                     
                     # Use SchedulingManager for standard auto-schedule
                     scheduling_manager = SchedulingManager(db)
-                    scheduling_results = scheduling_manager.auto_schedule_matches(
-                        matches=matches_to_schedule, dry_run=dry_run, seed=seed
-                    )
+                    if scope == "all":
+                        # Leagues that share no team or facility are scheduled independently
+                        scheduling_results = scheduling_manager.auto_schedule_components(
+                            matches=matches_to_schedule, dry_run=dry_run, seed=seed, ordering=ordering
+                        )
+                        decomposition = scheduling_results["decomposition"]
+                        logger.debug(
+                            "Scheduled %s independent components (largest: %s matches, workers: %s)",
+                            decomposition['components'],
+                            decomposition['largest_component'],
+                            decomposition['workers'],
+                        )
+                        optimized_assignments = scheduling_results["assignments"]
+                    else:
+                        scheduling_results = scheduling_manager.auto_schedule_matches(
+                            matches=matches_to_schedule, dry_run=dry_run, seed=seed, ordering=ordering
+                        )
 
                 # Extract results based on match_manager return format
                 scheduled_count = scheduling_results.get("scheduled", 0)
@@ -632,36 +736,36 @@ def register_routes(app, get_db):
                     if scheduled_matches_with_quality else 0, 1
                 )
 
-                print(
-                    f"Auto-scheduling results: {scheduled_count} scheduled, {failed_count} failed, success rate: {success_rate}%"
+                logger.info(
+                    "Auto-scheduling results: %s scheduled, %s failed, success rate: %s%%",
+                    scheduled_count,
+                    failed_count,
+                    success_rate,
                 )
 
                 # Enhanced warning output when not all matches are scheduled
                 if failed_count > 0:
-                    warning_message = f"⚠️ WARNING: Auto-scheduling incomplete!"
-                    print(f"\n{warning_message}")
-                    print(f"Results structure:")
-                    print(f"  - Total matches processed: {total_count}")
-                    print(f"  - Successfully scheduled: {scheduled_count}")
-                    print(f"  - Failed to schedule: {failed_count}")
-                    print(f"  - Success rate: {success_rate}%")
-
-                    # Log detailed error information
+                    logger.warning(
+                        "Auto-scheduling incomplete: %s of %s matches scheduled, %s failed (%s%%)",
+                        scheduled_count,
+                        total_count,
+                        failed_count,
+                        success_rate,
+                    )
+
+                    # Per-match details only when trace output is enabled
                     if errors:
-                        print(f"  - Error details:")
                         for i, error in enumerate(errors[:5], 1):  # Show first 5 errors
-                            print(f"    {i}. {error}")
+                            logger.debug("  error %s. %s", i, error)
                         if len(errors) > 5:
-                            print(f"    ... and {len(errors) - 5} more errors")
+                            logger.debug("  ... and %s more errors", len(errors) - 5)
 
-                    # Log scheduling details for failed matches
                     failed_details = [
                         detail
                         for detail in scheduling_details
                         if detail.get("status") == "scheduling_failed"
                     ]
-                    if failed_details:
-                        print(f"  - Failed match details:")
+                    if logger.isEnabledFor(logging.DEBUG):
                         for i, detail in enumerate(
                             failed_details[:3], 1
                         ):  # Show first 3 failed matches
@@ -670,15 +774,14 @@ def register_routes(app, get_db):
                             visitor_team = detail.get("visitor_team", "")
                             if home_team and visitor_team:
                                 match_info += f" ({home_team} vs {visitor_team})"
-                            print(
-                                f"    {i}. {match_info}: {detail.get('reason', 'Unknown reason')}"
+                            logger.debug(
+                                "  failed %s. %s: %s",
+                                i,
+                                match_info,
+                                detail.get('reason', 'Unknown reason'),
                             )
                         if len(failed_details) > 3:
-                            print(
-                                f"    ... and {len(failed_details) - 3} more failed matches"
-                            )
-
-                    print(f"⚠️ End warning\n")
+                            logger.debug("  ... and %s more failed matches", len(failed_details) - 3)
 
                 # Prepare response message based on results
                 if total_count == 0:
@@ -706,6 +809,14 @@ def register_routes(app, get_db):
                     "failed": failed_count,
                     "dry_run": dry_run,
                     "seed": seed,  # Include seed for reproducible execution
+                    "ordering": ordering,
+                    "assignments": optimized_assignments if dry_run else None,
+                    "solver": solver_report,
+                    "decomposition": scheduling_results.get("decomposition"),
+                    "components": scheduling_results.get("components"),
+                    # Time per scheduling stage and slowest matches (of the optimizer when it placed the matches)
+                    "profile": scheduling_results.get("profile") or (
+                        optimization_result.get("profile") if optimization_result else None),
                     "scheduling_details": scheduling_details,
                     "average_quality_score": average_quality_score,
                     "operations": (
@@ -758,7 +869,7 @@ def register_routes(app, get_db):
                 return jsonify(response_data)
 
             except Exception as db_error:
-                print(f"Database auto-scheduling error: {str(db_error)}")
+                logger.error("Database auto-scheduling error: %s", db_error)
                 traceback.print_exc()
                 return (
                     jsonify({"error": f"Auto-scheduling failed: {str(db_error)}"}),
@@ -766,14 +877,15 @@ def register_routes(app, get_db):
                 )
 
         except Exception as e:
-            print(f"Bulk auto-schedule error: {str(e)}")
+            logger.error("Bulk auto-schedule error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Bulk auto-schedule failed: {str(e)}"}), 500
 
     @app.route("/api/bulk-unschedule", methods=["POST"])
+    @profiled("bulk_unschedule")
     def bulk_unschedule():
         """Bulk unschedule matches"""
-        print(f"\n=== BULK UNSCHEDULE ===")
+        logger.debug("=== BULK UNSCHEDULE ===")
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -783,7 +895,7 @@ def register_routes(app, get_db):
             scope = request.form.get("scope", "all")
             league_id = request.form.get("league_id", type=int)
 
-            print(f"Bulk unschedule scope: {scope}, league_id: {league_id}")
+            logger.debug("Bulk unschedule scope: %s, league_id: %s", scope, league_id)
 
             # Determine which matches to unschedule - use MatchType.SCHEDULED directly
             matches_to_unschedule = []
@@ -835,7 +947,7 @@ def register_routes(app, get_db):
                     }
                 )
 
-            print(f"Found {len(matches_to_unschedule)} scheduled matches to unschedule")
+            logger.info("Found %s scheduled matches to unschedule", len(matches_to_unschedule))
 
             # Unschedule each match
             unscheduled_count = 0
@@ -849,11 +961,11 @@ def register_routes(app, get_db):
                     # Save to database
                     if scheduling_manager.unschedule_match(match):
                         unscheduled_count += 1
-                        print(f"Successfully unscheduled match {match.id}")
+                        logger.debug("Successfully unscheduled match %s", match.id)
 
                 except Exception as e:
                     errors.append(f"Error unscheduling match {match.id}: {str(e)}")
-                    print(f"Error unscheduling match {match.id}: {str(e)}")
+                    logger.error("Error unscheduling match %s: %s", match.id, e)
 
             # Prepare response
             message = f"Unscheduled {unscheduled_count} of {len(matches_to_unschedule)} matches"
@@ -871,14 +983,15 @@ def register_routes(app, get_db):
             )
 
         except Exception as e:
-            print(f"Bulk unschedule error: {str(e)}")
+            logger.error("Bulk unschedule error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Bulk unschedule failed: {str(e)}"}), 500
 
     @app.route("/api/bulk-delete", methods=["POST"])
+    @profiled("bulk_delete")
     def bulk_delete():
         """Bulk delete unscheduled matches (safety restriction)"""
-        print(f"\n=== BULK DELETE ===")
+        logger.debug("=== BULK DELETE ===")
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -890,7 +1003,7 @@ def register_routes(app, get_db):
             )  # Default to unscheduled only
             league_id = request.form.get("league_id", type=int)
 
-            print(f"Bulk delete scope: {scope}, league_id: {league_id}")
+            logger.debug("Bulk delete scope: %s, league_id: %s", scope, league_id)
 
             # Determine which matches to delete - use MatchType.UNSCHEDULED directly for safety
             matches_to_delete = []
@@ -942,7 +1055,7 @@ def register_routes(app, get_db):
                     }
                 )
 
-            print(f"Found {len(matches_to_delete)} unscheduled matches to delete")
+            logger.info("Found %s unscheduled matches to delete", len(matches_to_delete))
 
             # Delete each match
             deleted_count = 0
@@ -960,11 +1073,11 @@ def register_routes(app, get_db):
                     # Delete the match
                     db.delete_match(match.id)
                     deleted_count += 1
-                    print(f"Successfully deleted match {match.id}")
+                    logger.debug("Successfully deleted match %s", match.id)
 
                 except Exception as e:
                     errors.append(f"Error deleting match {match.id}: {str(e)}")
-                    print(f"Error deleting match {match.id}: {str(e)}")
+                    logger.error("Error deleting match %s: %s", match.id, e)
 
             # Prepare response
             message = f"Deleted {deleted_count} of {len(matches_to_delete)} unscheduled matches"
@@ -982,7 +1095,7 @@ def register_routes(app, get_db):
             )
 
         except Exception as e:
-            print(f"Bulk delete error: {str(e)}")
+            logger.error("Bulk delete error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Bulk delete failed: {str(e)}"}), 500
 
@@ -1024,7 +1137,7 @@ def register_routes(app, get_db):
                 match_type = MatchType.ALL
             
             # Get matches with filters
-            matches_list = db.list_matches(
+            matches_list = db.list_match_summaries(
                 facility=facility,
                 league=league,
                 team=team,
@@ -1040,10 +1153,11 @@ def register_routes(app, get_db):
             calendar_context = create_calendar_context(db, month, year)
             
             # Filter calendar matches based on current filters
+            filtered_ids = {m.id for m in filtered_matches}
             for week in calendar_context['calendar_weeks']:
                 for day in week.days:
                     # Filter day matches based on current filters
-                    day.matches = [m for m in day.matches if m in filtered_matches]
+                    day.matches = [m for m in day.matches if m.id in filtered_ids]
             
             # Convert calendar data to JSON-serializable format
             calendar_json = {
@@ -1083,15 +1197,16 @@ def register_routes(app, get_db):
             return jsonify(calendar_json)
             
         except Exception as e:
-            print(f"Error in calendar_data endpoint: {str(e)}")
+            logger.error("Error in calendar_data endpoint: %s", e)
             return jsonify({"error": f"Failed to load calendar data: {str(e)}"}), 500
 
     # ==================== OPTIMIZER OPERATIONS ====================
 
     @app.route("/api/optimize-auto-schedule", methods=["POST"])
+    @profiled("optimize_auto_schedule")
     def optimize_auto_schedule():
         """Run auto-schedule optimization with multiple iterations"""
-        print(f"\n=== AUTO-SCHEDULE OPTIMIZER ===")
+        logger.debug("=== AUTO-SCHEDULE OPTIMIZER ===")
         db = get_db()
         if db is None:
             return jsonify({"error": "No database connected"}), 500
@@ -1101,19 +1216,27 @@ def register_routes(app, get_db):
             scope = request.form.get("scope", "all")
             league_id = request.form.get("league_id", type=int)
             max_iterations = request.form.get("max_iterations", 10, type=int)
+            ordering = request.form.get("ordering", "best_option")
+            if ordering not in ORDERINGS:
+                return jsonify({"error": f"Invalid ordering '{ordering}'"}), 400
             
             # Validate max_iterations
             if max_iterations < 1 or max_iterations > 100:
                 return jsonify({"error": "Max iterations must be between 1 and 100"}), 400
 
-            print(f"Optimizer scope: {scope}, league_id: {league_id}, max_iterations: {max_iterations}")
+            logger.debug(
+                "Optimizer scope: %s, league_id: %s, max_iterations: %s",
+                scope,
+                league_id,
+                max_iterations,
+            )
 
             # Get the matches to optimize based on scope (same logic as bulk_auto_schedule)
             matches_to_optimize = []
 
             if scope == "all":
                 matches_to_optimize = db.list_matches(match_type=MatchType.UNSCHEDULED)
-                print(f"Optimizing all unscheduled matches: {len(matches_to_optimize)} found")
+                logger.debug("Optimizing all unscheduled matches: %s found", len(matches_to_optimize))
 
             elif scope == "league" and league_id:
                 league = db.get_league(league_id)
@@ -1121,7 +1244,11 @@ def register_routes(app, get_db):
                     return jsonify({"error": f"League {league_id} not found"}), 400
 
                 matches_to_optimize = db.list_matches(league=league, match_type=MatchType.UNSCHEDULED)
-                print(f"Optimizing unscheduled matches for league '{league.name}': {len(matches_to_optimize)} found")
+                logger.debug(
+                    "Optimizing unscheduled matches for league '%s': %s found",
+                    league.name,
+                    len(matches_to_optimize),
+                )
 
             elif scope == "selected":
                 # Apply current filter parameters
@@ -1133,7 +1260,7 @@ def register_routes(app, get_db):
                 league = db.get_league(league_id_filter) if league_id_filter else None
                 all_matches = db.list_matches(league=league, match_type=MatchType.UNSCHEDULED)
                 matches_to_optimize = filter_matches(all_matches, start_date, end_date, search_query)
-                print(f"Optimizing filtered unscheduled matches: {len(matches_to_optimize)} found")
+                logger.debug("Optimizing filtered unscheduled matches: %s found", len(matches_to_optimize))
 
             else:
                 return jsonify({"error": "Invalid scope or missing parameters"}), 400
@@ -1149,7 +1276,7 @@ def register_routes(app, get_db):
                     "results_history": []
                 })
 
-            print(f"Starting optimization for {len(matches_to_optimize)} unscheduled matches")
+            logger.debug("Starting optimization for %s unscheduled matches", len(matches_to_optimize))
 
             # Use SchedulingManager for optimization
             scheduling_manager = SchedulingManager(db)
@@ -1157,7 +1284,8 @@ def register_routes(app, get_db):
             # Run the optimization
             optimization_result = scheduling_manager.optimize_auto_schedule(
                 matches=matches_to_optimize, 
-                max_iterations=max_iterations
+                max_iterations=max_iterations,
+                ordering=ordering
             )
 
             if not optimization_result.get('optimization_completed', False):
@@ -1171,7 +1299,12 @@ def register_routes(app, get_db):
             results_history = optimization_result.get('results_history', [])
             improvement_found = optimization_result.get('improvement_found', False)
 
-            print(f"Optimization completed: best_seed={best_seed}, unscheduled={best_unscheduled_count}, quality={best_quality_score}")
+            logger.info(
+                "Optimization completed: best_seed=%s, unscheduled=%s, quality=%s",
+                best_seed,
+                best_unscheduled_count,
+                best_quality_score,
+            )
 
             # Prepare response
             response = {
@@ -1183,7 +1316,8 @@ def register_routes(app, get_db):
                 "best_unscheduled_count": best_unscheduled_count,
                 "best_quality_score": best_quality_score,
                 "improvement_found": improvement_found,
-                "results_history": results_history
+                "results_history": results_history,
+                "profile": optimization_result.get('profile'),
             }
 
             if improvement_found:
@@ -1194,7 +1328,7 @@ def register_routes(app, get_db):
             return jsonify(response)
 
         except Exception as e:
-            print(f"Optimize auto-schedule error: {str(e)}")
+            logger.error("Optimize auto-schedule error: %s", e)
             traceback.print_exc()
             return jsonify({"error": f"Optimization failed: {str(e)}"}), 500
 
@@ -1282,7 +1416,11 @@ def register_routes(app, get_db):
         """Count how many lines are scheduled at a specific time"""
         if not scheduled_times or not target_time:
             return 0
-        return scheduled_times.count(target_time)
+        try:
+            target = time_to_minutes(target_time)
+            return sum(1 for time_str in scheduled_times if time_to_minutes(time_str) == target)
+        except ValueError:
+            return scheduled_times.count(target_time)
 
     def format_date(date_value, format_string='%Y-%m-%d'):
         """Format a date string or datetime object using strftime"""
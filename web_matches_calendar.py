@@ -48,6 +48,7 @@ class MatchesCalendar:
     def __init__(self, db_interface=None):
         """Initialize calendar with optional database interface"""
         self.db = db_interface
+        self._matches_by_date = None  # date -> list of MatchSummary, loaded on first use
     
     def get_calendar_data(self, year: int, month: int) -> Dict[str, Any]:
         """
@@ -165,16 +166,16 @@ class MatchesCalendar:
             return []
         
         try:
-            # Use the standard list_matches method from the database interface
-            from usta import MatchType
-            all_matches = self.db.list_matches(match_type=MatchType.SCHEDULED)
-            filtered_matches = []
+            # Load flat summaries once and index them by date; every calendar cell
+            # is then a dictionary lookup instead of a full list_matches call
+            if self._matches_by_date is None:
+                from usta import MatchType
+                self._matches_by_date = {}
+                for match in self.db.list_match_summaries(match_type=MatchType.SCHEDULED):
+                    if match.date:
+                        self._matches_by_date.setdefault(match.date, []).append(match)
             
-            for match in all_matches:
-                if self._match_is_on_date(match, target_date):
-                    filtered_matches.append(match)
-            
-            return filtered_matches
+            return list(self._matches_by_date.get(target_date, []))
         except Exception as e:
             print(f"Error getting matches for date {target_date}: {e}")
             return []
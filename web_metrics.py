@@ -0,0 +1,57 @@
+"""
+Prometheus Metrics Endpoint
+
+Serves the in-process registry (see metrics) at ``/metrics`` and records
+request latency per endpoint and the number of in-flight requests.
+Registering the routes also instruments the SQL managers, so only the web
+app pays for the per-method timing.
+"""
+
+import time
+
+from flask import Response, g, request
+
+import metrics
+from sql_facility_manager import SQLFacilityManager
+from sql_league_manager import SQLLeagueManager
+from sql_match_manager import SQLMatchManager
+from sql_team_manager import SQLTeamManager
+
+# Manager classes whose public methods are exported as tennis_db_method_*
+INSTRUMENTED_MANAGERS = ((SQLTeamManager, "team"), (SQLLeagueManager, "league"),
+                         (SQLFacilityManager, "facility"), (SQLMatchManager, "match"))
+
+
+def register_routes(app):
+    """Register the /metrics route and the request timing hooks, and instrument the SQL managers"""
+
+    for manager_class, manager_name in INSTRUMENTED_MANAGERS:
+        metrics.instrument_methods(manager_class, manager_name)
+
+    @app.before_request
+    def start_request_timer():
+        """Count the request as in flight and remember when it started"""
+        g.metrics_started = time.perf_counter()
+        metrics.HTTP_REQUESTS_IN_FLIGHT.inc()
+
+    @app.after_request
+    def remember_response_status(response):
+        """Keep the status for the latency observation made at teardown"""
+        g.metrics_status = response.status_code
+        return response
+
+    @app.teardown_request
+    def observe_request(error=None):
+        """Record the request's latency (also for requests that raised)"""
+        started = g.pop('metrics_started', None)
+        if started is None:
+            return
+        metrics.HTTP_REQUESTS_IN_FLIGHT.dec()
+        status = g.pop('metrics_status', 500 if error is not None else 200)
+        metrics.HTTP_REQUEST_DURATION.observe(time.perf_counter() - started, request.endpoint or 'unmatched',
+                                              request.method, str(status))
+
+    @app.route('/metrics')
+    def prometheus_metrics():
+        """All metrics in the Prometheus text format"""
+        return Response(metrics.REGISTRY.render(), content_type=metrics.CONTENT_TYPE)
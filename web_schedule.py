@@ -43,8 +43,8 @@ def register_routes(app: Flask):
             if league_id:
                 selected_league = db.get_league(league_id)
             
-            # Get ALL scheduled matches using Match.is_scheduled()
-            all_matches = db.list_matches(league=selected_league, match_type=MatchType.SCHEDULED)
+            # Get ALL scheduled matches as flat summaries (no Team/Facility hydration)
+            all_matches = db.list_match_summaries(league=selected_league, match_type=MatchType.SCHEDULED)
             scheduled_matches = [m for m in all_matches if m.is_scheduled()]
             print(f"Found {len(scheduled_matches)} scheduled matches")
             
@@ -134,7 +134,7 @@ def build_schedule_data(matches):
 
 
 def enhance_match_for_template(match):
-    """Enhance match object with additional data for template display using Match class methods"""
+    """Enhance a Match or MatchSummary with additional data for template display"""
     try:
         enhanced_match = {
             'id': match.id,
@@ -2,6 +2,9 @@ from flask import render_template, jsonify, request, redirect, url_for, flash
 from datetime import datetime, timedelta
 from typing import Dict, List, Any, Optional
 import calendar
+import logging
+
+logger = logging.getLogger(__name__)
 
 def register_routes(app):
     """Register court utilization calendar routes"""
@@ -45,9 +48,7 @@ def register_routes(app):
         """Get utilization data for a specific facility and date range"""
         from web_database import get_db
         
-        print(f"\n=== DEBUG: get_facility_utilization called ===")
-        print(f"Facility ID: {facility_id}")
-        print(f"Request args: {request.args}")
+        logger.debug("get_facility_utilization: facility %s, args %s", facility_id, request.args)
         
         try:
             db = get_db()
@@ -189,9 +190,7 @@ def register_routes(app):
         """Get utilization data formatted for monthly calendar view"""
         from web_database import get_db
         
-        print(f"\n=== DEBUG: get_monthly_utilization called ===")
-        print(f"Facility ID: {facility_id}")
-        print(f"Request args: {request.args}")
+        logger.debug("get_monthly_utilization: facility %s, args %s", facility_id, request.args)
 
         try:
             db = get_db()